@@ -32,13 +32,25 @@ app.conf.beat_schedule = {
         "task": "check_low_stock_levels",
         "schedule": crontab(hour=9, minute=0),  # Daily at 9 AM
     },
-    "clean-abandoned-carts-weekly": {
-        "task": "clean_abandoned_carts",
-        "schedule": crontab(0, 0, day_of_week="monday"),  # Weekly on Monday
+    "send-low-stock-alerts": {
+        "task": "send_low_stock_alerts",
+        "schedule": settings.LOW_STOCK_ALERT_INTERVAL,  # Every minute
     },
-    "daily-sales-report": {
-        "task": "generate_daily_sales_report",
-        "schedule": crontab(hour=0, minute=30),  # Daily at 00:30
+    "purge-expired-tokens-hourly": {
+        "task": "purge_expired_tokens",
+        "schedule": crontab(minute=15),  # Hourly at :15
+    },
+    "flush-content-views": {
+        "task": "flush_content_views",
+        "schedule": settings.VIEW_BUFFER_FLUSH_INTERVAL,  # Every 30 seconds
+    },
+    "purge-content-views-daily": {
+        "task": "purge_content_views",
+        "schedule": crontab(hour=2, minute=0),  # Daily at 2 AM
+    },
+    "rebuild-product-popularity-weekly": {
+        "task": "rebuild_product_popularity",
+        "schedule": crontab(0, 3, day_of_week="sunday"),  # Sundays at 3 AM
     },
     "monthly-system-cleanup": {
         "task": "cleanup_old_sessions",
@@ -1,4 +1,4 @@
-from datetime import timedelta
+from datetime import datetime, timedelta, timezone
 from os import getenv, path
 from pathlib import Path
 
@@ -27,6 +27,7 @@ DJANGO_APPS = [
     "django.contrib.messages",
     "django.contrib.staticfiles",
     "django.contrib.sites",
+    "django.contrib.postgres",
 ]
 
 THIRD_PARTY_APPS = [
@@ -66,6 +67,8 @@ MIDDLEWARE = [
     "django.contrib.auth.middleware.AuthenticationMiddleware",
     "django.contrib.messages.middleware.MessageMiddleware",
     "django.middleware.clickjacking.XFrameOptionsMiddleware",
+    "core_apps.common.middleware.ReadYourWritesMiddleware",
+    "core_apps.common.middleware.RateLimitHeadersMiddleware",
 ]
 
 ROOT_URLCONF = "config.urls"
@@ -103,6 +106,214 @@ DATABASES = {
     }
 }
 
+# Read replicas, configured as a comma separated list of hosts that share
+# the credentials of the primary. Each host is registered as replica_<n>.
+DATABASE_REPLICAS = []
+for _index, _host in enumerate(
+    filter(None, getenv("POSTGRES_REPLICA_HOSTS", "").split(","))
+):
+    _alias = f"replica_{_index}"
+    DATABASES[_alias] = {
+        **DATABASES["default"],
+        "HOST": _host.strip(),
+        "TEST": {"MIRROR": "default"},
+    }
+    DATABASE_REPLICAS.append(_alias)
+
+# Route whitelisted read-only API actions to the replicas
+DATABASE_ROUTERS = ["core_apps.common.routers.PrimaryReplicaRouter"]
+
+# Seconds a client keeps reading from the primary after a write
+READ_YOUR_WRITES_WINDOW = int(getenv("READ_YOUR_WRITES_WINDOW", "15"))
+
+# Cookie used to pin a client to the primary after a write
+READ_YOUR_WRITES_COOKIE = "pin_primary"
+
+# Seconds an unreachable replica is skipped before being retried
+REPLICA_RETRY_INTERVAL = int(getenv("REPLICA_RETRY_INTERVAL", "30"))
+
+# Shared cache. Values are serialized with msgpack where possible and
+# compressed above CACHE_COMPRESS_MIN_SIZE bytes; Redis outages degrade to
+# cache misses. KEY_PREFIX keeps environments sharing a Redis apart.
+CACHES = {
+    "default": {
+        "BACKEND": "core_apps.common.cache.ResilientRedisCache",
+        "LOCATION": getenv("CACHE_REDIS_URL", "redis://redis:6379/2"),
+        "KEY_PREFIX": getenv("CACHE_KEY_PREFIX", ""),
+        "OPTIONS": {
+            "serializer": "core_apps.common.cache.CompressedSerializer",
+            "max_connections": int(getenv("CACHE_MAX_CONNECTIONS", "50")),
+            "socket_timeout": float(getenv("CACHE_SOCKET_TIMEOUT", "0.25")),
+            "socket_connect_timeout": float(
+                getenv("CACHE_SOCKET_TIMEOUT", "0.25")
+            ),
+            "retry_on_timeout": False,
+        },
+    }
+}
+
+# Encoded size in bytes from which cache values are compressed
+CACHE_COMPRESS_MIN_SIZE = int(getenv("CACHE_COMPRESS_MIN_SIZE", "1024"))
+
+# Compression used for large cache values: "zlib" or "lz4"
+CACHE_COMPRESSOR = getenv("CACHE_COMPRESSOR", "lz4")
+
+# Seconds an unreachable cache is skipped before being retried
+CACHE_RETRY_INTERVAL = int(getenv("CACHE_RETRY_INTERVAL", "5"))
+
+# Seconds an authenticated user stays in the shared cache
+USER_CACHE_TIMEOUT = int(getenv("USER_CACHE_TIMEOUT", "300"))
+
+# Seconds and number of users kept in each process's local user cache
+USER_CACHE_LOCAL_TIMEOUT = int(getenv("USER_CACHE_LOCAL_TIMEOUT", "10"))
+USER_CACHE_LOCAL_SIZE = int(getenv("USER_CACHE_LOCAL_SIZE", "1024"))
+
+# Seconds between rebuilds of each process's revoked token filter, stretched
+# by up to a fifth per rebuild so processes do not rebuild together
+TOKEN_REVOCATION_FILTER_TTL = int(getenv("TOKEN_REVOCATION_FILTER_TTL", "60"))
+
+# Minimum number of revoked tokens the filter is sized for
+TOKEN_REVOCATION_FILTER_CAPACITY = 10000
+
+# Rows deleted per statement when purging expired tokens
+TOKEN_PURGE_BATCH_SIZE = int(getenv("TOKEN_PURGE_BATCH_SIZE", "1000"))
+
+# Expired sessions deleted per statement by the session cleanup
+SESSION_PURGE_BATCH_SIZE = int(getenv("SESSION_PURGE_BATCH_SIZE", "5000"))
+
+# Seconds batched maintenance deletes sleep between batches, so writers
+# waiting on the same table get the locks in between
+MAINTENANCE_BATCH_PAUSE = float(getenv("MAINTENANCE_BATCH_PAUSE", "0.05"))
+
+# Redis instance holding the throttle windows
+THROTTLE_REDIS_URL = getenv("THROTTLE_REDIS_URL", "redis://redis:6379/1")
+
+# Seconds to wait for Redis before letting a request through unthrottled
+THROTTLE_REDIS_TIMEOUT = float(getenv("THROTTLE_REDIS_TIMEOUT", "0.1"))
+
+# Directory shared by the API and workers where uploads are streamed
+# before a background task processes them
+UPLOAD_STAGING_DIR = getenv("UPLOAD_STAGING_DIR", str(BASE_DIR / "staging"))
+
+# Largest accepted avatar upload in bytes
+AVATAR_MAX_UPLOAD_SIZE = int(getenv("AVATAR_MAX_UPLOAD_SIZE", "5242880"))
+
+# Largest accepted avatar source in pixels, to refuse decompression bombs
+AVATAR_MAX_PIXELS = 25_000_000
+
+# Width and height that stored avatars are downscaled to fit
+AVATAR_MAX_DIMENSION = int(getenv("AVATAR_MAX_DIMENSION", "512"))
+
+# JPEG quality of stored avatars
+AVATAR_JPEG_QUALITY = 85
+
+# Where processed avatars are stored: "cloudinary" or "local"
+AVATAR_STORAGE = getenv("AVATAR_STORAGE", "cloudinary")
+
+# Seconds to wait for the social provider when downloading an avatar
+SOCIAL_AVATAR_FETCH_TIMEOUT = float(getenv("SOCIAL_AVATAR_FETCH_TIMEOUT", "5"))
+
+# Seconds during which repeated logins do not queue the same avatar again
+SOCIAL_AVATAR_IMPORT_LOCK_TIMEOUT = 600
+
+# Where content views are buffered before being written: "redis" or "local"
+VIEW_BUFFER_BACKEND = getenv("VIEW_BUFFER_BACKEND", "redis")
+
+# Redis database holding buffered content views
+VIEW_BUFFER_REDIS_URL = getenv("VIEW_BUFFER_REDIS_URL", "redis://redis:6379/3")
+
+# Seconds to wait for Redis before dropping a content view
+VIEW_BUFFER_REDIS_TIMEOUT = float(getenv("VIEW_BUFFER_REDIS_TIMEOUT", "0.25"))
+
+# Seconds between writes of buffered content views
+VIEW_BUFFER_FLUSH_INTERVAL = int(getenv("VIEW_BUFFER_FLUSH_INTERVAL", "30"))
+
+# Viewers a process-local buffer holds before writing them itself
+VIEW_BUFFER_LOCAL_MAX_KEYS = 1000
+
+# Content view rows per INSERT ... ON CONFLICT statement
+VIEW_BUFFER_FLUSH_BATCH_SIZE = 1000
+
+# How long viewer rows are kept after their last view; daily rollups are
+# kept indefinitely
+CONTENT_VIEW_RETENTION = timedelta(
+    days=int(getenv("CONTENT_VIEW_RETENTION_DAYS", "90"))
+)
+
+# Content view rows deleted per statement by the retention purge
+CONTENT_VIEW_PURGE_BATCH_SIZE = 5000
+
+# Where daily HyperLogLog sketches of distinct viewers are kept:
+# "database" (pure Python) or "redis" (PFADD, on VIEW_BUFFER_REDIS_URL)
+VIEWER_SKETCH_BACKEND = getenv("VIEWER_SKETCH_BACKEND", "database")
+
+# Register bits of database sketches: 12 is at most 4 KB per scope and
+# day for a standard error of 1.6%
+VIEWER_SKETCH_PRECISION = 12
+
+# How long daily viewer sketches are kept, covering the longest
+# analytics range
+VIEWER_SKETCH_RETENTION = timedelta(days=366)
+
+# Seconds product counts in the cached category tree may lag behind, so a
+# burst of product changes rebuilds the tree once rather than per change
+CATEGORY_TREE_COUNTS_DELAY = int(getenv("CATEGORY_TREE_COUNTS_DELAY", "30"))
+
+# Time after which a view or sale counts half as much towards popularity
+PRODUCT_POPULARITY_HALF_LIFE = timedelta(
+    days=float(getenv("PRODUCT_POPULARITY_HALF_LIFE_DAYS", "7"))
+)
+
+# Moment stored popularity scores are scaled to; scores overflow about
+# 1000 half-lives later, so move it forward and rebuild before then
+PRODUCT_POPULARITY_EPOCH = datetime(2026, 1, 1, tzinfo=timezone.utc)
+
+# Weight of each kind of event in a product's popularity
+PRODUCT_POPULARITY_WEIGHTS = {"view": 1.0, "sale": 20.0}
+
+# Products updated per popularity statement
+PRODUCT_POPULARITY_BATCH_SIZE = 500
+
+# Stock at or below which a product line is reported, unless its type or
+# the line itself sets a threshold
+LOW_STOCK_THRESHOLD = int(getenv("LOW_STOCK_THRESHOLD", "5"))
+
+# Comma-separated addresses the low stock digest is sent to
+LOW_STOCK_ALERT_RECIPIENTS = getenv(
+    "LOW_STOCK_ALERT_RECIPIENTS", "admin@nexuscommerce.com"
+).split(",")
+
+# Sender of the low stock digest
+LOW_STOCK_ALERT_FROM_EMAIL = "system@nexuscommerce.com"
+
+# Product lines listed per low stock digest email
+LOW_STOCK_DIGEST_SIZE = 500
+
+# Redis database holding low stock events and alerted lines
+STOCK_EVENT_REDIS_URL = getenv("STOCK_EVENT_REDIS_URL", "redis://redis:6379/4")
+
+# Socket timeout in seconds for stock event writes, kept short so stock
+# updates are not held up by a slow Redis
+STOCK_EVENT_REDIS_TIMEOUT = float(getenv("STOCK_EVENT_REDIS_TIMEOUT", "0.25"))
+
+# Seconds between digests of queued low stock events
+LOW_STOCK_ALERT_INTERVAL = 60
+
+# Widths in pixels of the responsive variants generated for product images
+PRODUCT_IMAGE_WIDTHS = [160, 480, 1080]
+
+# WebP and JPEG quality of product image variants
+PRODUCT_IMAGE_QUALITY = 80
+
+# Records created per bulk insert when provisioning users
+USER_PROVISION_BATCH_SIZE = int(getenv("USER_PROVISION_BATCH_SIZE", "1000"))
+
+# Threads verifying password hashes for the async login view
+LOGIN_HASH_WORKERS = int(getenv("LOGIN_HASH_WORKERS", "4"))
+
+# Logins queued or verifying before new ones are rejected with 503
+LOGIN_MAX_PENDING = int(getenv("LOGIN_MAX_PENDING", "64"))
+
 # Using argon password hashers from Django Docs
 PASSWORD_HASHERS = [
     "django.contrib.auth.hashers.Argon2PasswordHasher",
@@ -204,6 +415,77 @@ CELERY_BEAT_SCHEDULER = "django_celery_beat.schedulers:DatabaseScheduler"
 # Enable sending task events from workers
 CELERY_WORKER_SEND_TASK_EVENTS = True
 
+# Queue of tasks without a route below
+CELERY_TASK_DEFAULT_QUEUE = "default"
+
+# Each workload has its own queue and workers, so a burst of image
+# processing cannot hold up password reset emails behind it
+CELERY_TASK_ROUTES = {
+    "djcelery_email_send_multiple": {"queue": "email"},
+    "send_queued_emails": {"queue": "email"},
+    "process_avatar_upload": {"queue": "media"},
+    "import_social_avatar": {"queue": "media"},
+    "generate_product_image_variants": {"queue": "media"},
+    "flush_content_views": {"queue": "maintenance"},
+    "purge_content_views": {"queue": "maintenance"},
+    "cleanup_old_sessions": {"queue": "maintenance"},
+    "purge_expired_tokens": {"queue": "maintenance"},
+    "rebuild_product_popularity": {"queue": "maintenance"},
+    "check_low_stock_levels": {"queue": "maintenance"},
+    "send_low_stock_alerts": {"queue": "maintenance"},
+}
+
+# Reserve one task per worker process at a time; workers for short tasks,
+# such as email, raise it with --prefetch-multiplier
+CELERY_WORKER_PREFETCH_MULTIPLIER = 1
+
+# Time limits of tasks that outgrow the defaults above: image processing,
+# and batched maintenance over whole tables
+CELERY_TASK_ANNOTATIONS = {
+    "djcelery_email_send_multiple": {"soft_time_limit": 30, "time_limit": 60},
+    "send_queued_emails": {"soft_time_limit": 120, "time_limit": 180},
+    "process_avatar_upload": {"soft_time_limit": 120, "time_limit": 180},
+    "import_social_avatar": {"soft_time_limit": 120, "time_limit": 180},
+    "generate_product_image_variants": {
+        "soft_time_limit": 120,
+        "time_limit": 180,
+    },
+    "purge_content_views": {"soft_time_limit": 30 * 60, "time_limit": 35 * 60},
+    "cleanup_old_sessions": {"soft_time_limit": 30 * 60, "time_limit": 35 * 60},
+    "purge_expired_tokens": {"soft_time_limit": 30 * 60, "time_limit": 35 * 60},
+    "rebuild_product_popularity": {
+        "soft_time_limit": 30 * 60,
+        "time_limit": 35 * 60,
+    },
+    "check_low_stock_levels": {
+        "soft_time_limit": 10 * 60,
+        "time_limit": 15 * 60,
+    },
+}
+
+# Seconds before a task reserved but not acknowledged is redelivered; it
+# must exceed the longest time limit, as acks_late tasks are acknowledged
+# only once they finish
+CELERY_BROKER_TRANSPORT_OPTIONS = {"visibility_timeout": 60 * 60}
+
+# Backend BatchingEmailBackend delivers queued messages with
+EMAIL_BATCH_DELIVERY_BACKEND = "django.core.mail.backends.smtp.EmailBackend"
+
+# Redis database holding messages queued by BatchingEmailBackend
+EMAIL_BATCH_REDIS_URL = getenv("EMAIL_BATCH_REDIS_URL", "redis://redis:6379/5")
+
+# Socket timeout in seconds for queueing messages
+EMAIL_BATCH_REDIS_TIMEOUT = float(getenv("EMAIL_BATCH_REDIS_TIMEOUT", "0.5"))
+
+# Seconds queued messages wait for others to share their batch
+EMAIL_BATCH_WINDOW = int(getenv("EMAIL_BATCH_WINDOW", "2"))
+
+# Messages sent per batch over one connection
+EMAIL_BATCH_SIZE = 100
+
+# Seconds a worker keeps its SMTP connection open between batches
+EMAIL_POOL_IDLE_TIMEOUT = 60
+
 
 CLOUDINARY_CLOUD_NAME = getenv("CLOUDINARY_CLOUD_NAME")
 CLOUDINARY_API_KEY = getenv("CLOUDINARY_API_KEY")
@@ -253,16 +535,20 @@ REST_FRAMEWORK = {
     ],
     # Sets number of items per page in paginated responses
     "PAGE_SIZE": 10,
-    # Rate limiting classes for authenticated and anonymous users
+    # Rate limiting classes for authenticated and anonymous users, plus
+    # per-view scopes; checked atomically in Redis
     "DEFAULT_THROTTLE_CLASSES": (
-        "rest_framework.throttling.AnonRateThrottle",
-        "rest_framework.throttling.UserRateThrottle",
+        "core_apps.common.throttling.RedisAnonRateThrottle",
+        "core_apps.common.throttling.RedisUserRateThrottle",
+        "core_apps.common.throttling.RedisScopedRateThrottle",
     ),
     # Defines rate limits: anonymous users can make 20 requests/day,
-    # authenticated users 400/day
+    # authenticated users 400/day, with stricter per-view scopes
     "DEFAULT_THROTTLE_RATES": {
         "anon": "20/day",
         "user": "400/day",
+        "login": "10/min",
+        "upload_avatar": "10/hour",
     },
 }
 
@@ -296,6 +582,8 @@ DJOSER = {
         # Custom serializer for current user details
         "current_user": "core_apps.users.serializers.CustomUserSerializer",
     },
+    # Issue tokens with role claims after social login
+    "SOCIAL_AUTH_TOKEN_STRATEGY": "core_apps.users.tokens.RoleTokenStrategy",
 }
 
 # JWT configuration settings
@@ -306,10 +594,19 @@ SIMPLE_JWT = {
     "REFRESH_TOKEN_LIFETIME": timedelta(days=1),
     # Generate new refresh token after refresh
     "ROTATE_REFRESH_TOKENS": True,
+    # Reject rotated refresh tokens from then on
+    "BLACKLIST_AFTER_ROTATION": True,
     # Field used to identify users in the database
     "USER_ID_FIELD": "id",
     # Claim name for user ID in JWT payload
     "USER_ID_CLAIM": "user_id",
+    # Embed role and staff flags as claims for DB-free permission checks
+    "TOKEN_OBTAIN_SERIALIZER": (
+        "core_apps.users.tokens.RoleTokenObtainPairSerializer"
+    ),
+    "TOKEN_REFRESH_SERIALIZER": (
+        "core_apps.users.tokens.RoleTokenRefreshSerializer"
+    ),
 }
 
 
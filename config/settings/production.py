@@ -3,7 +3,7 @@ from os import getenv, path
 from dotenv import load_dotenv
 
 from .base import *  # noqa
-from .base import BASE_DIR
+from .base import BASE_DIR, CACHES
 
 # Production env directory for production purposes only.
 production_env_file = path.join(BASE_DIR, ".envs", ".env.production")
@@ -16,6 +16,8 @@ SECRET_KEY = getenv(
 
 DEBUG = False
 
+CACHES["default"]["KEY_PREFIX"] = getenv("CACHE_KEY_PREFIX", "production")
+
 SITE_NAME = getenv("SITE_NAME")
 
 CSRF_TRUSTED_ORIGINS = ["http://localhost:8080"]
@@ -23,7 +25,7 @@ CSRF_TRUSTED_ORIGINS = ["http://localhost:8080"]
 ALLOWED_HOSTS = [""]
 
 ADMIN_URL = getenv("DJANGO_ADMIN_URL")
-EMAIL_BACKEND = "djcelery_email.backends.CeleryEmailBackend"
+EMAIL_BACKEND = "core_apps.common.mail.BatchingEmailBackend"
 EMAIL_HOST = getenv("EMAIL_HOST")
 EMAIL_PORT = getenv("EMAIL_PORT")
 DEFAULT_FROM_EMAIL = getenv("DEFAULT_FROM_EMAIL")
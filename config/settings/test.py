@@ -1,4 +1,5 @@
 from .base import *  # noqa
+from .base import SIMPLE_JWT
 
 DEBUG = True
 
@@ -7,12 +8,35 @@ DATABASES = {
     "default": {
         "ENGINE": "django.db.backends.sqlite3",
         "NAME": ":memory:",  # Run tests with in-memory database for speed
-    }
+    },
+    # Mirror of the primary used to exercise the replica router
+    "replica": {
+        "ENGINE": "django.db.backends.sqlite3",
+        "NAME": ":memory:",
+        "TEST": {"MIRROR": "default"},
+    },
+}
+
+# Keep tests independent of a Redis server
+CACHES = {
+    "default": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache"}
 }
 
+# Buffer content views in memory, written by explicit flushes
+VIEW_BUFFER_BACKEND = "local"
+
+# Run batched maintenance deletes back to back
+MAINTENANCE_BATCH_PAUSE = 0
+
+# Replica routing is opt-in per test through the settings fixture
+DATABASE_REPLICAS = []
+
 # Define SECRET_KEY for testing
 SECRET_KEY = "test-secret-key-12345"
 
+# Sign test JWTs with the test secret key
+SIMPLE_JWT = {**SIMPLE_JWT, "SIGNING_KEY": SECRET_KEY}
+
 # Define ADMIN_URL for testing
 ADMIN_URL = "admin/"
 
@@ -18,7 +18,13 @@ class CategoryAdmin(DjangoMpttAdmin):
         search_fields: Fields that can be searched
     """
 
-    list_display: List[str] = ["name", "slug", "parent", "is_active"]
+    list_display: List[str] = [
+        "name",
+        "slug",
+        "parent",
+        "is_active",
+        "cumulative_product_count",
+    ]
     list_filter: List[str] = ["is_active"]
     list_editable: List[str] = ["is_active"]
     search_fields: Tuple[str, ...] = ("name", "slug")
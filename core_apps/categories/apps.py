@@ -15,3 +15,15 @@ class CategoriesConfig(AppConfig):
     default_auto_field: str = "django.db.models.BigAutoField"
     name: str = "core_apps.categories"
     verbose_name: str = _("Categories")
+
+    def ready(self) -> None:
+        """
+        Perform initialization tasks when app is ready.
+
+        Imports and registers signal handlers for category cache
+        invalidation.
+
+        Returns:
+            None
+        """
+        import core_apps.categories.signals  # noqa: F401
@@ -0,0 +1,442 @@
+import logging
+from collections import defaultdict
+from typing import (
+    Any,
+    DefaultDict,
+    Dict,
+    Iterable,
+    List,
+    Optional,
+    Set,
+    Tuple,
+)
+
+from django.core.cache import cache
+from django.core.exceptions import ValidationError
+from django.db import models, transaction
+from django.utils.text import slugify
+from django.utils.translation import gettext_lazy as _
+
+from .models import CATEGORY_TREE_CACHE_KEY, Category
+
+logger = logging.getLogger(__name__)
+
+# Marker for nodes that do not say anything about their parent
+KEEP_PARENT = object()
+
+# Fields a dataset may set on a category besides its parent
+DATA_FIELDS = ("description", "is_active")
+
+# MPTT bookkeeping fields recomputed after a load
+TREE_FIELDS = ("tree_id", "lft", "rght", "level")
+
+# Rows written per bulk statement, and names per IN list
+BATCH_SIZE = 1000
+
+
+def clean_category_node(item: Dict[str, Any], path: str) -> Dict[str, Any]:
+    """
+    Validate one node's name and data fields against the Category model.
+
+    Args:
+        item: Category dict from the dataset
+        path: Names from the root down to the node, for error messages
+
+    Returns:
+        Dict[str, Any]: Cleaned name and data fields given by the node
+
+    Raises:
+        ValidationError: If a value has the wrong type or fails the
+            model field's validation
+    """
+    cleaned: Dict[str, Any] = {}
+    for name in ("name", *DATA_FIELDS):
+        if name not in item:
+            continue
+        field = Category._meta.get_field(name)
+        value = item[name]
+        is_text = isinstance(field, (models.CharField, models.TextField))
+        if is_text and not isinstance(value, str):
+            raise ValidationError(
+                _("%(path)s: %(field)s must be a string."),
+                params={"path": path, "field": name},
+            )
+        try:
+            cleaned[name] = field.clean(value, None)
+        except ValidationError as e:
+            raise ValidationError(
+                _("%(path)s: %(field)s: %(error)s"),
+                params={
+                    "path": path,
+                    "field": name,
+                    "error": " ".join(e.messages),
+                },
+            )
+    return cleaned
+
+
+def flatten_category_data(
+    data: Iterable[Dict[str, Any]],
+) -> Dict[str, Dict[str, Any]]:
+    """
+    Normalise a nested or parent-pointer dataset into one entry per name.
+
+    Nested children take their parent from the enclosing node. Top-level
+    nodes use their ``parent`` key (a category name or null for a root);
+    when the key is missing, existing categories keep their current parent
+    and new ones become roots.
+
+    Args:
+        data: List of category dicts, optionally with ``children`` lists
+
+    Returns:
+        Dict[str, Dict[str, Any]]: Nodes keyed by category name
+
+    Raises:
+        ValidationError: If a node has no name, a name is repeated or a
+            value is invalid; messages start with the node's path
+    """
+    nodes: Dict[str, Dict[str, Any]] = {}
+    # Each entry holds the node, its parent and the path of its parent,
+    # so errors can point at the offending node
+    stack: List[Tuple[Any, Any, str, int]] = [
+        (item, KEEP_PARENT, "", index)
+        for index, item in reversed(list(enumerate(data)))
+    ]
+
+    while stack:
+        item, parent, parent_path, index = stack.pop()
+        name = item.get("name") if isinstance(item, dict) else None
+        if not name or not isinstance(name, str):
+            raise ValidationError(
+                _("%(path)s: every category needs a name."),
+                params={"path": f"{parent_path}[{index}]"},
+            )
+        path = f"{parent_path}{name}"
+        if name in nodes:
+            raise ValidationError(
+                _("%(path)s: category '%(name)s' appears more than once."),
+                params={"path": path, "name": name},
+            )
+
+        node: Dict[str, Any] = clean_category_node(item, path)
+        if parent is KEEP_PARENT:
+            parent = item.get("parent", KEEP_PARENT)
+            if parent is not KEEP_PARENT and not (
+                parent is None or isinstance(parent, str)
+            ):
+                raise ValidationError(
+                    _("%(path)s: parent must be a category name or null."),
+                    params={"path": path},
+                )
+        node["parent"] = parent
+        del node["name"]
+        nodes[name] = node
+
+        children = item.get("children") or []
+        if not isinstance(children, list):
+            raise ValidationError(
+                _("%(path)s: children must be a list."),
+                params={"path": path},
+            )
+        for index, child in reversed(list(enumerate(children))):
+            stack.append((child, name, f"{path} > ", index))
+    return nodes
+
+
+def allocate_slug(name: str, taken: Set[str]) -> str:
+    """
+    Build a slug for a new category that is unique within ``taken``.
+
+    Args:
+        name: Category name
+        taken: Slugs already in use, updated with the new slug
+
+    Returns:
+        str: Unique slug
+    """
+    base = slugify(name) or "category"
+    slug, index = base, 2
+    while slug in taken:
+        slug, index = f"{base}-{index}", index + 1
+    taken.add(slug)
+    return slug
+
+
+def renumber_tree() -> int:
+    """
+    Recompute MPTT fields from parent links, writing only changed rows.
+
+    Siblings and roots are numbered in name order, matching
+    ``order_insertion_by``. Unlike ``TreeManager.rebuild`` only nodes
+    whose tree_id, lft, rght or level actually changed are updated, so
+    untouched branches are not rewritten.
+
+    Returns:
+        int: Number of categories whose tree fields changed
+    """
+    children: DefaultDict[Optional[int], List[Dict[str, Any]]] = defaultdict(
+        list
+    )
+    for row in Category.objects.order_by("name").values(
+        "pkid", "parent_id", *TREE_FIELDS
+    ):
+        children[row["parent_id"]].append(row)
+
+    changed: List[Category] = []
+    for tree_id, root in enumerate(children[None], start=1):
+        counter = 1
+        stack = [(root, 0, False)]
+        while stack:
+            row, level, visited = stack.pop()
+            if visited:
+                row["new"]["rght"] = counter
+                counter += 1
+                new = row["new"]
+                if any(row[field] != new[field] for field in TREE_FIELDS):
+                    changed.append(Category(pkid=row["pkid"], **new))
+                continue
+
+            row["new"] = {"tree_id": tree_id, "lft": counter, "level": level}
+            counter += 1
+            stack.append((row, level, True))
+            for child in reversed(children[row["pkid"]]):
+                stack.append((child, level + 1, False))
+
+    Category.objects.bulk_update(changed, TREE_FIELDS, batch_size=BATCH_SIZE)
+    return len(changed)
+
+
+def resolve_parents(
+    nodes: Dict[str, Dict[str, Any]],
+    existing: Dict[str, Dict[str, Any]],
+    name_by_pk: Dict[int, str],
+) -> Dict[str, Optional[str]]:
+    """
+    Work out the parent of every category once the dataset is applied.
+
+    Args:
+        nodes: Dataset nodes keyed by category name
+        existing: Stored categories keyed by name
+        name_by_pk: Names of the stored categories keyed by primary key
+
+    Returns:
+        Dict[str, Optional[str]]: Parent name of every category, None for
+        roots
+
+    Raises:
+        ValidationError: If a parent is unknown or a category would be
+            its own ancestor
+    """
+    parents: Dict[str, Optional[str]] = {
+        name: name_by_pk.get(row["parent_id"]) for name, row in existing.items()
+    }
+    for name, node in nodes.items():
+        if node["parent"] is not KEEP_PARENT:
+            parents[name] = node["parent"]
+        elif name not in existing:
+            parents[name] = None
+
+    for name in nodes:
+        seen: Set[str] = {name}
+        parent = parents[name]
+        while parent is not None:
+            if parent not in parents:
+                raise ValidationError(
+                    _("Unknown parent '%(parent)s' for '%(name)s'."),
+                    params={"parent": parent, "name": name},
+                )
+            if parent in seen:
+                raise ValidationError(
+                    _("Category '%(name)s' would be its own ancestor."),
+                    params={"name": name},
+                )
+            seen.add(parent)
+            parent = parents[parent]
+    return parents
+
+
+def diff_categories(
+    nodes: Dict[str, Dict[str, Any]],
+    existing: Dict[str, Dict[str, Any]],
+    parents: Dict[str, Optional[str]],
+    name_by_pk: Dict[int, str],
+) -> List[Tuple[Dict[str, Any], Dict[str, Any]]]:
+    """
+    Find the stored categories the dataset changes.
+
+    Args:
+        nodes: Dataset nodes keyed by category name
+        existing: Stored categories keyed by name
+        parents: Parent name of every category once the dataset is applied
+        name_by_pk: Names of the stored categories keyed by primary key
+
+    Returns:
+        List[Tuple[Dict[str, Any], Dict[str, Any]]]: Stored row and the
+        changed values, with ``parent`` holding the new parent's name, of
+        every changed category
+    """
+    changed: List[Tuple[Dict[str, Any], Dict[str, Any]]] = []
+    for name, node in nodes.items():
+        row = existing.get(name)
+        if row is None:
+            continue
+        updates = {
+            field: node[field]
+            for field in DATA_FIELDS
+            if field in node and node[field] != row[field]
+        }
+        if parents[name] != name_by_pk.get(row["parent_id"]):
+            updates["parent"] = parents[name]
+        if updates:
+            changed.append((row, updates))
+    return changed
+
+
+def insert_categories(
+    names: List[str],
+    nodes: Dict[str, Dict[str, Any]],
+    parents: Dict[str, Optional[str]],
+    pk_by_name: Dict[str, int],
+    taken_slugs: Set[str],
+) -> None:
+    """
+    Insert new categories level by level, so parents get a pk before
+    their children reference it.
+
+    Tree fields are left at 0 for ``renumber_tree`` to fill in.
+
+    Args:
+        names: Names of the new categories, in dataset order
+        nodes: Dataset nodes keyed by category name
+        parents: Parent name of every category once the dataset is applied
+        pk_by_name: Primary keys of stored categories, updated with the
+            inserted ones
+        taken_slugs: Slugs in use, updated with the allocated ones
+    """
+    pending = set(names)
+    while pending:
+        ready = [
+            name
+            for name in names
+            if name in pending
+            and (parents[name] is None or parents[name] in pk_by_name)
+        ]
+        Category.objects.bulk_create(
+            [
+                Category(
+                    name=name,
+                    slug=allocate_slug(name, taken_slugs),
+                    parent_id=pk_by_name.get(parents[name]),
+                    tree_id=0,
+                    lft=0,
+                    rght=0,
+                    level=0,
+                    **{
+                        field: nodes[name][field]
+                        for field in DATA_FIELDS
+                        if field in nodes[name]
+                    },
+                )
+                for name in ready
+            ],
+            batch_size=BATCH_SIZE,
+        )
+        for start in range(0, len(ready), BATCH_SIZE):
+            pk_by_name.update(
+                Category.objects.filter(
+                    name__in=ready[start : start + BATCH_SIZE]  # noqa: E203
+                ).values_list("name", "pkid")
+            )
+        pending.difference_update(ready)
+
+
+def apply_category_updates(
+    changed: List[Tuple[Dict[str, Any], Dict[str, Any]]],
+    pk_by_name: Dict[str, int],
+) -> None:
+    """
+    Write the changed values of existing categories in bulk.
+
+    Args:
+        changed: Stored row and changed values of every changed category
+        pk_by_name: Primary keys of all categories, new ones included
+    """
+    updated: List[Category] = []
+    update_fields: Set[str] = set()
+    for row, updates in changed:
+        category = Category(pkid=row["pkid"])
+        for field, value in updates.items():
+            if field == "parent":
+                category.parent_id = pk_by_name.get(value)
+            else:
+                setattr(category, field, value)
+            update_fields.add(field)
+        updated.append(category)
+    if updated:
+        Category.objects.bulk_update(
+            updated, sorted(update_fields), batch_size=BATCH_SIZE
+        )
+
+
+def load_category_tree(data: Iterable[Dict[str, Any]]) -> Dict[str, int]:
+    """
+    Create or update a whole category taxonomy in bulk.
+
+    The dataset is diffed against the stored tree so unchanged categories
+    are not written. New categories are inserted level by level with
+    ``bulk_create`` and changed ones updated with ``bulk_update`` while MPTT
+    updates are disabled; tree fields, breadcrumbs and product counts are
+    then rebuilt once instead of shifting lft/rght on every insert.
+
+    Args:
+        data: Nested or parent-pointer list of category dicts with ``name``
+            and optional ``parent``, ``description``, ``is_active`` and
+            ``children`` keys
+
+    Returns:
+        Dict[str, int]: Numbers of created, updated, unchanged and
+        renumbered categories
+
+    Raises:
+        ValidationError: If the dataset is malformed, references unknown
+            parents or would create a cycle
+    """
+    nodes = flatten_category_data(data)
+
+    with transaction.atomic():
+        existing: Dict[str, Dict[str, Any]] = {
+            row["name"]: row
+            for row in Category.objects.select_for_update().values(
+                "pkid", "name", "slug", "parent_id", *DATA_FIELDS
+            )
+        }
+        name_by_pk = {row["pkid"]: name for name, row in existing.items()}
+        parents = resolve_parents(nodes, existing, name_by_pk)
+        new_names = [name for name in nodes if name not in existing]
+        changed = diff_categories(nodes, existing, parents, name_by_pk)
+        moved = any("parent" in updates for row, updates in changed)
+
+        with Category.objects.disable_mptt_updates():
+            pk_by_name = {name: row["pkid"] for name, row in existing.items()}
+            taken_slugs = {row["slug"] for row in existing.values()}
+            insert_categories(
+                new_names, nodes, parents, pk_by_name, taken_slugs
+            )
+            apply_category_updates(changed, pk_by_name)
+            renumbered = renumber_tree() if new_names or moved else 0
+
+        if new_names or changed:
+            Category.objects.refresh_ancestor_paths()
+        if moved:
+            Category.objects.rebuild_product_counts()
+        cache.delete(CATEGORY_TREE_CACHE_KEY)
+
+    summary = {
+        "created": len(new_names),
+        "updated": len(changed),
+        "unchanged": len(nodes) - len(new_names) - len(changed),
+        "renumbered": renumbered,
+    }
+    logger.info(f"Category tree loaded: {summary}")
+    return summary
@@ -0,0 +1,58 @@
+import json
+from typing import Any
+
+from django.core.exceptions import ValidationError
+from django.core.management.base import BaseCommand, CommandError, CommandParser
+
+from core_apps.categories.loaders import load_category_tree
+
+
+class Command(BaseCommand):
+    """
+    Management command bulk loading a category taxonomy from JSON.
+
+    The file holds a list of categories, either nested through
+    ``children`` lists or flat with a ``parent`` name on each entry.
+    """
+
+    help = "Create or update categories in bulk from a JSON file"
+
+    def add_arguments(self, parser: CommandParser) -> None:
+        """
+        Add command arguments.
+
+        Args:
+            parser: Command argument parser
+        """
+        parser.add_argument("path", help="Path to the JSON dataset")
+
+    def handle(self, *args: Any, **options: Any) -> None:
+        """
+        Load the dataset and report what changed.
+
+        Args:
+            *args: Additional positional arguments
+            **options: Command options
+
+        Raises:
+            CommandError: If the file cannot be read or the dataset is invalid
+        """
+        try:
+            with open(options["path"], encoding="utf-8") as f:
+                data = json.load(f)
+        except (OSError, ValueError) as e:
+            raise CommandError(f"Could not read {options['path']}: {e}")
+        if not isinstance(data, list):
+            raise CommandError("The dataset must be a list of categories")
+
+        try:
+            summary = load_category_tree(data)
+        except ValidationError as e:
+            raise CommandError("; ".join(e.messages))
+
+        self.stdout.write(
+            self.style.SUCCESS(
+                "Loaded categories: "
+                + ", ".join(f"{key}={value}" for key, value in summary.items())
+            )
+        )
@@ -0,0 +1,34 @@
+from typing import Any
+
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from core_apps.categories.models import Category
+
+
+class Command(BaseCommand):
+    """
+    Management command recomputing the materialized product counts.
+
+    Counts are normally maintained incrementally by product signals; this
+    command rebuilds them in bulk after imports or queryset updates that
+    bypass signals.
+    """
+
+    help = "Rebuild direct and cumulative active product counts per category"
+
+    def handle(self, *args: Any, **options: Any) -> None:
+        """
+        Rebuild all category product counts in a single transaction.
+
+        Args:
+            *args: Additional positional arguments
+            **options: Command options
+        """
+        with transaction.atomic():
+            updated: int = Category.objects.rebuild_product_counts()
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Rebuilt product counts for {updated} categories"
+            )
+        )
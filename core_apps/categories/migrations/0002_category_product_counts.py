@@ -0,0 +1,66 @@
+# Generated by Django 4.2.11 on 2026-10-19 04:51
+
+from django.db import migrations, models
+from django.db.models import Count, OuterRef, Subquery, Sum
+from django.db.models.functions import Coalesce
+
+
+def populate_product_counts(apps, schema_editor):
+    Category = apps.get_model("categories", "Category")
+    Product = apps.get_model("products", "Product")
+
+    direct_counts = (
+        Product.objects.filter(category=OuterRef("pk"), is_active=True)
+        .order_by()
+        .values("category")
+        .annotate(total=Count("pkid"))
+        .values("total")
+    )
+    Category.objects.update(product_count=Coalesce(Subquery(direct_counts), 0))
+
+    subtree_counts = (
+        Category.objects.filter(
+            tree_id=OuterRef("tree_id"),
+            lft__gte=OuterRef("lft"),
+            lft__lte=OuterRef("rght"),
+        )
+        .order_by()
+        .values("tree_id")
+        .annotate(total=Sum("product_count"))
+        .values("total")
+    )
+    Category.objects.update(
+        cumulative_product_count=Coalesce(Subquery(subtree_counts), 0)
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("categories", "0001_initial"),
+        ("products", "0002_alter_productline_price"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="category",
+            name="cumulative_product_count",
+            field=models.PositiveIntegerField(
+                default=0,
+                editable=False,
+                help_text="Maintained automatically, includes descendants",
+                verbose_name="Active Products Including Descendants",
+            ),
+        ),
+        migrations.AddField(
+            model_name="category",
+            name="product_count",
+            field=models.PositiveIntegerField(
+                default=0,
+                editable=False,
+                help_text="Maintained automatically, excludes descendants",
+                verbose_name="Active Products",
+            ),
+        ),
+        migrations.RunPython(populate_product_counts, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,37 @@
+# Generated by Django 4.2.11 on 2026-10-19 04:53
+
+from django.db import migrations, models
+
+
+def populate_ancestor_paths(apps, schema_editor):
+    Category = apps.get_model("categories", "Category")
+
+    paths = {None: []}
+    categories = list(Category.objects.order_by("tree_id", "lft"))
+    for category in categories:
+        category.ancestor_path = paths.get(category.parent_id, []) + [
+            {"id": str(category.id), "slug": category.slug, "name": category.name}
+        ]
+        paths[category.pk] = category.ancestor_path
+    Category.objects.bulk_update(categories, ["ancestor_path"], batch_size=1000)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("categories", "0002_category_product_counts"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="category",
+            name="ancestor_path",
+            field=models.JSONField(
+                default=list,
+                editable=False,
+                help_text="Maintained automatically, root first, self last",
+                verbose_name="Ancestor Path",
+            ),
+        ),
+        migrations.RunPython(populate_ancestor_paths, migrations.RunPython.noop),
+    ]
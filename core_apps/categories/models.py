@@ -1,13 +1,70 @@
-from typing import Any
+import json
+import time
+from typing import Any, Dict, List, Optional
 
 from autoslug import AutoSlugField
-from django.db import models
+from django.apps import apps
+from django.core.cache import cache
+from django.db import NotSupportedError, models
+from django.db.models import Count, F, Func, OuterRef, Subquery, Sum
+from django.db.models.functions import Coalesce, Greatest
 from django.utils.translation import gettext_lazy as _
+from mptt.managers import TreeManager
 from mptt.models import MPTTModel, TreeForeignKey
+from mptt.utils import get_cached_trees
 
 from core_apps.common.models import TimeStampedModel
 
 
+class ReplacePathPrefix(Func):
+    """
+    Replace the first breadcrumbs of an ancestor path with a new prefix.
+
+    Compiled per vendor, as JSON arrays cannot be sliced and joined
+    portably.
+
+    Attributes:
+        prefix: Breadcrumbs the path starts with afterwards
+        depth: Number of breadcrumbs replaced
+    """
+
+    output_field = models.JSONField()
+
+    def __init__(
+        self, expression: Any, prefix: List[Dict[str, str]], depth: int
+    ) -> None:
+        super().__init__(expression)
+        self.prefix = prefix
+        self.depth = depth
+
+    def as_sql(self, compiler: Any, connection: Any, **extra: Any) -> Any:
+        raise NotSupportedError(
+            f"Replacing path prefixes is not supported on {connection.vendor}"
+        )
+
+    def as_postgresql(self, compiler: Any, connection: Any) -> Any:
+        path, params = compiler.compile(self.source_expressions[0])
+        sql = (
+            "(%s::jsonb || COALESCE(("
+            "SELECT jsonb_agg(crumb ORDER BY position) "
+            f"FROM jsonb_array_elements({path}) "
+            "WITH ORDINALITY AS crumbs(crumb, position) "
+            "WHERE position > %s), '[]'::jsonb))"
+        )
+        return sql, (json.dumps(self.prefix), *params, self.depth)
+
+    def as_sqlite(self, compiler: Any, connection: Any) -> Any:
+        path, params = compiler.compile(self.source_expressions[0])
+        sql = (
+            "(SELECT json_group_array(json(value)) FROM ("
+            "SELECT 0 AS part, key, value FROM json_each(%s) "
+            "UNION ALL "
+            f"SELECT 1, key, value FROM json_each({path}) WHERE key >= %s "
+            "ORDER BY part, key))"
+        )
+        return sql, (json.dumps(self.prefix), *params, self.depth)
+
+
 def get_category_slug(instance: Any) -> str:
     """
     Helper function to generate slug from category name.
@@ -21,9 +78,22 @@ def get_category_slug(instance: Any) -> str:
     return instance.name
 
 
-class CategoryManager(models.Manager):
+# Cache key holding the serialized tree of active categories and the time
+# it was built
+CATEGORY_TREE_CACHE_KEY = "category:tree:v2"
+
+# Cache key holding the time product counts last changed; a cached tree
+# built before then is rebuilt once it is CATEGORY_TREE_COUNTS_DELAY old
+CATEGORY_COUNTS_CHANGED_KEY = "category:tree:counts-changed"
+
+
+class CategoryManager(TreeManager):
     """
     Custom manager for Category model providing additional query methods.
+
+    Extends MPTT's TreeManager, so querysets are ordered by (tree_id, lft)
+    and tree maintenance helpers such as ``disable_mptt_updates`` are
+    available on ``Category.objects``.
     """
 
     def active(self) -> models.QuerySet:
@@ -35,6 +105,190 @@ class CategoryManager(models.Manager):
         """
         return self.filter(is_active=True)
 
+    def active_tree(self) -> List["Category"]:
+        """
+        Load all active categories as nested trees in a single query.
+
+        Categories are fetched in depth-first (tree_id, lft) order and their
+        children are cached on each node, so ``get_children()`` on the
+        returned nodes does not hit the database. Subtrees below an
+        inactive category are left out.
+
+        Returns:
+            List[Category]: Active root categories with cached children
+        """
+        queryset = self.active().order_by("tree_id", "lft")
+        return [
+            node
+            for node in get_cached_trees(queryset)
+            if node.parent_id is None
+        ]
+
+    def adjust_product_counts(self, category_id: int, delta: int) -> None:
+        """
+        Apply a change in active products to a category and its ancestors.
+
+        The direct count of the category and the cumulative counts of the
+        category and every ancestor are updated with one UPDATE statement
+        over the MPTT bounds of the category. Counts never drop below
+        zero; drift from bulk queryset updates, which bypass signals, is
+        corrected by ``rebuild_product_counts``.
+
+        Args:
+            category_id: Primary key of the category that gained or lost
+                active products
+            delta: Number of active products added (negative if removed)
+        """
+        if delta == 0:
+            return
+        self.shift_cumulative_counts(category_id, delta)
+        self.filter(pk=category_id).update(
+            product_count=Greatest(F("product_count") + delta, 0)
+        )
+
+    def shift_cumulative_counts(self, category_id: int, delta: int) -> None:
+        """
+        Shift the cumulative counts of a category and all its ancestors.
+
+        Used directly when a whole subtree moves to another parent, so the
+        old and new ancestors gain or lose the subtree's products.
+
+        Args:
+            category_id: Primary key of the deepest category to update
+            delta: Number of active products added (negative if removed)
+        """
+        bounds = (
+            self.filter(pk=category_id).values("tree_id", "lft", "rght").first()
+        )
+        if bounds is None or delta == 0:
+            return
+
+        self.filter(
+            tree_id=bounds["tree_id"],
+            lft__lte=bounds["lft"],
+            rght__gte=bounds["rght"],
+        ).update(
+            cumulative_product_count=Greatest(
+                F("cumulative_product_count") + delta, 0
+            )
+        )
+        # Counts change with every product save, so the cached tree is
+        # only marked stale instead of being dropped each time
+        cache.set(CATEGORY_COUNTS_CHANGED_KEY, time.time(), timeout=None)
+
+    def rebuild_product_counts(self) -> int:
+        """
+        Recompute direct and cumulative active product counts from scratch.
+
+        Runs two set-based UPDATE statements: one counting active products
+        per category and one summing direct counts over each category's
+        MPTT subtree.
+
+        Returns:
+            int: Number of categories updated
+        """
+        Product = apps.get_model("products", "Product")
+
+        direct_counts = (
+            Product.objects.filter(category=OuterRef("pk"), is_active=True)
+            .order_by()
+            .values("category")
+            .annotate(total=Count("pkid"))
+            .values("total")
+        )
+        self.update(product_count=Coalesce(Subquery(direct_counts), 0))
+
+        subtree_counts = (
+            self.model.objects.filter(
+                tree_id=OuterRef("tree_id"),
+                lft__gte=OuterRef("lft"),
+                lft__lte=OuterRef("rght"),
+            )
+            .order_by()
+            .values("tree_id")
+            .annotate(total=Sum("product_count"))
+            .values("total")
+        )
+        updated: int = self.update(
+            cumulative_product_count=Coalesce(Subquery(subtree_counts), 0)
+        )
+        cache.delete(CATEGORY_TREE_CACHE_KEY)
+        return updated
+
+    def refresh_ancestor_paths(self, root: Optional["Category"] = None) -> int:
+        """
+        Recompute the stored ancestor paths of a subtree or of every tree.
+
+        A subtree is rewritten by a single set-based UPDATE over its MPTT
+        bounds: every path in it starts with the root's stored path, which
+        is swapped for the root's new one, and the rest of each path is
+        kept. Without a root every path is rebuilt from the parent links,
+        reading all categories in (tree_id, lft) order so every parent is
+        visited before its children, and changed paths are written back
+        with one bulk UPDATE.
+
+        Args:
+            root: Category whose subtree (itself included) is recomputed;
+                all categories are recomputed when omitted
+
+        Returns:
+            int: Number of categories rewritten
+        """
+        if root is not None:
+            return self.replace_path_prefix(root)
+
+        paths: Dict[Optional[int], List[Dict[str, str]]] = {None: []}
+        changed: List[Category] = []
+        for category in self.order_by("tree_id", "lft").only(
+            "pkid", "id", "name", "slug", "parent", "ancestor_path"
+        ):
+            path = paths.get(category.parent_id, []) + [
+                category.get_breadcrumb()
+            ]
+            paths[category.pk] = path
+            if category.ancestor_path != path:
+                category.ancestor_path = path
+                changed.append(category)
+
+        self.bulk_update(changed, ["ancestor_path"], batch_size=1000)
+        return len(changed)
+
+    def replace_path_prefix(self, root: "Category") -> int:
+        """
+        Rewrite the ancestor paths of a renamed or moved subtree.
+
+        Args:
+            root: Category at the top of the subtree, as just saved
+
+        Returns:
+            int: Number of categories in the subtree
+        """
+        node = (
+            self.filter(pk=root.pk)
+            .values("tree_id", "lft", "rght", "parent_id", "ancestor_path")
+            .get()
+        )
+        prefix: List[Dict[str, str]] = []
+        if node["parent_id"] is not None:
+            prefix = (
+                self.filter(pk=node["parent_id"])
+                .values_list("ancestor_path", flat=True)
+                .get()
+            )
+        path = prefix + [root.get_breadcrumb()]
+
+        updated: int = self.filter(
+            tree_id=node["tree_id"],
+            lft__gte=node["lft"],
+            lft__lte=node["rght"],
+        ).update(
+            ancestor_path=ReplacePathPrefix(
+                "ancestor_path", path, len(node["ancestor_path"])
+            )
+        )
+        root.ancestor_path = path
+        return updated
+
 
 class Category(MPTTModel, TimeStampedModel):
     """
@@ -47,6 +301,10 @@ class Category(MPTTModel, TimeStampedModel):
         description: Optional category description
         parent: Reference to parent category (optional)
         is_active: Category visibility status
+        ancestor_path: Breadcrumbs from the root down to this category
+        product_count: Number of active products directly in the category
+        cumulative_product_count: Number of active products in the category
+            and all of its descendants
         objects: Custom manager providing additional query methods
     """
 
@@ -79,6 +337,26 @@ class Category(MPTTModel, TimeStampedModel):
         default=False,
         help_text=_("Format: true=category visible"),
     )
+    ancestor_path: models.JSONField = models.JSONField(
+        verbose_name=_("Ancestor Path"),
+        default=list,
+        editable=False,
+        help_text=_("Maintained automatically, root first, self last"),
+    )
+    product_count: models.PositiveIntegerField = models.PositiveIntegerField(
+        verbose_name=_("Active Products"),
+        default=0,
+        editable=False,
+        help_text=_("Maintained automatically, excludes descendants"),
+    )
+    cumulative_product_count: models.PositiveIntegerField = (
+        models.PositiveIntegerField(
+            verbose_name=_("Active Products Including Descendants"),
+            default=0,
+            editable=False,
+            help_text=_("Maintained automatically, includes descendants"),
+        )
+    )
 
     objects = CategoryManager()
 
@@ -93,6 +371,13 @@ class Category(MPTTModel, TimeStampedModel):
         verbose_name = _("Category")
         verbose_name_plural = _("Categories")
 
+    # Fields maintained by set-based updates, never by instance saves
+    derived_fields = (
+        "ancestor_path",
+        "product_count",
+        "cumulative_product_count",
+    )
+
     def __str__(self) -> str:
         """
         String representation of the category.
@@ -101,3 +386,28 @@ class Category(MPTTModel, TimeStampedModel):
             str: Category name
         """
         return self.name
+
+    def get_breadcrumb(self) -> Dict[str, str]:
+        """
+        Get the breadcrumb entry describing this category.
+
+        Returns:
+            Dict[str, str]: Public id, slug and name of the category
+        """
+        return {"id": str(self.id), "slug": self.slug, "name": self.name}
+
+    def _get_user_field_names(self) -> List[str]:
+        """
+        Get the fields MPTT writes when saving an existing category.
+
+        Derived fields are excluded so saving a stale instance cannot
+        overwrite counts or paths maintained by set-based updates.
+
+        Returns:
+            List[str]: Names of the fields to save
+        """
+        return [
+            name
+            for name in super()._get_user_field_names()
+            if name not in self.derived_fields
+        ]
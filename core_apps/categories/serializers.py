@@ -12,6 +12,8 @@ class CategorySerializer(serializers.ModelSerializer):
 
     Attributes:
         category: Renamed field that maps to the Category model's name field
+        product_count: Active products directly in the category
+        cumulative_product_count: Active products including descendants
 
     Meta:
         model: The Category model to serialize
@@ -25,8 +27,29 @@ class CategorySerializer(serializers.ModelSerializer):
         fields = [
             "category",
             "slug",
+            "product_count",
+            "cumulative_product_count",
         ]
 
+
+class CategoryTreeSerializer(CategorySerializer):
+    """
+    Serializer rendering a category together with its active descendants.
+
+    Expects nodes loaded with ``Category.objects.active_tree()`` so children
+    are read from the MPTT cache instead of one query per node.
+
+    Attributes:
+        children: Nested representation of the active child categories
+    """
+
+    children: serializers.SerializerMethodField = (
+        serializers.SerializerMethodField()
+    )
+
+    class Meta(CategorySerializer.Meta):
+        fields = CategorySerializer.Meta.fields + ["children"]
+
     def get_children(self, obj: Category) -> List[Dict[str, Any]]:
         """
         Get all active children categories.
@@ -37,6 +60,20 @@ class CategorySerializer(serializers.ModelSerializer):
         Returns:
             List[Dict[str, Any]]: Serialized data of active child categories
         """
-        children = obj.get_children().filter(is_active=True)
-        serializer = CategorySerializer(children, many=True)
+        children = obj.get_children()
+        serializer = CategoryTreeSerializer(children, many=True)
         return serializer.data
+
+
+class CategoryLoadSerializer(serializers.Serializer):
+    """
+    Serializer validating the payload of a bulk category tree load.
+
+    Attributes:
+        categories: Nested or parent-pointer list of category dicts, see
+            ``load_category_tree`` for the accepted keys
+    """
+
+    categories: serializers.ListField = serializers.ListField(
+        child=serializers.DictField(), allow_empty=False
+    )
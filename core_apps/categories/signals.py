@@ -0,0 +1,112 @@
+import logging
+from typing import Any, Optional, Tuple, Type
+
+from django.core.cache import cache
+from django.db.models.base import Model
+from django.db.models.signals import post_delete, post_init, post_save
+from django.dispatch import receiver
+from mptt.signals import node_moved
+
+from core_apps.categories.models import CATEGORY_TREE_CACHE_KEY, Category
+
+logger = logging.getLogger(__name__)
+
+
+@receiver(post_save, sender=Category)
+@receiver(post_delete, sender=Category)
+@receiver(node_moved, sender=Category)
+def invalidate_category_tree(
+    sender: Type[Model], instance: Model, **kwargs: Any
+) -> None:
+    """
+    Drop the cached category tree whenever a category changes.
+
+    Triggered after a category is saved, deleted or moved within the tree,
+    so the next request to the tree endpoint rebuilds it.
+
+    Args:
+        sender: Model class that sent the signal (Category model)
+        instance: Category instance that changed
+        **kwargs: Additional signal arguments
+
+    Returns:
+        None
+    """
+    cache.delete(CATEGORY_TREE_CACHE_KEY)
+    logger.debug(f"Category tree cache invalidated by {instance}")
+
+
+def get_path_source(instance: Category) -> Optional[Tuple[str, Any]]:
+    """
+    Get the fields a category's breadcrumbs are derived from.
+
+    Args:
+        instance: Category instance being inspected
+
+    Returns:
+        Optional[Tuple[str, Any]]: Name and parent id, or None if either
+        field was deferred when the instance was loaded
+    """
+    if {"name", "parent_id"} - instance.__dict__.keys():
+        return None
+    return instance.name, instance.parent_id
+
+
+@receiver(post_init, sender=Category)
+def track_path_source(
+    sender: Type[Model], instance: Category, **kwargs: Any
+) -> None:
+    """
+    Remember the name and parent a category was loaded with.
+
+    Args:
+        sender: Model class that sent the signal (Category model)
+        instance: Category instance that was initialised
+        **kwargs: Additional signal arguments
+
+    Returns:
+        None
+    """
+    instance._path_source = get_path_source(instance)
+
+
+@receiver(post_save, sender=Category)
+def refresh_category_paths(
+    sender: Type[Model], instance: Category, created: bool, **kwargs: Any
+) -> None:
+    """
+    Keep breadcrumbs and cumulative counts in sync after a rename or move.
+
+    Renames and moves recompute the ancestor paths of the whole subtree in
+    one bulk update. Moves also shift the subtree's active product count
+    from the old ancestors to the new ones.
+
+    Args:
+        sender: Model class that sent the signal (Category model)
+        instance: Category instance that was saved
+        created: Boolean indicating if this is a new category
+        **kwargs: Additional signal arguments
+
+    Returns:
+        None
+    """
+    previous: Optional[Tuple[str, Any]] = instance._path_source
+    current: Optional[Tuple[str, Any]] = get_path_source(instance)
+
+    if created or previous is None or previous != current:
+        Category.objects.refresh_ancestor_paths(instance)
+
+    if not created and previous is not None and previous[1] != current[1]:
+        subtree_count: int = (
+            Category.objects.filter(pk=instance.pk)
+            .values_list("cumulative_product_count", flat=True)
+            .get()
+        )
+        if previous[1] is not None:
+            Category.objects.shift_cumulative_counts(
+                previous[1], -subtree_count
+            )
+        if current[1] is not None:
+            Category.objects.shift_cumulative_counts(current[1], subtree_count)
+
+    instance._path_source = current
@@ -1,10 +1,13 @@
+from django.urls import path
 from rest_framework.routers import DefaultRouter
 
-from .views import CategoryViewSet
+from .views import CategoryTreeLoadAPIView, CategoryViewSet
 
 app_name = "categories"
 
 router = DefaultRouter()
 router.register("", CategoryViewSet, basename="category")
 
-urlpatterns = router.urls
+urlpatterns = [
+    path("load/", CategoryTreeLoadAPIView.as_view(), name="category-load"),
+] + router.urls
@@ -1,19 +1,35 @@
-from typing import Any
+import time
+from typing import Any, Dict, List, Optional
 
+from django.conf import settings
+from django.core.cache import cache
+from django.core.exceptions import ValidationError
 from django.db.models import QuerySet
 from drf_yasg.utils import swagger_auto_schema
-from rest_framework import viewsets
-from rest_framework.permissions import IsAuthenticatedOrReadOnly
+from rest_framework import serializers, status, viewsets
+from rest_framework.decorators import action
+from rest_framework.permissions import IsAdminUser, IsAuthenticatedOrReadOnly
 from rest_framework.request import Request
 from rest_framework.response import Response
+from rest_framework.views import APIView
 
+from core_apps.common.mixins import ReplicaReadMixin
 from core_apps.common.renderers import GenericJSONRenderer
 
-from .models import Category
-from .serializers import CategorySerializer
+from .loaders import load_category_tree
+from .models import (
+    CATEGORY_COUNTS_CHANGED_KEY,
+    CATEGORY_TREE_CACHE_KEY,
+    Category,
+)
+from .serializers import (
+    CategoryLoadSerializer,
+    CategorySerializer,
+    CategoryTreeSerializer,
+)
 
 
-class CategoryViewSet(viewsets.ModelViewSet):
+class CategoryViewSet(ReplicaReadMixin, viewsets.ModelViewSet):
     """
     A ViewSet for viewing and editing categories.
 
@@ -25,6 +41,8 @@ class CategoryViewSet(viewsets.ModelViewSet):
         object_label: Label for the object type
         lookup_field: Field used for object lookup
         http_method_names: Allowed HTTP methods (read-only)
+        replica_read_actions: Actions served from a read replica
+        tree_cache_timeout: Seconds the rendered category tree is cached
     """
 
     queryset: QuerySet[Category] = Category.objects.filter(is_active=True)
@@ -34,6 +52,8 @@ class CategoryViewSet(viewsets.ModelViewSet):
     object_label: str = "categories"
     lookup_field: str = "slug"
     http_method_names: list[str] = ["get"]  # Read-only operations
+    replica_read_actions: list[str] = ["list", "retrieve", "tree"]
+    tree_cache_timeout: int = 60 * 60
 
     @swagger_auto_schema(
         operation_summary="List Categories",
@@ -72,3 +92,99 @@ class CategoryViewSet(viewsets.ModelViewSet):
             Response: Serialized category data
         """
         return super().retrieve(request, *args, **kwargs)
+
+    @swagger_auto_schema(
+        operation_summary="Category Tree",
+        operation_description="Get all active categories as a nested tree",
+        responses={200: CategoryTreeSerializer(many=True)},
+    )
+    @action(methods=["get"], detail=False, pagination_class=None)
+    def tree(self, request: Request) -> Response:
+        """
+        Get the whole tree of active categories.
+
+        The tree is built from a single ordered MPTT query and the
+        serialized result is cached until any category changes. Product
+        count changes do not drop it; a tree showing outdated counts is
+        served until it is ``CATEGORY_TREE_COUNTS_DELAY`` seconds old.
+
+        Args:
+            request: HTTP request object
+
+        Returns:
+            Response: Nested list of active root categories
+        """
+        cached = cache.get_many(
+            [CATEGORY_TREE_CACHE_KEY, CATEGORY_COUNTS_CHANGED_KEY]
+        )
+        tree: Optional[Dict[str, Any]] = cached.get(CATEGORY_TREE_CACHE_KEY)
+        counts_changed_at: Optional[float] = cached.get(
+            CATEGORY_COUNTS_CHANGED_KEY
+        )
+        now = time.time()
+        if tree is not None and (
+            counts_changed_at is None
+            or counts_changed_at < tree["built_at"]
+            or now - tree["built_at"] < settings.CATEGORY_TREE_COUNTS_DELAY
+        ):
+            return Response(tree["data"])
+
+        roots: List[Category] = Category.objects.active_tree()
+        data = CategoryTreeSerializer(roots, many=True).data
+        cache.set(
+            CATEGORY_TREE_CACHE_KEY,
+            {"built_at": now, "data": data},
+            timeout=self.tree_cache_timeout,
+        )
+        return Response(data)
+
+
+class CategoryTreeLoadAPIView(APIView):
+    """
+    Admin-only endpoint creating or updating a whole taxonomy in bulk.
+
+    Attributes:
+        permission_classes: List of permission classes
+        renderer_classes: List of renderer classes
+        object_label: Label for the object type
+    """
+
+    permission_classes = [IsAdminUser]
+    renderer_classes = [GenericJSONRenderer]
+    object_label: str = "categories"
+
+    @swagger_auto_schema(
+        operation_summary="Load Category Tree",
+        operation_description="""
+        Create or update many categories at once from a nested or
+        parent-pointer dataset. Unchanged categories are not written and
+        the MPTT tree is rebuilt once at the end.
+        """,
+        request_body=CategoryLoadSerializer,
+        responses={200: "Load summary", 400: "Invalid dataset"},
+    )
+    def post(self, request: Request, *args: Any, **kwargs: Any) -> Response:
+        """
+        Load the posted categories into the tree.
+
+        Args:
+            request: HTTP request object
+            *args: Additional positional arguments
+            **kwargs: Additional keyword arguments
+
+        Returns:
+            Response: Numbers of created, updated, unchanged and renumbered
+            categories
+
+        Raises:
+            serializers.ValidationError: If the dataset is invalid
+        """
+        serializer = CategoryLoadSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        try:
+            summary = load_category_tree(
+                serializer.validated_data["categories"]
+            )
+        except ValidationError as e:
+            raise serializers.ValidationError({"categories": e.messages})
+        return Response(summary, status=status.HTTP_200_OK)
@@ -1,10 +1,10 @@
-from typing import List, Type
+from typing import Any, List, Type
 
 from django.contrib import admin
 from django.contrib.contenttypes.admin import GenericTabularInline
 from django.db import models
 
-from .models import ContentView
+from .models import ContentView, ContentViewDaily
 
 
 @admin.register(ContentView)
@@ -22,7 +22,8 @@ class ContentViewAdmin(admin.ModelAdmin):
         "content_object",  # The object that was viewed
         "user",  # User who viewed the content
         "viewer_ip",  # IP address of the viewer
-        "created_at",  # When the view was recorded
+        "view_count",  # How many times they viewed it
+        "last_viewed",  # When they last viewed it
     ]
 
 
@@ -48,5 +49,61 @@ class ContentViewInline(GenericTabularInline):
     readonly_fields: List[str] = [
         "user",  # Who viewed the content
         "viewer_ip",  # Their IP address
-        "created_at",  # When the view occurred
+        "view_count",  # How many times they viewed it
+        "last_viewed",  # When they last viewed it
     ]
+
+
+@admin.register(ContentViewDaily)
+class ContentViewDailyAdmin(admin.ModelAdmin):
+    """
+    Admin configuration for ContentViewDaily model.
+    Shows views per object and day without scanning individual viewers.
+
+    Attributes:
+        list_display: Fields to display in the list view
+        list_filter: Fields to filter the list view by
+        date_hierarchy: Field to drill down the list view by
+    """
+
+    list_display: List[str] = [
+        "content_object",  # The object that was viewed
+        "day",  # Day of the views
+        "views",  # Number of views that day
+        "unique_viewers",  # Distinct viewers that day
+    ]
+    list_filter: List[str] = ["content_type"]
+    date_hierarchy: str = "day"
+
+
+class ContentViewDailyInline(GenericTabularInline):
+    """
+    Inline admin configuration for ContentViewDaily model.
+    Shows the daily view rollups on the admin page of the viewed model.
+
+    Attributes:
+        model: The model class to be displayed inline
+        extra: Number of extra empty forms to display
+        readonly_fields: Fields that cannot be modified through the
+        inline interface
+        can_delete: Whether rollups can be deleted from the inline
+    """
+
+    model: Type[models.Model] = ContentViewDaily
+    extra: int = 0
+    readonly_fields: List[str] = ["day", "views", "unique_viewers"]
+    fields: List[str] = ["day", "views", "unique_viewers"]
+    can_delete: bool = False
+
+    def has_add_permission(self, request: Any, obj: Any = None) -> bool:
+        """
+        Rollups are only written by the view flush.
+
+        Args:
+            request: HTTP request object
+            obj: Object whose admin page is shown
+
+        Returns:
+            bool: Always False
+        """
+        return False
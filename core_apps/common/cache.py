@@ -0,0 +1,227 @@
+import logging
+import pickle
+import time
+import zlib
+from functools import wraps
+from typing import Any, Callable, Dict, Tuple
+
+import lz4.frame
+import msgpack
+from django.conf import settings
+from django.core.cache.backends.redis import RedisCache
+from redis import RedisError
+
+logger = logging.getLogger(__name__)
+
+# First byte of every stored value: serialization format in the low two
+# bits, compression in the next two
+PICKLE, MSGPACK = 0x00, 0x01
+UNCOMPRESSED, ZLIB, LZ4 = 0x00, 0x04, 0x08
+FORMAT_MASK, COMPRESSION_MASK = 0x03, 0x0C
+
+COMPRESSORS: Dict[str, Tuple[int, Callable[[bytes], bytes]]] = {
+    "zlib": (ZLIB, zlib.compress),
+    "lz4": (LZ4, lz4.frame.compress),
+}
+DECOMPRESSORS: Dict[int, Callable[[bytes], bytes]] = {
+    ZLIB: zlib.decompress,
+    LZ4: lz4.frame.decompress,
+}
+
+
+class CompressedSerializer:
+    """
+    Cache serializer using msgpack for plain data and pickle otherwise,
+    compressing values above ``CACHE_COMPRESS_MIN_SIZE`` bytes.
+
+    msgpack is only used when a value is made exclusively of exact dict,
+    list, str, bytes, int, float, bool and None types, so every value
+    comes back with the type it was stored with. Integers are stored
+    unencoded, as with Django's serializer, so ``incr`` keeps working.
+
+    Attributes:
+        min_size: Smallest encoded size, in bytes, that is compressed
+        compression: Header flag of the configured compressor
+        compress: Function compressing encoded values
+    """
+
+    def __init__(self) -> None:
+        self.min_size: int = settings.CACHE_COMPRESS_MIN_SIZE
+        self.compression, self.compress = COMPRESSORS[settings.CACHE_COMPRESSOR]
+
+    def dumps(self, obj: Any) -> Any:
+        """
+        Encode a value for Redis.
+
+        Args:
+            obj: Value to store
+
+        Returns:
+            Union[int, bytes]: The integer itself or the encoded payload
+        """
+        if type(obj) is int:
+            return obj
+        try:
+            flags = MSGPACK
+            payload = msgpack.packb(obj, use_bin_type=True, strict_types=True)
+        except (TypeError, ValueError, OverflowError):
+            flags = PICKLE
+            payload = pickle.dumps(obj, pickle.HIGHEST_PROTOCOL)
+
+        if len(payload) >= self.min_size:
+            compressed = self.compress(payload)
+            if len(compressed) < len(payload):
+                flags |= self.compression
+                payload = compressed
+        return bytes([flags]) + payload
+
+    def loads(self, data: bytes) -> Any:
+        """
+        Decode a value read from Redis.
+
+        Args:
+            data: Stored payload
+
+        Returns:
+            Any: The original value
+        """
+        try:
+            return int(data)
+        except ValueError:
+            pass
+        flags, payload = data[0], data[1:]
+        compression = flags & COMPRESSION_MASK
+        if compression:
+            payload = DECOMPRESSORS[compression](payload)
+        if flags & FORMAT_MASK == MSGPACK:
+            return msgpack.unpackb(payload, raw=False, strict_map_key=False)
+        return pickle.loads(payload)
+
+
+def degrade_gracefully(fallback: Any) -> Callable:
+    """
+    Make a cache method return ``fallback`` instead of failing when Redis
+    is unreachable.
+
+    After a failure Redis is skipped for ``CACHE_RETRY_INTERVAL`` seconds,
+    so an outage costs one connection timeout per interval rather than
+    one per cache call.
+
+    Args:
+        fallback: Value returned, or exception class raised, while Redis
+            is down
+
+    Returns:
+        Callable: Decorator for ``ResilientRedisCache`` methods
+    """
+
+    def decorator(method: Callable) -> Callable:
+        @wraps(method)
+        def wrapper(self: "ResilientRedisCache", *args: Any, **kwargs: Any):
+            if self._down_until > time.monotonic():
+                return self._fallback(fallback)
+            try:
+                return method(self, *args, **kwargs)
+            except RedisError as e:
+                self._mark_down(e)
+                return self._fallback(fallback)
+
+        return wrapper
+
+    return decorator
+
+
+def is_cache_available(backend: Any) -> bool:
+    """
+    Tell whether a cache backend is serving, rather than degrading.
+
+    Lets callers tell a real miss from a miss returned because Redis is
+    down, for data that must not be trusted absent then.
+
+    Args:
+        backend: Cache backend, such as ``django.core.cache.cache``
+
+    Returns:
+        bool: False only while a ``ResilientRedisCache`` skips Redis
+    """
+    is_available = getattr(backend, "is_available", None)
+    return is_available() if is_available is not None else True
+
+
+class ResilientRedisCache(RedisCache):
+    """
+    Django's Redis cache backend that degrades to cache misses while Redis
+    is down, instead of turning every request into a 500.
+
+    Reads miss, writes are dropped and ``incr`` reports a missing key, so
+    callers fall back to the database exactly as on a cold cache.
+    """
+
+    _down_until: float = 0.0
+
+    def _mark_down(self, error: RedisError) -> None:
+        """
+        Skip Redis for ``CACHE_RETRY_INTERVAL`` seconds after a failure.
+
+        Args:
+            error: Error raised by the Redis client
+        """
+        self._down_until = time.monotonic() + settings.CACHE_RETRY_INTERVAL
+        logger.warning(
+            f"Cache unavailable, serving without it for "
+            f"{settings.CACHE_RETRY_INTERVAL}s: {error}"
+        )
+
+    def _fallback(self, fallback: Any) -> Any:
+        """
+        Produce the value returned while Redis is down.
+
+        Args:
+            fallback: Value to return, or exception class to raise
+
+        Returns:
+            Any: The fallback value
+        """
+        if isinstance(fallback, type) and issubclass(fallback, Exception):
+            raise fallback("Cache unavailable")
+        return fallback() if callable(fallback) else fallback
+
+    def is_available(self) -> bool:
+        """
+        Tell whether Redis is being used, or skipped after a failure.
+
+        Returns:
+            bool: False while calls fall back instead of reaching Redis
+        """
+        return self._down_until <= time.monotonic()
+
+    def get(self, key: Any, default: Any = None, version: Any = None) -> Any:
+        """
+        Get a value, or ``default`` on a miss or while Redis is down.
+
+        Args:
+            key: Cache key
+            default: Value returned on a miss
+            version: Key version
+
+        Returns:
+            Any: Cached value or default
+        """
+        if self._down_until > time.monotonic():
+            return default
+        try:
+            return super().get(key, default, version)
+        except RedisError as e:
+            self._mark_down(e)
+            return default
+
+    add = degrade_gracefully(False)(RedisCache.add)
+    set = degrade_gracefully(None)(RedisCache.set)
+    touch = degrade_gracefully(False)(RedisCache.touch)
+    delete = degrade_gracefully(False)(RedisCache.delete)
+    get_many = degrade_gracefully(dict)(RedisCache.get_many)
+    has_key = degrade_gracefully(False)(RedisCache.has_key)
+    incr = degrade_gracefully(ValueError)(RedisCache.incr)
+    set_many = degrade_gracefully(list)(RedisCache.set_many)
+    delete_many = degrade_gracefully(None)(RedisCache.delete_many)
+    clear = degrade_gracefully(False)(RedisCache.clear)
@@ -2,10 +2,20 @@ import logging
 from typing import Optional, Tuple, Union
 
 from django.conf import settings
+from django.utils.translation import gettext_lazy as _
+from rest_framework.exceptions import AuthenticationFailed
 from rest_framework.request import Request
 from rest_framework_simplejwt.authentication import AuthUser, JWTAuthentication
 from rest_framework_simplejwt.exceptions import TokenError
+from rest_framework_simplejwt.settings import api_settings
 from rest_framework_simplejwt.tokens import Token
+from rest_framework_simplejwt.utils import get_md5_hash_password
+
+from core_apps.users.cache import (
+    cache_user,
+    get_cached_user,
+    get_user_version,
+)
 
 # Configure logger for authentication-related events
 logger: logging.Logger = logging.getLogger(__name__)
@@ -26,6 +36,9 @@ class CookieAuthentication(JWTAuthentication):
     3. Validate found token
     4. Return authenticated user and token
 
+    Resolved users are cached in a per-process LRU and in the shared
+    cache, so a warm cache authenticates without any database query.
+
     Attributes:
         Inherits all attributes from JWTAuthentication
     """
@@ -79,3 +92,39 @@ class CookieAuthentication(JWTAuthentication):
 
         # Return None if no valid token was found
         return None
+
+    def get_user(self, validated_token: Token) -> AuthUser:
+        """
+        Resolve the token's user from the user cache or the database.
+
+        Only users that passed simplejwt's checks (existing and active) are
+        cached, and every save of a user bumps its cache version, so a
+        deactivated user or a changed password is never served from cache.
+
+        Args:
+            validated_token: Token that passed signature and expiry checks
+
+        Returns:
+            AuthUser: The authenticated user
+
+        Raises:
+            InvalidToken: If the token has no user id claim
+            AuthenticationFailed: If the user is missing or inactive
+        """
+        user_id = validated_token.get(api_settings.USER_ID_CLAIM)
+        if user_id is None:
+            return super().get_user(validated_token)
+
+        user: Optional[AuthUser] = get_cached_user(user_id)
+        if user is None:
+            version = get_user_version(user_id)
+            user = super().get_user(validated_token)
+            cache_user(user_id, user, version)
+        elif api_settings.CHECK_REVOKE_TOKEN and validated_token.get(
+            api_settings.REVOKE_TOKEN_CLAIM
+        ) != get_md5_hash_password(user.password):
+            raise AuthenticationFailed(
+                _("The user's password has been changed."),
+                code="password_changed",
+            )
+        return user
@@ -0,0 +1,57 @@
+from typing import Any
+
+from django.contrib.postgres.search import TrigramWordSimilarity
+from django.db import connections
+from django.db.models import Q, QuerySet
+from rest_framework.filters import SearchFilter
+from rest_framework.request import Request
+
+# Annotation holding the similarity of each result to the search term
+RANK_ANNOTATION = "search_rank"
+
+
+class TrigramSearchFilter(SearchFilter):
+    """
+    Search one denormalized, lowercased text column with pg_trgm.
+
+    Views name the column in ``trigram_search_field``; it should carry a
+    GIN ``gin_trgm_ops`` index. Rows containing the term, or with a word
+    similar enough to it (pg_trgm's ``%>`` operator), are returned ranked
+    by word similarity, so typos still match and best matches come first.
+    Both conditions are served by the trigram index.
+
+    On databases without pg_trgm the filter falls back to a plain
+    substring match without ranking.
+    """
+
+    def filter_queryset(
+        self, request: Request, queryset: QuerySet, view: Any
+    ) -> QuerySet:
+        """
+        Filter and rank the queryset by the request's search term.
+
+        Args:
+            request: Request carrying the search parameter
+            queryset: Queryset to filter
+            view: View declaring ``trigram_search_field``
+
+        Returns:
+            QuerySet: Matching rows, best match first on PostgreSQL
+        """
+        field = getattr(view, "trigram_search_field", None)
+        term = request.query_params.get(self.search_param, "")
+        term = " ".join(term.replace("\x00", "").split()).lower()
+        if not field or not term:
+            return queryset
+
+        contains = Q(**{f"{field}__contains": term})
+        if connections[queryset.db].vendor != "postgresql":
+            return queryset.filter(contains)
+
+        return (
+            queryset.annotate(
+                **{RANK_ANNOTATION: TrigramWordSimilarity(term, field)}
+            )
+            .filter(contains | Q(**{f"{field}__trigram_word_similar": term}))
+            .order_by(f"-{RANK_ANNOTATION}", "pk")
+        )
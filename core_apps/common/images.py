@@ -0,0 +1,45 @@
+import hashlib
+
+from django.core.files.base import ContentFile
+from django.core.files.storage import default_storage
+from PIL import Image
+
+
+def flatten_to_rgb(image: Image.Image) -> Image.Image:
+    """
+    Convert an image to RGB, placing transparent areas on white.
+
+    Args:
+        image: Image in any mode
+
+    Returns:
+        Image.Image: RGB image
+    """
+    if image.mode not in ("RGBA", "LA", "P"):
+        return image.convert("RGB")
+    image = image.convert("RGBA")
+    flattened = Image.new("RGB", image.size, "white")
+    flattened.paste(image, mask=image.getchannel("A"))
+    return flattened
+
+
+def store_content_addressed(content: bytes, prefix: str, extension: str) -> str:
+    """
+    Save a file in the default storage under its content hash.
+
+    Identical content always maps to the same name, so it is written once
+    and can be cached by clients forever.
+
+    Args:
+        content: File content
+        prefix: Storage directory of the file
+        extension: File extension without the dot
+
+    Returns:
+        str: Storage name of the file
+    """
+    digest = hashlib.sha256(content).hexdigest()
+    name = f"{prefix}/{digest[:2]}/{digest}.{extension}"
+    if not default_storage.exists(name):
+        name = default_storage.save(name, ContentFile(content))
+    return name
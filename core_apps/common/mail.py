@@ -0,0 +1,207 @@
+import json
+import logging
+import smtplib
+import threading
+import time
+from functools import lru_cache
+from typing import List, Sequence
+
+import djcelery_email.conf  # noqa: F401 - defines the settings used below
+import redis
+from django.conf import settings
+from django.core.mail import EmailMessage, get_connection
+from django.core.mail.backends.base import BaseEmailBackend
+from djcelery_email.utils import dict_to_email, email_to_dict
+
+logger = logging.getLogger(__name__)
+
+# Redis list of serialized messages waiting to be sent, oldest first
+OUTBOX_KEY = "email:outbox"
+
+# Redis key held while a send of the outbox is scheduled
+SCHEDULED_KEY = "email:send-scheduled"
+
+# Delivery connection kept open by each worker thread between batches
+_pool = threading.local()
+
+
+@lru_cache(maxsize=None)
+def get_outbox_client() -> redis.Redis:
+    """
+    Get the process-wide Redis client holding the email outbox.
+
+    Returns:
+        redis.Redis: Client backed by a shared connection pool
+    """
+    return redis.Redis.from_url(
+        settings.EMAIL_BATCH_REDIS_URL,
+        socket_timeout=settings.EMAIL_BATCH_REDIS_TIMEOUT,
+        socket_connect_timeout=settings.EMAIL_BATCH_REDIS_TIMEOUT,
+    )
+
+
+class BatchingEmailBackend(BaseEmailBackend):
+    """
+    Queue messages in Redis for ``send_queued_emails`` to send in batches.
+
+    The first message of a window schedules a send ``EMAIL_BATCH_WINDOW``
+    seconds later, so messages sent in the meantime, such as a burst of
+    activation emails, share one task and one SMTP connection instead of
+    each taking a task and a connection of its own.
+    """
+
+    def send_messages(self, email_messages: Sequence[EmailMessage]) -> int:
+        """
+        Queue messages for delivery.
+
+        Args:
+            email_messages: Messages to send
+
+        Returns:
+            int: Number of messages queued
+        """
+        if not email_messages:
+            return 0
+        payloads = [json.dumps(email_to_dict(m)) for m in email_messages]
+        window = settings.EMAIL_BATCH_WINDOW
+        try:
+            pipeline = get_outbox_client().pipeline(transaction=False)
+            pipeline.rpush(OUTBOX_KEY, *payloads)
+            pipeline.set(SCHEDULED_KEY, 1, nx=True, ex=window * 10)
+            _, scheduled = pipeline.execute()
+        except redis.RedisError:
+            if not self.fail_silently:
+                raise
+            logger.exception("Failed to queue email messages")
+            return 0
+        if scheduled:
+            from .tasks import send_queued_emails
+
+            send_queued_emails.apply_async(countdown=window)
+        return len(payloads)
+
+
+def schedule_send() -> None:
+    """
+    Allow the next queued message to schedule a send of the outbox.
+
+    Called by the send before it drains the outbox, so a message queued
+    after the drain always schedules another send.
+    """
+    get_outbox_client().delete(SCHEDULED_KEY)
+
+
+def take_batch(size: int) -> List[str]:
+    """
+    Take the oldest messages out of the outbox.
+
+    Args:
+        size: Maximum number of messages to take
+
+    Returns:
+        List[str]: Serialized messages, oldest first
+    """
+    return [
+        payload.decode()
+        for payload in get_outbox_client().lpop(OUTBOX_KEY, size) or []
+    ]
+
+
+def requeue_batch(payloads: List[str]) -> None:
+    """
+    Put undelivered messages back in front of the outbox, in order.
+
+    Args:
+        payloads: Serialized messages, oldest first
+    """
+    if payloads:
+        get_outbox_client().lpush(OUTBOX_KEY, *reversed(payloads))
+
+
+def get_delivery_connection() -> BaseEmailBackend:
+    """
+    Get this thread's open delivery connection, opening one if needed.
+
+    Connections idle for ``EMAIL_POOL_IDLE_TIMEOUT`` seconds are replaced
+    rather than reused, as SMTP servers drop idle clients.
+
+    Returns:
+        BaseEmailBackend: Open ``EMAIL_BATCH_DELIVERY_BACKEND`` connection
+    """
+    connection = getattr(_pool, "connection", None)
+    idle = time.monotonic() - getattr(_pool, "used_at", 0.0)
+    if connection is not None and idle > settings.EMAIL_POOL_IDLE_TIMEOUT:
+        close_delivery_connection()
+        connection = None
+    if connection is None:
+        connection = get_connection(settings.EMAIL_BATCH_DELIVERY_BACKEND)
+        connection.open()
+        _pool.connection = connection
+    _pool.used_at = time.monotonic()
+    return connection
+
+
+def close_delivery_connection() -> None:
+    """
+    Close and forget this thread's delivery connection, if any.
+    """
+    connection = getattr(_pool, "connection", None)
+    _pool.connection = None
+    if connection is not None:
+        try:
+            connection.close()
+        except Exception:
+            logger.debug("Failed to close email connection", exc_info=True)
+
+
+def is_permanent_failure(error: Exception) -> bool:
+    """
+    Tell whether a delivery error would recur on every attempt.
+
+    Args:
+        error: Error raised while sending a message
+
+    Returns:
+        bool: True if the message should be dropped rather than retried
+    """
+    if isinstance(error, smtplib.SMTPRecipientsRefused):
+        return True
+    if isinstance(error, smtplib.SMTPResponseException):
+        return error.smtp_code >= 500
+    # Network and SMTP errors are OSErrors; anything else is the message
+    return not isinstance(error, OSError)
+
+
+def send_batch(payloads: List[str]) -> int:
+    """
+    Send serialized messages one at a time over the pooled connection.
+
+    Messages are handed to the server one by one, so a failure is known
+    per message. Messages the server rejects for good are logged and
+    dropped. On a transient failure the connection is discarded and the
+    failed message and those after it are put back in the outbox, so
+    delivered messages are never sent again.
+
+    Args:
+        payloads: Serialized messages, oldest first
+
+    Returns:
+        int: Number of messages delivered
+
+    Raises:
+        OSError: On a transient failure, after requeueing the rest
+    """
+    delivered = 0
+    for index, payload in enumerate(payloads):
+        message = dict_to_email(json.loads(payload))
+        try:
+            get_delivery_connection().send_messages([message])
+        except Exception as e:
+            if is_permanent_failure(e):
+                logger.warning(f"Dropped email to {message.to}: {e}")
+                continue
+            close_delivery_connection()
+            requeue_batch(payloads[index:])
+            raise
+        delivered += 1
+    return delivered
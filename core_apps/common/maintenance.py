@@ -0,0 +1,61 @@
+import logging
+import time
+from typing import Optional, Type
+
+from django.conf import settings
+from django.db import models, transaction
+
+logger = logging.getLogger(__name__)
+
+
+def delete_in_batches(
+    model: Type[models.Model],
+    batch_size: int,
+    pause: Optional[float] = None,
+    **filters: object,
+) -> int:
+    """
+    Delete matching rows a batch at a time, each in its own transaction.
+
+    Keeping every DELETE small holds locks only briefly, and pausing
+    between batches lets requests writing the same table take them, so
+    they are not blocked while a large backlog is purged. The number of
+    rows, duration and rate are logged once done.
+
+    Args:
+        model: Model whose rows are deleted
+        batch_size: Maximum rows deleted per statement
+        pause: Seconds to sleep between batches, ``MAINTENANCE_BATCH_PAUSE``
+            if None
+        **filters: Lookups selecting the rows to delete
+
+    Returns:
+        int: Number of rows deleted
+    """
+    if pause is None:
+        pause = settings.MAINTENANCE_BATCH_PAUSE
+    started = time.monotonic()
+    deleted = batches = 0
+    while True:
+        pks = list(
+            model.objects.filter(**filters)
+            .order_by()
+            .values_list("pk", flat=True)[:batch_size]
+        )
+        if not pks:
+            break
+        with transaction.atomic():
+            deleted += model.objects.filter(pk__in=pks).delete()[0]
+        batches += 1
+        if len(pks) < batch_size:
+            break
+        if pause:
+            time.sleep(pause)
+
+    duration = time.monotonic() - started
+    rate = deleted / duration if duration else 0.0
+    logger.info(
+        f"Deleted {deleted} {model._meta.label} rows in {batches} batches "
+        f"over {duration:.2f}s ({rate:.0f} rows/s)"
+    )
+    return deleted
@@ -0,0 +1,160 @@
+import pickle
+import statistics
+import time
+import uuid
+from decimal import Decimal
+from typing import Any, Dict, List
+
+from django.conf import settings
+from django.core.cache import cache
+from django.core.management.base import BaseCommand, CommandParser
+from django.test import override_settings
+
+from core_apps.common.cache import CompressedSerializer
+
+
+def build_payloads() -> Dict[str, Any]:
+    """
+    Build values shaped like the ones the API caches.
+
+    Returns:
+        Dict[str, Any]: Sample values keyed by name
+    """
+
+    def product(i: int) -> Dict[str, Any]:
+        return {
+            "id": str(uuid.uuid4()),
+            "name": f"Wireless noise cancelling headphones {i}",
+            "slug": f"wireless-noise-cancelling-headphones-{i}",
+            "description": f"Model {i} over-ear headphones with 30 hours "
+            "of battery, USB-C charging and a carrying case.",
+            "category": "Electronics",
+            "is_digital": False,
+            "price": f"{100 + i}.99",
+            "stock_qty": i,
+        }
+
+    def category(i: int) -> Dict[str, Any]:
+        return {"id": i, "name": f"Category {i}", "slug": f"category-{i}"}
+
+    return {
+        "counter": 17,
+        "user version": {"id": str(uuid.uuid4()), "version": 3},
+        "product": product(0),
+        "product list (50)": [product(i) for i in range(50)],
+        "category tree (200)": [
+            dict(category(i), children=[category(i * 10 + 1)])
+            for i in range(200)
+        ],
+        "pickled objects (50)": [
+            dict(product(i), price=Decimal(f"{100 + i}.99")) for i in range(50)
+        ],
+    }
+
+
+class Command(BaseCommand):
+    """
+    Management command comparing cache payload sizes and latencies.
+
+    Sizes are compared between plain pickle, Django's default, and the
+    msgpack serializer without compression, with zlib and with lz4. Get
+    and set latencies are measured against the configured cache.
+    """
+
+    help = "Benchmark cache payload sizes and get/set latency"
+
+    def add_arguments(self, parser: CommandParser) -> None:
+        """
+        Add command arguments.
+
+        Args:
+            parser: Command argument parser
+        """
+        parser.add_argument("--iterations", type=int, default=200)
+
+    def handle(self, *args: Any, **options: Any) -> None:
+        """
+        Print payload sizes and latencies for every sample value.
+
+        Args:
+            *args: Additional positional arguments
+            **options: Command options
+        """
+        payloads = build_payloads()
+        serializers = {
+            "msgpack": self.get_serializer("lz4", min_size=2**31),
+            "msgpack+zlib": self.get_serializer("zlib"),
+            "msgpack+lz4": self.get_serializer("lz4"),
+        }
+
+        self.stdout.write("Payload sizes (bytes):")
+        for name, value in payloads.items():
+            sizes = [f"pickle {len(pickle.dumps(value, -1))}"]
+            for label, serializer in serializers.items():
+                encoded = serializer.dumps(value)
+                size = len(encoded) if isinstance(encoded, bytes) else 0
+                sizes.append(f"{label} {size or 'raw int'}")
+            self.stdout.write(f"  {name}: " + ", ".join(sizes))
+
+        self.stdout.write(
+            f"Latency against {settings.CACHES['default']['BACKEND']} "
+            f"({options['iterations']} iterations, ms):"
+        )
+        for name, value in payloads.items():
+            result = self.time_cache(value, options["iterations"])
+            self.stdout.write(
+                f"  {name}: set p50 {result['set_p50']:.3f} "
+                f"p95 {result['set_p95']:.3f}, get p50 "
+                f"{result['get_p50']:.3f} p95 {result['get_p95']:.3f}"
+            )
+
+    def get_serializer(
+        self, compressor: str, min_size: int = 1024
+    ) -> CompressedSerializer:
+        """
+        Build a serializer with the given compression settings.
+
+        Args:
+            compressor: Name of the compressor
+            min_size: Encoded size from which values are compressed
+
+        Returns:
+            CompressedSerializer: Configured serializer
+        """
+        with override_settings(
+            CACHE_COMPRESSOR=compressor, CACHE_COMPRESS_MIN_SIZE=min_size
+        ):
+            return CompressedSerializer()
+
+    def time_cache(self, value: Any, iterations: int) -> Dict[str, float]:
+        """
+        Time round trips of one value through the configured cache.
+
+        Args:
+            value: Value to store and read back
+            iterations: Number of set and get calls
+
+        Returns:
+            Dict[str, float]: Median and 95th percentile set/get latency
+        """
+        key = f"benchmark:{uuid.uuid4().hex}"
+        sets: List[float] = []
+        gets: List[float] = []
+        try:
+            for _ in range(iterations):
+                started = time.perf_counter()
+                cache.set(key, value, timeout=60)
+                sets.append(time.perf_counter() - started)
+                started = time.perf_counter()
+                cache.get(key)
+                gets.append(time.perf_counter() - started)
+        finally:
+            cache.delete(key)
+        sets.sort()
+        gets.sort()
+        return {
+            "set_p50": statistics.median(sets) * 1000,
+            "set_p95": sets[int(len(sets) * 0.95) - 1] * 1000,
+            "get_p50": statistics.median(gets) * 1000,
+            "get_p95": gets[int(len(gets) * 0.95) - 1] * 1000,
+        }
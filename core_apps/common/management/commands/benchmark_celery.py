@@ -0,0 +1,153 @@
+import statistics
+import threading
+import time
+import uuid
+from contextlib import ExitStack
+from typing import Any, Dict, List, Tuple
+
+from celery import Celery
+from celery.contrib.testing.worker import start_worker
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandParser
+
+# Tasks whose routes stand in for each workload
+MEDIA_TASK = "process_avatar_upload"
+EMAIL_TASK = "djcelery_email_send_multiple"
+
+
+class Command(BaseCommand):
+    """
+    Management command measuring queue layouts on an in-memory broker.
+
+    A burst of slow media tasks is queued ahead of a few fast email tasks,
+    then worked off twice: once with every worker on one shared queue at
+    Celery's default prefetch, and once with the queues and prefetch
+    multipliers the workers are deployed with. Throughput and the wait
+    of the email tasks are compared. Tasks sleep instead of working, so
+    the numbers reflect scheduling rather than the host's speed.
+    """
+
+    help = "Benchmark Celery queue routing and prefetch on a memory broker"
+
+    def add_arguments(self, parser: CommandParser) -> None:
+        """
+        Add command arguments.
+
+        Args:
+            parser: Command argument parser
+        """
+        parser.add_argument("--media", type=int, default=200)
+        parser.add_argument("--email", type=int, default=20)
+        parser.add_argument("--media-ms", type=float, default=20.0)
+        parser.add_argument("--email-ms", type=float, default=2.0)
+        parser.add_argument("--workers", type=int, default=4)
+
+    def handle(self, *args: Any, **options: Any) -> None:
+        """
+        Print throughput and email wait for both layouts.
+
+        Args:
+            *args: Additional positional arguments
+            **options: Command options
+        """
+        workers = options["workers"]
+        media_queue = settings.CELERY_TASK_ROUTES[MEDIA_TASK]["queue"]
+        email_queue = settings.CELERY_TASK_ROUTES[EMAIL_TASK]["queue"]
+        routed = [(media_queue, 1)] * (workers - 1) + [(email_queue, 4)]
+        layouts = {
+            "shared queue, prefetch 4": [("shared", 4)] * workers,
+            f"routed {media_queue}/{email_queue}, prefetch 1/4": routed,
+        }
+
+        self.stdout.write(
+            f"{options['media']} media tasks of {options['media_ms']} ms "
+            f"then {options['email']} email tasks of {options['email_ms']} "
+            f"ms, {workers} worker processes:"
+        )
+        for name, layout in layouts.items():
+            result = self.run_layout(layout, options)
+            self.stdout.write(
+                f"  {name}: {result['throughput']:.0f} tasks/s, email wait "
+                f"p50 {result['email_p50']:.0f} ms "
+                f"p95 {result['email_p95']:.0f} ms"
+            )
+
+    def run_layout(
+        self, layout: List[Tuple[str, int]], options: Dict[str, Any]
+    ) -> Dict[str, float]:
+        """
+        Work off the burst with one layout of workers.
+
+        Each worker is a solo pool in a thread, standing in for one worker
+        process. Queues are prefixed per run, since the memory broker's
+        state is shared by the whole process.
+
+        Args:
+            layout: Queue and prefetch multiplier of each worker
+            options: Command options
+
+        Returns:
+            Dict[str, float]: Tasks per second, and median and 95th
+            percentile wait of the email tasks in milliseconds
+        """
+        prefix = uuid.uuid4().hex[:8]
+        app = Celery("benchmark", broker="memory://")
+        app.conf.task_ignore_result = True
+        app.conf.task_default_queue = f"{prefix}.shared"
+        app.conf.broker_transport_options = {"polling_interval": 0.01}
+        routed = {queue for queue, _ in layout} - {"shared"}
+        app.conf.task_routes = {
+            f"benchmark.{queue}": {"queue": f"{prefix}.{queue}"}
+            for queue in routed
+        }
+
+        total = options["media"] + options["email"]
+        waits: Dict[str, List[float]] = {"media": [], "email": []}
+        lock = threading.Lock()
+        finished = threading.Event()
+
+        def record(kind: str, sent: float) -> None:
+            with lock:
+                waits[kind].append(time.perf_counter() - sent)
+                if sum(len(values) for values in waits.values()) == total:
+                    finished.set()
+
+        media_queue = settings.CELERY_TASK_ROUTES[MEDIA_TASK]["queue"]
+        email_queue = settings.CELERY_TASK_ROUTES[EMAIL_TASK]["queue"]
+
+        # Not shared, so tasks of earlier runs are not bound to this app
+        @app.task(name=f"benchmark.{media_queue}", shared=False)
+        def media(sent: float) -> None:
+            time.sleep(options["media_ms"] / 1000)
+            record("media", sent)
+
+        @app.task(name=f"benchmark.{email_queue}", shared=False)
+        def email(sent: float) -> None:
+            time.sleep(options["email_ms"] / 1000)
+            record("email", sent)
+
+        with ExitStack() as stack:
+            for queue, prefetch in layout:
+                stack.enter_context(
+                    start_worker(
+                        app,
+                        pool="solo",
+                        perform_ping_check=False,
+                        queues=[f"{prefix}.{queue}"],
+                        prefetch_multiplier=prefetch,
+                    )
+                )
+            started = time.perf_counter()
+            for _ in range(options["media"]):
+                media.delay(time.perf_counter())
+            for _ in range(options["email"]):
+                email.delay(time.perf_counter())
+            finished.wait(timeout=600)
+            elapsed = time.perf_counter() - started
+
+        emails = sorted(waits["email"]) or [0.0]
+        return {
+            "throughput": total / elapsed,
+            "email_p50": statistics.median(emails) * 1000,
+            "email_p95": emails[max(int(len(emails) * 0.95) - 1, 0)] * 1000,
+        }
@@ -0,0 +1,81 @@
+from typing import Any, Dict, Optional
+
+from django.conf import settings
+from django.http import HttpRequest, HttpResponse
+from django.utils.deprecation import MiddlewareMixin
+
+from .replicas import pin_to_primary
+from .throttling import QUOTA_ATTRIBUTE
+
+# HTTP methods that never modify data
+SAFE_METHODS = ("GET", "HEAD", "OPTIONS")
+
+
+class ReadYourWritesMiddleware(MiddlewareMixin):
+    """
+    Pin clients to the primary database for a short window after a write.
+
+    Successful unsafe requests set a short-lived cookie and, for
+    authenticated users, a cache marker. ``ReplicaReadMixin`` checks both
+    before sending a read to a replica, so clients always see their own
+    writes even when replicas lag behind. Built on ``MiddlewareMixin`` so
+    the stack stays async-capable for async views under ASGI.
+    """
+
+    def process_response(
+        self, request: HttpRequest, response: HttpResponse
+    ) -> HttpResponse:
+        """
+        Pin the client after a successful write.
+
+        Args:
+            request: HTTP request object
+            response: Response returned by the view
+
+        Returns:
+            HttpResponse: The response, with the pin cookie after writes
+        """
+        if request.method not in SAFE_METHODS and response.status_code < 400:
+            pin_to_primary(request)
+            response.set_cookie(
+                settings.READ_YOUR_WRITES_COOKIE,
+                "1",
+                max_age=settings.READ_YOUR_WRITES_WINDOW,
+                path=settings.COOKIE_PATH,
+                secure=settings.COOKIE_SECURE,
+                httponly=True,
+                samesite=settings.COOKIE_SAMESITE,
+            )
+        return response
+
+
+class RateLimitHeadersMiddleware(MiddlewareMixin):
+    """
+    Report the tightest throttle quota checked for a request.
+
+    The Redis throttles record their quota on the request; this adds
+    ``X-RateLimit-Limit``, ``X-RateLimit-Remaining`` and
+    ``X-RateLimit-Window`` (seconds) to the response.
+    """
+
+    def process_response(
+        self, request: HttpRequest, response: HttpResponse
+    ) -> HttpResponse:
+        """
+        Add the rate limit headers if a throttle checked the request.
+
+        Args:
+            request: HTTP request object
+            response: Response returned by the view
+
+        Returns:
+            HttpResponse: The response with rate limit headers
+        """
+        quota: Optional[Dict[str, Any]] = getattr(
+            request, QUOTA_ATTRIBUTE, None
+        )
+        if quota is not None:
+            response["X-RateLimit-Limit"] = str(quota["limit"])
+            response["X-RateLimit-Remaining"] = str(quota["remaining"])
+            response["X-RateLimit-Window"] = str(quota["window"])
+        return response
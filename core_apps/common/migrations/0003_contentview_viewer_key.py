@@ -0,0 +1,70 @@
+# Generated by Django 4.2.11 on 2026-10-19 09:40
+
+from django.db import migrations, models
+
+
+def populate_viewer_keys(apps, schema_editor):
+    ContentView = apps.get_model("common", "ContentView")
+
+    # Rows of one user from several IPs now share a key; keep the most
+    # recent and drop the rest, each row standing for one view so far
+    kept = {}
+    duplicates = []
+    for view in ContentView.objects.order_by("-last_viewed"):
+        if view.user_id is not None:
+            view.viewer_key = f"user:{view.user_id}"
+        elif view.viewer_ip:
+            view.viewer_key = f"ip:{view.viewer_ip}"
+        else:
+            view.viewer_key = "anonymous"
+        key = (view.content_type_id, view.object_id, view.viewer_key)
+        if key in kept:
+            kept[key].view_count += 1
+            duplicates.append(view.pkid)
+        else:
+            kept[key] = view
+    ContentView.objects.filter(pkid__in=duplicates).delete()
+    ContentView.objects.bulk_update(
+        kept.values(), ["viewer_key", "view_count"], batch_size=1000
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("contenttypes", "0002_remove_content_type_name"),
+        ("common", "0002_initial"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="contentview",
+            name="view_count",
+            field=models.PositiveIntegerField(
+                default=1, verbose_name="View Count"
+            ),
+        ),
+        migrations.AddField(
+            model_name="contentview",
+            name="viewer_key",
+            field=models.CharField(
+                default="",
+                editable=False,
+                max_length=64,
+                verbose_name="Viewer Key",
+            ),
+            preserve_default=False,
+        ),
+        migrations.RunPython(populate_viewer_keys, migrations.RunPython.noop),
+        migrations.AlterUniqueTogether(
+            name="contentview",
+            unique_together=set(),
+        ),
+        migrations.AddConstraint(
+            model_name="contentview",
+            constraint=models.UniqueConstraint(
+                fields=("content_type", "object_id", "viewer_key"),
+                name="unique_content_viewer",
+            ),
+        ),
+    ]
@@ -0,0 +1,109 @@
+# Generated by Django 4.2.11 on 2026-10-19 05:33
+
+from django.db import migrations, models
+import django.db.models.deletion
+import uuid
+
+from django.utils import timezone
+
+
+def backfill_rollups(apps, schema_editor):
+    ContentView = apps.get_model("common", "ContentView")
+    ContentViewDaily = apps.get_model("common", "ContentViewDaily")
+
+    # Earlier views are not kept per day, so each viewer's views are
+    # counted on the day of their last view
+    rollups = {}
+    for content_type_id, object_id, view_count, last_viewed in (
+        ContentView.objects.values_list(
+            "content_type_id", "object_id", "view_count", "last_viewed"
+        ).iterator()
+    ):
+        day = timezone.localdate(last_viewed)
+        rollup = rollups.get((content_type_id, object_id, day))
+        if rollup is None:
+            rollup = rollups[(content_type_id, object_id, day)] = (
+                ContentViewDaily(
+                    content_type_id=content_type_id,
+                    object_id=object_id,
+                    day=day,
+                )
+            )
+        rollup.views += view_count
+        rollup.unique_viewers += 1
+    ContentViewDaily.objects.bulk_create(rollups.values(), batch_size=1000)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("contenttypes", "0002_remove_content_type_name"),
+        ("common", "0003_contentview_viewer_key"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="ContentViewDaily",
+            fields=[
+                (
+                    "pkid",
+                    models.BigAutoField(
+                        editable=False, primary_key=True, serialize=False
+                    ),
+                ),
+                (
+                    "id",
+                    models.UUIDField(
+                        default=uuid.uuid4, editable=False, unique=True
+                    ),
+                ),
+                ("created_at", models.DateTimeField(auto_now_add=True)),
+                ("updated_at", models.DateTimeField(auto_now=True)),
+                (
+                    "object_id",
+                    models.PositiveIntegerField(verbose_name="Object ID"),
+                ),
+                ("day", models.DateField(verbose_name="Day")),
+                (
+                    "views",
+                    models.PositiveIntegerField(
+                        default=0, verbose_name="Views"
+                    ),
+                ),
+                (
+                    "unique_viewers",
+                    models.PositiveIntegerField(
+                        default=0, verbose_name="Unique Viewers"
+                    ),
+                ),
+            ],
+            options={
+                "verbose_name": "Daily Content Views",
+                "verbose_name_plural": "Daily Content Views",
+                "ordering": ["-day"],
+            },
+        ),
+        migrations.AddIndex(
+            model_name="contentview",
+            index=models.Index(
+                fields=["last_viewed"], name="content_view_last_viewed_idx"
+            ),
+        ),
+        migrations.AddField(
+            model_name="contentviewdaily",
+            name="content_type",
+            field=models.ForeignKey(
+                on_delete=django.db.models.deletion.CASCADE,
+                to="contenttypes.contenttype",
+                verbose_name="Content Type",
+            ),
+        ),
+        migrations.AddConstraint(
+            model_name="contentviewdaily",
+            constraint=models.UniqueConstraint(
+                fields=("content_type", "object_id", "day"),
+                name="unique_content_view_day",
+            ),
+        ),
+        migrations.RunPython(backfill_rollups, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,52 @@
+# Generated by Django 4.2.11 on 2026-10-19 05:36
+
+from django.db import migrations, models
+import uuid
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("common", "0004_contentviewdaily"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="ViewerSketch",
+            fields=[
+                (
+                    "pkid",
+                    models.BigAutoField(
+                        editable=False, primary_key=True, serialize=False
+                    ),
+                ),
+                (
+                    "id",
+                    models.UUIDField(
+                        default=uuid.uuid4, editable=False, unique=True
+                    ),
+                ),
+                ("created_at", models.DateTimeField(auto_now_add=True)),
+                ("updated_at", models.DateTimeField(auto_now=True)),
+                (
+                    "scope",
+                    models.CharField(max_length=64, verbose_name="Scope"),
+                ),
+                ("day", models.DateField(verbose_name="Day")),
+                ("sketch", models.BinaryField(verbose_name="Sketch")),
+            ],
+            options={
+                "verbose_name": "Viewer Sketch",
+                "verbose_name_plural": "Viewer Sketches",
+                "indexes": [
+                    models.Index(fields=["day"], name="viewer_sketch_day_idx")
+                ],
+            },
+        ),
+        migrations.AddConstraint(
+            model_name="viewersketch",
+            constraint=models.UniqueConstraint(
+                fields=("scope", "day"), name="unique_viewer_sketch_day"
+            ),
+        ),
+    ]
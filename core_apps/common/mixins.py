@@ -0,0 +1,66 @@
+from contextvars import Token
+from typing import Any, List, Optional
+
+from rest_framework.request import Request
+from rest_framework.response import Response
+
+from .middleware import SAFE_METHODS
+from .replicas import (
+    is_pinned_to_primary,
+    reset_replica_reads,
+    set_replica_reads,
+)
+
+
+class ReplicaReadMixin:
+    """
+    ViewSet mixin serving whitelisted read-only actions from a replica.
+
+    Reads are routed to a replica only when the request uses a safe method,
+    the action is listed in ``replica_read_actions`` and the client has not
+    written within the read-your-writes window.
+
+    Attributes:
+        replica_read_actions: Actions allowed to read from a replica
+    """
+
+    replica_read_actions: List[str] = ["list", "retrieve"]
+
+    _replica_token: Optional[Token] = None
+
+    def initial(self, request: Request, *args: Any, **kwargs: Any) -> None:
+        """
+        Enable replica reads once the request is authenticated.
+
+        Args:
+            request: HTTP request object
+            *args: Additional positional arguments
+            **kwargs: Additional keyword arguments
+        """
+        super().initial(request, *args, **kwargs)
+        if (
+            request.method in SAFE_METHODS
+            and self.action in self.replica_read_actions
+            and not is_pinned_to_primary(request)
+        ):
+            self._replica_token = set_replica_reads(True)
+
+    def finalize_response(
+        self, request: Request, response: Response, *args: Any, **kwargs: Any
+    ) -> Response:
+        """
+        Restore primary reads before the response leaves the view.
+
+        Args:
+            request: HTTP request object
+            response: Response returned by the handler
+            *args: Additional positional arguments
+            **kwargs: Additional keyword arguments
+
+        Returns:
+            Response: The finalized response
+        """
+        if self._replica_token is not None:
+            reset_replica_reads(self._replica_token)
+            self._replica_token = None
+        return super().finalize_response(request, response, *args, **kwargs)
@@ -1,10 +1,12 @@
 import uuid
-from typing import Any, Optional, Tuple, Union
+from datetime import date, datetime
+from typing import Any, Dict, Iterable, List, Optional, Tuple, Type, Union
 
 from django.contrib.auth import get_user_model
 from django.contrib.contenttypes.fields import GenericForeignKey
 from django.contrib.contenttypes.models import ContentType
-from django.db import IntegrityError, models
+from django.db import connections, models, router, transaction
+from django.utils import timezone
 from django.utils.translation import gettext_lazy as _
 
 # Get the active User model as defined in settings.AUTH_USER_MODEL
@@ -37,6 +39,92 @@ class TimeStampedModel(models.Model):
         ordering = ["-created_at", "-updated_at"]
 
 
+def get_viewer_key(user_id: Optional[int], viewer_ip: Optional[str]) -> str:
+    """
+    Identify a viewer by their user, or by their IP address if anonymous.
+
+    Args:
+        user_id: Primary key of the viewing user, if authenticated
+        viewer_ip: IP address of the viewer
+
+    Returns:
+        str: Key that content views are unique by, per object
+    """
+    if user_id is not None:
+        return f"user:{user_id}"
+    return f"ip:{viewer_ip}" if viewer_ip else "anonymous"
+
+
+def bulk_upsert(
+    model: Type[models.Model],
+    field_names: List[str],
+    rows: Iterable[List[Any]],
+    unique_fields: List[str],
+    updates: Dict[str, str],
+) -> int:
+    """
+    Insert rows, updating the ones that conflict, in one statement.
+
+    Django's ``bulk_create(update_conflicts=True)`` can only overwrite
+    columns, so counters are upserted with INSERT ... ON CONFLICT here.
+    Each entry of ``updates`` says how a conflicting row's column changes:
+    ``"add"`` the new value to it, keep the ``"latest"`` of both values or
+    ``"replace"`` it.
+
+    Args:
+        model: Model whose table receives the rows
+        field_names: Fields given for every row, in order
+        rows: Field values of each row
+        unique_fields: Fields of the unique constraint rows conflict on
+        updates: How each updated field changes on conflict
+
+    Returns:
+        int: Number of rows inserted or updated
+    """
+    using = router.db_for_write(model)
+    connection = connections[using]
+    quote = connection.ops.quote_name
+    fields = [model._meta.get_field(name) for name in field_names]
+
+    params: List[Any] = []
+    count = 0
+    for values in rows:
+        params.extend(
+            field.get_db_prep_save(value, connection)
+            for field, value in zip(fields, values)
+        )
+        count += 1
+    if not count:
+        return 0
+
+    table = quote(model._meta.db_table)
+    latest = "GREATEST" if connection.vendor == "postgresql" else "MAX"
+    expressions = {
+        "add": "{old}.{column} + EXCLUDED.{column}",
+        "latest": latest + "({old}.{column}, EXCLUDED.{column})",
+        "replace": "EXCLUDED.{column}",
+    }
+    assignments = []
+    for name, kind in updates.items():
+        column = quote(model._meta.get_field(name).column)
+        value = expressions[kind].format(old=table, column=column)
+        assignments.append(f"{column} = {value}")
+
+    columns = ", ".join(quote(field.column) for field in fields)
+    conflict = ", ".join(
+        quote(model._meta.get_field(name).column) for name in unique_fields
+    )
+    placeholders = "(" + ", ".join(["%s"] * len(fields)) + ")"
+    sql = (
+        f"INSERT INTO {table} ({columns}) VALUES "
+        f"{', '.join([placeholders] * count)} "
+        f"ON CONFLICT ({conflict}) DO UPDATE SET {', '.join(assignments)}"
+    )
+    with transaction.atomic(using), connection.cursor() as cursor:
+        cursor.execute(sql, params)
+    return count
+
+
 class ContentView(TimeStampedModel):
     """
     Tracks views/visits to any content type in the application.
@@ -48,6 +136,9 @@ class ContentView(TimeStampedModel):
         content_object: Generic foreign key to the viewed content
         user: Optional foreign key to the user who viewed the content
         viewer_ip: IP address of the viewer
+        viewer_key: The user, or the IP address of anonymous viewers,
+            that views are counted by
+        view_count: Number of views by this viewer
         last_viewed: Timestamp of the last view
     """
 
@@ -73,12 +164,31 @@ class ContentView(TimeStampedModel):
     viewer_ip: models.GenericIPAddressField = models.GenericIPAddressField(
         verbose_name=_("Viewer IP Address"), null=True, blank=True
     )
+    viewer_key: models.CharField = models.CharField(
+        verbose_name=_("Viewer Key"), max_length=64, editable=False
+    )
+    view_count: models.PositiveIntegerField = models.PositiveIntegerField(
+        verbose_name=_("View Count"), default=1
+    )
     last_viewed: models.DateTimeField = models.DateTimeField()
 
     class Meta:
         verbose_name = _("Content View")
         verbose_name_plural = _("Content Views")
-        unique_together = ["content_type", "object_id", "user", "viewer_ip"]
+        # Unlike (user, viewer_ip), the key is never NULL, so anonymous
+        # views conflict too and can be upserted
+        constraints = [
+            models.UniqueConstraint(
+                fields=["content_type", "object_id", "viewer_key"],
+                name="unique_content_viewer",
+            )
+        ]
+        # Lets the retention purge find expired rows without a table scan
+        indexes = [
+            models.Index(
+                fields=["last_viewed"], name="content_view_last_viewed_idx"
+            )
+        ]
 
     def __str__(self) -> str:
         """
@@ -99,11 +209,15 @@ class ContentView(TimeStampedModel):
         cls,
         content_object: models.Model,
         user: Optional[models.Model],
-        viewer_ip: str,
+        viewer_ip: Optional[str],
     ) -> None:
         """
         Record a view for a content object.
 
+        The view is only added to the view buffer, a single in-memory or
+        pipelined Redis increment; ``flush_content_views`` writes buffered
+        views to the database in bulk.
+
         Args:
             content_object: The Django model instance being viewed
             user: The user viewing the content (can be None for anonymous views)
@@ -111,23 +225,213 @@ class ContentView(TimeStampedModel):
 
         Returns:
             None
-
-        Note:
-            Silently handles integrity errors from duplicate views
-            Uses get_or_create to prevent duplicate processing
         """
+        from .view_buffer import buffer_view
+
+        # get_for_model is served from the ContentType cache after the
+        # first lookup per model
         content_type: ContentType = ContentType.objects.get_for_model(
             content_object
         )
-        try:
-            view: Tuple[ContentView, bool] = cls.objects.get_or_create(
-                content_type=content_type,
-                object_id=content_object.pkid,
-                defaults={"user": user, "viewer_ip": viewer_ip},
+        user_id: Optional[int] = (
+            user.pk if user is not None and user.is_authenticated else None
+        )
+        buffer_view(content_type.pk, content_object.pkid, user_id, viewer_ip)
+
+    @classmethod
+    def upsert_views(
+        cls,
+        views: Iterable[
+            Tuple[int, int, Optional[int], Optional[str], int, datetime]
+        ],
+    ) -> int:
+        """
+        Add buffered views to their rows with one INSERT ... ON CONFLICT.
+
+        New viewers get a row; for existing ones the count is increased
+        and ``last_viewed`` moved forward, never back, so out-of-order
+        flushes are harmless.
+
+        Args:
+            views: Content type id, object id, user id, viewer IP, number
+                of views and time of the last view, at most one entry per
+                viewer key of an object
+
+        Returns:
+            int: Number of rows inserted or updated
+        """
+        now = timezone.now()
+        return bulk_upsert(
+            cls,
+            [
+                "id",
+                "created_at",
+                "updated_at",
+                "content_type",
+                "object_id",
+                "user",
+                "viewer_ip",
+                "viewer_key",
+                "view_count",
+                "last_viewed",
+            ],
+            (
+                [
+                    uuid.uuid4(),
+                    now,
+                    now,
+                    content_type_id,
+                    object_id,
+                    user_id,
+                    viewer_ip,
+                    get_viewer_key(user_id, viewer_ip),
+                    count,
+                    last,
+                ]
+                for (
+                    content_type_id,
+                    object_id,
+                    user_id,
+                    viewer_ip,
+                    count,
+                    last,
+                ) in views
+            ),
+            unique_fields=["content_type", "object_id", "viewer_key"],
+            updates={
+                "view_count": "add",
+                "last_viewed": "latest",
+                "viewer_ip": "replace",
+                "updated_at": "replace",
+            },
+        )
+
+
+class ContentViewDaily(TimeStampedModel):
+    """
+    Views of one object on one day, rolled up from buffered views.
+
+    Written by the same flush as ``ContentView``, so analytics read one
+    row per object and day instead of scanning every viewer, and raw view
+    rows can be purged past ``CONTENT_VIEW_RETENTION``.
+
+    Attributes:
+        content_type: Foreign key to ContentType model
+        object_id: ID of the viewed object
+        content_object: Generic foreign key to the viewed content
+        day: Day of the views, in ``TIME_ZONE``
+        views: Number of views on the day
+        unique_viewers: Number of distinct viewers on the day
+    """
+
+    content_type: models.ForeignKey = models.ForeignKey(
+        ContentType, on_delete=models.CASCADE, verbose_name=_("Content Type")
+    )
+    object_id: models.PositiveIntegerField = models.PositiveIntegerField(
+        verbose_name=_("Object ID")
+    )
+    content_object: GenericForeignKey = GenericForeignKey(
+        "content_type", "object_id"
+    )
+    day: models.DateField = models.DateField(verbose_name=_("Day"))
+    views: models.PositiveIntegerField = models.PositiveIntegerField(
+        verbose_name=_("Views"), default=0
+    )
+    unique_viewers: models.PositiveIntegerField = models.PositiveIntegerField(
+        verbose_name=_("Unique Viewers"), default=0
+    )
+
+    class Meta:
+        verbose_name = _("Daily Content Views")
+        verbose_name_plural = _("Daily Content Views")
+        ordering = ["-day"]
+        constraints = [
+            models.UniqueConstraint(
+                fields=["content_type", "object_id", "day"],
+                name="unique_content_view_day",
+            )
+        ]
+
+    def __str__(self) -> str:
+        """
+        String representation showing the object, day and view count.
+
+        Returns:
+            str: Formatted string with content, day and views
+        """
+        return f"{self.content_object} on {self.day}: {self.views} views"
+
+    @classmethod
+    def add_views(cls, days: Iterable[Tuple[int, int, date, int, int]]) -> int:
+        """
+        Add views to their daily rollups with one INSERT ... ON CONFLICT.
+
+        Args:
+            days: Content type id, object id, day, number of views and
+                number of new viewers, at most one entry per object and day
+
+        Returns:
+            int: Number of rollup rows inserted or updated
+        """
+        now = timezone.now()
+        return bulk_upsert(
+            cls,
+            [
+                "id",
+                "created_at",
+                "updated_at",
+                "content_type",
+                "object_id",
+                "day",
+                "views",
+                "unique_viewers",
+            ],
+            ([uuid.uuid4(), now, now, *entry] for entry in days),
+            unique_fields=["content_type", "object_id", "day"],
+            updates={
+                "views": "add",
+                "unique_viewers": "add",
+                "updated_at": "replace",
+            },
+        )
+
+
+class ViewerSketch(TimeStampedModel):
+    """
+    HyperLogLog sketch of the distinct viewers of a scope on one day.
+
+    Used when ``VIEWER_SKETCH_BACKEND`` is "database". Sketches of several
+    days merge into the distinct viewers of the whole range at a few
+    kilobytes per scope and day, however many views there were.
+
+    Attributes:
+        scope: What was viewed, such as ``product:12`` or ``category:3``
+        day: Day of the views, in ``TIME_ZONE``
+        sketch: Serialized ``HyperLogLog`` of the viewer keys
+    """
+
+    scope: models.CharField = models.CharField(
+        verbose_name=_("Scope"), max_length=64
+    )
+    day: models.DateField = models.DateField(verbose_name=_("Day"))
+    sketch: models.BinaryField = models.BinaryField(verbose_name=_("Sketch"))
+
+    class Meta:
+        verbose_name = _("Viewer Sketch")
+        verbose_name_plural = _("Viewer Sketches")
+        constraints = [
+            models.UniqueConstraint(
+                fields=["scope", "day"], name="unique_viewer_sketch_day"
             )
-            if not view[1]:  # if not created
-                # View already exists, could update last_viewed here
-                pass
-        except IntegrityError:
-            # Handle potential race conditions or constraint violations
-            pass
+        ]
+        # Lets the retention purge find expired sketches without a scan
+        indexes = [models.Index(fields=["day"], name="viewer_sketch_day_idx")]
+
+    def __str__(self) -> str:
+        """
+        String representation showing the scope and day.
+
+        Returns:
+            str: Formatted string with scope and day
+        """
+        return f"Viewers of {self.scope} on {self.day}"
@@ -0,0 +1,118 @@
+from typing import Optional, Tuple
+
+from django.utils.translation import gettext_lazy as _
+from rest_framework.exceptions import AuthenticationFailed
+from rest_framework.permissions import SAFE_METHODS, BasePermission
+from rest_framework.request import Request
+from rest_framework.views import APIView
+from rest_framework_simplejwt.tokens import Token
+
+from core_apps.profiles.models import Profile
+from core_apps.users.tokens import (
+    ROLE_CLAIM,
+    STAFF_CLAIM,
+    token_claims_are_current,
+)
+
+
+class TokenRolePermission(BasePermission):
+    """
+    Base permission authorizing from the role claims of the request's JWT.
+
+    The profile is never loaded: the role and staff flag come from the
+    validated token, and the token version is checked against the cached
+    current version so claims issued before a role change are rejected.
+
+    Attributes:
+        allowed_roles: Profile user types granted access
+        allow_staff: Whether tokens with the is_staff claim are granted
+            access regardless of role
+        message: Error message when access is denied
+    """
+
+    allowed_roles: Tuple[str, ...] = ()
+    allow_staff: bool = True
+    message = _("Your role does not allow this action.")
+
+    def get_token(self, request: Request) -> Optional[Token]:
+        """
+        Get the request's validated token if it carries current role claims.
+
+        Args:
+            request: Incoming request
+
+        Returns:
+            Optional[Token]: The token, or None for unauthenticated requests
+            and tokens without role claims
+
+        Raises:
+            AuthenticationFailed: If the role claims are out of date
+        """
+        token = request.auth
+        if not isinstance(token, Token) or ROLE_CLAIM not in token:
+            return None
+        if not token_claims_are_current(token):
+            raise AuthenticationFailed(
+                _("Token roles are out of date, please log in again."),
+                code="token_roles_stale",
+            )
+        return token
+
+    def has_permission(self, request: Request, view: APIView) -> bool:
+        """
+        Check the token's role claims against the allowed roles.
+
+        Args:
+            request: Incoming request
+            view: View being accessed
+
+        Returns:
+            bool: True if the token grants access
+        """
+        token = self.get_token(request)
+        if token is None:
+            return False
+        if self.allow_staff and token.get(STAFF_CLAIM):
+            return True
+        return token.get(ROLE_CLAIM) in self.allowed_roles
+
+
+class IsBuyer(TokenRolePermission):
+    """Allow buyers, and staff."""
+
+    allowed_roles = (Profile.UserType.BUYER,)
+
+
+class IsSeller(TokenRolePermission):
+    """Allow sellers and platform admins, and staff."""
+
+    allowed_roles = (Profile.UserType.SELLER, Profile.UserType.ADMIN)
+
+
+class IsAdminRole(TokenRolePermission):
+    """Allow platform admins, and staff."""
+
+    allowed_roles = (Profile.UserType.ADMIN,)
+
+
+class IsStaffToken(TokenRolePermission):
+    """Allow only tokens carrying the is_staff claim."""
+
+
+class IsSellerOrReadOnly(IsSeller):
+    """Allow anyone to read and sellers, admins and staff to write."""
+
+    def has_permission(self, request: Request, view: APIView) -> bool:
+        """
+        Allow safe methods, otherwise check the seller role.
+
+        Args:
+            request: Incoming request
+            view: View being accessed
+
+        Returns:
+            bool: True if access is granted
+        """
+        if request.method in SAFE_METHODS:
+            return True
+        return super().has_permission(request, view)
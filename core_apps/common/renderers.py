@@ -75,8 +75,10 @@ class GenericJSONRenderer(JSONRenderer):
         # Extract status code from response
         status_code: int = response.status_code
 
-        # Check for errors in response data
-        errors: Optional[Any] = data.get("errors", None)
+        # Check for errors in response data (list payloads carry none)
+        errors: Optional[Any] = (
+            data.get("errors", None) if isinstance(data, dict) else None
+        )
 
         # If errors exist, return data without wrapping
         if errors is not None:
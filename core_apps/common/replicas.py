@@ -0,0 +1,175 @@
+import logging
+import random
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar, Token
+from typing import Dict, Iterator, List, Optional
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import DatabaseError, connections
+from django.http import HttpRequest
+
+logger: logging.Logger = logging.getLogger(__name__)
+
+# Whether reads issued in the current request/task may go to a replica
+_replica_reads: ContextVar[bool] = ContextVar("replica_reads", default=False)
+
+# Monotonic timestamps until which a failing replica is skipped
+_unhealthy_until: Dict[str, float] = {}
+
+
+def replica_reads_enabled() -> bool:
+    """
+    Check whether reads in the current context may be served by a replica.
+
+    Returns:
+        bool: True inside a ``use_replica`` block, False otherwise
+    """
+    return _replica_reads.get()
+
+
+def set_replica_reads(enabled: bool = True) -> Token:
+    """
+    Allow or forbid replica reads for the rest of the current context.
+
+    Args:
+        enabled: Whether reads may go to a replica
+
+    Returns:
+        Token: Token to pass to ``reset_replica_reads``
+    """
+    return _replica_reads.set(enabled)
+
+
+def reset_replica_reads(token: Token) -> None:
+    """
+    Restore the replica read flag saved by ``set_replica_reads``.
+
+    Args:
+        token: Token returned by ``set_replica_reads``
+    """
+    _replica_reads.reset(token)
+
+
+@contextmanager
+def use_replica(enabled: bool = True) -> Iterator[None]:
+    """
+    Context manager allowing reads inside the block to go to a replica.
+
+    Args:
+        enabled: Pass False to force the primary inside the block
+
+    Yields:
+        None
+    """
+    token = set_replica_reads(enabled)
+    try:
+        yield
+    finally:
+        reset_replica_reads(token)
+
+
+def mark_replica_unhealthy(alias: str) -> None:
+    """
+    Skip a replica until ``REPLICA_RETRY_INTERVAL`` seconds have passed.
+
+    Args:
+        alias: Database alias of the failing replica
+    """
+    _unhealthy_until[alias] = time.monotonic() + settings.REPLICA_RETRY_INTERVAL
+    logger.warning("Replica %s unreachable, falling back to primary", alias)
+
+
+def replica_is_healthy(alias: str) -> bool:
+    """
+    Check that a replica accepts connections.
+
+    Failures are remembered for ``REPLICA_RETRY_INTERVAL`` seconds so a
+    dead replica costs one connection attempt per interval, not per query.
+
+    Args:
+        alias: Database alias of the replica
+
+    Returns:
+        bool: True if the replica can be used
+    """
+    retry_at: Optional[float] = _unhealthy_until.get(alias)
+    if retry_at is not None:
+        if retry_at > time.monotonic():
+            return False
+        del _unhealthy_until[alias]
+
+    try:
+        connections[alias].ensure_connection()
+    except DatabaseError:
+        mark_replica_unhealthy(alias)
+        return False
+    return True
+
+
+def choose_replica() -> Optional[str]:
+    """
+    Pick a random healthy replica.
+
+    Returns:
+        Optional[str]: Replica alias, or None if no replica is usable
+    """
+    healthy: List[str] = [
+        alias
+        for alias in settings.DATABASE_REPLICAS
+        if replica_is_healthy(alias)
+    ]
+    if not healthy:
+        return None
+    return random.choice(healthy)
+
+
+def get_primary_pin_key(user_pk: int) -> str:
+    """
+    Build the cache key marking a user as pinned to the primary.
+
+    Args:
+        user_pk: Primary key of the user
+
+    Returns:
+        str: Cache key for the marker
+    """
+    return f"primary-pin:{user_pk}"
+
+
+def pin_to_primary(request: HttpRequest) -> None:
+    """
+    Record that the client behind the request has just written.
+
+    The authenticated user gets a cache marker; anonymous clients rely on
+    the cookie set by ``ReadYourWritesMiddleware``.
+
+    Args:
+        request: The request that performed the write
+    """
+    user = getattr(request, "user", None)
+    if user is not None and user.is_authenticated:
+        cache.set(
+            get_primary_pin_key(user.pk),
+            True,
+            timeout=settings.READ_YOUR_WRITES_WINDOW,
+        )
+
+
+def is_pinned_to_primary(request: HttpRequest) -> bool:
+    """
+    Check whether the client wrote recently and must read from the primary.
+
+    Args:
+        request: The incoming request
+
+    Returns:
+        bool: True if the read-your-writes window is still open
+    """
+    if settings.READ_YOUR_WRITES_COOKIE in request.COOKIES:
+        return True
+    user = getattr(request, "user", None)
+    if user is not None and user.is_authenticated:
+        return bool(cache.get(get_primary_pin_key(user.pk)))
+    return False
@@ -0,0 +1,83 @@
+from typing import Any, Optional, Type
+
+from django.conf import settings
+from django.db import DEFAULT_DB_ALIAS
+from django.db.models import Model
+
+from .replicas import choose_replica, replica_reads_enabled
+
+
+class PrimaryReplicaRouter:
+    """
+    Database router sending whitelisted reads to the read replicas.
+
+    Reads are only routed to a replica inside a ``use_replica`` block,
+    which ``ReplicaReadMixin`` opens for safe, non-pinned requests. All
+    writes go to the primary and migrations only run there.
+    """
+
+    def db_for_read(self, model: Type[Model], **hints: Any) -> Optional[str]:
+        """
+        Choose the database for a read query.
+
+        Args:
+            model: Model class being queried
+            **hints: Routing hints supplied by Django
+
+        Returns:
+            Optional[str]: A healthy replica alias, the primary when every
+            replica is down, or None to let Django decide
+        """
+        if not replica_reads_enabled():
+            return None
+        return choose_replica() or DEFAULT_DB_ALIAS
+
+    def db_for_write(self, model: Type[Model], **hints: Any) -> Optional[str]:
+        """
+        Send every write to the primary.
+
+        Args:
+            model: Model class being written
+            **hints: Routing hints supplied by Django
+
+        Returns:
+            str: The primary database alias
+        """
+        return DEFAULT_DB_ALIAS
+
+    def allow_relation(
+        self, obj1: Model, obj2: Model, **hints: Any
+    ) -> Optional[bool]:
+        """
+        Allow relations between objects loaded from any database in the pool.
+
+        Args:
+            obj1: First related object
+            obj2: Second related object
+            **hints: Routing hints supplied by Django
+
+        Returns:
+            Optional[bool]: True when both objects live in the pool
+        """
+        pool = {DEFAULT_DB_ALIAS, *settings.DATABASE_REPLICAS}
+        if obj1._state.db in pool and obj2._state.db in pool:
+            return True
+        return None
+
+    def allow_migrate(
+        self, db: str, app_label: str, **hints: Any
+    ) -> Optional[bool]:
+        """
+        Prevent migrations from running against a replica.
+
+        Args:
+            db: Database alias being migrated
+            app_label: Label of the app being migrated
+            **hints: Routing hints supplied by Django
+
+        Returns:
+            Optional[bool]: False for replicas, None otherwise
+        """
+        if db in settings.DATABASE_REPLICAS:
+            return False
+        return None
@@ -0,0 +1,13 @@
+from django.dispatch import Signal
+
+# Sent by flush_view_buffer once buffered views are written, with
+# ``views``: a list of (content type id, object id, number of views, time
+# of the last view) tuples, and ``viewers``: the same views as a list of
+# (content type id, object id, viewer key, time of the last view) tuples
+content_views_flushed = Signal()
+
+# Sent by ProductLine querysets after an update setting stock, with
+# ``levels``: a list of (primary key, stock quantity, line low stock
+# threshold, product type id) tuples read back after the update, and
+# ``using``: the database alias written to
+stock_levels_updated = Signal()
@@ -0,0 +1,251 @@
+import hashlib
+import math
+from typing import Dict, Iterable, Iterator, Optional, Tuple
+
+
+class BloomFilter:
+    """
+    Fixed-size probabilistic set answering "definitely not" or "maybe".
+
+    Membership tests never return false negatives; false positives happen
+    at roughly ``error_rate`` once ``capacity`` items have been added.
+
+    Attributes:
+        capacity: Number of items the filter is sized for
+        error_rate: Target false positive rate at capacity
+        size: Number of bits in the filter
+        hash_count: Number of bit positions set per item
+    """
+
+    def __init__(self, capacity: int, error_rate: float = 0.001) -> None:
+        self.capacity = max(capacity, 1)
+        self.error_rate = error_rate
+        self.size = max(
+            8,
+            math.ceil(
+                -self.capacity * math.log(error_rate) / (math.log(2) ** 2)
+            ),
+        )
+        self.hash_count = max(1, round(self.size / self.capacity * math.log(2)))
+        self._bits = bytearray((self.size + 7) // 8)
+
+    def _positions(self, item: str) -> Iterator[int]:
+        """
+        Get the bit positions of an item using double hashing.
+
+        Args:
+            item: Item to hash
+
+        Yields:
+            int: Bit positions in the filter
+        """
+        digest = hashlib.blake2b(item.encode(), digest_size=16).digest()
+        first = int.from_bytes(digest[:8], "big")
+        second = int.from_bytes(digest[8:], "big") | 1
+        for i in range(self.hash_count):
+            yield (first + i * second) % self.size
+
+    def add(self, item: str) -> None:
+        """
+        Add an item to the filter.
+
+        Args:
+            item: Item to add
+        """
+        for position in self._positions(item):
+            self._bits[position >> 3] |= 1 << (position & 7)
+
+    def update(self, items: Iterable[str]) -> None:
+        """
+        Add many items to the filter.
+
+        Args:
+            items: Items to add
+        """
+        for item in items:
+            self.add(item)
+
+    def __contains__(self, item: str) -> bool:
+        """
+        Check whether an item may have been added.
+
+        Args:
+            item: Item to look up
+
+        Returns:
+            bool: False if the item was definitely never added
+        """
+        return all(
+            self._bits[position >> 3] & (1 << (position & 7))
+            for position in self._positions(item)
+        )
+
+
+class HyperLogLog:
+    """
+    Mergeable estimate of the number of distinct items added.
+
+    Items are hashed to one of ``2 ** precision`` registers, each keeping
+    the longest run of leading zero bits seen, for a standard error of
+    about ``1.04 / sqrt(2 ** precision)``. Few set registers are kept in a
+    sparse map, so a sketch of a handful of items serializes to a few
+    bytes and a full one to ``2 ** precision`` bytes. Sketches of the same
+    precision merge losslessly, so daily sketches combine into the
+    distinct count of any range of days.
+
+    Attributes:
+        precision: Number of hash bits selecting a register
+        size: Number of registers
+    """
+
+    SPARSE = 0
+    DENSE = 1
+
+    def __init__(self, precision: int = 12) -> None:
+        if not 4 <= precision <= 16:
+            raise ValueError("Precision must be between 4 and 16")
+        self.precision = precision
+        self.size = 1 << precision
+        self._sparse: Dict[int, int] = {}
+        self._registers: Optional[bytearray] = None
+
+    def _locate(self, item: str) -> Tuple[int, int]:
+        """
+        Get an item's register and the rank it sets the register to.
+
+        Args:
+            item: Item to hash
+
+        Returns:
+            Tuple[int, int]: Register index and position of the first set
+            bit after the index bits
+        """
+        digest = hashlib.blake2b(item.encode(), digest_size=8).digest()
+        value = int.from_bytes(digest, "big")
+        width = 64 - self.precision
+        rest = value & ((1 << width) - 1)
+        return value >> width, width - rest.bit_length() + 1
+
+    def _set(self, index: int, rank: int) -> None:
+        """
+        Raise a register to a rank.
+
+        Args:
+            index: Register index
+            rank: Rank to raise it to
+        """
+        if self._registers is not None:
+            if rank > self._registers[index]:
+                self._registers[index] = rank
+        elif rank > self._sparse.get(index, 0):
+            self._sparse[index] = rank
+            # Sparse entries serialize to 3 bytes; switch once dense is
+            # smaller
+            if len(self._sparse) * 3 > self.size:
+                self._registers = bytearray(self.size)
+                for i, r in self._sparse.items():
+                    self._registers[i] = r
+                self._sparse = {}
+
+    def _items(self) -> Iterator[Tuple[int, int]]:
+        """
+        Iterate over the set registers.
+
+        Yields:
+            Tuple[int, int]: Register index and rank
+        """
+        if self._registers is None:
+            yield from self._sparse.items()
+        else:
+            for index, rank in enumerate(self._registers):
+                if rank:
+                    yield index, rank
+
+    def add(self, item: str) -> None:
+        """
+        Add an item to the sketch.
+
+        Args:
+            item: Item to add
+        """
+        self._set(*self._locate(item))
+
+    def update(self, items: Iterable[str]) -> None:
+        """
+        Add many items to the sketch.
+
+        Args:
+            items: Items to add
+        """
+        for item in items:
+            self.add(item)
+
+    def merge(self, other: "HyperLogLog") -> None:
+        """
+        Add every item of another sketch to this one.
+
+        Args:
+            other: Sketch of the same precision
+
+        Raises:
+            ValueError: If the precisions differ
+        """
+        if other.precision != self.precision:
+            raise ValueError("Only sketches of equal precision can merge")
+        for index, rank in other._items():
+            self._set(index, rank)
+
+    def count(self) -> int:
+        """
+        Estimate the number of distinct items added.
+
+        Returns:
+            int: Estimated distinct count
+        """
+        ranks = [rank for _, rank in self._items()]
+        zeros = self.size - len(ranks)
+        total = zeros + sum(math.ldexp(1.0, -rank) for rank in ranks)
+        if self.size >= 128:
+            alpha = 0.7213 / (1 + 1.079 / self.size)
+        else:
+            alpha = {16: 0.673, 32: 0.697, 64: 0.709}[self.size]
+        estimate = alpha * self.size * self.size / total
+        # Linear counting is more accurate while many registers are empty
+        if estimate <= 2.5 * self.size and zeros:
+            estimate = self.size * math.log(self.size / zeros)
+        return round(estimate)
+
+    def to_bytes(self) -> bytes:
+        """
+        Serialize the sketch.
+
+        Returns:
+            bytes: Format and precision, then 3 bytes per set register if
+            sparse or 1 byte per register if dense
+        """
+        if self._registers is not None:
+            return bytes([self.DENSE, self.precision]) + bytes(self._registers)
+        return bytes([self.SPARSE, self.precision]) + b"".join(
+            index.to_bytes(2, "big") + bytes([rank])
+            for index, rank in sorted(self._sparse.items())
+        )
+
+    @classmethod
+    def from_bytes(cls, data: bytes) -> "HyperLogLog":
+        """
+        Deserialize a sketch written by ``to_bytes``.
+
+        Args:
+            data: Serialized sketch
+
+        Returns:
+            HyperLogLog: The sketch
+        """
+        sketch = cls(data[1])
+        if data[0] == cls.DENSE:
+            sketch._registers = bytearray(data[2:])
+        else:
+            for start in range(2, len(data), 3):
+                high, low, rank = data[start], data[start + 1], data[start + 2]
+                sketch._set(high << 8 | low, rank)
+        return sketch
@@ -0,0 +1,124 @@
+import logging
+from typing import Dict
+
+from celery import Task, shared_task
+from django.conf import settings
+from django.contrib.sessions.models import Session
+from django.core.cache import cache
+from django.utils import timezone
+
+from .mail import schedule_send, send_batch, take_batch
+from .maintenance import delete_in_batches
+from .models import ContentView, ViewerSketch
+from .view_buffer import flush_view_buffer
+
+logger = logging.getLogger(__name__)
+
+# Cache key held while buffered content views are being written
+FLUSH_LOCK_KEY = "content-views:flush-lock"
+
+
+@shared_task(name="flush_content_views")
+def flush_content_views() -> int:
+    """
+    Write buffered content views to the database.
+
+    Runs every ``VIEW_BUFFER_FLUSH_INTERVAL`` seconds. A lock keeps runs
+    from overlapping, since two drains of the Redis buffer would write the
+    same views twice.
+
+    Returns:
+        int: Number of content view rows inserted or updated
+    """
+    if not cache.add(
+        FLUSH_LOCK_KEY, True, timeout=settings.VIEW_BUFFER_FLUSH_INTERVAL * 10
+    ):
+        logger.info("Skipped content view flush, another one is running")
+        return 0
+    try:
+        return flush_view_buffer()
+    finally:
+        cache.delete(FLUSH_LOCK_KEY)
+
+
+@shared_task(name="purge_content_views", acks_late=True)
+def purge_content_views() -> Dict[str, int]:
+    """
+    Daily removal of viewer rows and sketches past their retention window.
+
+    Views of purged viewer rows are kept in the daily rollups; a viewer
+    returning after the window is counted as new, as they would be on any
+    later day. Rows are deleted in bounded batches, each in its own
+    transaction.
+
+    Returns:
+        Dict[str, int]: Numbers of content view and sketch rows deleted
+    """
+    now = timezone.now()
+    batch_size: int = settings.CONTENT_VIEW_PURGE_BATCH_SIZE
+    summary = {
+        "views": delete_in_batches(
+            ContentView,
+            batch_size,
+            last_viewed__lt=now - settings.CONTENT_VIEW_RETENTION,
+        ),
+        "sketches": delete_in_batches(
+            ViewerSketch,
+            batch_size,
+            day__lt=timezone.localdate(now - settings.VIEWER_SKETCH_RETENTION),
+        ),
+    }
+    logger.info(f"Purged expired content views: {summary}")
+    return summary
+
+
+@shared_task(name="cleanup_old_sessions", acks_late=True)
+def cleanup_old_sessions() -> int:
+    """
+    Monthly removal of expired database sessions.
+
+    Unlike ``clearsessions``, which deletes every expired row in one
+    statement and can lock ``django_session`` for minutes, rows are
+    deleted in bounded batches, each in its own transaction.
+
+    Returns:
+        int: Number of session rows deleted
+    """
+    deleted = delete_in_batches(
+        Session,
+        settings.SESSION_PURGE_BATCH_SIZE,
+        expire_date__lt=timezone.now(),
+    )
+    logger.info(f"Purged {deleted} expired sessions")
+    return deleted
+
+
+@shared_task(
+    bind=True,
+    name="send_queued_emails",
+    max_retries=5,
+    default_retry_delay=30,
+)
+def send_queued_emails(self: Task) -> int:
+    """
+    Send a batch of the messages queued by ``BatchingEmailBackend``.
+
+    Up to ``EMAIL_BATCH_SIZE`` messages are sent over one pooled SMTP
+    connection, and another send is queued if more are waiting. On a
+    transient failure only the undelivered messages are put back, and
+    the task retries with backoff.
+
+    Returns:
+        int: Number of messages delivered
+    """
+    schedule_send()
+    batch_size: int = settings.EMAIL_BATCH_SIZE
+    payloads = take_batch(batch_size)
+    try:
+        delivered = send_batch(payloads)
+    except OSError as e:
+        logger.warning(f"Email batch failed, retrying: {e}")
+        raise self.retry(exc=e, countdown=30 * 2**self.request.retries)
+    if len(payloads) == batch_size:
+        send_queued_emails.delay()
+    return delivered
@@ -0,0 +1,208 @@
+import logging
+import math
+from functools import lru_cache
+from typing import Any, Dict, Optional
+
+import redis
+from django.conf import settings
+from django.http import HttpRequest
+from redis.commands.core import Script
+from rest_framework.throttling import (
+    AnonRateThrottle,
+    ScopedRateThrottle,
+    UserRateThrottle,
+)
+
+logger = logging.getLogger(__name__)
+
+# Attribute of the Django request holding the tightest quota checked
+QUOTA_ATTRIBUTE = "throttle_quota"
+
+# Sliding-window counter: the previous fixed window's count, weighted by
+# how much of it still overlaps the sliding window, plus the current
+# window's count. Both counts live in one hash so the key is declared.
+# Returns {allowed, remaining, retry_after_ms}.
+SLIDING_WINDOW_SCRIPT = """
+local limit = tonumber(ARGV[1])
+local window = tonumber(ARGV[2])
+local clock = redis.call('TIME')
+local now = tonumber(clock[1]) + tonumber(clock[2]) / 1000000
+local start = math.floor(now / window) * window
+local current = tonumber(redis.call('HGET', KEYS[1], start) or '0')
+local previous = tonumber(redis.call('HGET', KEYS[1], start - window) or '0')
+local elapsed = now - start
+local used = previous * (1 - elapsed / window) + current
+
+if used + 1 > limit then
+    local retry = window - elapsed
+    if current + 1 <= limit and previous > 0 then
+        retry = window * (1 - (limit - 1 - current) / previous) - elapsed
+    end
+    return {0, 0, math.ceil(retry * 1000)}
+end
+
+redis.call('HINCRBY', KEYS[1], start, 1)
+for _, field in ipairs(redis.call('HKEYS', KEYS[1])) do
+    if tonumber(field) < start - window then
+        redis.call('HDEL', KEYS[1], field)
+    end
+end
+redis.call('EXPIRE', KEYS[1], window * 2)
+return {1, math.floor(limit - used - 1), 0}
+"""
+
+
+@lru_cache(maxsize=None)
+def get_redis_client() -> redis.Redis:
+    """
+    Get the Redis client used by the throttles.
+
+    Returns:
+        redis.Redis: Client backed by a shared connection pool
+    """
+    return redis.Redis.from_url(
+        settings.THROTTLE_REDIS_URL,
+        socket_timeout=settings.THROTTLE_REDIS_TIMEOUT,
+        socket_connect_timeout=settings.THROTTLE_REDIS_TIMEOUT,
+    )
+
+
+@lru_cache(maxsize=4)
+def get_sliding_window_script(client: redis.Redis) -> Script:
+    """
+    Get the sliding-window script registered on a client.
+
+    Registering hashes the script, so it is done once per client rather
+    than on every check; calls then go through EVALSHA. Keyed on the
+    client so a replaced client gets its own registration.
+
+    Args:
+        client: Redis client running the script
+
+    Returns:
+        Script: Callable script
+    """
+    return client.register_script(SLIDING_WINDOW_SCRIPT)
+
+
+class RedisThrottleMixin:
+    """
+    Replace the cache history list of DRF's rate throttles with one atomic
+    sliding-window script call per check.
+
+    The check is a single round trip and is race-free across workers.
+    If Redis is unreachable requests are allowed and the failure logged,
+    so an outage degrades rate limiting instead of the whole API.
+
+    Attributes:
+        num_requests: Requests allowed per window
+        duration: Window length in seconds
+        remaining: Requests left in the window after this check
+        retry_after: Seconds until the next request would be allowed
+    """
+
+    num_requests: Optional[int]
+    duration: Optional[int]
+    remaining: Optional[int] = None
+    retry_after: Optional[float] = None
+
+    def allow_request(self, request: Any, view: Any) -> bool:
+        """
+        Check and count a request against the client's window.
+
+        Args:
+            request: DRF or Django request being checked
+            view: View handling the request
+
+        Returns:
+            bool: True if the request is within the limit
+        """
+        if self.rate is None:
+            return True
+        self.key = self.get_cache_key(request, view)
+        if self.key is None:
+            return True
+
+        try:
+            script = get_sliding_window_script(get_redis_client())
+            allowed, remaining, retry_ms = script(
+                keys=[self.key], args=[self.num_requests, self.duration]
+            )
+        except redis.RedisError as e:
+            logger.warning(f"Throttle check skipped, Redis unavailable: {e}")
+            return True
+
+        self.remaining = int(remaining)
+        self.retry_after = int(retry_ms) / 1000 if not allowed else None
+        self.record_quota(request)
+        return bool(allowed)
+
+    def wait(self) -> Optional[float]:
+        """
+        Get the seconds to wait before retrying a throttled request.
+
+        Returns:
+            Optional[float]: Seconds to wait, None if not throttled
+        """
+        if self.retry_after is None:
+            return None
+        return math.ceil(self.retry_after)
+
+    def record_quota(self, request: Any) -> None:
+        """
+        Remember the quota on the request for the rate limit headers.
+
+        When several throttles apply, the one with the fewest remaining
+        requests is reported.
+
+        Args:
+            request: DRF or Django request being checked
+        """
+        django_request: HttpRequest = getattr(request, "_request", request)
+        quota: Optional[Dict[str, Any]] = getattr(
+            django_request, QUOTA_ATTRIBUTE, None
+        )
+        if quota is None or self.remaining < quota["remaining"]:
+            setattr(
+                django_request,
+                QUOTA_ATTRIBUTE,
+                {
+                    "limit": self.num_requests,
+                    "remaining": self.remaining,
+                    "window": self.duration,
+                },
+            )
+
+
+class RedisAnonRateThrottle(RedisThrottleMixin, AnonRateThrottle):
+    """Limit anonymous clients by IP using the ``anon`` rate."""
+
+
+class RedisUserRateThrottle(RedisThrottleMixin, UserRateThrottle):
+    """Limit authenticated users by id using the ``user`` rate."""
+
+
+class RedisScopedRateThrottle(RedisThrottleMixin, ScopedRateThrottle):
+    """
+    Limit clients per view scope using ``throttle_scope`` on the view.
+
+    Views or actions without a scope are not limited by this throttle.
+    """
+
+    def allow_request(self, request: Any, view: Any) -> bool:
+        """
+        Resolve the view's scope and rate, then check the request.
+
+        Args:
+            request: DRF or Django request being checked
+            view: View handling the request
+
+        Returns:
+            bool: True if the request is within the scope's limit
+        """
+        self.scope = getattr(view, self.scope_attr, None)
+        if not self.scope:
+            return True
+        self.rate = self.get_rate()
+        self.num_requests, self.duration = self.parse_rate(self.rate)
+        return RedisThrottleMixin.allow_request(self, request, view)
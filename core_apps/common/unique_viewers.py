@@ -0,0 +1,189 @@
+from datetime import date, timedelta
+from functools import lru_cache
+from typing import Dict, Iterable, Set, Tuple, Union
+
+import redis
+from django.conf import settings
+from django.db import transaction
+
+from .models import ViewerSketch
+from .sketches import HyperLogLog
+
+# Viewer keys seen per scope and day
+ViewerEntries = Dict[Tuple[str, date], Set[str]]
+
+
+def get_days(since: date, until: date) -> Iterable[date]:
+    """
+    Iterate over the days of a range.
+
+    Args:
+        since: First day
+        until: Last day, included
+
+    Yields:
+        date: Each day of the range
+    """
+    for offset in range((until - since).days + 1):
+        yield since + timedelta(days=offset)
+
+
+class DatabaseSketchStore:
+    """
+    Keep daily viewer sketches in the database, as pure Python HyperLogLogs.
+
+    Adding inserts the missing sketches, then locks, merges and writes
+    back the affected ones in one transaction, so concurrent writers, such
+    as inline flushes of the local view buffer, queue on the row locks
+    instead of overwriting each other's viewers.
+
+    Attributes:
+        precision: Precision of new sketches
+    """
+
+    def __init__(self, precision: int) -> None:
+        self.precision = precision
+
+    def add(self, entries: ViewerEntries) -> None:
+        """
+        Add viewers to the sketches of their scopes and days.
+
+        Rows are inserted and locked in key order so writers with
+        overlapping entries cannot deadlock.
+
+        Args:
+            entries: Viewer keys per scope and day
+        """
+        if not entries:
+            return
+        keys = sorted(entries)
+        empty = HyperLogLog(self.precision).to_bytes()
+        with transaction.atomic():
+            ViewerSketch.objects.bulk_create(
+                [
+                    ViewerSketch(scope=scope, day=day, sketch=empty)
+                    for scope, day in keys
+                ],
+                ignore_conflicts=True,
+            )
+            stored = {
+                (sketch.scope, sketch.day): sketch
+                for sketch in ViewerSketch.objects.select_for_update()
+                .filter(
+                    scope__in={scope for scope, _ in keys},
+                    day__in={day for _, day in keys},
+                )
+                .order_by("scope", "day")
+            }
+            updated = []
+            for key in keys:
+                row = stored[key]
+                sketch = HyperLogLog.from_bytes(bytes(row.sketch))
+                sketch.update(entries[key])
+                row.sketch = sketch.to_bytes()
+                updated.append(row)
+            ViewerSketch.objects.bulk_update(updated, ["sketch"])
+
+    def count(self, scope: str, since: date, until: date) -> int:
+        """
+        Estimate the distinct viewers of a scope over a range of days.
+
+        Args:
+            scope: What was viewed
+            since: First day
+            until: Last day, included
+
+        Returns:
+            int: Estimated distinct viewers
+        """
+        merged = HyperLogLog(self.precision)
+        for data in ViewerSketch.objects.filter(
+            scope=scope, day__range=(since, until)
+        ).values_list("sketch", flat=True):
+            merged.merge(HyperLogLog.from_bytes(bytes(data)))
+        return merged.count()
+
+
+class RedisSketchStore:
+    """
+    Keep daily viewer sketches in Redis with PFADD.
+
+    Each scope and day is one HyperLogLog key, expiring after
+    ``VIEWER_SKETCH_RETENTION``; PFCOUNT merges the keys of a range of
+    days on the server.
+
+    Attributes:
+        client: Redis client holding the sketches
+    """
+
+    def __init__(self, client: redis.Redis) -> None:
+        self.client = client
+
+    @staticmethod
+    def get_key(scope: str, day: date) -> str:
+        """
+        Build the key of a scope's sketch for a day.
+
+        Args:
+            scope: What was viewed
+            day: Day of the views
+
+        Returns:
+            str: Redis key of the sketch
+        """
+        return f"viewers:{scope}:{day.isoformat()}"
+
+    def add(self, entries: ViewerEntries) -> None:
+        """
+        Add viewers to the sketches of their scopes and days.
+
+        Args:
+            entries: Viewer keys per scope and day
+        """
+        ttl = int(settings.VIEWER_SKETCH_RETENTION.total_seconds())
+        pipeline = self.client.pipeline(transaction=False)
+        for (scope, day), viewers in entries.items():
+            key = self.get_key(scope, day)
+            pipeline.pfadd(key, *viewers)
+            pipeline.expire(key, ttl)
+        pipeline.execute()
+
+    def count(self, scope: str, since: date, until: date) -> int:
+        """
+        Estimate the distinct viewers of a scope over a range of days.
+
+        Args:
+            scope: What was viewed
+            since: First day
+            until: Last day, included
+
+        Returns:
+            int: Estimated distinct viewers
+        """
+        keys = [self.get_key(scope, day) for day in get_days(since, until)]
+        return self.client.pfcount(*keys)
+
+
+SketchStore = Union[DatabaseSketchStore, RedisSketchStore]
+
+
+@lru_cache(maxsize=None)
+def get_sketch_store(backend: str) -> SketchStore:
+    """
+    Get the process-wide viewer sketch store of a backend.
+
+    Args:
+        backend: ``VIEWER_SKETCH_BACKEND``, "database" or "redis"
+
+    Returns:
+        SketchStore: The store sketches are added to and counted from
+    """
+    if backend == "redis":
+        return RedisSketchStore(
+            redis.Redis.from_url(
+                settings.VIEW_BUFFER_REDIS_URL,
+                socket_timeout=settings.VIEW_BUFFER_REDIS_TIMEOUT,
+                socket_connect_timeout=settings.VIEW_BUFFER_REDIS_TIMEOUT,
+            )
+        )
+    return DatabaseSketchStore(settings.VIEWER_SKETCH_PRECISION)
@@ -0,0 +1,187 @@
+import logging
+import re
+import uuid
+from pathlib import Path
+from typing import Any, Iterable, Optional
+
+from django.conf import settings
+from django.core.files.uploadedfile import UploadedFile
+from django.core.files.uploadhandler import FileUploadHandler
+from django.http import HttpRequest
+
+logger = logging.getLogger(__name__)
+
+# Staged uploads are referenced by a bare hex name, never by a path
+REFERENCE_PATTERN = re.compile(r"^[0-9a-f]{32}$")
+
+
+class UploadTooLarge(Exception):
+    """Raised when an upload exceeds its size limit while streaming."""
+
+
+def get_staged_path(reference: str) -> Path:
+    """
+    Resolve a staging reference to its file.
+
+    Args:
+        reference: Name returned when the upload was staged
+
+    Returns:
+        Path: Location of the staged file
+
+    Raises:
+        ValueError: If the reference is not a staging name
+    """
+    if not REFERENCE_PATTERN.match(reference):
+        raise ValueError(f"Invalid staging reference: {reference!r}")
+    return Path(settings.UPLOAD_STAGING_DIR) / reference
+
+
+def discard_staged(reference: str) -> None:
+    """
+    Delete a staged upload if it still exists.
+
+    Args:
+        reference: Name returned when the upload was staged
+    """
+    get_staged_path(reference).unlink(missing_ok=True)
+
+
+def stage_chunks(chunks: Iterable[bytes], max_size: int = 0) -> str:
+    """
+    Write a stream of chunks, such as a download, to the staging directory.
+
+    Args:
+        chunks: File content in pieces
+        max_size: Largest accepted file in bytes, unlimited if 0
+
+    Returns:
+        str: Staging reference of the file
+
+    Raises:
+        UploadTooLarge: If the content grows past ``max_size`` bytes
+    """
+    Path(settings.UPLOAD_STAGING_DIR).mkdir(parents=True, exist_ok=True)
+    reference = uuid.uuid4().hex
+    size = 0
+    try:
+        with get_staged_path(reference).open("xb") as file:
+            for chunk in chunks:
+                size += len(chunk)
+                if max_size and size > max_size:
+                    raise UploadTooLarge(
+                        f"Uploads are limited to {max_size} bytes."
+                    )
+                file.write(chunk)
+    except BaseException:
+        discard_staged(reference)
+        raise
+    return reference
+
+
+class StagedUploadedFile(UploadedFile):
+    """
+    Upload written to the staging directory, kept after the request ends.
+
+    Only ``reference`` needs to be handed to a background task, which then
+    owns the file and must discard it when done.
+
+    Attributes:
+        reference: Staging name of the file
+    """
+
+    def __init__(self, reference: str, **kwargs: Any) -> None:
+        self.reference = reference
+        path = get_staged_path(reference)
+        super().__init__(file=path.open("rb"), **kwargs)
+
+    def temporary_file_path(self) -> str:
+        """
+        Get the staged file's path, so validators read it from disk.
+
+        Returns:
+            str: Path of the staged file
+        """
+        return str(get_staged_path(self.reference))
+
+
+class StagingUploadHandler(FileUploadHandler):
+    """
+    Stream uploaded files straight to the staging directory.
+
+    Each chunk is written as it arrives, so the file is never held in
+    memory, and the upload is aborted as soon as it passes ``max_size``
+    bytes instead of after it has been received in full.
+
+    Attributes:
+        max_size: Largest accepted file in bytes
+    """
+
+    def __init__(
+        self, request: Optional[HttpRequest] = None, max_size: int = 0
+    ) -> None:
+        super().__init__(request)
+        self.max_size = max_size
+        self.reference: Optional[str] = None
+        self.size = 0
+        self._file: Any = None
+
+    def new_file(self, *args: Any, **kwargs: Any) -> None:
+        """
+        Open a staging file for the next uploaded file.
+
+        Args:
+            *args: Field name, file name and content type of the upload
+            **kwargs: Content length, charset and extra content type data
+        """
+        super().new_file(*args, **kwargs)
+        Path(settings.UPLOAD_STAGING_DIR).mkdir(parents=True, exist_ok=True)
+        self.reference = uuid.uuid4().hex
+        self.size = 0
+        self._file = get_staged_path(self.reference).open("xb")
+
+    def receive_data_chunk(self, raw_data: bytes, start: int) -> None:
+        """
+        Append a chunk to the staging file.
+
+        Args:
+            raw_data: Chunk of file content
+            start: Offset of the chunk in the file
+
+        Raises:
+            UploadTooLarge: If the file grows past ``max_size`` bytes
+        """
+        self.size += len(raw_data)
+        if self.max_size and self.size > self.max_size:
+            self.upload_interrupted()
+            raise UploadTooLarge(
+                f"Uploads are limited to {self.max_size} bytes."
+            )
+        self._file.write(raw_data)
+
+    def file_complete(self, file_size: int) -> StagedUploadedFile:
+        """
+        Close the staging file and expose it as an uploaded file.
+
+        Args:
+            file_size: Total size of the file
+
+        Returns:
+            StagedUploadedFile: The staged upload
+        """
+        self._file.close()
+        return StagedUploadedFile(
+            self.reference,
+            name=self.file_name,
+            content_type=self.content_type,
+            size=file_size,
+            charset=self.charset,
+            content_type_extra=self.content_type_extra,
+        )
+
+    def upload_interrupted(self) -> None:
+        """Remove the partial staging file of an aborted upload."""
+        if self._file is not None and self.reference is not None:
+            self._file.close()
+            discard_staged(self.reference)
+            logger.info(f"Discarded interrupted upload {self.reference}")
@@ -0,0 +1,352 @@
+import logging
+import threading
+import time
+from collections import defaultdict
+from datetime import date, datetime
+from datetime import timezone as dt_timezone
+from functools import lru_cache
+from typing import Dict, List, Optional, Set, Tuple, Union
+
+import redis
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.db import DatabaseError, transaction
+from django.utils import timezone
+
+from .models import ContentView, ContentViewDaily, get_viewer_key
+from .signals import content_views_flushed
+
+logger = logging.getLogger(__name__)
+
+User = get_user_model()
+
+# Content type id, object id, user id and viewer IP of a buffered view
+ViewKey = Tuple[int, int, Optional[int], Optional[str]]
+
+# Number of views per key and Unix time of the last one
+BufferedViews = Dict[ViewKey, Tuple[int, float]]
+
+
+class LocalViewBuffer:
+    """
+    Buffer views in process memory.
+
+    Every process writes its own buffer once it holds ``max_keys`` viewers
+    or its first view is ``max_age`` seconds old, so a process that dies
+    loses at most that many views. Meant for development and single
+    process deployments; the Celery flush only drains the worker's buffer.
+
+    Attributes:
+        max_keys: Viewers held before the buffer is due for a flush
+        max_age: Seconds a view is held before the buffer is due
+    """
+
+    def __init__(self, max_keys: int, max_age: float) -> None:
+        self.max_keys = max_keys
+        self.max_age = max_age
+        self._lock = threading.Lock()
+        self._views: BufferedViews = {}
+        self._since: Optional[float] = None
+
+    def add(self, key: ViewKey, timestamp: float) -> bool:
+        """
+        Count one view.
+
+        Args:
+            key: Viewed object and viewer
+            timestamp: Unix time of the view
+
+        Returns:
+            bool: Whether the buffer is due to be flushed
+        """
+        with self._lock:
+            count, _ = self._views.get(key, (0, timestamp))
+            self._views[key] = (count + 1, timestamp)
+            if self._since is None:
+                self._since = timestamp
+            return (
+                len(self._views) >= self.max_keys
+                or timestamp - self._since >= self.max_age
+            )
+
+    def drain(self) -> BufferedViews:
+        """
+        Take every buffered view out of the buffer.
+
+        Returns:
+            BufferedViews: Views per key and time of the last one
+        """
+        with self._lock:
+            views, self._views, self._since = self._views, {}, None
+        return views
+
+    def acknowledge(self) -> None:
+        """Confirm drained views were written; nothing is kept to discard."""
+
+
+class RedisViewBuffer:
+    """
+    Buffer views in a Redis hash shared by every process.
+
+    A view costs one pipelined round trip: HINCRBY of the viewer's count
+    and HSET of the time of their last view. Draining renames the hash, so
+    views arriving meanwhile start a new one, and the renamed copy is only
+    deleted once acknowledged; a copy left behind by a failed flush is
+    drained again by the next one. Drains must not run concurrently.
+
+    Attributes:
+        client: Redis client holding the buffer
+        key: Hash receiving new views
+        flushing_key: Hash being written to the database
+    """
+
+    key = "content-views"
+    flushing_key = "content-views:flushing"
+
+    def __init__(self, client: redis.Redis) -> None:
+        self.client = client
+
+    def add(self, key: ViewKey, timestamp: float) -> bool:
+        """
+        Count one view.
+
+        Args:
+            key: Viewed object and viewer
+            timestamp: Unix time of the view
+
+        Returns:
+            bool: Always False, the buffer is flushed by a periodic task
+        """
+        field = "|".join("" if part is None else str(part) for part in key)
+        pipeline = self.client.pipeline(transaction=False)
+        pipeline.hincrby(self.key, f"c|{field}", 1)
+        pipeline.hset(self.key, f"t|{field}", timestamp)
+        pipeline.execute()
+        return False
+
+    def drain(self) -> BufferedViews:
+        """
+        Move buffered views aside and read them.
+
+        Returns:
+            BufferedViews: Views per key and time of the last one
+        """
+        if not self.client.exists(self.flushing_key):
+            try:
+                self.client.rename(self.key, self.flushing_key)
+            except redis.ResponseError:
+                return {}  # Nothing was viewed since the last flush
+
+        counts: Dict[str, int] = {}
+        times: Dict[str, float] = {}
+        for name, value in self.client.hgetall(self.flushing_key).items():
+            kind, field = name.decode().split("|", 1)
+            if kind == "c":
+                counts[field] = int(value)
+            else:
+                times[field] = float(value)
+
+        views: BufferedViews = {}
+        for field, count in counts.items():
+            content_type_id, object_id, user_id, viewer_ip = field.split("|")
+            key = (
+                int(content_type_id),
+                int(object_id),
+                int(user_id) if user_id else None,
+                viewer_ip or None,
+            )
+            views[key] = (count, times.get(field, time.time()))
+        return views
+
+    def acknowledge(self) -> None:
+        """Discard drained views once they are written."""
+        self.client.delete(self.flushing_key)
+
+
+ViewBuffer = Union[LocalViewBuffer, RedisViewBuffer]
+
+
+@lru_cache(maxsize=None)
+def get_view_buffer(backend: str) -> ViewBuffer:
+    """
+    Get the process-wide view buffer of a backend.
+
+    Args:
+        backend: ``VIEW_BUFFER_BACKEND``, "redis" or "local"
+
+    Returns:
+        ViewBuffer: The buffer views are added to
+    """
+    if backend == "local":
+        return LocalViewBuffer(
+            settings.VIEW_BUFFER_LOCAL_MAX_KEYS,
+            settings.VIEW_BUFFER_FLUSH_INTERVAL,
+        )
+    return RedisViewBuffer(
+        redis.Redis.from_url(
+            settings.VIEW_BUFFER_REDIS_URL,
+            socket_timeout=settings.VIEW_BUFFER_REDIS_TIMEOUT,
+            socket_connect_timeout=settings.VIEW_BUFFER_REDIS_TIMEOUT,
+        )
+    )
+
+
+def buffer_view(
+    content_type_id: int,
+    object_id: int,
+    user_id: Optional[int],
+    viewer_ip: Optional[str],
+) -> None:
+    """
+    Add one view to the configured buffer.
+
+    Views are dropped, not failed, when Redis is unreachable, so an outage
+    never breaks the pages being viewed.
+
+    Args:
+        content_type_id: Content type of the viewed object
+        object_id: Primary key of the viewed object
+        user_id: Primary key of the viewing user, if authenticated
+        viewer_ip: IP address of the viewer
+    """
+    buffer = get_view_buffer(settings.VIEW_BUFFER_BACKEND)
+    try:
+        due = buffer.add(
+            (content_type_id, object_id, user_id, viewer_ip), time.time()
+        )
+    except redis.RedisError as e:
+        logger.warning(f"Dropped a content view, Redis is unavailable: {e}")
+        return
+    if due:
+        try:
+            flush_view_buffer(buffer)
+        except DatabaseError as e:
+            logger.error(f"Failed to write buffered content views: {e}")
+
+
+def get_daily_rollups(
+    rows: List[Tuple[int, int, Optional[int], Optional[str], int, datetime]]
+) -> List[Tuple[int, int, date, int, int]]:
+    """
+    Sum views per object and day, counting viewers new on their day.
+
+    A viewer is new if their stored last view, read in one query per
+    content type before the rows are upserted, is from an earlier day.
+    Views buffered across midnight count on the day of the last one.
+
+    Args:
+        rows: Merged views about to be upserted, one per viewer key
+
+    Returns:
+        List: Content type id, object id, day, number of views and number
+        of new viewers
+    """
+    wanted: Dict[int, Tuple[Set[int], Set[str]]] = defaultdict(
+        lambda: (set(), set())
+    )
+    for content_type_id, object_id, user_id, viewer_ip, _, _ in rows:
+        objects, keys = wanted[content_type_id]
+        objects.add(object_id)
+        keys.add(get_viewer_key(user_id, viewer_ip))
+
+    previous: Dict[Tuple[int, int, str], datetime] = {}
+    for content_type_id, (objects, keys) in wanted.items():
+        for object_id, viewer_key, last_viewed in ContentView.objects.filter(
+            content_type_id=content_type_id,
+            object_id__in=objects,
+            viewer_key__in=keys,
+        ).values_list("object_id", "viewer_key", "last_viewed"):
+            previous[(content_type_id, object_id, viewer_key)] = last_viewed
+
+    days: Dict[Tuple[int, int, date], List[int]] = defaultdict(lambda: [0, 0])
+    for content_type_id, object_id, user_id, viewer_ip, count, last in rows:
+        day = timezone.localdate(last)
+        before = previous.get(
+            (content_type_id, object_id, get_viewer_key(user_id, viewer_ip))
+        )
+        totals = days[(content_type_id, object_id, day)]
+        totals[0] += count
+        if before is None or timezone.localdate(before) < day:
+            totals[1] += 1
+    return [(*key, views, viewers) for key, (views, viewers) in days.items()]
+
+
+def flush_view_buffer(buffer: Optional[ViewBuffer] = None) -> int:
+    """
+    Write buffered views to the database in bulk upserts.
+
+    Views of users deleted since they were buffered are counted as
+    anonymous. Entries are merged per viewer key first, since one
+    INSERT ... ON CONFLICT cannot update the same row twice. The daily
+    rollups are updated in the same transaction. Once written,
+    ``content_views_flushed`` is sent with the views.
+
+    Args:
+        buffer: Buffer to drain, the configured one if None
+
+    Returns:
+        int: Number of content view rows inserted or updated
+    """
+    buffer = buffer or get_view_buffer(settings.VIEW_BUFFER_BACKEND)
+    views = buffer.drain()
+    if not views:
+        return 0
+
+    user_ids = {key[2] for key in views if key[2] is not None}
+    existing = set(
+        User.objects.filter(pk__in=user_ids).values_list("pk", flat=True)
+    )
+
+    merged: Dict[Tuple[int, int, str], List] = {}
+    for (content_type_id, object_id, user_id, viewer_ip), (
+        count,
+        last,
+    ) in views.items():
+        if user_id not in existing:
+            user_id = None
+        viewer_key = get_viewer_key(user_id, viewer_ip)
+        entry = merged.get((content_type_id, object_id, viewer_key))
+        if entry is None:
+            merged[(content_type_id, object_id, viewer_key)] = [
+                content_type_id,
+                object_id,
+                user_id,
+                viewer_ip,
+                count,
+                last,
+            ]
+            continue
+        entry[4] += count
+        if last > entry[5]:
+            entry[3], entry[5] = viewer_ip, last
+
+    rows = [
+        (*entry[:5], datetime.fromtimestamp(entry[5], tz=dt_timezone.utc))
+        for entry in merged.values()
+    ]
+    batch_size: int = settings.VIEW_BUFFER_FLUSH_BATCH_SIZE
+    written = 0
+    # One transaction, so a failed flush leaves nothing half written when
+    # the same views are drained again
+    with transaction.atomic():
+        for start in range(0, len(rows), batch_size):
+            batch = rows[start : start + batch_size]  # noqa: E203
+            days = get_daily_rollups(batch)
+            written += ContentView.upsert_views(batch)
+            ContentViewDaily.add_views(days)
+    buffer.acknowledge()
+    logger.info(f"Flushed {len(views)} buffered viewers into {written} rows")
+
+    # Receivers run after the views are acknowledged, so a failing one
+    # cannot make the next flush write the same views again
+    for receiver, result in content_views_flushed.send_robust(
+        sender=ContentView,
+        views=[(row[0], row[1], row[4], row[5]) for row in rows],
+        viewers=[
+            (row[0], row[1], get_viewer_key(row[2], row[3]), row[5])
+            for row in rows
+        ],
+    ):
+        if isinstance(result, Exception):
+            logger.error(f"Content view receiver {receiver} failed: {result}")
+    return written
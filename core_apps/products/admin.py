@@ -5,6 +5,8 @@ from django.db.models import Model
 from django.urls import reverse
 from django.utils.safestring import mark_safe
 
+from core_apps.common.admin import ContentViewDailyInline
+
 from .models import (
     Attribute,
     AttributeValue,
@@ -100,6 +102,7 @@ class ProductAdmin(admin.ModelAdmin):
     inlines: List[Type[admin.TabularInline]] = [
         ProductLineInline,
         AttributeValueProductInline,
+        ContentViewDailyInline,
     ]
     list_display: List[str] = ["name", "is_active", "created_at"]
     list_filter: List[str] = ["is_active", "category"]
@@ -0,0 +1,96 @@
+from collections import defaultdict
+from datetime import datetime, timedelta
+from typing import Any, Dict, Iterable, Tuple
+
+from django.conf import settings
+from django.contrib.contenttypes.models import ContentType
+from django.db.models import Sum
+from django.utils import timezone
+
+from core_apps.common.models import ContentViewDaily
+from core_apps.common.unique_viewers import ViewerEntries, get_sketch_store
+
+from .models import Product
+
+
+def add_unique_viewers(
+    viewers: Iterable[Tuple[int, int, str, datetime]]
+) -> None:
+    """
+    Add product viewers to the daily sketches of products and categories.
+
+    A category's sketch receives the viewers of all its products, so its
+    distinct viewers are counted without merging product sketches.
+
+    Args:
+        viewers: Content type id, object id, viewer key and time of the
+            last view, for any content type
+    """
+    product_type_id = ContentType.objects.get_for_model(Product).pk
+    product_viewers = [
+        (object_id, viewer_key, last)
+        for content_type_id, object_id, viewer_key, last in viewers
+        if content_type_id == product_type_id
+    ]
+    if not product_viewers:
+        return
+    categories = dict(
+        Product.objects.filter(
+            pk__in={object_id for object_id, _, _ in product_viewers}
+        ).values_list("pk", "category_id")
+    )
+
+    entries: ViewerEntries = defaultdict(set)
+    for object_id, viewer_key, last in product_viewers:
+        day = timezone.localdate(last)
+        entries[(f"product:{object_id}", day)].add(viewer_key)
+        if object_id in categories:
+            category = f"category:{categories[object_id]}"
+            entries[(category, day)].add(viewer_key)
+    get_sketch_store(settings.VIEWER_SKETCH_BACKEND).add(entries)
+
+
+def get_product_analytics(product: Product, days: int) -> Dict[str, Any]:
+    """
+    Summarise a product's views over recent days.
+
+    Views per day come from the daily rollups, and distinct viewers over
+    the whole range from merged daily HyperLogLog sketches, so neither
+    reads individual viewers.
+
+    Args:
+        product: Product to summarise
+        days: Number of days, including today, to cover
+
+    Returns:
+        Dict[str, Any]: Total views, estimated distinct viewers of the
+        product and its category, and views and unique viewers per day,
+        oldest first
+    """
+    today = timezone.localdate()
+    since = today - timedelta(days=days - 1)
+    store = get_sketch_store(settings.VIEWER_SKETCH_BACKEND)
+    rollups = ContentViewDaily.objects.filter(
+        content_type=ContentType.objects.get_for_model(Product),
+        object_id=product.pk,
+        day__gte=since,
+    ).order_by("day")
+    return {
+        "product": product.slug,
+        "since": since.isoformat(),
+        "views": rollups.aggregate(total=Sum("views"))["total"] or 0,
+        "unique_viewers": store.count(f"product:{product.pk}", since, today),
+        "category_unique_viewers": store.count(
+            f"category:{product.category_id}", since, today
+        ),
+        "daily": [
+            {
+                "day": day.isoformat(),
+                "views": views,
+                "unique_viewers": unique_viewers,
+            }
+            for day, views, unique_viewers in rollups.values_list(
+                "day", "views", "unique_viewers"
+            )
+        ],
+    }
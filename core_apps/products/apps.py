@@ -18,3 +18,15 @@ class ProductsConfig(AppConfig):
     default_auto_field: str = "django.db.models.BigAutoField"
     name: str = "core_apps.products"
     verbose_name: str = _("Products")
+
+    def ready(self) -> None:
+        """
+        Perform initialization tasks when app is ready.
+
+        Imports and registers signal handlers keeping category product
+        counts in sync.
+
+        Returns:
+            None
+        """
+        import core_apps.products.signals  # noqa: F401
@@ -0,0 +1,50 @@
+from io import BytesIO
+from typing import IO, Dict
+
+from django.conf import settings
+from PIL import Image, ImageOps
+
+from core_apps.common.images import flatten_to_rgb, store_content_addressed
+
+# Formats variants are encoded in, by variants key and file extension
+VARIANT_FORMATS = {"webp": ("WEBP", "webp"), "jpeg": ("JPEG", "jpg")}
+
+# Storage directory of generated variants
+VARIANTS_PREFIX = "product_images/variants"
+
+
+def build_variants(source: IO[bytes]) -> Dict[str, Dict[str, str]]:
+    """
+    Generate the fixed-width WebP and JPEG copies of a product image.
+
+    Images are never upscaled: widths larger than the source collapse to
+    one variant at the source width. Metadata is not copied.
+
+    Args:
+        source: Open file of the original image
+
+    Returns:
+        Dict[str, Dict[str, str]]: Storage names by format and width
+    """
+    with Image.open(source) as image:
+        image = flatten_to_rgb(ImageOps.exif_transpose(image))
+
+    variants: Dict[str, Dict[str, str]] = {key: {} for key in VARIANT_FORMATS}
+    widths = sorted(
+        {min(width, image.width) for width in settings.PRODUCT_IMAGE_WIDTHS}
+    )
+    for width in widths:
+        height = max(1, round(image.height * width / image.width))
+        resized = image.resize((width, height), Image.Resampling.LANCZOS)
+        for key, (image_format, extension) in VARIANT_FORMATS.items():
+            output = BytesIO()
+            resized.save(
+                output,
+                image_format,
+                quality=settings.PRODUCT_IMAGE_QUALITY,
+                optimize=image_format == "JPEG",
+            )
+            variants[key][str(width)] = store_content_addressed(
+                output.getvalue(), VARIANTS_PREFIX, extension
+            )
+    return variants
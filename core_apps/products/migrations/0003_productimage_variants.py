@@ -0,0 +1,24 @@
+# Generated by Django 4.2.11 on 2026-10-19 05:16
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("products", "0002_alter_productline_price"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="productimage",
+            name="variants",
+            field=models.JSONField(
+                blank=True,
+                default=dict,
+                editable=False,
+                help_text="Resized copies by format and width, generated in the background",
+                verbose_name="Variants",
+            ),
+        ),
+    ]
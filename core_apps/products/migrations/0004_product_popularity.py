@@ -0,0 +1,29 @@
+# Generated by Django 4.2.11 on 2026-10-19 05:30
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("products", "0003_productimage_variants"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="product",
+            name="popularity",
+            field=models.FloatField(
+                default=0.0,
+                editable=False,
+                help_text="Maintained automatically from views and sales",
+                verbose_name="Popularity",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="product",
+            index=models.Index(
+                fields=["is_active", "popularity"], name="product_active_popularity_idx"
+            ),
+        ),
+    ]
@@ -0,0 +1,39 @@
+# Generated by Django 4.2.11 on 2026-10-19 05:39
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("products", "0004_product_popularity"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="productline",
+            name="low_stock_threshold",
+            field=models.PositiveIntegerField(
+                blank=True,
+                help_text="Format: optional, defaults to the product type's",
+                null=True,
+                verbose_name="Low Stock Threshold",
+            ),
+        ),
+        migrations.AddField(
+            model_name="producttype",
+            name="low_stock_threshold",
+            field=models.PositiveIntegerField(
+                blank=True,
+                help_text="Format: optional, defaults to LOW_STOCK_THRESHOLD",
+                null=True,
+                verbose_name="Low Stock Threshold",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="productline",
+            index=models.Index(
+                fields=["updated_at"], name="product_line_updated_idx"
+            ),
+        ),
+    ]
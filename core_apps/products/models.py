@@ -3,13 +3,15 @@ from decimal import Decimal
 from autoslug import AutoSlugField
 from django.core.exceptions import ValidationError
 from django.core.validators import MinValueValidator
-from django.db import models
+from django.db import models, transaction
 from django.db.models.manager import Manager
+from django.utils import timezone
 from django.utils.translation import gettext_lazy as _
 from mptt.models import TreeForeignKey
 
 from core_apps.categories.models import Category
 from core_apps.common.models import TimeStampedModel
+from core_apps.common.signals import stock_levels_updated
 
 from .fields import OrderField
 
@@ -78,6 +80,71 @@ class IsActiveQueryset(models.QuerySet):
         return self.filter(is_active=True)
 
 
+class ProductLineQuerySet(IsActiveQueryset):
+    """
+    Queryset of product lines reporting the stock levels it updates.
+
+    Updates setting ``stock_qty``, including ``F()`` expressions and
+    ``bulk_update``, lock the matched lines, update them and read the new
+    levels back in the same transaction, then send
+    ``stock_levels_updated``. Updates of stock or thresholds stamp
+    ``updated_at``, which ``auto_now`` only does on ``save()``, so the low
+    stock check sees the lines.
+    """
+
+    # Columns read back from stock updates, in the order of a stock level
+    STOCK_LEVEL_FIELDS = (
+        "pkid",
+        "stock_qty",
+        "low_stock_threshold",
+        "product_type_id",
+    )
+
+    # Primary keys per IN list when reading stock levels back
+    STOCK_LEVEL_BATCH_SIZE = 1000
+
+    def update(self, **kwargs) -> int:
+        """
+        Update the lines, reporting new stock levels if stock changes.
+
+        The matched lines are locked before the update, so the levels read
+        back afterwards are the ones this update wrote.
+
+        Args:
+            **kwargs: Field values or expressions to set
+
+        Returns:
+            int: Number of lines updated
+        """
+        if {"stock_qty", "low_stock_threshold"} & kwargs.keys():
+            kwargs.setdefault("updated_at", timezone.now())
+        if "stock_qty" not in kwargs:
+            return super().update(**kwargs)
+
+        size = self.STOCK_LEVEL_BATCH_SIZE
+        lines = self.model._base_manager.using(self.db)
+        with transaction.atomic(using=self.db, savepoint=False):
+            pks = list(
+                self.select_for_update(of=("self",)).values_list(
+                    "pk", flat=True
+                )
+            )
+            if not pks:
+                return 0
+            updated = super().update(**kwargs)
+            levels = []
+            for start in range(0, len(pks), size):
+                levels.extend(
+                    lines.filter(
+                        pk__in=pks[start : start + size]  # noqa: E203
+                    ).values_list(*self.STOCK_LEVEL_FIELDS)
+                )
+        stock_levels_updated.send(
+            sender=self.model, levels=levels, using=self.db
+        )
+        return updated
+
+
 class Product(TimeStampedModel):
     """
     Core Product model representing basic product information.
@@ -94,6 +161,8 @@ class Product(TimeStampedModel):
         is_active: Product's visibility status
         attribute_values: Associated attribute values
         product_type: Type classification of the product
+        popularity: Time-decayed weight of views and sales, scaled to
+            ``PRODUCT_POPULARITY_EPOCH`` so it can be ordered by directly
     """
 
     name: models.CharField = models.CharField(
@@ -131,6 +200,12 @@ class Product(TimeStampedModel):
     product_type: models.ForeignKey = models.ForeignKey(
         "ProductType", on_delete=models.PROTECT, related_name="product_type"
     )
+    popularity: models.FloatField = models.FloatField(
+        verbose_name=_("Popularity"),
+        default=0.0,
+        editable=False,
+        help_text=_("Maintained automatically from views and sales"),
+    )
 
     objects: Manager = IsActiveQueryset.as_manager()
 
@@ -138,6 +213,14 @@ class Product(TimeStampedModel):
         verbose_name = _("Product")
         verbose_name_plural = _("Products")
         ordering = ["-created_at"]
+        indexes = [
+            # Serves ?ordering=-popularity on active products as an index
+            # scan, read backwards
+            models.Index(
+                fields=["is_active", "popularity"],
+                name="product_active_popularity_idx",
+            )
+        ]
 
     def __str__(self) -> str:
         return self.name
@@ -174,6 +257,12 @@ class ProductLine(TimeStampedModel):
     )
     sku = models.CharField(max_length=10)
     stock_qty = models.IntegerField()
+    low_stock_threshold = models.PositiveIntegerField(
+        verbose_name=_("Low Stock Threshold"),
+        null=True,
+        blank=True,
+        help_text=_("Format: optional, defaults to the product type's"),
+    )
     weight = models.FloatField()
     is_active = models.BooleanField(default=False)
     order = OrderField(unique_for_field="product", blank=True)
@@ -184,12 +273,17 @@ class ProductLine(TimeStampedModel):
         verbose_name=_("Attribute Values"),
     )
 
-    objects = IsActiveQueryset.as_manager()
+    objects = ProductLineQuerySet.as_manager()
 
     class Meta:
         verbose_name = _("Product Line")
         verbose_name_plural = _("Product Lines")
         ordering = ["-created_at"]
+        indexes = [
+            # Lets the low stock check read only lines changed since it
+            # last ran
+            models.Index(fields=["updated_at"], name="product_line_updated_idx")
+        ]
 
     def __str__(self):
         return f"{self.product.name} - {self.sku}"
@@ -231,6 +325,10 @@ class ProductImage(TimeStampedModel):
     """
     Model for storing product line images.
     Multiple images can be associated with a single product line.
+
+    ``variants`` maps each format to the storage names of its resized
+    copies by width, plus the ``source`` image they were generated from:
+    ``{"source": name, "webp": {"160": name, ...}, "jpeg": {...}}``.
     """
 
     alternative_text = models.CharField(
@@ -257,6 +355,15 @@ class ProductImage(TimeStampedModel):
         verbose_name=_("Display Order"),
         help_text=_("Format: auto-assigned if not specified"),
     )
+    variants = models.JSONField(
+        verbose_name=_("Variants"),
+        default=dict,
+        blank=True,
+        editable=False,
+        help_text=_(
+            "Resized copies by format and width, generated in the background"
+        ),
+    )
 
     class Meta:
         verbose_name = _("Product Image")
@@ -358,6 +465,12 @@ class ProductType(TimeStampedModel):
         null=True,
         blank=True,
     )
+    low_stock_threshold = models.PositiveIntegerField(
+        verbose_name=_("Low Stock Threshold"),
+        null=True,
+        blank=True,
+        help_text=_("Format: optional, defaults to LOW_STOCK_THRESHOLD"),
+    )
     attribute = models.ManyToManyField(
         Attribute,
         through="ProductTypeAttribute",
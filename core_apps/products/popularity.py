@@ -0,0 +1,166 @@
+import logging
+import math
+from collections import defaultdict
+from datetime import date, datetime, time
+from typing import Dict, Iterable, Optional, Tuple
+
+from django.conf import settings
+from django.contrib.contenttypes.models import ContentType
+from django.db import transaction
+from django.db.models import Case, F, FloatField, Value, When
+from django.utils import timezone
+
+from core_apps.common.models import ContentViewDaily
+
+from .models import Product
+
+logger = logging.getLogger(__name__)
+
+
+def get_event_weight(at: datetime, weight: float = 1.0) -> float:
+    """
+    Scale an event's weight to the popularity epoch.
+
+    Scores use forward decay: an event at time ``t`` adds
+    ``weight * 2 ** ((t - epoch) / half_life)``. Every stored score then
+    shrinks by the same factor as time passes, so ordering by the stored
+    column is ordering by the decayed score, and events are added without
+    touching any other product. Scores overflow after about 1000
+    half-lives past ``PRODUCT_POPULARITY_EPOCH``; move the epoch forward
+    and rebuild well before then.
+
+    Args:
+        at: Time of the event
+        weight: Weight of the event when it happens
+
+    Returns:
+        float: Amount the event adds to the stored score
+    """
+    half_life = settings.PRODUCT_POPULARITY_HALF_LIFE.total_seconds()
+    elapsed = (at - settings.PRODUCT_POPULARITY_EPOCH).total_seconds()
+    return weight * math.pow(2, elapsed / half_life)
+
+
+def get_current_popularity(
+    score: float, now: Optional[datetime] = None
+) -> float:
+    """
+    Decay a stored score to the current time, for display.
+
+    Args:
+        score: Stored popularity of a product
+        now: Time to decay to, the current time if None
+
+    Returns:
+        float: Weighted number of recent events, each halved per half-life
+    """
+    return score / get_event_weight(now or timezone.now())
+
+
+def add_popularity(increments: Dict[int, float]) -> int:
+    """
+    Add event weights to product scores in batched updates.
+
+    Each batch of ``PRODUCT_POPULARITY_BATCH_SIZE`` products is one UPDATE
+    adding a per-product amount, so concurrent additions never overwrite
+    each other.
+
+    Args:
+        increments: Amount from ``get_event_weight`` per product key
+
+    Returns:
+        int: Number of products updated
+    """
+    items = [(pk, amount) for pk, amount in increments.items() if amount]
+    batch_size: int = settings.PRODUCT_POPULARITY_BATCH_SIZE
+    updated = 0
+    for start in range(0, len(items), batch_size):
+        batch = items[start : start + batch_size]  # noqa: E203
+        amount = Case(
+            *(When(pk=pk, then=Value(value)) for pk, value in batch),
+            default=Value(0.0),
+            output_field=FloatField(),
+        )
+        updated += Product.objects.filter(
+            pk__in=[pk for pk, _ in batch]
+        ).update(popularity=F("popularity") + amount)
+    return updated
+
+
+def score_product_views(
+    views: Iterable[Tuple[int, int, int, datetime]]
+) -> Dict[int, float]:
+    """
+    Turn view counts into popularity increments of the viewed products.
+
+    Args:
+        views: Content type id, object id, number of views and time of the
+            last of them, for any content type
+
+    Returns:
+        Dict[int, float]: Amount to add per product key
+    """
+    product_type_id = ContentType.objects.get_for_model(Product).pk
+    weight: float = settings.PRODUCT_POPULARITY_WEIGHTS["view"]
+    increments: Dict[int, float] = defaultdict(float)
+    for content_type_id, object_id, count, last in views:
+        if content_type_id == product_type_id:
+            increments[object_id] += get_event_weight(last, weight * count)
+    return increments
+
+
+def get_noon(day: date) -> datetime:
+    """
+    Get noon of a day in ``TIME_ZONE``.
+
+    Args:
+        day: Day of the events
+
+    Returns:
+        datetime: Aware time at the middle of the day
+    """
+    return timezone.make_aware(datetime.combine(day, time(12)))
+
+
+def rebuild_popularity() -> int:
+    """
+    Recompute every product's score from its daily view rollups.
+
+    A day's views are counted at noon of the day, which is close enough
+    after a few hours of decay; scores kept up to date by the view flush
+    are exact. Products are rewritten a batch at a time, each in its own
+    transaction.
+
+    Returns:
+        int: Number of products rescored
+    """
+    product_type_id = ContentType.objects.get_for_model(Product).pk
+    batch_size: int = settings.PRODUCT_POPULARITY_BATCH_SIZE
+    rescored = 0
+    last_pk = 0
+    while True:
+        pks = list(
+            Product.objects.filter(pk__gt=last_pk)
+            .order_by("pk")
+            .values_list("pk", flat=True)[:batch_size]
+        )
+        if not pks:
+            break
+        last_pk = pks[-1]
+
+        days = ContentViewDaily.objects.filter(
+            content_type_id=product_type_id, object_id__in=pks
+        ).values_list("object_id", "day", "views")
+        scores = score_product_views(
+            (product_type_id, object_id, views, get_noon(day))
+            for object_id, day, views in days.iterator()
+        )
+        products = [
+            Product(pk=pk, popularity=scores.get(pk, 0.0)) for pk in pks
+        ]
+        with transaction.atomic():
+            Product.objects.bulk_update(products, ["popularity"])
+        rescored += len(products)
+
+    logger.info(f"Rebuilt popularity of {rescored} products")
+    return rescored
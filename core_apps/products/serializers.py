@@ -1,8 +1,10 @@
 from typing import Any, Dict
 
+from django.core.files.storage import default_storage
 from django.utils.translation import gettext_lazy as _
 from rest_framework import serializers
 
+from .images import VARIANT_FORMATS
 from .models import (
     Attribute,
     AttributeValue,
@@ -21,17 +23,49 @@ class ProductImageSerializer(serializers.ModelSerializer):
     Attributes:
         alternative_text: Alternative text for image accessibility
         url: URL to the stored image
+        srcset: Resized variants by MIME type, as srcset strings
         order: Display order of the image
     """
 
+    srcset = serializers.SerializerMethodField()
+
     class Meta:
         model = ProductImage
         fields: list[str] = [
             "alternative_text",
             "url",
+            "srcset",
             "order",
         ]
 
+    def get_srcset(self, obj: ProductImage) -> Dict[str, str]:
+        """
+        Build a srcset per format from the image's generated variants.
+
+        Keys are MIME types so clients can use them directly as
+        ``<source type=...>`` elements of a ``<picture>``. Images whose
+        variants are not generated yet have an empty srcset.
+
+        Args:
+            obj: ProductImage instance being serialized
+
+        Returns:
+            Dict[str, str]: srcset strings keyed by MIME type
+        """
+        request = self.context.get("request")
+        srcset: Dict[str, str] = {}
+        for key in VARIANT_FORMATS:
+            widths = obj.variants.get(key, {})
+            candidates = []
+            for width in sorted(widths, key=int):
+                url = default_storage.url(widths[width])
+                if request is not None:
+                    url = request.build_absolute_uri(url)
+                candidates.append(f"{url} {width}w")
+            if candidates:
+                srcset[f"image/{key}"] = ", ".join(candidates)
+        return srcset
+
 
 class AttributeSerializer(serializers.ModelSerializer):
     """
@@ -207,6 +241,8 @@ class ProductSerializer(serializers.ModelSerializer):
     Attributes:
         product_lines: Nested serializer for product variants
         category: Category name string
+        breadcrumbs: Precomputed path from the root category down to the
+            product's category
         attribute_value: Nested serializer for product attributes
     """
 
@@ -216,6 +252,9 @@ class ProductSerializer(serializers.ModelSerializer):
     category: serializers.CharField = serializers.CharField(
         source="category.name"
     )
+    breadcrumbs: serializers.ReadOnlyField = serializers.ReadOnlyField(
+        source="category.ancestor_path"
+    )
     attribute_value: AttributeValueSerializer = AttributeValueSerializer(
         source="attribute_values", many=True, read_only=True
     )
@@ -228,6 +267,7 @@ class ProductSerializer(serializers.ModelSerializer):
             "slug",
             "description",
             "category",
+            "breadcrumbs",
             "attribute_value",
             "product_lines",
         ]
@@ -0,0 +1,337 @@
+import logging
+from datetime import datetime
+from typing import Any, List, Optional, Tuple, Type, Union
+
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models.base import Model
+from django.db.models.signals import (
+    post_delete,
+    post_init,
+    post_save,
+    pre_delete,
+    pre_save,
+)
+from django.dispatch import receiver
+from django.utils import timezone
+
+from core_apps.categories.models import Category
+from core_apps.common.models import ContentView
+from core_apps.common.signals import content_views_flushed, stock_levels_updated
+from core_apps.products.analytics import add_unique_viewers
+from core_apps.products.models import (
+    Product,
+    ProductImage,
+    ProductLine,
+    ProductType,
+)
+from core_apps.products.popularity import add_popularity, score_product_views
+from core_apps.products.stock import (
+    TYPE_THRESHOLDS_KEY,
+    StockLevel,
+    record_stock_levels,
+)
+from core_apps.products.tasks import generate_product_image_variants
+
+logger = logging.getLogger(__name__)
+
+# Marker for products loaded without their category or is_active fields
+UNTRACKED = object()
+
+
+def get_counted_category_id(instance: Product) -> Union[int, None, object]:
+    """
+    Get the category an instance contributes an active product count to.
+
+    Args:
+        instance: Product instance being inspected
+
+    Returns:
+        Category primary key, None if the product is inactive, or
+        ``UNTRACKED`` if the relevant fields were deferred
+    """
+    if {"category_id", "is_active"} & instance.get_deferred_fields():
+        return UNTRACKED
+    return instance.category_id if instance.is_active else None
+
+
+def fetch_counted_category_id(pk: int) -> Optional[int]:
+    """
+    Read the category a stored product is counted in from the database.
+
+    Args:
+        pk: Primary key of the product
+
+    Returns:
+        Optional[int]: Category primary key, or None if inactive or missing
+    """
+    row = Product.objects.filter(pk=pk).values("category_id", "is_active")
+    row = row.first()
+    if row is None or not row["is_active"]:
+        return None
+    return row["category_id"]
+
+
+@receiver(post_init, sender=Product)
+def track_counted_category(
+    sender: Type[Model], instance: Product, **kwargs: Any
+) -> None:
+    """
+    Remember which category a loaded product is counted in.
+
+    Args:
+        sender: Model class that sent the signal (Product model)
+        instance: Product instance that was initialised
+        **kwargs: Additional signal arguments
+
+    Returns:
+        None
+    """
+    instance._counted_category_id = get_counted_category_id(instance)
+
+
+@receiver(pre_save, sender=Product)
+@receiver(pre_delete, sender=Product)
+def resolve_counted_category(
+    sender: Type[Model], instance: Product, **kwargs: Any
+) -> None:
+    """
+    Load the stored category of products loaded with deferred fields.
+
+    Args:
+        sender: Model class that sent the signal (Product model)
+        instance: Product instance about to be saved or deleted
+        **kwargs: Additional signal arguments
+
+    Returns:
+        None
+    """
+    if instance._counted_category_id is UNTRACKED:
+        instance._counted_category_id = (
+            None
+            if instance._state.adding
+            else fetch_counted_category_id(instance.pk)
+        )
+
+
+@receiver(post_save, sender=Product)
+def update_category_product_counts(
+    sender: Type[Model], instance: Product, created: bool, **kwargs: Any
+) -> None:
+    """
+    Move a product's count when its category or active flag changes.
+
+    Args:
+        sender: Model class that sent the signal (Product model)
+        instance: Product instance that was saved
+        created: Boolean indicating if this is a new product
+        **kwargs: Additional signal arguments
+
+    Returns:
+        None
+    """
+    previous: Optional[int] = None if created else instance._counted_category_id
+    current = get_counted_category_id(instance)
+    if current is UNTRACKED:
+        current = fetch_counted_category_id(instance.pk)
+
+    if previous != current:
+        if previous is not None:
+            Category.objects.adjust_product_counts(previous, -1)
+        if current is not None:
+            Category.objects.adjust_product_counts(current, 1)
+        logger.debug(
+            f"Product {instance.pk} moved from category {previous} "
+            f"to {current}"
+        )
+    instance._counted_category_id = current
+
+
+@receiver(post_delete, sender=Product)
+def remove_category_product_count(
+    sender: Type[Model], instance: Product, **kwargs: Any
+) -> None:
+    """
+    Remove a deleted product from its category counts.
+
+    Args:
+        sender: Model class that sent the signal (Product model)
+        instance: Product instance that was deleted
+        **kwargs: Additional signal arguments
+
+    Returns:
+        None
+    """
+    if instance._counted_category_id is not None:
+        Category.objects.adjust_product_counts(
+            instance._counted_category_id, -1
+        )
+
+
+@receiver(post_save, sender=ProductImage)
+def queue_product_image_variants(
+    sender: Type[Model], instance: ProductImage, **kwargs: Any
+) -> None:
+    """
+    Queue variant generation when an image's file has changed.
+
+    Saves that keep the file, such as reordering, do not regenerate the
+    variants. The task is queued after commit so the worker sees the row.
+
+    Args:
+        sender: Model class that sent the signal (ProductImage model)
+        instance: ProductImage instance that was saved
+        **kwargs: Additional signal arguments
+
+    Returns:
+        None
+    """
+    if instance.url and instance.url.name != instance.variants.get("source"):
+        transaction.on_commit(
+            lambda: generate_product_image_variants.delay(instance.pk)
+        )
+
+
+@receiver(content_views_flushed, sender=ContentView)
+def add_view_popularity(
+    sender: Type[Model],
+    views: List[Tuple[int, int, int, datetime]],
+    **kwargs: Any,
+) -> None:
+    """
+    Add flushed product views to the viewed products' popularity.
+
+    Args:
+        sender: The ContentView model class
+        views: Content type id, object id, number of views and time of the
+            last view of every flushed viewer
+        **kwargs: Additional keyword arguments
+    """
+    add_popularity(score_product_views(views))
+
+
+@receiver(content_views_flushed, sender=ContentView)
+def sketch_product_viewers(
+    sender: Type[Model],
+    viewers: List[Tuple[int, int, str, datetime]],
+    **kwargs: Any,
+) -> None:
+    """
+    Add flushed product viewers to the daily distinct viewer sketches.
+
+    Args:
+        sender: The ContentView model class
+        viewers: Content type id, object id, viewer key and time of the
+            last view of every flushed viewer
+        **kwargs: Additional keyword arguments
+    """
+    add_unique_viewers(viewers)
+
+
+@receiver(stock_levels_updated, sender=ProductLine)
+def queue_updated_stock_levels(
+    sender: Type[Model],
+    levels: List[StockLevel],
+    using: str,
+    **kwargs: Any,
+) -> None:
+    """
+    Check stock levels written by a queryset update once they commit.
+
+    Args:
+        sender: The ProductLine model class
+        levels: New stock levels read back after the update
+        using: Database alias written to
+        **kwargs: Additional keyword arguments
+    """
+    transaction.on_commit(lambda: record_stock_levels(levels), using=using)
+
+
+@receiver(post_save, sender=ProductLine)
+def queue_saved_stock_level(
+    sender: Type[Model],
+    instance: ProductLine,
+    update_fields: Optional[frozenset],
+    using: str,
+    **kwargs: Any,
+) -> None:
+    """
+    Check the stock level of a saved product line once it commits.
+
+    Args:
+        sender: The ProductLine model class
+        instance: Product line that was saved
+        update_fields: Fields saved, or None if all were
+        using: Database alias written to
+        **kwargs: Additional keyword arguments
+    """
+    if update_fields is not None and "stock_qty" not in update_fields:
+        return
+    level = (
+        instance.pk,
+        instance.stock_qty,
+        instance.low_stock_threshold,
+        instance.product_type_id,
+    )
+    transaction.on_commit(lambda: record_stock_levels([level]), using=using)
+
+
+@receiver(post_init, sender=ProductType)
+def track_type_threshold(
+    sender: Type[Model], instance: ProductType, **kwargs: Any
+) -> None:
+    """
+    Remember the low stock threshold a loaded product type was stored with.
+
+    Args:
+        sender: The ProductType model class
+        instance: Product type that was initialised
+        **kwargs: Additional keyword arguments
+    """
+    instance._stored_threshold = (
+        UNTRACKED
+        if "low_stock_threshold" in instance.get_deferred_fields()
+        else instance.low_stock_threshold
+    )
+
+
+@receiver(post_save, sender=ProductType)
+def touch_type_stock_lines(
+    sender: Type[Model], instance: ProductType, created: bool, **kwargs: Any
+) -> None:
+    """
+    Mark the lines using a product type's threshold as changed when it is.
+
+    A new threshold can put lines below it without their stock changing,
+    so the lines falling back to it are stamped for the next low stock
+    check to read.
+
+    Args:
+        sender: The ProductType model class
+        instance: Product type that was saved
+        created: Whether the product type was just created
+        **kwargs: Additional keyword arguments
+    """
+    if not created and instance._stored_threshold != (
+        instance.low_stock_threshold
+    ):
+        ProductLine.objects.filter(
+            product_type=instance, low_stock_threshold__isnull=True
+        ).update(updated_at=timezone.now())
+    instance._stored_threshold = instance.low_stock_threshold
+
+
+@receiver(post_save, sender=ProductType)
+@receiver(post_delete, sender=ProductType)
+def clear_type_thresholds(
+    sender: Type[Model], instance: ProductType, **kwargs: Any
+) -> None:
+    """
+    Drop the cached product type thresholds when a type changes.
+
+    Args:
+        sender: The ProductType model class
+        instance: Product type that was saved or deleted
+        **kwargs: Additional keyword arguments
+    """
+    cache.delete(TYPE_THRESHOLDS_KEY)
@@ -0,0 +1,237 @@
+import logging
+from datetime import datetime, timedelta
+from functools import lru_cache
+from itertools import islice
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+
+import redis
+from django.conf import settings
+from django.core.cache import cache
+from django.core.mail import EmailMessage, get_connection
+from django.db.models import F, IntegerField, Value
+from django.db.models.functions import Coalesce
+from django.db.models.query import QuerySet
+
+from .models import ProductLine, ProductType
+
+logger = logging.getLogger(__name__)
+
+# Cache key of the time the low stock check last started
+CHECKED_AT_KEY = "low-stock:checked-at"
+
+# Lines saved this long before a check started are read again by the next
+# one, so transactions still open while a check runs are not missed
+CHECK_OVERLAP = timedelta(minutes=5)
+
+# Cache key of the low stock thresholds set on product types
+TYPE_THRESHOLDS_KEY = "low-stock:type-thresholds"
+
+# Redis list of product lines that fell to their threshold, oldest first
+EVENTS_KEY = "low-stock:events"
+
+# Product name, SKU, stock and threshold of a low stock line
+LowStockLine = Tuple[str, str, int, int]
+
+# Primary key, stock, own threshold and product type id of a product line
+StockLevel = Tuple[int, int, Optional[int], int]
+
+
+def get_low_stock_lines(
+    since: Optional[datetime] = None,
+) -> QuerySet[ProductLine]:
+    """
+    Select product lines at or below their low stock threshold.
+
+    A line's threshold is its own, else its product type's, else
+    ``LOW_STOCK_THRESHOLD``, and is annotated as ``threshold``.
+
+    Args:
+        since: Only select lines saved after this time, all lines if None
+
+    Returns:
+        QuerySet[ProductLine]: The low stock lines
+    """
+    lines = ProductLine.objects.annotate(
+        threshold=Coalesce(
+            "low_stock_threshold",
+            "product_type__low_stock_threshold",
+            Value(settings.LOW_STOCK_THRESHOLD),
+            output_field=IntegerField(),
+        )
+    ).filter(stock_qty__lte=F("threshold"))
+    if since is not None:
+        lines = lines.filter(updated_at__gt=since)
+    return lines
+
+
+def iter_digest_chunks(
+    lines: QuerySet[ProductLine],
+) -> Iterator[List[LowStockLine]]:
+    """
+    Stream low stock lines in chunks of ``LOW_STOCK_DIGEST_SIZE``.
+
+    Rows are read through a cursor with the product name joined in, so
+    neither model instances nor the whole result are held in memory.
+
+    Args:
+        lines: Lines annotated with ``threshold``
+
+    Yields:
+        List[LowStockLine]: The next chunk of lines
+    """
+    size = settings.LOW_STOCK_DIGEST_SIZE
+    rows = (
+        lines.order_by("product__name", "sku")
+        .values_list("product__name", "sku", "stock_qty", "threshold")
+        .iterator(chunk_size=size)
+    )
+    while chunk := list(islice(rows, size)):
+        yield chunk
+
+
+def send_low_stock_digest(lines: QuerySet[ProductLine]) -> int:
+    """
+    Email low stock lines to ``LOW_STOCK_ALERT_RECIPIENTS``.
+
+    Each chunk of lines is one email, all sent over one connection.
+
+    Args:
+        lines: Lines annotated with ``threshold``
+
+    Returns:
+        int: Number of lines reported
+    """
+    reported = 0
+    with get_connection() as connection:
+        for part, chunk in enumerate(iter_digest_chunks(lines), start=1):
+            body = "\n".join(
+                f"- {name} (SKU: {sku}): {stock} remaining, "
+                f"threshold {threshold}"
+                for name, sku, stock, threshold in chunk
+            )
+            EmailMessage(
+                subject=f"Low Stock Alert (part {part})",
+                body=f"Low stock alert for:\n{body}\n",
+                from_email=settings.LOW_STOCK_ALERT_FROM_EMAIL,
+                to=settings.LOW_STOCK_ALERT_RECIPIENTS,
+                connection=connection,
+            ).send()
+            reported += len(chunk)
+    return reported
+
+
+def get_type_thresholds() -> Dict[int, int]:
+    """
+    Get the low stock thresholds set on product types.
+
+    The few types are cached until one is saved or deleted, so stock
+    writes can resolve thresholds without a query.
+
+    Returns:
+        Dict[int, int]: Threshold per product type primary key
+    """
+    thresholds = cache.get(TYPE_THRESHOLDS_KEY)
+    if thresholds is None:
+        thresholds = dict(
+            ProductType.objects.filter(
+                low_stock_threshold__isnull=False
+            ).values_list("pk", "low_stock_threshold")
+        )
+        cache.set(TYPE_THRESHOLDS_KEY, thresholds, None)
+    return thresholds
+
+
+def get_alert_key(pk: int) -> str:
+    """
+    Build the key marking a product line as already alerted.
+
+    Args:
+        pk: Primary key of the product line
+
+    Returns:
+        str: Redis key of the marker
+    """
+    return f"low-stock:alerted:{pk}"
+
+
+@lru_cache(maxsize=None)
+def get_stock_event_client() -> redis.Redis:
+    """
+    Get the process-wide Redis client holding low stock events.
+
+    Returns:
+        redis.Redis: Client backed by a shared connection pool
+    """
+    return redis.Redis.from_url(
+        settings.STOCK_EVENT_REDIS_URL,
+        socket_timeout=settings.STOCK_EVENT_REDIS_TIMEOUT,
+        socket_connect_timeout=settings.STOCK_EVENT_REDIS_TIMEOUT,
+    )
+
+
+def record_stock_levels(levels: Iterable[StockLevel]) -> int:
+    """
+    Queue an event for each product line that fell to its threshold.
+
+    A line at or below its threshold is marked with SET NX, and only the
+    write that sets the marker queues an event, so a line is reported
+    once per stockout however many writes follow. Lines above their
+    threshold clear the marker, re-arming the alert. Redis failures are
+    logged and the events dropped, as the daily check still reports the
+    lines.
+
+    Args:
+        levels: New stock levels of updated product lines
+
+    Returns:
+        int: Number of events queued
+    """
+    default = settings.LOW_STOCK_THRESHOLD
+    type_thresholds = get_type_thresholds()
+    low, restocked = [], []
+    for pk, stock_qty, threshold, product_type_id in levels:
+        if threshold is None:
+            threshold = type_thresholds.get(product_type_id, default)
+        (low if stock_qty <= threshold else restocked).append(pk)
+    if not low and not restocked:
+        return 0
+
+    client = get_stock_event_client()
+    try:
+        pipeline = client.pipeline(transaction=False)
+        for pk in low:
+            pipeline.set(get_alert_key(pk), 1, nx=True)
+        if restocked:
+            pipeline.delete(*[get_alert_key(pk) for pk in restocked])
+        results = pipeline.execute()
+        crossed = [pk for pk, marked in zip(low, results) if marked]
+        if crossed:
+            client.rpush(EVENTS_KEY, *crossed)
+    except redis.RedisError as e:
+        logger.warning(f"Dropped low stock events: {e}")
+        return 0
+    return len(crossed)
+
+
+def drain_stock_events() -> List[int]:
+    """
+    Take every queued low stock event.
+
+    Returns:
+        List[int]: Primary keys of the product lines that ran low
+    """
+    pipeline = get_stock_event_client().pipeline(transaction=True)
+    pipeline.lrange(EVENTS_KEY, 0, -1)
+    pipeline.delete(EVENTS_KEY)
+    events, _ = pipeline.execute()
+    return [int(pk) for pk in events]
+
+
+def requeue_stock_events(pks: List[int]) -> None:
+    """
+    Put drained events back in front of the queue, oldest first.
+
+    Args:
+        pks: Primary keys of the product lines, as drained
+    """
+    get_stock_event_client().lpush(EVENTS_KEY, *reversed(pks))
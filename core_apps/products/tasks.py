@@ -1,10 +1,23 @@
-from typing import List
+import logging
 
 from celery import shared_task
-from django.core.mail import send_mail
-from django.db.models.query import QuerySet
+from django.core.cache import cache
+from django.utils import timezone
+from PIL import Image
 
-from .models import ProductLine
+from .images import build_variants
+from .models import ProductImage
+from .popularity import rebuild_popularity
+from .stock import (
+    CHECK_OVERLAP,
+    CHECKED_AT_KEY,
+    drain_stock_events,
+    get_low_stock_lines,
+    requeue_stock_events,
+    send_low_stock_digest,
+)
+
+logger = logging.getLogger(__name__)
 
 
 @shared_task(
@@ -13,46 +26,109 @@ from .models import ProductLine
     retry_kwargs={"max_retries": 3},
     retry_backoff=True,
 )
-def check_low_stock_levels() -> None:
+def check_low_stock_levels() -> int:
     """
-    Daily check for products with low stock levels.
-    Notifies administrators when stock falls below threshold.
+    Daily digest of product lines that ran low since the last check.
 
-    This task:
-    1. Queries all product lines with stock quantity <= threshold
-    2. Generates a formatted message with low stock items
-    3. Sends email notification to administrators
+    Stockouts are reported as they happen by ``send_low_stock_alerts``;
+    this check is the backstop for events dropped while Redis was down.
+
+    Only lines saved since the previous check started are read, so the
+    work follows the day's stock changes rather than the catalog's size.
+    Without a recorded check, as on the first run, every line is read.
+    The check time is only recorded once the digest is sent, so a failed
+    run is repeated in full by its retries.
 
     Note:
         - Configured to retry up to 3 times with exponential backoff
-        - Threshold is currently set to 5 units
-        - Email is sent only if low stock items are found
+        - Thresholds are set per line or product type, falling back to
+          ``LOW_STOCK_THRESHOLD``
+        - Emails are sent only if low stock lines are found
 
     Returns:
-        None: This task doesn't return any value
+        int: Number of low stock lines reported
 
     Raises:
         Exception: Any exceptions during execution will trigger retry mechanism
     """
-    low_stock_threshold: int = 5
-    low_stock_items: QuerySet[ProductLine] = ProductLine.objects.filter(
-        stock_qty__lte=low_stock_threshold
+    started = timezone.now()
+    since = cache.get(CHECKED_AT_KEY)
+    reported = send_low_stock_digest(
+        get_low_stock_lines(since - CHECK_OVERLAP if since else None)
     )
+    cache.set(CHECKED_AT_KEY, started, None)
+    return reported
+
+
+@shared_task(name="send_low_stock_alerts")
+def send_low_stock_alerts() -> int:
+    """
+    Send one digest of the product lines that ran low since the last run.
+
+    Events are queued as stock writes commit, one per line and stockout.
+    Lines restocked before the digest is sent are left out. If sending
+    fails the events are queued again for the next run.
+
+    Returns:
+        int: Number of low stock lines reported
+    """
+    pks = drain_stock_events()
+    if not pks:
+        return 0
+    try:
+        return send_low_stock_digest(get_low_stock_lines().filter(pk__in=pks))
+    except Exception:
+        requeue_stock_events(pks)
+        raise
+
+
+@shared_task(name="generate_product_image_variants", acks_late=True)
+def generate_product_image_variants(image_id: int) -> None:
+    """
+    Generate the responsive variants of a product image.
+
+    The variants are only recorded if the image still points at the file
+    they were generated from, so a task racing a newer upload cannot
+    overwrite that upload's variants.
 
-    if low_stock_items.exists():
-        message: str = "Low stock alert for:\n"
-        for item in low_stock_items:
-            message += (
-                f"- {item.product.name} "
-                f"(SKU: {item.sku}): "
-                f"{item.stock_qty} remaining\n"
-            )
-
-        recipient_list: List[str] = ["admin@nexuscommerce.com"]
-        send_mail(
-            subject="Low Stock Alert",
-            message=message,
-            from_email="system@nexuscommerce.com",
-            recipient_list=recipient_list,
-            fail_silently=False,
-        )
+    Args:
+        image_id: Primary key of the ProductImage
+
+    Returns:
+        None
+    """
+    image = ProductImage.objects.filter(pk=image_id).first()
+    if image is None or not image.url:
+        return
+
+    source = image.url.name
+    try:
+        with image.url.open("rb") as file:
+            variants = build_variants(file)
+    except (
+        OSError,
+        SyntaxError,
+        ValueError,
+        Image.DecompressionBombError,
+    ) as e:
+        logger.warning(f"Skipped variants of product image {image_id}: {e}")
+        return
+
+    ProductImage.objects.filter(pk=image_id, url=source).update(
+        variants={"source": source, **variants}
+    )
+
+
+@shared_task(name="rebuild_product_popularity", acks_late=True)
+def rebuild_product_popularity() -> int:
+    """
+    Weekly recomputation of product popularity from daily view rollups.
+
+    Scores are kept current by every view flush; the rebuild fills in
+    products that predate the score and corrects drift from views whose
+    flush receivers failed.
+
+    Returns:
+        int: Number of products rescored
+    """
+    return rebuild_popularity()
@@ -6,17 +6,21 @@ from django_filters.rest_framework import DjangoFilterBackend
 from drf_yasg.utils import swagger_auto_schema
 from rest_framework import filters, viewsets
 from rest_framework.decorators import action
-from rest_framework.permissions import IsAuthenticatedOrReadOnly
+from rest_framework.exceptions import ValidationError
+from rest_framework.permissions import IsAdminUser, IsAuthenticatedOrReadOnly
 from rest_framework.request import Request
 from rest_framework.response import Response
 
+from core_apps.common.mixins import ReplicaReadMixin
+from core_apps.common.models import ContentView
 from core_apps.common.renderers import GenericJSONRenderer
 
+from .analytics import get_product_analytics
 from .models import Product, ProductImage, ProductLine
 from .serializers import ProductSerializer
 
 
-class ProductViewSet(viewsets.ModelViewSet):
+class ProductViewSet(ReplicaReadMixin, viewsets.ModelViewSet):
     """
     ViewSet for viewing products with optimized database queries.
     Create, update, and delete operations restricted to admin interface.
@@ -34,6 +38,7 @@ class ProductViewSet(viewsets.ModelViewSet):
         search_fields: Fields available for text search
         ordering_fields: Fields available for sorting
         ordering: Default ordering
+        replica_read_actions: Actions served from a read replica
     """
 
     queryset: QuerySet[Product] = Product.objects.all()
@@ -51,8 +56,14 @@ class ProductViewSet(viewsets.ModelViewSet):
     ]
     filterset_fields: List[str] = ["category", "is_digital"]
     search_fields: List[str] = ["name", "description"]
-    ordering_fields: List[str] = ["created_at", "name"]
+    ordering_fields: List[str] = ["created_at", "name", "popularity"]
     ordering: List[str] = ["-created_at"]
+    replica_read_actions: List[str] = [
+        "list",
+        "retrieve",
+        "list_by_category",
+        "analytics",
+    ]
 
     def get_cache_key(self, **kwargs: Dict[str, Any]) -> str:
         """
@@ -89,8 +100,12 @@ class ProductViewSet(viewsets.ModelViewSet):
            - Related category data
            - Prefetched related fields
            - Additional filters based on kwargs
+           - The request's filters, search and ordering
         4. Caches the result for 15 minutes
 
+        Filter backends run before caching, as ordering clones the
+        queryset and would discard the cached rows if applied to a hit.
+
         Args:
             **kwargs: Additional filters to apply to the queryset
 
@@ -127,6 +142,7 @@ class ProductViewSet(viewsets.ModelViewSet):
             elif "product_slug" in kwargs:
                 queryset = queryset.filter(slug=kwargs["product_slug"])
 
+            queryset = self.filter_queryset(queryset)
             cache.set(cache_key, queryset, timeout=60 * 15)
             return queryset
 
@@ -179,6 +195,11 @@ class ProductViewSet(viewsets.ModelViewSet):
         instance: Optional[Product] = self.get_cached_queryset(
             product_slug=kwargs.get("slug")
         ).first()
+        if instance is not None:
+            # Only buffered here; flush_content_views writes views in bulk
+            ContentView.record_view(
+                instance, request.user, request.META.get("REMOTE_ADDR")
+            )
         serializer = self.get_serializer(instance)
         return Response(serializer.data)
 
@@ -214,3 +235,37 @@ class ProductViewSet(viewsets.ModelViewSet):
             return self.get_paginated_response(serializer.data)
         serializer = self.get_serializer(queryset, many=True)
         return Response(serializer.data)
+
+    @swagger_auto_schema(
+        operation_summary="Product Analytics",
+        operation_description="Views and unique viewers of a product per "
+        "day, read from the daily rollups, and estimated distinct viewers "
+        "of the product and its category over the range. Admin only.",
+        responses={200: "Product analytics", 404: "Product not found"},
+    )
+    @action(methods=["get"], detail=True, permission_classes=[IsAdminUser])
+    def analytics(
+        self, request: Request, slug: Optional[str] = None
+    ) -> Response:
+        """
+        Summarise a product's views over the last ``days`` days.
+
+        Args:
+            request: HTTP request object, optionally with ``days`` (1-365,
+                default 30)
+            slug: Slug of the product
+
+        Returns:
+            Response: Total views, estimated distinct viewers and views
+            and unique viewers per day
+
+        Raises:
+            ValidationError: If ``days`` is not a number from 1 to 365
+        """
+        try:
+            days = int(request.query_params.get("days", 30))
+        except ValueError:
+            days = 0
+        if not 1 <= days <= 365:
+            raise ValidationError({"days": "Must be a number from 1 to 365."})
+        return Response(get_product_analytics(self.get_object(), days))
@@ -0,0 +1,173 @@
+import hashlib
+import logging
+import re
+from io import BytesIO
+from pathlib import Path
+from typing import Any, Optional
+
+import cloudinary.uploader
+import requests
+from django.conf import settings
+from django.core.files.storage import default_storage
+from PIL import Image, ImageOps
+
+from core_apps.common.images import flatten_to_rgb, store_content_addressed
+from core_apps.common.uploads import stage_chunks
+
+logger = logging.getLogger(__name__)
+
+# Formats accepted as avatar sources; avatars are always stored as JPEG
+ALLOWED_FORMATS = {"JPEG", "PNG", "WEBP", "GIF"}
+
+
+# Storage names given to avatars by ``AVATAR_STORAGE = "local"``
+LOCAL_AVATAR_NAME = re.compile(r"avatars/[0-9a-f]{2}/[0-9a-f]{64}\.jpg")
+
+# Bytes read from the social provider at a time when downloading avatars
+FETCH_CHUNK_SIZE = 64 * 1024
+
+
+class InvalidAvatar(Exception):
+    """Raised when an uploaded file is not an acceptable avatar image."""
+
+
+def get_avatar_source_hash(url: str) -> str:
+    """
+    Hash a social avatar URL, to tell whether it was already imported.
+
+    Args:
+        url: Avatar URL from the social provider
+
+    Returns:
+        str: Hex SHA-256 digest of the URL
+    """
+    return hashlib.sha256(url.encode()).hexdigest()
+
+
+def fetch_avatar(url: str) -> str:
+    """
+    Download a social avatar to the staging directory.
+
+    The response is streamed and abandoned as soon as it passes
+    ``AVATAR_MAX_UPLOAD_SIZE`` bytes, the same limit as direct uploads.
+
+    Args:
+        url: Avatar URL from the social provider
+
+    Returns:
+        str: Staging reference of the downloaded image
+
+    Raises:
+        requests.RequestException: If the download fails
+        UploadTooLarge: If the image is larger than uploads may be
+    """
+    with requests.get(
+        url, stream=True, timeout=settings.SOCIAL_AVATAR_FETCH_TIMEOUT
+    ) as response:
+        response.raise_for_status()
+        return stage_chunks(
+            response.iter_content(FETCH_CHUNK_SIZE),
+            settings.AVATAR_MAX_UPLOAD_SIZE,
+        )
+
+
+def prepare_avatar(path: Path) -> bytes:
+    """
+    Validate, downscale and re-encode an uploaded avatar.
+
+    The image is rotated according to its EXIF orientation, shrunk to fit
+    ``AVATAR_MAX_DIMENSION`` pixels and re-encoded as JPEG without EXIF,
+    ICC or other metadata, so location data from phone cameras is never
+    published.
+
+    Args:
+        path: File holding the uploaded image
+
+    Returns:
+        bytes: JPEG encoded avatar
+
+    Raises:
+        InvalidAvatar: If the file is not a supported, sane image
+    """
+    try:
+        with Image.open(path) as image:
+            if image.format not in ALLOWED_FORMATS:
+                raise InvalidAvatar(f"Unsupported image format {image.format}")
+            if image.width * image.height > settings.AVATAR_MAX_PIXELS:
+                raise InvalidAvatar(
+                    f"Image of {image.width}x{image.height} pixels is too large"
+                )
+            image.verify()
+
+        # verify() leaves the image unusable, so decode from a fresh handle
+        with Image.open(path) as image:
+            image = ImageOps.exif_transpose(image)
+            image.thumbnail(
+                (settings.AVATAR_MAX_DIMENSION, settings.AVATAR_MAX_DIMENSION)
+            )
+            image = flatten_to_rgb(image)
+    except (
+        OSError,
+        SyntaxError,
+        ValueError,
+        Image.DecompressionBombError,
+    ) as e:
+        raise InvalidAvatar(str(e)) from e
+
+    output = BytesIO()
+    image.save(
+        output, "JPEG", quality=settings.AVATAR_JPEG_QUALITY, optimize=True
+    )
+    return output.getvalue()
+
+
+def store_avatar(content: bytes) -> str:
+    """
+    Save a prepared avatar to the configured storage backend.
+
+    ``AVATAR_STORAGE`` selects Cloudinary or, for development without
+    Cloudinary credentials, the local media storage. Local files are named
+    after their content hash, so re-uploading the same avatar is a no-op.
+
+    Args:
+        content: JPEG encoded avatar
+
+    Returns:
+        str: Cloudinary public id or local storage name of the avatar
+    """
+    if settings.AVATAR_STORAGE == "local":
+        return store_content_addressed(content, "avatars", "jpg")
+
+    response = cloudinary.uploader.upload(
+        BytesIO(content), folder="avatars", resource_type="image"
+    )
+    return response["public_id"]
+
+
+def get_avatar_url(avatar: Any) -> Optional[str]:
+    """
+    Get the URL an avatar is served from, wherever it was stored.
+
+    Avatars stored locally are kept in the same ``CloudinaryField`` as
+    Cloudinary public ids, so their content-addressed names are told
+    apart and resolved through the local media storage instead.
+
+    Args:
+        avatar: Value of ``Profile.avatar``, a ``CloudinaryResource`` once
+            loaded or the stored name as just assigned
+
+    Returns:
+        str: URL of the avatar
+        None: If no avatar is set
+    """
+    if not avatar:
+        return None
+    if isinstance(avatar, str):
+        name = avatar
+    else:
+        name = avatar.public_id
+        if avatar.format:
+            name = f"{name}.{avatar.format}"
+    if LOCAL_AVATAR_NAME.fullmatch(name):
+        return default_storage.url(name)
+    return getattr(avatar, "url", None)
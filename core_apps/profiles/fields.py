@@ -0,0 +1,33 @@
+from typing import Any
+
+from autoslug import AutoSlugField
+from django.db.models import Model
+
+# Instance attribute marking a slug as allocated in bulk beforehand
+PREALLOCATED_SLUG = "_preallocated_slug"
+
+
+class PreallocatedAutoSlugField(AutoSlugField):
+    """
+    AutoSlugField that keeps slugs allocated in bulk before an insert.
+
+    AutoSlugField checks uniqueness with one query per saved instance,
+    which turns a ``bulk_create`` of thousands of rows into thousands of
+    queries. Instances flagged with ``PREALLOCATED_SLUG`` keep the slug
+    they carry; all other saves behave exactly like AutoSlugField.
+    """
+
+    def pre_save(self, instance: Model, add: bool) -> Any:
+        """
+        Return the preallocated slug, or generate one as AutoSlugField.
+
+        Args:
+            instance: Model instance being saved
+            add: Whether the instance is being inserted
+
+        Returns:
+            Any: Slug to store
+        """
+        if getattr(instance, PREALLOCATED_SLUG, False):
+            return self.value_from_object(instance)
+        return super().pre_save(instance, add)
@@ -0,0 +1,23 @@
+# Generated by Django 4.2.11 on 2026-10-19 05:01
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("profiles", "0002_initial"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="profile",
+            name="token_version",
+            field=models.PositiveIntegerField(
+                default=0,
+                editable=False,
+                help_text="Maintained automatically when the role changes",
+                verbose_name="Token Version",
+            ),
+        ),
+    ]
@@ -0,0 +1,61 @@
+# Generated by Django 4.2.11 on 2026-10-19 05:18
+
+from django.contrib.postgres.operations import TrigramExtension
+from django.db import migrations, models
+
+INDEX_NAME = "profiles_search_name_trgm"
+
+
+def populate_search_names(apps, schema_editor):
+    Profile = apps.get_model("profiles", "Profile")
+
+    profiles = list(Profile.objects.select_related("user"))
+    for profile in profiles:
+        names = [
+            profile.user.username,
+            profile.user.first_name,
+            profile.user.last_name,
+        ]
+        profile.search_name = " ".join(filter(None, names)).lower()
+    Profile.objects.bulk_update(profiles, ["search_name"], batch_size=1000)
+
+
+def create_trigram_index(apps, schema_editor):
+    if schema_editor.connection.vendor != "postgresql":
+        return
+    table = apps.get_model("profiles", "Profile")._meta.db_table
+    schema_editor.execute(
+        f"CREATE INDEX IF NOT EXISTS {INDEX_NAME} ON {table} "
+        f"USING gin (search_name gin_trgm_ops)"
+    )
+
+
+def drop_trigram_index(apps, schema_editor):
+    if schema_editor.connection.vendor != "postgresql":
+        return
+    schema_editor.execute(f"DROP INDEX IF EXISTS {INDEX_NAME}")
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("profiles", "0003_profile_token_version"),
+    ]
+
+    operations = [
+        TrigramExtension(),
+        migrations.AddField(
+            model_name="profile",
+            name="search_name",
+            field=models.CharField(
+                blank=True,
+                default="",
+                editable=False,
+                help_text="Maintained automatically from the user's names",
+                max_length=200,
+                verbose_name="Search Name",
+            ),
+        ),
+        migrations.RunPython(populate_search_names, migrations.RunPython.noop),
+        migrations.RunPython(create_trigram_index, drop_trigram_index),
+    ]
@@ -0,0 +1,24 @@
+# Generated by Django 4.2.11 on 2026-10-19 05:21
+
+import core_apps.profiles.fields
+import core_apps.profiles.models
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("profiles", "0004_profile_search_name"),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name="profile",
+            name="slug",
+            field=core_apps.profiles.fields.PreallocatedAutoSlugField(
+                editable=False,
+                populate_from=core_apps.profiles.models.get_user_username,
+                unique=True,
+            ),
+        ),
+    ]
@@ -0,0 +1,25 @@
+# Generated by Django 4.2.11 on 2026-10-19 09:12
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("profiles", "0005_profile_slug_preallocated"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="profile",
+            name="avatar_source_hash",
+            field=models.CharField(
+                blank=True,
+                default="",
+                editable=False,
+                help_text="Maintained automatically by social login",
+                max_length=64,
+                verbose_name="Avatar Source Hash",
+            ),
+        ),
+    ]
@@ -1,4 +1,5 @@
-from autoslug import AutoSlugField
+from typing import Any
+
 from cloudinary.models import CloudinaryField
 from django.contrib.auth import get_user_model
 from django.db import models
@@ -8,6 +9,8 @@ from phonenumber_field.modelfields import PhoneNumberField
 
 from core_apps.common.models import TimeStampedModel
 
+from .fields import PreallocatedAutoSlugField
+
 # Get the active User model as defined in settings
 User = get_user_model()
 
@@ -25,6 +28,20 @@ def get_user_username(instance: "Profile") -> str:
     return instance.user.username
 
 
+def get_search_name(user: User) -> str:
+    """
+    Build the lowercased name document profiles are searched by.
+
+    Args:
+        user: User whose names are combined
+
+    Returns:
+        str: Username, first and last name separated by spaces
+    """
+    names = [user.username, user.first_name, user.last_name]
+    return " ".join(filter(None, names)).lower()
+
+
 class Profile(TimeStampedModel):
     """
     User profile model storing additional user information.
@@ -42,6 +59,12 @@ class Profile(TimeStampedModel):
         country: User's country of residence
         city: User's city of residence
         slug: URL-friendly unique identifier
+        token_version: Bumped whenever the role or staff flags change so
+            JWTs carrying the old role claims are rejected
+        search_name: Lowercased username, first and last name, kept in
+            sync from user saves and trigram indexed for search
+        avatar_source_hash: SHA-256 of the social provider's avatar URL
+            last imported, so unchanged avatars are not fetched again
     """
 
     class UserType(models.TextChoices):
@@ -95,9 +118,33 @@ class Profile(TimeStampedModel):
     city: models.CharField = models.CharField(
         verbose_name=_("City"), max_length=180, default="Accra"
     )
-    slug: AutoSlugField = AutoSlugField(
+    slug: PreallocatedAutoSlugField = PreallocatedAutoSlugField(
         populate_from=get_user_username, unique=True
     )
+    token_version: models.PositiveIntegerField = models.PositiveIntegerField(
+        verbose_name=_("Token Version"),
+        default=0,
+        editable=False,
+        help_text=_("Maintained automatically when the role changes"),
+    )
+    # The trigram GIN index is created by migration 0004 on PostgreSQL
+    # only, since tests run on SQLite
+    search_name: models.CharField = models.CharField(
+        verbose_name=_("Search Name"),
+        max_length=200,
+        blank=True,
+        default="",
+        editable=False,
+        help_text=_("Maintained automatically from the user's names"),
+    )
+    avatar_source_hash: models.CharField = models.CharField(
+        verbose_name=_("Avatar Source Hash"),
+        max_length=64,
+        blank=True,
+        default="",
+        editable=False,
+        help_text=_("Maintained automatically by social login"),
+    )
 
     def __str__(self) -> str:
         """
@@ -108,6 +155,18 @@ class Profile(TimeStampedModel):
         """
         return f"{self.user.username}'s Profile"
 
+    def save(self, *args: Any, **kwargs: Any) -> None:
+        """
+        Save the profile, filling the search document of new profiles.
+
+        Args:
+            *args: Positional arguments passed to Model.save
+            **kwargs: Keyword arguments passed to Model.save
+        """
+        if self._state.adding and not self.search_name:
+            self.search_name = get_search_name(self.user)
+        super().save(*args, **kwargs)
+
     class Meta:
         """
         Model metadata options.
@@ -1,11 +1,17 @@
 import logging
 from typing import Any, Dict, Optional, Tuple
 
-import cloudinary.uploader
-from cloudinary.exceptions import Error as CloudinaryError
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
 from social_core.backends.base import BaseAuth
 
+from core_apps.profiles.avatars import get_avatar_source_hash
 from core_apps.profiles.models import Profile
+from core_apps.profiles.tasks import (
+    get_avatar_import_key,
+    import_social_avatar,
+)
 
 logger = logging.getLogger(__name__)
 
@@ -20,6 +26,11 @@ def save_profile(
     """
     Social auth pipeline to save user profile with Google OAuth avatar.
 
+    The avatar is not downloaded during the login request. An import task
+    is queued instead, unless the profile already holds the avatar from
+    this URL or an import of it is already queued, so repeated logins
+    neither block on the provider nor upload the same picture again.
+
     Args:
         backend: Authentication backend being used
         user: User instance that was created/authenticated
@@ -29,11 +40,8 @@ def save_profile(
 
     Returns:
         Optional[Tuple[Profile, bool]]: Tuple of (profile, created) if
-        successful,
+        the backend provided an avatar,
         None if no avatar update was needed
-
-    Raises:
-        CloudinaryError: If avatar upload to Cloudinary fails
     """
     if backend.name != "google-oauth2":
         return None
@@ -43,41 +51,31 @@ def save_profile(
         logger.debug("No avatar URL found in Google OAuth response")
         return None
 
-    try:
-        # Upload Google profile picture to Cloudinary
-        upload_result = cloudinary.uploader.upload(
-            avatar_url,
-            folder="avatars",  # Organize uploads in a folder
-            overwrite=True,  # Update existing avatar if any
-        )
-
-        # Get or create user profile
-        profile, created = Profile.objects.get_or_create(user=user)
-
-        # Save Cloudinary image ID to profile
-        profile.avatar = upload_result["public_id"]
-        profile.save()
+    profile, created = Profile.objects.get_or_create(user=user)
 
-        logger.info(
-            "Successfully updated avatar for user %s (profile_id=%s)",
+    source_hash = get_avatar_source_hash(avatar_url)
+    if profile.avatar_source_hash == source_hash:
+        logger.debug(
+            "Avatar of user %s is already imported (profile_id=%s)",
             user.username,
             profile.id,
         )
-
         return profile, created
 
-    except CloudinaryError as e:
-        logger.error(
-            "Failed to upload avatar to Cloudinary for user %s: %s",
-            user.username,
-            str(e),
+    # cache.add is atomic, so concurrent logins queue a single import
+    if cache.add(
+        get_avatar_import_key(profile.id, source_hash),
+        True,
+        settings.SOCIAL_AVATAR_IMPORT_LOCK_TIMEOUT,
+    ):
+        profile_id = str(profile.id)
+        transaction.on_commit(
+            lambda: import_social_avatar.delay(profile_id, avatar_url)
         )
-        raise
-
-    except Exception as e:
-        logger.error(
-            "Unexpected error while saving profile for user %s: %s",
+        logger.info(
+            "Queued avatar import for user %s (profile_id=%s)",
             user.username,
-            str(e),
+            profile.id,
         )
-        raise
+
+    return profile, created
@@ -6,6 +6,7 @@ from phonenumbers import parse as parse_phone
 from phonenumbers.phonenumberutil import NumberParseException
 from rest_framework import serializers
 
+from .avatars import get_avatar_url
 from .models import Profile
 
 
@@ -69,10 +70,11 @@ class ProfileSerializer(serializers.ModelSerializer):
             str: URL of the avatar if it exists
             None: If no avatar is set
         """
-        try:
-            return obj.avatar.url
-        except AttributeError:
-            return None
+        url = get_avatar_url(obj.avatar)
+        request = self.context.get("request")
+        if url is not None and request is not None:
+            url = request.build_absolute_uri(url)
+        return url
 
 
 class UpdateProfileSerializer(serializers.ModelSerializer):
@@ -2,11 +2,13 @@ import logging
 from typing import Any, Type
 
 from django.db.models.base import Model
-from django.db.models.signals import post_save
+from django.db.models.signals import post_init, post_save
 from django.dispatch import receiver
+from rest_framework_simplejwt.settings import api_settings
 
 from config.settings.base import AUTH_USER_MODEL
-from core_apps.profiles.models import Profile
+from core_apps.profiles.models import Profile, get_search_name
+from core_apps.users.tokens import bump_token_version
 
 logger = logging.getLogger(__name__)
 
@@ -40,3 +42,89 @@ def create_user_profile(
             f"Profile already exists for "
             f"{instance.first_name} {instance.last_name}"
         )
+        sync_search_name(instance)
+
+
+@receiver(post_init, sender=AUTH_USER_MODEL)
+def track_search_name(
+    sender: Type[Model], instance: Model, **kwargs: Any
+) -> None:
+    """
+    Remember the search document a user was loaded with.
+
+    Args:
+        sender: Model class that sent the signal (User model)
+        instance: User instance that was initialised
+        **kwargs: Additional signal arguments
+
+    Returns:
+        None
+    """
+    deferred = {"username", "first_name", "last_name"} & set(
+        instance.get_deferred_fields()
+    )
+    instance._loaded_search_name = (
+        None if deferred else get_search_name(instance)
+    )
+
+
+def sync_search_name(user: Model) -> None:
+    """
+    Copy a saved user's names to their profile's search document.
+
+    Nothing is written unless a name changed since the user was loaded.
+
+    Args:
+        user: User instance that was saved
+    """
+    search_name = get_search_name(user)
+    if search_name == user._loaded_search_name:
+        return
+    Profile.objects.filter(user=user).update(search_name=search_name)
+    user._loaded_search_name = search_name
+
+
+@receiver(post_init, sender=Profile)
+def track_user_type(
+    sender: Type[Model], instance: Profile, **kwargs: Any
+) -> None:
+    """
+    Remember the role a profile was loaded with.
+
+    Args:
+        sender: Model class that sent the signal (Profile model)
+        instance: Profile instance that was initialised
+        **kwargs: Additional signal arguments
+
+    Returns:
+        None
+    """
+    instance._loaded_user_type = instance.__dict__.get("user_type")
+
+
+@receiver(post_save, sender=Profile)
+def revoke_stale_role_claims(
+    sender: Type[Model], instance: Profile, created: bool, **kwargs: Any
+) -> None:
+    """
+    Bump the token version when a profile's role changes.
+
+    Tokens issued before the change carry the old role claim and are
+    rejected by the token-based permission classes from then on.
+
+    Args:
+        sender: Model class that sent the signal (Profile model)
+        instance: Profile instance that was saved
+        created: Boolean indicating if this is a new profile
+        **kwargs: Additional signal arguments
+
+    Returns:
+        None
+    """
+    if created or instance.user_type == instance._loaded_user_type:
+        return
+    bump_token_version(getattr(instance.user, api_settings.USER_ID_FIELD))
+    # Keep a later save of this instance from restoring the old version
+    instance.refresh_from_db(fields=["token_version"])
+    instance._loaded_user_type = instance.user_type
+    logger.info(f"Role changed to {instance.user_type} for {instance}")
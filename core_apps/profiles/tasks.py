@@ -1,31 +1,144 @@
+import logging
 from uuid import UUID
 
-import cloudinary.uploader
 from celery import shared_task
+from celery.app.task import Task
+from django.core.cache import cache
 
+from core_apps.common.uploads import (
+    UploadTooLarge,
+    discard_staged,
+    get_staged_path,
+)
+
+from .avatars import (
+    InvalidAvatar,
+    fetch_avatar,
+    get_avatar_source_hash,
+    prepare_avatar,
+    store_avatar,
+)
 from .models import Profile
 
+logger = logging.getLogger(__name__)
+
+
+def get_avatar_import_key(profile_id: UUID, source_hash: str) -> str:
+    """
+    Build the cache key marking a social avatar import as queued.
+
+    Args:
+        profile_id: The unique identifier of the user's profile
+        source_hash: Hash of the avatar URL being imported
+
+    Returns:
+        str: Cache key of the pending import
+    """
+    return f"avatar-import:{profile_id}:{source_hash}"
+
 
-@shared_task(name="upload_avatar_to_cloudinary")
-def upload_avatar_to_cloudinary(profile_id: UUID, image_content: bytes) -> None:
+@shared_task(
+    bind=True,
+    name="process_avatar_upload",
+    max_retries=3,
+    default_retry_delay=30,
+)
+def process_avatar_upload(self: Task, profile_id: UUID, reference: str) -> None:
     """
-    Asynchronous task to upload user avatar images to Cloudinary.
+    Asynchronous task turning a staged upload into the profile's avatar.
 
-    This task is executed in the background using Celery to prevent
-    blocking the main application thread during image uploads.
+    Only the staging reference travels through the broker; the image is
+    read from the staging directory, validated, downscaled and stripped of
+    metadata, then forwarded to the avatar storage backend. The staged
+    file is discarded once the avatar is stored, rejected, or the last
+    storage retry has failed.
 
     Args:
         profile_id: The unique identifier of the user's profile
-        image_content: The binary content of the image to upload
+        reference: Staging reference of the uploaded image
 
     Returns:
         None
 
     Raises:
         Profile.DoesNotExist: If profile with given ID is not found
-        cloudinary.Error: If upload to Cloudinary fails
+        cloudinary.Error: If the last upload attempt to Cloudinary fails
     """
+    try:
+        content = prepare_avatar(get_staged_path(reference))
+    except InvalidAvatar as e:
+        logger.warning(f"Rejected avatar upload for profile {profile_id}: {e}")
+        discard_staged(reference)
+        return
+
+    try:
+        avatar = store_avatar(content)
+    except Exception as e:
+        if self.request.retries < self.max_retries:
+            raise self.retry(exc=e)
+        discard_staged(reference)
+        raise
+    discard_staged(reference)
+
     profile = Profile.objects.get(id=profile_id)
-    response = cloudinary.uploader.upload(image_content)
-    profile.avatar = response["url"]
+    profile.avatar = avatar
     profile.save()
+
+
+@shared_task(
+    bind=True,
+    name="import_social_avatar",
+    acks_late=True,
+    max_retries=3,
+    default_retry_delay=60,
+)
+def import_social_avatar(self: Task, profile_id: UUID, avatar_url: str) -> None:
+    """
+    Asynchronous task importing a social provider's avatar for a profile.
+
+    The task is idempotent: it does nothing if the profile's stored source
+    hash already matches the URL, and records the hash together with the
+    avatar in one conditional update, so a duplicate or retried delivery
+    never uploads the same picture twice. The image goes through the same
+    validation and re-encoding as direct uploads.
+
+    Args:
+        profile_id: The unique identifier of the user's profile
+        avatar_url: Avatar URL from the social provider
+
+    Returns:
+        None
+
+    Raises:
+        requests.RequestException: If the last download attempt fails
+        cloudinary.Error: If the last upload attempt to Cloudinary fails
+    """
+    source_hash = get_avatar_source_hash(avatar_url)
+    pending = Profile.objects.filter(id=profile_id).exclude(
+        avatar_source_hash=source_hash
+    )
+    if not pending.exists():
+        cache.delete(get_avatar_import_key(profile_id, source_hash))
+        return
+
+    try:
+        reference = fetch_avatar(avatar_url)
+        try:
+            content = prepare_avatar(get_staged_path(reference))
+        finally:
+            discard_staged(reference)
+        avatar = store_avatar(content)
+    except (InvalidAvatar, UploadTooLarge) as e:
+        logger.warning(f"Rejected social avatar for profile {profile_id}: {e}")
+        # Remember the URL anyway, so every login does not fetch it again
+        pending.update(avatar_source_hash=source_hash)
+        return
+    except Exception as e:
+        if self.request.retries < self.max_retries:
+            raise self.retry(exc=e)
+        # Let a later login queue the import again
+        cache.delete(get_avatar_import_key(profile_id, source_hash))
+        raise
+
+    if pending.update(avatar=avatar, avatar_source_hash=source_hash):
+        logger.info(f"Imported social avatar for profile {profile_id}")
@@ -1,16 +1,24 @@
-from typing import Any, Type
+from typing import Any, Optional, Type
 
+from django.conf import settings
 from django.db.models import QuerySet
 from django_filters.rest_framework import DjangoFilterBackend
 from drf_yasg import openapi
 from drf_yasg.utils import swagger_auto_schema
-from rest_framework import filters, status, viewsets
+from rest_framework import status, viewsets
 from rest_framework.decorators import action
 from rest_framework.request import Request
 from rest_framework.response import Response
 from rest_framework.serializers import Serializer
 
+from core_apps.common.filters import TrigramSearchFilter
+from core_apps.common.mixins import ReplicaReadMixin
 from core_apps.common.renderers import GenericJSONRenderer
+from core_apps.common.uploads import (
+    StagingUploadHandler,
+    UploadTooLarge,
+    discard_staged,
+)
 
 from .models import Profile
 from .serializers import (
@@ -18,10 +26,10 @@ from .serializers import (
     ProfileSerializer,
     UpdateProfileSerializer,
 )
-from .tasks import upload_avatar_to_cloudinary
+from .tasks import process_avatar_upload
 
 
-class ProfileViewSet(viewsets.ModelViewSet):
+class ProfileViewSet(ReplicaReadMixin, viewsets.ModelViewSet):
     """
     ViewSet for managing user profiles.
 
@@ -32,17 +40,22 @@ class ProfileViewSet(viewsets.ModelViewSet):
         renderer_classes: Custom JSON renderer for consistent API responses
         object_label: Label used in response data
         filter_backends: Backend classes for filtering and searching
-        search_fields: Fields available for text search
+        trigram_search_field: Trigram indexed name document searched by
+            the ``search`` parameter
         filterset_fields: Fields available for filtering
         lookup_field: Field used for retrieving specific profiles
+        replica_read_actions: Public actions served from a read replica
+        throttle_scope: Rate scope, set per action for stricter limits
     """
 
     renderer_classes = [GenericJSONRenderer]
     object_label = "profiles"
-    filter_backends = [DjangoFilterBackend, filters.SearchFilter]
-    search_fields = ["user__username", "user__first_name", "user__last_name"]
+    filter_backends = [DjangoFilterBackend, TrigramSearchFilter]
+    trigram_search_field = "search_name"
     filterset_fields = ["user_type", "country", "city"]
     lookup_field = "slug"
+    replica_read_actions = ["list", "retrieve"]
+    throttle_scope: Optional[str] = None
 
     def get_queryset(self) -> QuerySet:
         """
@@ -82,7 +95,7 @@ class ProfileViewSet(viewsets.ModelViewSet):
                 "search",
                 openapi.IN_QUERY,
                 description="Search profiles by username, first name, or "
-                "last name",
+                "last name, tolerating typos; best matches first",
                 type=openapi.TYPE_STRING,
             ),
             openapi.Parameter(
@@ -165,10 +178,38 @@ class ProfileViewSet(viewsets.ModelViewSet):
                 description="Invalid request",
                 examples={"application/json": {"error": "Invalid image data"}},
             ),
+            413: openapi.Response(
+                description="Image file too large",
+                examples={
+                    "application/json": {
+                        "error": "Uploads are limited to 5242880 bytes."
+                    }
+                },
+            ),
         },
     )
-    @action(detail=False, methods=["patch"])
+    @action(detail=False, methods=["patch"], throttle_scope="upload_avatar")
     def upload_avatar(self, request):
+        # Stream the file to the staging directory, enforcing the size
+        # limit chunk by chunk, before anything reads the request body
+        request._request.upload_handlers = [
+            StagingUploadHandler(
+                request._request, max_size=settings.AVATAR_MAX_UPLOAD_SIZE
+            )
+        ]
+        try:
+            files = request.FILES
+        except UploadTooLarge as e:
+            return Response(
+                {"error": str(e)},
+                status=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+            )
+        except Exception as e:
+            return Response(
+                {"error": str(e)}, status=status.HTTP_400_BAD_REQUEST
+            )
+
+        queued = None
         try:
             profile = request.user.profile
             serializer = self.get_serializer(profile, data=request.data)
@@ -185,8 +226,8 @@ class ProfileViewSet(viewsets.ModelViewSet):
                     status=status.HTTP_400_BAD_REQUEST,
                 )
 
-            image_content = image.read()
-            upload_avatar_to_cloudinary.delay(str(profile.id), image_content)
+            process_avatar_upload.delay(str(profile.id), image.reference)
+            queued = image
 
             return Response(
                 {"message": "Avatar upload started."},
@@ -198,6 +239,13 @@ class ProfileViewSet(viewsets.ModelViewSet):
                 {"error": str(e)}, status=status.HTTP_400_BAD_REQUEST
             )
 
+        finally:
+            # The task owns the queued file; nothing else is needed
+            for _, uploads in files.lists():
+                for upload in uploads:
+                    if upload is not queued:
+                        discard_staged(upload.reference)
+
     @swagger_auto_schema(
         operation_summary="Create Profile",
         operation_description="Creates a new user profile. Note: Profiles are "
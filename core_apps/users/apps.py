@@ -6,3 +6,14 @@ class UsersConfig(AppConfig):
     default_auto_field = "django.db.models.BigAutoField"
     name = "core_apps.users"
     verbose_name = _("Users")
+
+    def ready(self) -> None:
+        """
+        Perform initialization tasks when app is ready.
+
+        Imports and registers signal handlers for user cache invalidation.
+
+        Returns:
+            None
+        """
+        import core_apps.users.signals  # noqa: F401
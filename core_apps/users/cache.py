@@ -0,0 +1,215 @@
+import copy
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Hashable, Optional, Tuple
+
+from django.conf import settings
+from django.core.cache import cache
+
+
+class LocalTTLCache:
+    """
+    Thread-safe, size-bounded LRU cache whose entries expire after a TTL.
+
+    Used as a per-process tier in front of the shared cache, so repeated
+    lookups within one worker do not even reach Redis.
+
+    Attributes:
+        maxsize: Maximum number of entries kept before evicting the least
+            recently used one
+        timeout: Seconds an entry stays valid
+    """
+
+    def __init__(self, maxsize: int, timeout: float) -> None:
+        self.maxsize = maxsize
+        self.timeout = timeout
+        self._entries: "OrderedDict[Hashable, Tuple[float, Any]]" = (
+            OrderedDict()
+        )
+        self._lock = threading.Lock()
+
+    def get(self, key: Hashable) -> Optional[Any]:
+        """
+        Get a live entry and mark it as recently used.
+
+        Args:
+            key: Entry key
+
+        Returns:
+            Optional[Any]: Cached value, or None if missing or expired
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            expires_at, value = entry
+            if expires_at <= time.monotonic():
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return value
+
+    def set(self, key: Hashable, value: Any) -> None:
+        """
+        Store an entry, evicting the least recently used one if full.
+
+        Args:
+            key: Entry key
+            value: Value to cache
+        """
+        with self._lock:
+            self._entries[key] = (time.monotonic() + self.timeout, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+    def delete(self, key: Hashable) -> None:
+        """
+        Remove an entry if present.
+
+        Args:
+            key: Entry key
+        """
+        with self._lock:
+            self._entries.pop(key, None)
+
+    def clear(self) -> None:
+        """Remove every entry."""
+        with self._lock:
+            self._entries.clear()
+
+
+# Per-process tier of the authenticated user cache
+local_user_cache = LocalTTLCache(
+    maxsize=settings.USER_CACHE_LOCAL_SIZE,
+    timeout=settings.USER_CACHE_LOCAL_TIMEOUT,
+)
+
+
+def get_user_version_key(user_id: Any) -> str:
+    """
+    Get the shared cache key holding a user's cache version.
+
+    Args:
+        user_id: Public id of the user, as stored in JWT claims
+
+    Returns:
+        str: Cache key
+    """
+    return f"auth:user-version:{user_id}"
+
+
+def get_user_cache_key(user_id: Any, version: int) -> str:
+    """
+    Get the shared cache key of one version of a cached user.
+
+    Args:
+        user_id: Public id of the user, as stored in JWT claims
+        version: Current cache version of the user
+
+    Returns:
+        str: Cache key
+    """
+    return f"auth:user:{user_id}:v{version}"
+
+
+def get_user_version(user_id: Any) -> Optional[int]:
+    """
+    Get a user's current cache version.
+
+    A missing version, never set or evicted, is started at the current
+    time in nanoseconds rather than at 0, so entries cached under an
+    earlier run of versions can never be read again.
+
+    Args:
+        user_id: Public id of the user, as stored in JWT claims
+
+    Returns:
+        Optional[int]: Current version, None if the shared cache cannot
+        provide one, in which case neither tier may be used
+    """
+    version_key = get_user_version_key(user_id)
+    version: Optional[int] = cache.get(version_key)
+    if version is None:
+        cache.add(version_key, time.time_ns(), timeout=None)
+        version = cache.get(version_key)
+    return version
+
+
+def get_cached_user(user_id: Any) -> Optional[Any]:
+    """
+    Look up an authenticated user in the local and shared caches.
+
+    The local tier is checked first; entries there live for at most
+    ``USER_CACHE_LOCAL_TIMEOUT`` seconds, which bounds how long another
+    process's version bump can go unnoticed. On a local miss the shared
+    cache is read under the user's current version, so bumped entries are
+    never served from it.
+
+    Args:
+        user_id: Public id of the user, as stored in JWT claims
+
+    Returns:
+        Optional[User]: A copy of the cached user, or None on a miss
+    """
+    key = str(user_id)
+    user = local_user_cache.get(key)
+    if user is None:
+        version = get_user_version(key)
+        if version is None:
+            return None
+        user = cache.get(get_user_cache_key(key, version))
+        if user is None:
+            return None
+        local_user_cache.set(key, user)
+    # Hand out copies so request code cannot mutate the shared instance
+    return copy.copy(user)
+
+
+def cache_user(user_id: Any, user: Any, version: Optional[int]) -> None:
+    """
+    Store an authenticated user in both cache tiers.
+
+    The version must be read before the user is loaded: a save committed
+    in between bumps the version, so the stale copy is orphaned instead
+    of being stored under the new version.
+
+    Args:
+        user_id: Public id of the user, as stored in JWT claims
+        user: User instance loaded from the database
+        version: Cache version read before loading the user, None to
+            skip caching
+    """
+    if version is None:
+        return
+    key = str(user_id)
+    cache.set(
+        get_user_cache_key(key, version),
+        user,
+        timeout=settings.USER_CACHE_TIMEOUT,
+    )
+    local_user_cache.set(key, user)
+
+
+def bump_user_version(user_id: Any) -> None:
+    """
+    Invalidate every cached copy of a user.
+
+    Incrementing the version orphans the shared cache entry, which then
+    expires on its own, and the local entry of this process is dropped
+    immediately.
+
+    Args:
+        user_id: Public id of the user, as stored in JWT claims
+    """
+    key = str(user_id)
+    version_key = get_user_version_key(key)
+    # add() is a no-op when the key exists, so incr() always has a target
+    cache.add(version_key, time.time_ns(), timeout=None)
+    try:
+        cache.incr(version_key)
+    except ValueError:
+        # Evicted between add() and incr(), or the cache is unavailable
+        cache.set(version_key, time.time_ns(), timeout=None)
+    local_user_cache.delete(key)
@@ -0,0 +1,130 @@
+import asyncio
+import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, Optional
+
+from django.conf import settings
+from django.contrib.auth.hashers import check_password, make_password
+
+logger = logging.getLogger(__name__)
+
+
+class LoginOverloaded(Exception):
+    """Raised when too many password checks are already waiting."""
+
+
+class PasswordVerifier:
+    """
+    Runs password hash verification in a bounded thread pool.
+
+    Argon2 verification takes hundreds of milliseconds of CPU; running it
+    in a small dedicated pool keeps the event loop free, and admission
+    control rejects new logins outright once ``max_pending`` checks are
+    queued or running instead of letting latency grow without bound.
+
+    Attributes:
+        max_workers: Number of threads verifying hashes concurrently
+        max_pending: Maximum checks queued or running before new ones are
+            rejected
+        rejected: Number of checks rejected since startup
+    """
+
+    def __init__(self, max_workers: int, max_pending: int) -> None:
+        self.max_workers = max_workers
+        self.max_pending = max_pending
+        self.rejected = 0
+        self._pending = 0
+        self._lock = threading.Lock()
+        self._executor: Optional[ThreadPoolExecutor] = None
+
+    @property
+    def pending(self) -> int:
+        """
+        Get the queue depth: checks waiting for or holding a pool thread.
+
+        Returns:
+            int: Number of pending checks
+        """
+        return self._pending
+
+    @property
+    def executor(self) -> ThreadPoolExecutor:
+        """
+        Get the thread pool, creating it on first use.
+
+        Returns:
+            ThreadPoolExecutor: Pool dedicated to password hashing
+        """
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(
+                max_workers=self.max_workers,
+                thread_name_prefix="password-hash",
+            )
+        return self._executor
+
+    def get_stats(self) -> Dict[str, int]:
+        """
+        Get the current pool metrics.
+
+        Returns:
+            Dict[str, int]: Queue depth, capacity and rejected checks
+        """
+        return {
+            "pending": self._pending,
+            "max_pending": self.max_pending,
+            "workers": self.max_workers,
+            "rejected": self.rejected,
+        }
+
+    async def verify(self, user: Optional[Any], password: str) -> bool:
+        """
+        Check a password against a user's hash without blocking the loop.
+
+        Unknown users still pay for one hash so response times do not
+        reveal which emails are registered. Outdated hashes of correct
+        passwords are re-hashed in the pool and must then be saved by the
+        caller.
+
+        Args:
+            user: User being logged in, or None if the email is unknown
+            password: Raw password submitted
+
+        Returns:
+            bool: True if the password is correct
+
+        Raises:
+            LoginOverloaded: If the pool already has ``max_pending`` checks
+        """
+        with self._lock:
+            if self._pending >= self.max_pending:
+                self.rejected += 1
+                logger.warning(
+                    f"Login rejected, password queue full: {self.get_stats()}"
+                )
+                raise LoginOverloaded()
+            self._pending += 1
+
+        try:
+            loop = asyncio.get_running_loop()
+            if user is None:
+                await loop.run_in_executor(
+                    self.executor, make_password, password
+                )
+                return False
+            return await loop.run_in_executor(
+                self.executor,
+                check_password,
+                password,
+                user.password,
+                user.set_password,
+            )
+        finally:
+            with self._lock:
+                self._pending -= 1
+
+
+password_verifier = PasswordVerifier(
+    max_workers=settings.LOGIN_HASH_WORKERS,
+    max_pending=settings.LOGIN_MAX_PENDING,
+)
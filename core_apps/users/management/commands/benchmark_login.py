@@ -0,0 +1,190 @@
+import asyncio
+import statistics
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, List
+
+from django.contrib.auth import get_user_model
+from django.contrib.auth.hashers import make_password
+from django.core.management.base import BaseCommand, CommandParser
+from django.test import AsyncRequestFactory, RequestFactory
+
+from core_apps.users.views import AsyncLoginView, CustomTokenObtainPairView
+
+User = get_user_model()
+
+PASSWORD = "benchmark-password"
+
+
+class Command(BaseCommand):
+    """
+    Management command comparing login throughput of the two login paths.
+
+    The sync DRF view is driven from a pool of threads standing in for
+    WSGI workers, and the async view from concurrent coroutines on one
+    event loop, as under ASGI. Both verify a real Argon2 hash. A throwaway
+    user is created for the run and deleted afterwards.
+    """
+
+    help = "Benchmark WSGI vs ASGI login throughput under concurrency"
+
+    def add_arguments(self, parser: CommandParser) -> None:
+        """
+        Add command arguments.
+
+        Args:
+            parser: Command argument parser
+        """
+        parser.add_argument("--requests", type=int, default=100)
+        parser.add_argument(
+            "--concurrency",
+            type=int,
+            default=16,
+            help="Concurrent logins; also the number of simulated workers",
+        )
+
+    def handle(self, *args: Any, **options: Any) -> None:
+        """
+        Run both benchmarks and print throughput and latency.
+
+        Args:
+            *args: Additional positional arguments
+            **options: Command options
+        """
+        email = f"benchmark-{uuid.uuid4().hex[:8]}@example.com"
+        user = User.objects.create_user(
+            username=email.split("@")[0],
+            first_name="Benchmark",
+            last_name="User",
+            email=email,
+            password=PASSWORD,
+            is_active=True,
+        )
+        User.objects.filter(pk=user.pk).update(
+            password=make_password(PASSWORD, hasher="argon2")
+        )
+        payload = {"email": email, "password": PASSWORD}
+        total, concurrency = options["requests"], options["concurrency"]
+
+        try:
+            wsgi = self.run_wsgi(payload, total, concurrency)
+            asgi = asyncio.run(self.run_asgi(payload, total, concurrency))
+        finally:
+            user.delete()
+
+        self.report("WSGI (sync view, thread per worker)", wsgi)
+        self.report("ASGI (async view, bounded hash pool)", asgi)
+
+    def run_wsgi(
+        self, payload: Dict[str, str], total: int, concurrency: int
+    ) -> Dict[str, Any]:
+        """
+        Drive the sync view from ``concurrency`` threads.
+
+        Args:
+            payload: Login credentials
+            total: Number of logins
+            concurrency: Number of worker threads
+
+        Returns:
+            Dict[str, Any]: Elapsed time, latencies and status codes
+        """
+        # Throttling would reject most of the burst
+        view = CustomTokenObtainPairView.as_view(throttle_classes=[])
+        factory = RequestFactory()
+
+        def login() -> Any:
+            request = factory.post(
+                "/api/v1/auth/login/", payload, content_type="application/json"
+            )
+            return view(request)
+
+        started = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=concurrency) as pool:
+            results = list(pool.map(lambda _: self.timed(login), range(total)))
+        return self.collect(results, time.perf_counter() - started)
+
+    async def run_asgi(
+        self, payload: Dict[str, str], total: int, concurrency: int
+    ) -> Dict[str, Any]:
+        """
+        Drive the async view from ``concurrency`` concurrent coroutines.
+
+        Args:
+            payload: Login credentials
+            total: Number of logins
+            concurrency: Maximum logins in flight
+
+        Returns:
+            Dict[str, Any]: Elapsed time, latencies and status codes
+        """
+        # Throttling would reject most of the burst
+        view = AsyncLoginView.as_view(throttle_classes=())
+        factory = AsyncRequestFactory()
+        semaphore = asyncio.Semaphore(concurrency)
+
+        async def login() -> Any:
+            async with semaphore:
+                request = factory.post(
+                    "/api/v1/auth/login/",
+                    payload,
+                    content_type="application/json",
+                )
+                started = time.perf_counter()
+                response = await view(request)
+                return time.perf_counter() - started, response.status_code
+
+        started = time.perf_counter()
+        results = await asyncio.gather(*(login() for _ in range(total)))
+        return self.collect(results, time.perf_counter() - started)
+
+    def timed(self, call: Callable[[], Any]) -> Any:
+        """
+        Time one sync login.
+
+        Args:
+            call: Function performing the login
+
+        Returns:
+            Tuple[float, int]: Latency in seconds and status code
+        """
+        started = time.perf_counter()
+        response = call()
+        return time.perf_counter() - started, response.status_code
+
+    def collect(self, results: List[Any], elapsed: float) -> Dict[str, Any]:
+        """
+        Summarise a benchmark run.
+
+        Args:
+            results: (latency, status code) per login
+            elapsed: Wall-clock duration of the run
+
+        Returns:
+            Dict[str, Any]: Throughput, latency percentiles and statuses
+        """
+        latencies = sorted(latency for latency, _ in results)
+        statuses: Dict[int, int] = {}
+        for _, code in results:
+            statuses[code] = statuses.get(code, 0) + 1
+        return {
+            "throughput": len(results) / elapsed,
+            "p50": statistics.median(latencies) * 1000,
+            "p95": latencies[int(len(latencies) * 0.95) - 1] * 1000,
+            "statuses": statuses,
+        }
+
+    def report(self, label: str, result: Dict[str, Any]) -> None:
+        """
+        Print one benchmark result.
+
+        Args:
+            label: Name of the login path
+            result: Summary from ``collect``
+        """
+        self.stdout.write(
+            f"{label}: {result['throughput']:.1f} logins/s, "
+            f"p50 {result['p50']:.0f} ms, p95 {result['p95']:.0f} ms, "
+            f"statuses {result['statuses']}"
+        )
@@ -0,0 +1,78 @@
+import json
+from typing import Any
+
+from django.core.management.base import BaseCommand, CommandError, CommandParser
+
+from core_apps.profiles.models import Profile
+from core_apps.users.provisioning import provision_users
+
+
+class Command(BaseCommand):
+    """
+    Management command creating many users and profiles from JSON.
+
+    The file holds a list of account records with ``email``, ``username``,
+    ``first_name``, ``last_name`` and optionally ``user_type`` and a
+    pre-hashed ``password``.
+    """
+
+    help = "Create users and their profiles in bulk from a JSON file"
+
+    def add_arguments(self, parser: CommandParser) -> None:
+        """
+        Add command arguments.
+
+        Args:
+            parser: Command argument parser
+        """
+        parser.add_argument("path", help="Path to the JSON dataset")
+        parser.add_argument(
+            "--user-type",
+            choices=Profile.UserType.values,
+            default=Profile.UserType.BUYER,
+            help="Role of records that do not set their own",
+        )
+        parser.add_argument(
+            "--inactive",
+            action="store_true",
+            help="Create the accounts inactive",
+        )
+        parser.add_argument("--batch-size", type=int, default=None)
+
+    def handle(self, *args: Any, **options: Any) -> None:
+        """
+        Provision the dataset and report the summary.
+
+        Args:
+            *args: Additional positional arguments
+            **options: Command options
+
+        Raises:
+            CommandError: If the file cannot be read or is not a list
+        """
+        try:
+            with open(options["path"], encoding="utf-8") as f:
+                data = json.load(f)
+        except (OSError, ValueError) as e:
+            raise CommandError(f"Could not read {options['path']}: {e}")
+        if not isinstance(data, list):
+            raise CommandError("The dataset must be a list of users")
+
+        summary = provision_users(
+            data,
+            user_type=options["user_type"],
+            is_active=not options["inactive"],
+            batch_size=options["batch_size"],
+        )
+
+        for rejection in summary["rejected"]:
+            self.stderr.write(
+                f"Record {rejection['index']} ({rejection['email']}): "
+                f"{rejection['error']}"
+            )
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Provisioned users: created={summary['created']}, "
+                f"skipped={summary['skipped']}, failed={summary['failed']}"
+            )
+        )
@@ -0,0 +1,357 @@
+import logging
+import secrets
+from collections import Counter
+from typing import Any, Dict, Iterable, List, Optional, Set, Tuple
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.contrib.auth.hashers import (
+    UNUSABLE_PASSWORD_PREFIX,
+    identify_hasher,
+)
+from django.core.exceptions import ValidationError
+from django.db import IntegrityError, transaction
+
+from core_apps.profiles.fields import PREALLOCATED_SLUG
+from core_apps.profiles.models import Profile, get_search_name
+
+logger = logging.getLogger(__name__)
+
+User = get_user_model()
+
+# Keys every provisioning record must have
+REQUIRED_FIELDS = ("email", "username", "first_name", "last_name")
+
+# Keys whose values, when given, must be strings
+STRING_FIELDS = REQUIRED_FIELDS + ("password", "user_type")
+
+
+def allocate_profile_slugs(usernames: List[str]) -> List[str]:
+    """
+    Allocate unique profile slugs for many usernames at once.
+
+    Slugs follow AutoSlugField's scheme (``name``, ``name-2``, ...) but
+    existing slugs are read in one query, plus one per colliding base,
+    instead of one query per profile.
+
+    Args:
+        usernames: Usernames of the new profiles
+
+    Returns:
+        List[str]: One unique slug per username, in order
+    """
+    field = Profile._meta.get_field("slug")
+    bases = [
+        field.slugify(username)[: field.max_length] or "profile"
+        for username in usernames
+    ]
+    taken: Set[str] = set(
+        Profile.objects.filter(slug__in=set(bases)).values_list(
+            "slug", flat=True
+        )
+    )
+    repeated = {base for base, count in Counter(bases).items() if count > 1}
+    for base in taken | repeated:
+        taken.update(
+            Profile.objects.filter(
+                slug__startswith=f"{base}{field.index_sep}"
+            ).values_list("slug", flat=True)
+        )
+
+    slugs: List[str] = []
+    for base in bases:
+        slug, index = base, 2
+        while slug in taken:
+            tail = f"{field.index_sep}{index}"
+            slug, index = (
+                f"{base[: field.max_length - len(tail)]}{tail}",
+                index + 1,
+            )
+        taken.add(slug)
+        slugs.append(slug)
+    return slugs
+
+
+def build_user(
+    record: Dict[str, Any], is_active: bool
+) -> Tuple[Optional[Any], Optional[str]]:
+    """
+    Validate one record and build its unsaved user.
+
+    Args:
+        record: Provisioning record
+        is_active: Whether the account can log in right away
+
+    Returns:
+        Tuple: The user, or None and the reason the record was rejected
+    """
+    wrong = [
+        key
+        for key in STRING_FIELDS
+        if record.get(key) is not None and not isinstance(record[key], str)
+    ]
+    if wrong:
+        return None, f"Not a string: {', '.join(wrong)}"
+
+    missing = [key for key in REQUIRED_FIELDS if not record.get(key)]
+    if missing:
+        return None, f"Missing {', '.join(missing)}"
+
+    password = record.get("password")
+    if password:
+        try:
+            identify_hasher(password)
+        except ValueError:
+            return None, "Password is not a hash from a supported hasher"
+    else:
+        # Same as make_password(None), minus 40 secrets.choice() calls
+        password = UNUSABLE_PASSWORD_PREFIX + secrets.token_urlsafe(30)
+
+    user = User(
+        email=User.objects.normalize_email(record["email"]),
+        username=User.normalize_username(record["username"]),
+        first_name=record["first_name"],
+        last_name=record["last_name"],
+        password=password,
+        is_active=is_active,
+    )
+    try:
+        user.clean_fields(exclude=["password"])
+    except ValidationError as e:
+        return None, "; ".join(
+            f"{field}: {' '.join(messages)}"
+            for field, messages in e.message_dict.items()
+        )
+    return user, None
+
+
+# A record's position in the input, the record and its unsaved user
+Entry = Tuple[int, Dict[str, Any], Any]
+
+
+def reject_record(
+    summary: Dict[str, Any],
+    outcome: str,
+    index: int,
+    record: Dict[str, Any],
+    reason: str,
+) -> None:
+    """
+    Count a record that was not created and report why.
+
+    Args:
+        summary: Provisioning summary to update
+        outcome: Counter to increment, ``skipped`` or ``failed``
+        index: Position of the record in the input
+        record: The record
+        reason: Why the record was not created
+    """
+    summary[outcome] += 1
+    summary["rejected"].append(
+        {"index": index, "email": record.get("email"), "error": reason}
+    )
+
+
+def validate_chunk(
+    records: List[Any],
+    start: int,
+    user_type: str,
+    is_active: bool,
+    summary: Dict[str, Any],
+) -> List[Entry]:
+    """
+    Build the users of one chunk, failing the invalid records.
+
+    Args:
+        records: Records of the chunk
+        start: Position of the chunk's first record in the input
+        user_type: Role of records that do not set ``user_type``
+        is_active: Whether the accounts can log in right away
+        summary: Provisioning summary to update
+
+    Returns:
+        List[Entry]: The valid records and their users
+    """
+    user_types = set(Profile.UserType.values)
+    chunk: List[Entry] = []
+    for index, record in enumerate(records, start=start):
+        if not isinstance(record, dict):
+            reject_record(
+                summary, "failed", index, {}, "Record is not an object"
+            )
+            continue
+        user, error = build_user(record, is_active)
+        if error:
+            reject_record(summary, "failed", index, record, error)
+        elif record.get("user_type", user_type) not in user_types:
+            reject_record(summary, "failed", index, record, "Unknown user_type")
+        else:
+            chunk.append((index, record, user))
+    return chunk
+
+
+def dedupe_chunk(
+    chunk: List[Entry],
+    seen_emails: Set[str],
+    seen_usernames: Set[str],
+    summary: Dict[str, Any],
+) -> List[Entry]:
+    """
+    Skip the records of a chunk whose email or username is taken.
+
+    Emails and usernames already registered are read in one query each
+    and added to the seen sets, along with those the chunk claims, so
+    repeats in later chunks are skipped too.
+
+    Args:
+        chunk: Valid records of the chunk and their users
+        seen_emails: Emails registered or claimed so far
+        seen_usernames: Usernames registered or claimed so far
+        summary: Provisioning summary to update
+
+    Returns:
+        List[Entry]: The records to create
+    """
+    seen_emails.update(
+        User.objects.filter(
+            email__in={user.email for _, _, user in chunk}
+        ).values_list("email", flat=True)
+    )
+    seen_usernames.update(
+        User.objects.filter(
+            username__in={user.username for _, _, user in chunk}
+        ).values_list("username", flat=True)
+    )
+
+    new: List[Entry] = []
+    for index, record, user in chunk:
+        if user.email in seen_emails:
+            reject_record(
+                summary, "skipped", index, record, "Email already registered"
+            )
+        elif user.username in seen_usernames:
+            reject_record(
+                summary, "skipped", index, record, "Username already taken"
+            )
+        else:
+            seen_emails.add(user.email)
+            seen_usernames.add(user.username)
+            new.append((index, record, user))
+    return new
+
+
+def insert_users(new: List[Entry], user_type: str) -> None:
+    """
+    Insert the users of one chunk and their profiles in a transaction.
+
+    Args:
+        new: Records to create and their users
+        user_type: Role of records that do not set ``user_type``
+
+    Raises:
+        IntegrityError: If a user or profile conflicts with a concurrent
+            registration
+    """
+    users = [user for _, _, user in new]
+    slugs = allocate_profile_slugs([user.username for user in users])
+    with transaction.atomic():
+        User.objects.bulk_create(users)
+        if any(user.pk is None for user in users):
+            # Backends that cannot return ids from bulk inserts
+            pks = dict(
+                User.objects.filter(
+                    id__in=[user.id for user in users]
+                ).values_list("id", "pkid")
+            )
+            for user in users:
+                user.pk = pks[user.id]
+
+        profiles = []
+        for (_, record, user), slug in zip(new, slugs):
+            profile = Profile(
+                user=user,
+                user_type=record.get("user_type", user_type),
+                slug=slug,
+                search_name=get_search_name(user),
+            )
+            setattr(profile, PREALLOCATED_SLUG, True)
+            profiles.append(profile)
+        Profile.objects.bulk_create(profiles)
+
+
+def provision_users(
+    records: Iterable[Dict[str, Any]],
+    user_type: str = Profile.UserType.BUYER,
+    is_active: bool = True,
+    batch_size: Optional[int] = None,
+) -> Dict[str, Any]:
+    """
+    Create users and their profiles in chunked bulk inserts.
+
+    Each record holds ``email``, ``username``, ``first_name`` and
+    ``last_name``, and optionally ``user_type`` and ``password``. Passwords
+    must already be hashed by one of ``PASSWORD_HASHERS``; records without
+    one get an unusable password and set theirs through password reset.
+    Nothing is hashed here, so tens of thousands of accounts are created
+    in seconds.
+
+    Every chunk of ``batch_size`` records costs a handful of queries: one
+    each to find taken emails, usernames and slugs, then one bulk insert
+    of users and one of profiles, in a transaction of its own. Records
+    that are invalid, repeated or already registered are skipped and
+    reported. ``post_save`` signals are not sent, so the profile search
+    name and slug are filled here.
+
+    Args:
+        records: Accounts to create
+        user_type: Role of records that do not set ``user_type``
+        is_active: Whether the accounts can log in right away
+        batch_size: Records per chunk, ``USER_PROVISION_BATCH_SIZE`` if None
+
+    Returns:
+        Dict[str, Any]: Numbers of created, skipped and failed records and
+        the reason for each record that was not created
+    """
+    batch_size = batch_size or settings.USER_PROVISION_BATCH_SIZE
+    records = list(records)
+    summary: Dict[str, Any] = {
+        "created": 0,
+        "skipped": 0,
+        "failed": 0,
+        "rejected": [],
+    }
+    seen_emails: Set[str] = set()
+    seen_usernames: Set[str] = set()
+
+    for start in range(0, len(records), batch_size):
+        chunk = validate_chunk(
+            records[start : start + batch_size],  # noqa: E203
+            start,
+            user_type,
+            is_active,
+            summary,
+        )
+        new = dedupe_chunk(chunk, seen_emails, seen_usernames, summary)
+        if not new:
+            continue
+        try:
+            insert_users(new, user_type)
+        except IntegrityError as e:
+            logger.warning(f"Provisioning chunk at {start} conflicted: {e}")
+            for index, record, _ in new:
+                reject_record(
+                    summary,
+                    "failed",
+                    index,
+                    record,
+                    "Conflicted with a registration",
+                )
+            continue
+        summary["created"] += len(new)
+
+    summary["rejected"].sort(key=lambda rejection: rejection["index"])
+    logger.info(
+        f"Provisioned {summary['created']} users, skipped "
+        f"{summary['skipped']}, failed {summary['failed']}"
+    )
+    return summary
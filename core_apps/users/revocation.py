@@ -0,0 +1,176 @@
+import logging
+import random
+import threading
+import time
+from datetime import datetime
+from typing import Optional
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import connection
+from django.utils import timezone
+from rest_framework_simplejwt.token_blacklist.models import BlacklistedToken
+
+from core_apps.common.cache import is_cache_available
+from core_apps.common.sketches import BloomFilter
+
+logger = logging.getLogger(__name__)
+
+
+class RevocationFilter:
+    """
+    Per-process Bloom filter of revoked refresh token ids.
+
+    The filter is rebuilt from the blacklist of unexpired tokens about
+    every ``TOKEN_REVOCATION_FILTER_TTL`` seconds. Revocations made since
+    then, in any process, are found through exact entries in the shared
+    cache.
+
+    Only the first lookup of a process builds the filter on the request
+    path; concurrent lookups wait for that one build. A stale filter keeps
+    answering while a single background thread rebuilds it, and each
+    process's interval is jittered so workers do not all rescan the
+    blacklist at the same moment.
+
+    Attributes:
+        bloom: Filter holding every revoked jti known at the last rebuild
+        built_at: Monotonic time of the last rebuild
+        ttl: Seconds this process keeps a filter before rebuilding it
+    """
+
+    def __init__(self) -> None:
+        self.bloom: Optional[BloomFilter] = None
+        self.built_at: float = 0.0
+        self.ttl: float = 0.0
+        self._lock = threading.Lock()
+        self._rebuilding = threading.Lock()
+
+    def rebuild(self) -> None:
+        """Reload the filter from the blacklist of unexpired tokens."""
+        jtis = BlacklistedToken.objects.filter(
+            token__expires_at__gt=timezone.now()
+        ).values_list("token__jti", flat=True)
+        count = jtis.count()
+        bloom = BloomFilter(
+            capacity=max(count * 2, settings.TOKEN_REVOCATION_FILTER_CAPACITY)
+        )
+        bloom.update(jtis.iterator(chunk_size=2000))
+        ttl = settings.TOKEN_REVOCATION_FILTER_TTL * random.uniform(1.0, 1.2)
+        with self._lock:
+            self.bloom, self.built_at, self.ttl = bloom, time.monotonic(), ttl
+        logger.debug(f"Token revocation filter rebuilt with {count} tokens")
+
+    def rebuild_in_background(self) -> None:
+        """
+        Start a rebuild in a thread unless one is already running.
+        """
+        if not self._rebuilding.acquire(blocking=False):
+            return
+        threading.Thread(
+            target=self._run_rebuild, name="revocation-filter", daemon=True
+        ).start()
+
+    def _run_rebuild(self) -> None:
+        """Rebuild in the background thread, then release its connection."""
+        try:
+            self.rebuild()
+        except Exception:
+            logger.exception("Token revocation filter rebuild failed")
+        finally:
+            connection.close()
+            self._rebuilding.release()
+
+    def might_contain(self, jti: str) -> bool:
+        """
+        Check the filter, building it first if this process has none.
+
+        Args:
+            jti: Token id to look up
+
+        Returns:
+            bool: False if the token was definitely not revoked before the
+            last rebuild
+        """
+        bloom = self.bloom
+        if bloom is None:
+            with self._rebuilding:
+                if self.bloom is None:
+                    self.rebuild()
+            bloom = self.bloom
+        elif time.monotonic() - self.built_at > self.ttl:
+            self.rebuild_in_background()
+        return jti in bloom
+
+    def add(self, jti: str) -> None:
+        """
+        Add a newly revoked token id to this process's filter.
+
+        Args:
+            jti: Token id being revoked
+        """
+        with self._lock:
+            if self.bloom is not None:
+                self.bloom.add(jti)
+
+    def clear(self) -> None:
+        """Drop the filter so the next lookup rebuilds it."""
+        with self._lock:
+            self.bloom, self.built_at, self.ttl = None, 0.0, 0.0
+
+
+revocation_filter = RevocationFilter()
+
+
+def get_revocation_key(jti: str) -> str:
+    """
+    Get the shared cache key marking a token id as revoked.
+
+    Args:
+        jti: Token id
+
+    Returns:
+        str: Cache key
+    """
+    return f"auth:revoked:{jti}"
+
+
+def record_revocation(jti: str, expires_at: datetime) -> None:
+    """
+    Publish a revoked token id to the shared cache and the local filter.
+
+    The cache entry lives until the token would have expired anyway, so it
+    covers the gap until every process rebuilds its filter.
+
+    Args:
+        jti: Token id being revoked
+        expires_at: Expiry of the revoked token
+    """
+    timeout = int((expires_at - timezone.now()).total_seconds())
+    if timeout <= 0:
+        return
+    cache.set(get_revocation_key(jti), True, timeout=timeout)
+    revocation_filter.add(jti)
+
+
+def is_token_revoked(jti: str) -> bool:
+    """
+    Check whether a refresh token id has been blacklisted.
+
+    A negative answer from the local Bloom filter plus a miss on the
+    shared cache means the token is not revoked, without any database
+    query. Only filter hits, which are real revocations or rare false
+    positives, fall back to the exact blacklist lookup. While the cache is
+    unavailable a miss proves nothing, as recent revocations may be
+    missing from the filter, so every lookup goes to the blacklist.
+
+    Args:
+        jti: Token id to check
+
+    Returns:
+        bool: True if the token is blacklisted
+    """
+    if cache.get(get_revocation_key(jti)):
+        return True
+    if is_cache_available(cache) and not revocation_filter.might_contain(jti):
+        return False
+    return BlacklistedToken.objects.filter(token__jti=jti).exists()
@@ -4,6 +4,8 @@ from djoser.serializers import UserCreateSerializer, UserSerializer
 from phonenumber_field.serializerfields import PhoneNumberField
 from rest_framework import serializers
 
+from core_apps.profiles.models import Profile
+
 User = get_user_model()
 
 
@@ -54,3 +56,22 @@ class CustomUserSerializer(UserSerializer):
             "city",
         ]
         read_only_fields = ["id", "email", "date_joined"]
+
+
+class UserProvisionSerializer(serializers.Serializer):
+    """
+    Serializer validating the payload of a bulk user provisioning.
+
+    Attributes:
+        users: Account records, see ``provision_users`` for the keys
+        user_type: Role of records that do not set their own
+        is_active: Whether the accounts can log in right away
+    """
+
+    users = serializers.ListField(
+        child=serializers.DictField(), allow_empty=False
+    )
+    user_type = serializers.ChoiceField(
+        choices=Profile.UserType.choices, default=Profile.UserType.BUYER
+    )
+    is_active = serializers.BooleanField(default=True)
@@ -0,0 +1,110 @@
+from typing import Any, Optional, Tuple, Type
+
+from django.db import transaction
+from django.db.models.base import Model
+from django.db.models.signals import post_delete, post_init, post_save
+from django.dispatch import receiver
+from rest_framework_simplejwt.settings import api_settings
+from rest_framework_simplejwt.token_blacklist.models import BlacklistedToken
+
+from config.settings.base import AUTH_USER_MODEL
+
+from .cache import bump_user_version
+from .revocation import record_revocation
+from .tokens import bump_token_version
+
+
+@receiver(post_save, sender=AUTH_USER_MODEL)
+@receiver(post_delete, sender=AUTH_USER_MODEL)
+def invalidate_cached_user(
+    sender: Type[Model], instance: Model, **kwargs: Any
+) -> None:
+    """
+    Drop cached copies of a user whenever it is saved or deleted.
+
+    Deactivation and password changes both go through ``save()``, so
+    authentication never serves a stale user after either. The version is
+    bumped again once the transaction commits, orphaning any copy another
+    request loaded and cached from the row as it was before the commit.
+    Queryset ``update()`` calls bypass this signal and are picked up once
+    the cached entry expires.
+
+    Args:
+        sender: Model class that sent the signal (User model)
+        instance: User instance that was saved or deleted
+        **kwargs: Additional signal arguments
+    """
+    user_id = getattr(instance, api_settings.USER_ID_FIELD)
+    bump_user_version(user_id)
+    transaction.on_commit(lambda: bump_user_version(user_id))
+
+
+def get_staff_flags(instance: Model) -> Optional[Tuple[bool, bool]]:
+    """
+    Get the staff flags embedded as claims in a user's tokens.
+
+    Args:
+        instance: User instance being inspected
+
+    Returns:
+        Optional[Tuple[bool, bool]]: is_staff and is_superuser, or None if
+        either field was deferred when the instance was loaded
+    """
+    if {"is_staff", "is_superuser"} - instance.__dict__.keys():
+        return None
+    return instance.is_staff, instance.is_superuser
+
+
+@receiver(post_init, sender=AUTH_USER_MODEL)
+def track_staff_flags(
+    sender: Type[Model], instance: Model, **kwargs: Any
+) -> None:
+    """
+    Remember the staff flags a user was loaded with.
+
+    Args:
+        sender: Model class that sent the signal (User model)
+        instance: User instance that was initialised
+        **kwargs: Additional signal arguments
+    """
+    instance._staff_flags = get_staff_flags(instance)
+
+
+@receiver(post_save, sender=AUTH_USER_MODEL)
+def revoke_stale_staff_claims(
+    sender: Type[Model], instance: Model, created: bool, **kwargs: Any
+) -> None:
+    """
+    Bump the token version when a user's staff flags change.
+
+    Args:
+        sender: Model class that sent the signal (User model)
+        instance: User instance that was saved
+        created: Boolean indicating if this is a new user
+        **kwargs: Additional signal arguments
+    """
+    flags = get_staff_flags(instance)
+    if not created and (flags is None or flags != instance._staff_flags):
+        bump_token_version(getattr(instance, api_settings.USER_ID_FIELD))
+    instance._staff_flags = flags
+
+
+@receiver(post_save, sender=BlacklistedToken)
+def publish_revocation(
+    sender: Type[Model],
+    instance: BlacklistedToken,
+    created: bool,
+    **kwargs: Any
+) -> None:
+    """
+    Make a newly blacklisted token visible to every process's revocation
+    check.
+
+    Args:
+        sender: Model class that sent the signal (BlacklistedToken model)
+        instance: Blacklist entry that was saved
+        created: Boolean indicating if this is a new entry
+        **kwargs: Additional signal arguments
+    """
+    if created:
+        record_revocation(instance.token.jti, instance.token.expires_at)
@@ -0,0 +1,40 @@
+import logging
+from typing import Dict
+
+from celery import shared_task
+from django.conf import settings
+from django.utils import timezone
+from rest_framework_simplejwt.token_blacklist.models import (
+    BlacklistedToken,
+    OutstandingToken,
+)
+
+from core_apps.common.maintenance import delete_in_batches
+
+logger = logging.getLogger(__name__)
+
+
+@shared_task(name="purge_expired_tokens", acks_late=True)
+def purge_expired_tokens() -> Dict[str, int]:
+    """
+    Remove expired refresh tokens from the outstanding and blacklist tables.
+
+    Expired tokens are rejected on their signature alone, so their rows
+    only slow down blacklist lookups. Blacklist entries are deleted before
+    the outstanding tokens they reference.
+
+    Returns:
+        Dict[str, int]: Numbers of blacklisted and outstanding rows deleted
+    """
+    now = timezone.now()
+    batch_size: int = settings.TOKEN_PURGE_BATCH_SIZE
+    summary = {
+        "blacklisted": delete_in_batches(
+            BlacklistedToken, batch_size, token__expires_at__lte=now
+        ),
+        "outstanding": delete_in_batches(
+            OutstandingToken, batch_size, expires_at__lte=now
+        ),
+    }
+    logger.info(f"Purged expired tokens: {summary}")
+    return summary
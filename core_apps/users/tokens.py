@@ -0,0 +1,249 @@
+from typing import Any, Dict
+
+from django.apps import apps
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.db.models import F
+from django.utils.translation import gettext_lazy as _
+from rest_framework_simplejwt.exceptions import (
+    AuthenticationFailed,
+    InvalidToken,
+    TokenError,
+)
+from rest_framework_simplejwt.serializers import (
+    TokenObtainPairSerializer,
+    TokenRefreshSerializer,
+)
+from rest_framework_simplejwt.settings import api_settings
+from rest_framework_simplejwt.tokens import RefreshToken, Token
+
+# Claims describing the user's role, copied into every access token
+ROLE_CLAIM = "role"
+STAFF_CLAIM = "is_staff"
+SUPERUSER_CLAIM = "is_superuser"
+TOKEN_VERSION_CLAIM = "token_version"
+
+
+def get_token_version_key(user_id: Any) -> str:
+    """
+    Get the cache key holding a user's current token version.
+
+    Args:
+        user_id: Public id of the user, as stored in JWT claims
+
+    Returns:
+        str: Cache key
+    """
+    return f"auth:token-version:{user_id}"
+
+
+def get_token_version(user_id: Any) -> int:
+    """
+    Get the token version a user's role claims must carry to be valid.
+
+    Read from the cache and only loaded from the profile on a miss, so
+    permission checks do not query the database on a warm cache.
+
+    Args:
+        user_id: Public id of the user, as stored in JWT claims
+
+    Returns:
+        int: Current token version, 0 if the user has no profile
+    """
+    key = get_token_version_key(user_id)
+    version = cache.get(key)
+    if version is None:
+        Profile = apps.get_model("profiles", "Profile")
+        version = (
+            Profile.objects.filter(
+                **{f"user__{api_settings.USER_ID_FIELD}": user_id}
+            )
+            .values_list("token_version", flat=True)
+            .first()
+        ) or 0
+        # Outlives every token that could still present this version
+        lifetime = settings.SIMPLE_JWT["REFRESH_TOKEN_LIFETIME"]
+        cache.set(key, version, timeout=int(lifetime.total_seconds()))
+    return version
+
+
+def bump_token_version(user_id: Any) -> None:
+    """
+    Invalidate the role claims of every token issued to a user.
+
+    Args:
+        user_id: Public id of the user, as stored in JWT claims
+    """
+    Profile = apps.get_model("profiles", "Profile")
+    Profile.objects.filter(
+        **{f"user__{api_settings.USER_ID_FIELD}": user_id}
+    ).update(token_version=F("token_version") + 1)
+    cache.delete(get_token_version_key(user_id))
+
+
+def get_role_claims(user: Any) -> Dict[str, Any]:
+    """
+    Build the role claims embedded in a user's tokens.
+
+    Args:
+        user: User the token is issued to
+
+    Returns:
+        Dict[str, Any]: Role, staff flags and token version
+    """
+    Profile = apps.get_model("profiles", "Profile")
+    profile = (
+        Profile.objects.filter(user=user)
+        .only("user_type", "token_version")
+        .first()
+    )
+    return {
+        ROLE_CLAIM: profile.user_type if profile else None,
+        STAFF_CLAIM: user.is_staff,
+        SUPERUSER_CLAIM: user.is_superuser,
+        TOKEN_VERSION_CLAIM: profile.token_version if profile else 0,
+    }
+
+
+def token_claims_are_current(token: Token) -> bool:
+    """
+    Check that a token's role claims were issued at the current version.
+
+    Args:
+        token: Validated access or refresh token
+
+    Returns:
+        bool: True if the claims are current
+    """
+    user_id = token.get(api_settings.USER_ID_CLAIM)
+    version = token.get(TOKEN_VERSION_CLAIM)
+    if user_id is None or version is None:
+        return False
+    return bool(version == get_token_version(user_id))
+
+
+class RoleRefreshToken(RefreshToken):
+    """
+    Refresh token carrying the user's role and staff flags as claims.
+
+    Access tokens derived from it copy the claims, so permission classes
+    can authorize from the token alone.
+    """
+
+    @classmethod
+    def for_user(cls, user: Any) -> Token:
+        """
+        Issue a refresh token with role claims for a user.
+
+        Args:
+            user: User the token is issued to
+
+        Returns:
+            Token: Refresh token including role claims
+        """
+        token = super().for_user(user)
+        for claim, value in get_role_claims(user).items():
+            token[claim] = value
+        return token
+
+    def check_blacklist(self) -> None:
+        """
+        Reject blacklisted tokens using the revocation filter.
+
+        Unlike the default check this does not query the blacklist table
+        unless the filter reports a possible revocation.
+
+        Raises:
+            TokenError: If the token is blacklisted
+        """
+        from .revocation import is_token_revoked
+
+        if is_token_revoked(self.payload[api_settings.JTI_CLAIM]):
+            raise TokenError(_("Token is blacklisted"))
+
+
+class RoleTokenObtainPairSerializer(TokenObtainPairSerializer):
+    """
+    Login serializer issuing tokens with role claims.
+    """
+
+    token_class = RoleRefreshToken
+
+
+class RoleTokenRefreshSerializer(TokenRefreshSerializer):
+    """
+    Refresh serializer rejecting tokens whose role claims are stale.
+
+    Once a user's role or staff flags change, refreshing fails and the
+    user has to log in again to receive tokens with the new claims.
+    """
+
+    token_class = RoleRefreshToken
+
+    def validate(self, attrs: Dict[str, Any]) -> Dict[str, str]:
+        """
+        Check the refresh token's role claims, then refresh it.
+
+        Follows ``TokenRefreshSerializer.validate``, but decodes the token
+        once, so its signature and blacklist are only checked once.
+
+        Args:
+            attrs: Serializer input holding the refresh token
+
+        Returns:
+            Dict[str, str]: New access (and rotated refresh) token
+
+        Raises:
+            InvalidToken: If the token's role claims are out of date
+            AuthenticationFailed: If the token's user may not log in
+        """
+        refresh = self.token_class(attrs["refresh"])
+        if not token_claims_are_current(refresh):
+            raise InvalidToken(
+                _("Token roles are out of date, please log in again.")
+            )
+
+        user_id = refresh.payload.get(api_settings.USER_ID_CLAIM)
+        user = get_user_model().objects.get(
+            **{api_settings.USER_ID_FIELD: user_id}
+        )
+        if not api_settings.USER_AUTHENTICATION_RULE(user):
+            raise AuthenticationFailed(
+                self.error_messages["no_active_account"], "no_active_account"
+            )
+
+        data = {"access": str(refresh.access_token)}
+        if api_settings.ROTATE_REFRESH_TOKENS:
+            if api_settings.BLACKLIST_AFTER_ROTATION:
+                refresh.blacklist()
+            refresh.set_jti()
+            refresh.set_exp()
+            refresh.set_iat()
+            refresh.outstand()
+            data["refresh"] = str(refresh)
+        return data
+
+
+class RoleTokenStrategy:
+    """
+    Djoser social auth token strategy issuing tokens with role claims.
+    """
+
+    @classmethod
+    def obtain(cls, user: Any) -> Dict[str, Any]:
+        """
+        Issue a token pair for a user logged in through a provider.
+
+        Args:
+            user: Authenticated user
+
+        Returns:
+            Dict[str, Any]: Access token, refresh token and the user
+        """
+        refresh = RoleRefreshToken.for_user(user)
+        return {
+            "access": str(refresh.access_token),
+            "refresh": str(refresh),
+            "user": user,
+        }
@@ -1,10 +1,11 @@
 from django.urls import path, re_path
 
 from .views import (
+    AsyncLoginView,
     CustomProviderAuthView,
-    CustomTokenObtainPairView,
     CustomTokenRefreshView,
     LogoutAPIView,
+    UserProvisioningAPIView,
 )
 
 # Define URL patterns for authentication endpoints
@@ -19,11 +20,15 @@ urlpatterns = [
     ),
     # Login endpoint for obtaining JWT tokens
     # POST request with email/password returns access and refresh tokens
-    path("login/", CustomTokenObtainPairView.as_view()),
+    # Async view verifying passwords in a bounded thread pool
+    path("login/", AsyncLoginView.as_view()),
     # Token refresh endpoint
     # POST request with refresh token returns new access token
     path("refresh/", CustomTokenRefreshView.as_view()),
     # Logout endpoint
     # POST request clears authentication cookies
     path("logout/", LogoutAPIView.as_view()),
+    # Bulk provisioning endpoint (admin only)
+    # POST request with a list of accounts returns a creation summary
+    path("provision/", UserProvisioningAPIView.as_view()),
 ]
@@ -11,4 +11,11 @@ set -o nounset
 # -A config.celery_app: Specify the Celery app to use
 # worker: Run as a worker
 # -l INFO: Set logging level to INFO
-exec watchfiles --filter python celery.__main__.main --args '-A config.celery_app worker -l INFO'
+# -Q: Queues consumed, all of them unless the service sets CELERY_QUEUES
+# -c: Worker processes, CELERY_CONCURRENCY or one per CPU
+# --prefetch-multiplier: Tasks reserved per process, CELERY_PREFETCH_MULTIPLIER
+QUEUES="${CELERY_QUEUES:-default,email,media,maintenance}"
+CONCURRENCY="${CELERY_CONCURRENCY:-$(nproc)}"
+PREFETCH="${CELERY_PREFETCH_MULTIPLIER:-1}"
+
+exec watchfiles --filter python celery.__main__.main --args "-A config.celery_app worker -l INFO -Q ${QUEUES} -c ${CONCURRENCY} --prefetch-multiplier ${PREFETCH} -n ${QUEUES%%,*}@%h"
@@ -4,4 +4,12 @@ set -o errexit
 set -o nounset
 set -o pipefail
 
-exec celery -A config.celery_app worker -l INFO
\ No newline at end of file
+# Queues, processes and tasks reserved per process are set per worker
+# service, see CELERY_QUEUES in local.yml
+QUEUES="${CELERY_QUEUES:-default,email,media,maintenance}"
+CONCURRENCY="${CELERY_CONCURRENCY:-$(nproc)}"
+PREFETCH="${CELERY_PREFETCH_MULTIPLIER:-1}"
+
+exec celery -A config.celery_app worker -l INFO -Q "${QUEUES}" \
+    -c "${CONCURRENCY}" --prefetch-multiplier "${PREFETCH}" \
+    -n "${QUEUES%%,*}@%h"
@@ -11,4 +11,6 @@ python /app/manage.py migrate
 
 NUM_WORKERS=${GUNICORN_WORKERS:-3}
 
-exec /usr/local/bin/gunicorn config.wsgi --bind 0.0.0.0:8000 --chdir=/app --workers $NUM_WORKERS
\ No newline at end of file
+# Uvicorn workers serve config.asgi so async views such as login do not
+# hold a worker while passwords are verified
+exec /usr/local/bin/gunicorn config.asgi --bind 0.0.0.0:8000 --chdir=/app --workers $NUM_WORKERS --worker-class uvicorn.workers.UvicornWorker
\ No newline at end of file
@@ -0,0 +1,91 @@
+from io import StringIO
+
+import pytest
+from django.core.management import call_command
+from django.urls import reverse
+
+from core_apps.categories.models import Category
+from core_apps.products.models import Product
+
+pytestmark = pytest.mark.django_db
+
+
+def counts(category):
+    """Return the (direct, cumulative) counts stored for a category"""
+    category.refresh_from_db()
+    return category.product_count, category.cumulative_product_count
+
+
+class TestCategoryProductCounts:
+    """Tests for the materialized per-category product counts"""
+
+    @pytest.fixture
+    def tree(self, category_factory):
+        root = category_factory(name="Electronics", is_active=True)
+        phones = category_factory(name="Phones", parent=root, is_active=True)
+        laptops = category_factory(name="Laptops", parent=root, is_active=True)
+        return root, phones, laptops
+
+    def test_create_counts_towards_ancestors(self, tree, product_factory):
+        """Test a new active product is counted up the tree"""
+        root, phones, laptops = tree
+        product_factory(category=phones)
+        product_factory(category=phones, is_active=False)
+
+        assert counts(phones) == (1, 1)
+        assert counts(root) == (0, 1)
+        assert counts(laptops) == (0, 0)
+
+    def test_category_change_moves_count(self, tree, product_factory):
+        """Test moving a product shifts its count between branches"""
+        root, phones, laptops = tree
+        product = product_factory(category=phones)
+
+        product = Product.objects.get(pk=product.pk)
+        product.category = laptops
+        product.save()
+
+        assert counts(phones) == (0, 0)
+        assert counts(laptops) == (1, 1)
+        assert counts(root) == (0, 1)
+
+    def test_deactivate_and_delete(self, tree, product_factory):
+        """Test deactivating or deleting a product removes its count"""
+        root, phones, _ = tree
+        first = product_factory(category=phones)
+        second = product_factory(category=phones)
+
+        first.is_active = False
+        first.save()
+        Product.objects.only("name").get(pk=second.pk).delete()
+
+        assert counts(phones) == (0, 0)
+        assert counts(root) == (0, 0)
+
+    def test_rebuild_command(self, tree, product_factory):
+        """Test the rebuild command repairs drifted counts"""
+        root, phones, laptops = tree
+        product_factory(category=phones)
+        product_factory(category=laptops)
+        product_factory(category=root)
+        Category.objects.update(product_count=0, cumulative_product_count=0)
+
+        call_command("rebuild_category_counts", stdout=StringIO())
+
+        assert counts(root) == (1, 3)
+        assert counts(phones) == (1, 1)
+
+    def test_counts_in_category_response(
+        self, api_client, tree, product_factory, django_assert_num_queries
+    ):
+        """Test counts are exposed without extra queries"""
+        root, phones, _ = tree
+        product_factory(category=phones)
+        url = reverse("categories:category-detail", kwargs={"slug": root.slug})
+
+        with django_assert_num_queries(1):
+            response = api_client.get(url)
+
+        data = response.json()["categories"]
+        assert data["product_count"] == 0
+        assert data["cumulative_product_count"] == 1
@@ -0,0 +1,269 @@
+import json
+from io import StringIO
+
+import pytest
+from django.contrib.auth import get_user_model
+from django.core.exceptions import ValidationError
+from django.core.management import CommandError, call_command
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from core_apps.categories.loaders import load_category_tree
+from core_apps.categories.models import Category
+from core_apps.products.models import Product
+
+pytestmark = pytest.mark.django_db
+
+User = get_user_model()
+
+NESTED = [
+    {
+        "name": "Electronics",
+        "is_active": True,
+        "children": [
+            {"name": "Phones", "is_active": True},
+            {
+                "name": "Laptops",
+                "is_active": True,
+                "children": [{"name": "Gaming", "is_active": True}],
+            },
+        ],
+    },
+    {"name": "Books", "is_active": True},
+]
+
+
+def tree_shape():
+    """Return (name, parent name, level) for every category in tree order"""
+    return [
+        (c.name, c.parent.name if c.parent else None, c.level)
+        for c in Category.objects.select_related("parent")
+    ]
+
+
+def assert_valid_tree():
+    """Assert MPTT fields agree with what a full rebuild produces"""
+    before = list(
+        Category.objects.values_list("pkid", "tree_id", "lft", "rght", "level")
+    )
+    Category.objects.rebuild()
+    after = list(
+        Category.objects.values_list("pkid", "tree_id", "lft", "rght", "level")
+    )
+    assert sorted(before) == sorted(after)
+
+
+class TestLoadCategoryTree:
+    """Tests for the bulk category tree loader"""
+
+    def test_nested_load(self):
+        """Test a nested dataset creates a valid tree"""
+        summary = load_category_tree(NESTED)
+
+        assert summary["created"] == 5
+        assert tree_shape() == [
+            ("Books", None, 0),
+            ("Electronics", None, 0),
+            ("Laptops", "Electronics", 1),
+            ("Gaming", "Laptops", 2),
+            ("Phones", "Electronics", 1),
+        ]
+        assert Category.objects.get(name="Gaming").ancestor_path[0]["name"] == (
+            "Electronics"
+        )
+        assert_valid_tree()
+
+    def test_parent_pointer_load(self):
+        """Test a flat dataset with parent names is accepted in any order"""
+        load_category_tree(
+            [
+                {"name": "Gaming", "parent": "Laptops"},
+                {"name": "Laptops", "parent": "Electronics"},
+                {"name": "Electronics", "parent": None},
+            ]
+        )
+
+        gaming = Category.objects.get(name="Gaming")
+        assert [c.name for c in gaming.get_ancestors()] == [
+            "Electronics",
+            "Laptops",
+        ]
+        assert_valid_tree()
+
+    def test_reload_is_a_noop(self, django_assert_max_num_queries):
+        """Test loading the same dataset twice writes nothing"""
+        load_category_tree(NESTED)
+
+        with django_assert_max_num_queries(3):
+            summary = load_category_tree(NESTED)
+
+        assert summary == {
+            "created": 0,
+            "updated": 0,
+            "unchanged": 5,
+            "renumbered": 0,
+        }
+
+    def test_move_and_update(self, product_factory):
+        """Test moving a branch keeps counts and tree fields consistent"""
+        load_category_tree(NESTED)
+        product_factory(category=Category.objects.get(name="Gaming"))
+
+        summary = load_category_tree(
+            [
+                {"name": "Laptops", "parent": "Books"},
+                {"name": "Phones", "description": "Mobile phones"},
+            ]
+        )
+
+        assert summary["updated"] == 2
+        assert summary["unchanged"] == 0
+        books = Category.objects.get(name="Books")
+        assert books.cumulative_product_count == 1
+        assert (
+            Category.objects.get(name="Electronics").cumulative_product_count
+            == 0
+        )
+        assert Category.objects.get(name="Phones").description == (
+            "Mobile phones"
+        )
+        assert [
+            crumb["name"]
+            for crumb in Category.objects.get(name="Gaming").ancestor_path
+        ] == ["Books", "Laptops", "Gaming"]
+        assert Product.objects.count() == 1
+        assert_valid_tree()
+
+    def test_new_child_under_existing_category(self, category_factory):
+        """Test new nodes attach to categories created through the ORM"""
+        category_factory(name="Electronics", is_active=True)
+
+        summary = load_category_tree(
+            [{"name": "Cameras", "parent": "Electronics"}]
+        )
+
+        assert summary["created"] == 1
+        assert Category.objects.get(name="Cameras").slug == "cameras"
+        assert_valid_tree()
+
+    def test_unknown_parent_is_rejected(self):
+        """Test a dataset referencing a missing parent changes nothing"""
+        with pytest.raises(ValidationError):
+            load_category_tree(
+                [
+                    {"name": "Phones", "parent": "Electronics"},
+                ]
+            )
+        assert not Category.objects.exists()
+
+    def test_cycle_is_rejected(self):
+        """Test a dataset making a category its own ancestor is rejected"""
+        load_category_tree(NESTED)
+
+        with pytest.raises(ValidationError):
+            load_category_tree([{"name": "Electronics", "parent": "Gaming"}])
+        assert Category.objects.get(name="Electronics").parent is None
+
+
+class TestLoadCategoryTreeCommand:
+    """Tests for the load_category_tree management command"""
+
+    def test_command_loads_file(self, tmp_path):
+        """Test the command loads a JSON file and prints a summary"""
+        path = tmp_path / "categories.json"
+        path.write_text(json.dumps(NESTED))
+        out = StringIO()
+
+        call_command("load_category_tree", str(path), stdout=out)
+
+        assert "created=5" in out.getvalue()
+        assert Category.objects.count() == 5
+
+    def test_command_reports_invalid_dataset(self, tmp_path):
+        """Test validation errors surface as command errors"""
+        path = tmp_path / "categories.json"
+        path.write_text(json.dumps([{"name": "Phones", "parent": "Nope"}]))
+
+        with pytest.raises(CommandError):
+            call_command("load_category_tree", str(path))
+
+
+class TestCategoryTreeLoadEndpoint:
+    """Tests for the admin-only bulk load endpoint"""
+
+    endpoint = reverse("categories:category-load")
+
+    @pytest.fixture
+    def admin_client(self):
+        user = User.objects.create_superuser(
+            username="admin",
+            email="admin@example.com",
+            password="testpass123",
+        )
+        client = APIClient()
+        client.force_authenticate(user)
+        return client
+
+    def test_admin_can_load(self, admin_client):
+        """Test staff users can load a taxonomy"""
+        response = admin_client.post(
+            self.endpoint, {"categories": NESTED}, format="json"
+        )
+
+        assert response.status_code == status.HTTP_200_OK
+        assert response.json()["categories"]["created"] == 5
+
+    def test_invalid_dataset_returns_400(self, admin_client):
+        """Test loader validation errors become bad requests"""
+        response = admin_client.post(
+            self.endpoint,
+            {"categories": [{"name": "Phones", "parent": "Nope"}]},
+            format="json",
+        )
+
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+
+    @pytest.mark.parametrize(
+        "node, message",
+        [
+            (
+                {"name": "x" * 236},
+                "Electronics > xxx",
+            ),
+            (
+                {"name": "Phones", "is_active": "maybe"},
+                "Electronics > Phones: is_active: ",
+            ),
+            (
+                {"name": "Phones", "description": ["long"]},
+                "Electronics > Phones: description must be a string.",
+            ),
+            (
+                {"is_active": True},
+                "Electronics > [0]: every category needs a name.",
+            ),
+        ],
+    )
+    def test_invalid_node_returns_400_with_path(
+        self, admin_client, node, message
+    ):
+        """Test bad values are rejected before writing, naming the node"""
+        response = admin_client.post(
+            self.endpoint,
+            {"categories": [{"name": "Electronics", "children": [node]}]},
+            format="json",
+        )
+
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+        [error] = response.json()["categories"]["categories"]
+        assert error.startswith(message)
+        assert not Category.objects.exists()
+
+    def test_non_staff_forbidden(self, api_client_with_credentials):
+        """Test regular users cannot load categories"""
+        response = api_client_with_credentials.post(
+            self.endpoint, {"categories": NESTED}, format="json"
+        )
+
+        assert response.status_code == status.HTTP_403_FORBIDDEN
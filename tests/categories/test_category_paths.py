@@ -0,0 +1,117 @@
+import pytest
+
+from core_apps.categories.models import Category
+from core_apps.products.serializers import ProductSerializer
+
+pytestmark = pytest.mark.django_db
+
+
+def slugs(category):
+    """Return the breadcrumb slugs stored for a category"""
+    category.refresh_from_db()
+    return [crumb["slug"] for crumb in category.ancestor_path]
+
+
+class TestCategoryAncestorPath:
+    """Tests for the precomputed breadcrumbs on Category"""
+
+    @pytest.fixture
+    def tree(self, category_factory):
+        root = category_factory(name="Electronics")
+        phones = category_factory(name="Phones", parent=root)
+        android = category_factory(name="Android", parent=phones)
+        return root, phones, android
+
+    def test_path_on_create(self, tree):
+        """Test new categories get their full path"""
+        root, phones, android = tree
+
+        assert slugs(root) == ["electronics"]
+        assert slugs(android) == ["electronics", "phones", "android"]
+        assert android.ancestor_path[-1]["id"] == str(android.id)
+
+    def test_rename_updates_subtree(self, tree):
+        """Test renaming a category rewrites its descendants' paths"""
+        _, phones, android = tree
+
+        phones.name = "Mobiles"
+        phones.save()
+
+        android.refresh_from_db()
+        assert [crumb["name"] for crumb in android.ancestor_path] == [
+            "Electronics",
+            "Mobiles",
+            "Android",
+        ]
+
+    def test_subtree_rewritten_in_one_update(
+        self, tree, category_factory, django_assert_num_queries
+    ):
+        """Test a subtree's paths are rewritten without reading it"""
+        root, phones, android = tree
+        for index in range(5):
+            category_factory(name=f"Phone {index}", parent=android)
+        phones.name = "Mobiles"
+        Category.objects.filter(pk=phones.pk).update(name="Mobiles")
+
+        # Read the root and its parent, then one UPDATE for the subtree
+        with django_assert_num_queries(3):
+            assert Category.objects.refresh_ancestor_paths(phones) == 7
+
+        leaf = Category.objects.get(name="Phone 4")
+        assert [crumb["name"] for crumb in leaf.ancestor_path] == [
+            "Electronics",
+            "Mobiles",
+            "Android",
+            "Phone 4",
+        ]
+
+    def test_move_updates_subtree_and_counts(self, tree, category_factory):
+        """Test moving a subtree rewrites paths and shifts cumulative counts"""
+        root, phones, android = tree
+        gadgets = category_factory(name="Gadgets")
+        Category.objects.adjust_product_counts(android.pk, 2)
+
+        phones = Category.objects.get(pk=phones.pk)
+        phones.parent = gadgets
+        phones.save()
+
+        assert slugs(android) == ["gadgets", "phones", "android"]
+        root.refresh_from_db()
+        gadgets.refresh_from_db()
+        assert root.cumulative_product_count == 0
+        assert gadgets.cumulative_product_count == 2
+
+    def test_stale_save_keeps_derived_fields(self, tree):
+        """Test saving a stale instance does not overwrite derived fields"""
+        root, _, android = tree
+        stale = Category.objects.get(pk=root.pk)
+        Category.objects.adjust_product_counts(android.pk, 1)
+
+        stale.description = "Updated"
+        stale.save()
+
+        root.refresh_from_db()
+        assert root.cumulative_product_count == 1
+
+    def test_product_breadcrumbs_without_queries(
+        self, tree, product_factory, django_assert_num_queries
+    ):
+        """Test product breadcrumbs are read from the loaded category"""
+        _, _, android = tree
+        product = product_factory(category=android)
+        product = (
+            type(product).objects.select_related("category").get(pk=product.pk)
+        )
+
+        with django_assert_num_queries(0):
+            breadcrumbs = ProductSerializer().fields["breadcrumbs"]
+            data = breadcrumbs.to_representation(
+                breadcrumbs.get_attribute(product)
+            )
+
+        assert [crumb["slug"] for crumb in data] == [
+            "electronics",
+            "phones",
+            "android",
+        ]
@@ -0,0 +1,100 @@
+import pytest
+from django.core.cache import cache
+from django.urls import reverse
+from rest_framework import status
+
+from core_apps.categories.models import (
+    CATEGORY_COUNTS_CHANGED_KEY,
+    CATEGORY_TREE_CACHE_KEY,
+    Category,
+)
+from core_apps.categories.serializers import CategoryTreeSerializer
+
+pytestmark = pytest.mark.django_db
+
+
+@pytest.fixture(autouse=True)
+def clear_tree_cache():
+    """Start every test with a cold category tree cache"""
+    cache.delete_many([CATEGORY_TREE_CACHE_KEY, CATEGORY_COUNTS_CHANGED_KEY])
+
+
+class TestCategoryTree:
+    """Tests for the whole-tree category endpoint"""
+
+    endpoint = reverse("categories:category-tree")
+
+    def test_tree_is_nested(self, api_client, category_factory):
+        """Test active categories are returned as a nested tree"""
+        electronics = category_factory(name="Electronics", is_active=True)
+        phones = category_factory(
+            name="Phones", parent=electronics, is_active=True
+        )
+        category_factory(name="Android", parent=phones, is_active=True)
+        category_factory(name="Books", is_active=True)
+
+        response = api_client.get(self.endpoint)
+
+        assert response.status_code == status.HTTP_200_OK
+        tree = response.json()["categories"]
+        assert [node["slug"] for node in tree] == ["books", "electronics"]
+        assert tree[1]["children"][0]["slug"] == "phones"
+        assert tree[1]["children"][0]["children"][0]["slug"] == "android"
+
+    def test_inactive_subtrees_are_hidden(self, category_factory):
+        """Test inactive categories and their descendants are left out"""
+        hidden = category_factory(name="Hidden", is_active=False)
+        category_factory(name="Orphan", parent=hidden, is_active=True)
+        category_factory(name="Visible", is_active=True)
+
+        roots = Category.objects.active_tree()
+
+        assert [root.name for root in roots] == ["Visible"]
+
+    def test_tree_built_in_one_query(
+        self, category_factory, django_assert_num_queries
+    ):
+        """Test the tree is loaded and serialized with a single query"""
+        root = category_factory(name="Root", is_active=True)
+        for index in range(3):
+            child = category_factory(
+                name=f"Child {index}", parent=root, is_active=True
+            )
+            category_factory(name=f"Leaf {index}", parent=child, is_active=True)
+
+        with django_assert_num_queries(1):
+            roots = Category.objects.active_tree()
+            data = CategoryTreeSerializer(roots, many=True).data
+
+        assert len(data[0]["children"]) == 3
+
+    def test_cache_invalidated_on_change(self, api_client, category_factory):
+        """Test saving a category drops the cached tree"""
+        category = category_factory(name="Electronics", is_active=True)
+        api_client.get(self.endpoint)
+        assert cache.get(CATEGORY_TREE_CACHE_KEY) is not None
+
+        category.name = "Gadgets"
+        category.save()
+
+        assert cache.get(CATEGORY_TREE_CACHE_KEY) is None
+        response = api_client.get(self.endpoint)
+        assert response.json()["categories"][0]["category"] == "Gadgets"
+
+    def test_count_changes_are_debounced(
+        self, api_client, category_factory, settings
+    ):
+        """Test count changes refresh the tree only once it is old enough"""
+        settings.CATEGORY_TREE_COUNTS_DELAY = 60
+        category = category_factory(name="Electronics", is_active=True)
+        api_client.get(self.endpoint)
+
+        Category.objects.adjust_product_counts(category.pk, 3)
+
+        assert cache.get(CATEGORY_TREE_CACHE_KEY) is not None
+        response = api_client.get(self.endpoint)
+        assert response.json()["categories"][0]["product_count"] == 0
+
+        settings.CATEGORY_TREE_COUNTS_DELAY = 0
+        response = api_client.get(self.endpoint)
+        assert response.json()["categories"][0]["product_count"] == 3
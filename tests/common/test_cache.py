@@ -0,0 +1,120 @@
+from decimal import Decimal
+
+import fakeredis
+import pytest
+
+from core_apps.common.cache import (
+    LZ4,
+    MSGPACK,
+    PICKLE,
+    ZLIB,
+    CompressedSerializer,
+    ResilientRedisCache,
+)
+
+
+@pytest.fixture
+def serializer(settings):
+    settings.CACHE_COMPRESSOR = "lz4"
+    settings.CACHE_COMPRESS_MIN_SIZE = 256
+    return CompressedSerializer()
+
+
+def make_cache(url, **options):
+    """Build a Redis cache backend using the compressed serializer"""
+    return ResilientRedisCache(
+        url,
+        {
+            "KEY_PREFIX": "test",
+            "OPTIONS": {
+                "serializer": "core_apps.common.cache.CompressedSerializer",
+                **options,
+            },
+        },
+    )
+
+
+class TestCompressedSerializer:
+    """Tests for the msgpack/pickle serializer with compression"""
+
+    def test_integers_stay_raw(self, serializer):
+        """Test integers are stored unencoded so INCR works on them"""
+        assert serializer.dumps(42) == 42
+        assert serializer.loads(b"42") == 42
+
+    def test_plain_data_uses_msgpack(self, serializer):
+        """Test plain data round-trips through msgpack"""
+        value = {"id": "a1", "tags": ["x", "y"], "price": 9.5, "flag": None}
+        encoded = serializer.dumps(value)
+        assert encoded[0] == MSGPACK
+        assert serializer.loads(encoded) == value
+
+    def test_other_types_fall_back_to_pickle(self, serializer):
+        """Test values msgpack cannot keep exactly are pickled"""
+        for value in [Decimal("1.50"), (1, 2), {"ids": {1, 2}}, True]:
+            encoded = serializer.dumps(value)
+            assert encoded[0] & 0x03 == (MSGPACK if value is True else PICKLE)
+            assert serializer.loads(encoded) == value
+            assert type(serializer.loads(encoded)) is type(value)
+
+    @pytest.mark.parametrize("compressor,flag", [("lz4", LZ4), ("zlib", ZLIB)])
+    def test_compresses_above_threshold(self, settings, compressor, flag):
+        """Test only values above the threshold are compressed"""
+        settings.CACHE_COMPRESSOR = compressor
+        settings.CACHE_COMPRESS_MIN_SIZE = 256
+        serializer = CompressedSerializer()
+        small, large = ["a"] * 10, [{"name": f"item {i}"} for i in range(100)]
+
+        assert not serializer.dumps(small)[0] & flag
+        encoded = serializer.dumps(large)
+        assert encoded[0] & flag
+        settings.CACHE_COMPRESS_MIN_SIZE = 2**31
+        assert len(encoded) < len(CompressedSerializer().dumps(large))
+        assert serializer.loads(encoded) == large
+
+
+class TestResilientRedisCache:
+    """Tests for the Redis cache backend"""
+
+    def test_round_trip_and_incr(self):
+        """Test values and counters round-trip through Redis"""
+        cache = make_cache(
+            "redis://localhost:6379/0",
+            connection_class=fakeredis.FakeConnection,
+        )
+        cache.set("product", {"name": "Lamp", "price": Decimal("10.00")})
+        cache.set("hits", 1)
+        cache.incr("hits")
+
+        assert cache.get("product") == {"name": "Lamp", "price": Decimal("10")}
+        assert cache.get("hits") == 2
+
+    def test_degrades_when_redis_is_down(self, settings):
+        """Test an unreachable Redis behaves like an empty cache"""
+        settings.CACHE_RETRY_INTERVAL = 60
+        cache = make_cache(
+            "redis://127.0.0.1:1/0",
+            socket_connect_timeout=0.1,
+            socket_timeout=0.1,
+        )
+
+        assert cache.get("key", "default") == "default"
+        assert cache.set("key", "value") is None
+        assert cache.add("key", "value") is False
+        assert cache.get_many(["a", "b"]) == {}
+        assert cache.delete("key") is False
+        with pytest.raises(ValueError):
+            cache.incr("counter")
+        assert cache.get_or_set("key", "computed") == "computed"
+
+    def test_skips_redis_after_a_failure(self, settings, monkeypatch):
+        """Test Redis is not retried until the retry interval has passed"""
+        settings.CACHE_RETRY_INTERVAL = 60
+        cache = make_cache("redis://127.0.0.1:1/0", socket_connect_timeout=0.1)
+        cache.get("key")
+
+        calls = []
+        monkeypatch.setattr(cache._cache, "get_client", calls.append)
+        assert cache.get("key") is None
+        assert cache.set("key", 1) is None
+        assert calls == []
@@ -0,0 +1,28 @@
+from django.conf import settings
+
+from config.celery_app import app
+
+
+class TestCeleryRouting:
+    """Tests for the task queues and beat schedule"""
+
+    def test_scheduled_and_routed_tasks_exist(self):
+        """Test beat and the routes only name registered tasks"""
+        app.loader.import_default_modules()
+        scheduled = {entry["task"] for entry in app.conf.beat_schedule.values()}
+
+        assert scheduled - set(app.tasks) == set()
+        assert set(settings.CELERY_TASK_ROUTES) - set(app.tasks) == set()
+
+    def test_workloads_use_their_own_queues(self):
+        """Test email, media and maintenance tasks are kept apart"""
+        router = app.amqp.router
+
+        def queue(name):
+            return router.route({}, name)["queue"].name
+
+        assert queue("djcelery_email_send_multiple") == "email"
+        assert queue("process_avatar_upload") == "media"
+        assert queue("cleanup_old_sessions") == "maintenance"
+        assert queue("some_unrouted_task") == "default"
+        assert app.tasks["cleanup_old_sessions"].acks_late
@@ -0,0 +1,113 @@
+import smtplib
+
+import fakeredis
+import pytest
+from django.core import mail
+from django.core.mail.backends import locmem
+
+from core_apps.common import mail as batching
+from core_apps.common.tasks import send_queued_emails
+
+
+class FlakyBackend(locmem.EmailBackend):
+    """Local memory backend counting opens and failing on demand"""
+
+    opened = 0
+    failures = {}
+
+    def open(self):
+        FlakyBackend.opened += 1
+        return True
+
+    def send_messages(self, messages):
+        for message in messages:
+            error = self.failures.pop(message.to[0], None)
+            if error is not None:
+                raise error
+        return super().send_messages(messages)
+
+
+@pytest.fixture(autouse=True)
+def outbox(settings, monkeypatch):
+    settings.EMAIL_BACKEND = "core_apps.common.mail.BatchingEmailBackend"
+    client = fakeredis.FakeRedis()
+    monkeypatch.setattr(batching, "get_outbox_client", lambda: client)
+    monkeypatch.setattr(batching, "get_connection", lambda _: FlakyBackend())
+    FlakyBackend.opened = 0
+    FlakyBackend.failures = {}
+    yield client
+    batching.close_delivery_connection()
+
+
+def send(*recipients):
+    """Send one message to each recipient through the configured backend"""
+    for recipient in recipients:
+        mail.send_mail("Activate", "Body", "noreply@example.com", [recipient])
+
+
+class TestBatchingEmailBackend:
+    """Tests for batched delivery of queued email"""
+
+    def test_burst_shares_one_send_and_connection(self, monkeypatch):
+        """Test messages in one window are sent by one task, one connection"""
+        scheduled = []
+        monkeypatch.setattr(
+            send_queued_emails,
+            "apply_async",
+            lambda **kwargs: scheduled.append(kwargs),
+        )
+
+        send("a@example.com", "b@example.com", "c@example.com")
+
+        assert len(scheduled) == 1
+        assert mail.outbox == []
+        assert send_queued_emails() == 3
+        assert [m.to for m in mail.outbox] == [
+            ["a@example.com"],
+            ["b@example.com"],
+            ["c@example.com"],
+        ]
+        assert FlakyBackend.opened == 1
+
+        # The next message after a send schedules a new one
+        send("d@example.com")
+        assert len(scheduled) == 2
+
+    def test_retry_does_not_resend_delivered_messages(self, outbox):
+        """Test a transient failure requeues only the undelivered messages"""
+        payloads = [
+            batching.json.dumps(
+                batching.email_to_dict(
+                    mail.EmailMessage("Reset", "Body", to=[recipient])
+                )
+            )
+            for recipient in ("a@example.com", "b@example.com", "c@example.com")
+        ]
+        FlakyBackend.failures["b@example.com"] = smtplib.SMTPServerDisconnected(
+            "Connection lost"
+        )
+
+        with pytest.raises(OSError):
+            batching.send_batch(payloads)
+
+        assert outbox.llen(batching.OUTBOX_KEY) == 2
+        assert batching.send_batch(batching.take_batch(10)) == 2
+        assert [m.to[0] for m in mail.outbox] == [
+            "a@example.com",
+            "b@example.com",
+            "c@example.com",
+        ]
+        assert FlakyBackend.opened == 2
+
+    def test_rejected_recipients_are_dropped(self, outbox):
+        """Test a permanent rejection skips the message, not the batch"""
+        FlakyBackend.failures["bad@example.com"] = (
+            smtplib.SMTPRecipientsRefused(
+                {"bad@example.com": (550, b"No such user")}
+            )
+        )
+
+        send("bad@example.com", "good@example.com")
+
+        assert [m.to[0] for m in mail.outbox] == ["good@example.com"]
+        assert outbox.llen(batching.OUTBOX_KEY) == 0
@@ -0,0 +1,56 @@
+import logging
+from datetime import timedelta
+
+import pytest
+from django.contrib.sessions.backends.db import SessionStore
+from django.contrib.sessions.models import Session
+from django.utils import timezone
+
+from core_apps.common.maintenance import delete_in_batches
+from core_apps.common.tasks import cleanup_old_sessions
+
+pytestmark = pytest.mark.django_db
+
+
+def create_sessions(count, expire_date):
+    """Store sessions expiring at the given time"""
+    for _ in range(count):
+        store = SessionStore()
+        store.create()
+        Session.objects.filter(pk=store.session_key).update(
+            expire_date=expire_date
+        )
+
+
+class TestBatchedDeletes:
+    """Tests for the batched maintenance deletes"""
+
+    def test_deletes_in_short_batches(
+        self, monkeypatch, caplog, django_assert_num_queries
+    ):
+        """Test each batch is its own delete, with a pause in between"""
+        create_sessions(5, timezone.now() - timedelta(days=1))
+        pauses = []
+        monkeypatch.setattr(
+            "core_apps.common.maintenance.time.sleep", pauses.append
+        )
+
+        # A select and a delete in a savepoint per batch, no trailing empty
+        # select after the short last batch
+        with caplog.at_level(logging.INFO, "core_apps.common.maintenance"):
+            with django_assert_num_queries(12):
+                assert delete_in_batches(Session, 2, pause=0.5) == 5
+
+        assert pauses == [0.5, 0.5]
+        assert "Deleted 5 sessions.Session rows in 3 batches" in caplog.text
+        assert "rows/s" in caplog.text
+
+    def test_cleanup_keeps_live_sessions(self, settings):
+        """Test only expired sessions are removed"""
+        settings.SESSION_PURGE_BATCH_SIZE = 2
+        create_sessions(3, timezone.now() - timedelta(minutes=1))
+        create_sessions(2, timezone.now() + timedelta(days=1))
+
+        assert cleanup_old_sessions() == 3
+
+        assert Session.objects.count() == 2
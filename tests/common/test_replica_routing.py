@@ -0,0 +1,90 @@
+import pytest
+from django.db import DEFAULT_DB_ALIAS, DatabaseError, connections
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from rest_framework import status
+
+from core_apps.categories.models import Category
+from core_apps.common import replicas
+from core_apps.common.routers import PrimaryReplicaRouter
+
+pytestmark = pytest.mark.django_db(
+    transaction=True, databases=[DEFAULT_DB_ALIAS, "replica"]
+)
+
+
+@pytest.fixture
+def replica_settings(settings):
+    """Enable the mirrored test replica and reset its health state"""
+    settings.DATABASE_REPLICAS = ["replica"]
+    replicas._unhealthy_until.clear()
+    yield settings
+    replicas._unhealthy_until.clear()
+
+
+class TestPrimaryReplicaRouter:
+    router = PrimaryReplicaRouter()
+
+    def test_reads_use_primary_outside_replica_block(self, replica_settings):
+        """Test reads fall back to Django's default outside a replica block"""
+        assert self.router.db_for_read(Category) is None
+
+    def test_reads_use_replica_inside_block(self, replica_settings):
+        """Test reads go to the replica inside a replica block"""
+        with replicas.use_replica():
+            assert self.router.db_for_read(Category) == "replica"
+            assert self.router.db_for_write(Category) == DEFAULT_DB_ALIAS
+
+    def test_unhealthy_replica_falls_back(self, replica_settings, monkeypatch):
+        """Test an unreachable replica is skipped until the retry interval"""
+
+        def fail():
+            raise DatabaseError("replica down")
+
+        monkeypatch.setattr(connections["replica"], "ensure_connection", fail)
+        with replicas.use_replica():
+            assert self.router.db_for_read(Category) == DEFAULT_DB_ALIAS
+        assert "replica" in replicas._unhealthy_until
+
+    def test_no_migrations_on_replica(self, replica_settings):
+        """Test migrations never run against a replica"""
+        assert self.router.allow_migrate("replica", "categories") is False
+        assert self.router.allow_migrate(DEFAULT_DB_ALIAS, "categories") is None
+
+
+class TestReplicaReads:
+    endpoint = reverse("categories:category-list")
+
+    def test_list_served_from_replica(
+        self, api_client, category_factory, replica_settings
+    ):
+        """Test anonymous catalog reads hit the replica"""
+        category_factory(name="Electronics", is_active=True)
+
+        with CaptureQueriesContext(connections["replica"]) as replica_queries:
+            response = api_client.get(self.endpoint)
+
+        assert response.status_code == status.HTTP_200_OK
+        assert len(replica_queries) > 0
+
+    def test_pinned_client_reads_primary(
+        self, api_client, category_factory, replica_settings
+    ):
+        """Test a client inside the read-your-writes window reads primary"""
+        category_factory(name="Electronics", is_active=True)
+        api_client.cookies[replica_settings.READ_YOUR_WRITES_COOKIE] = "1"
+
+        with CaptureQueriesContext(connections["replica"]) as replica_queries:
+            response = api_client.get(self.endpoint)
+
+        assert response.status_code == status.HTTP_200_OK
+        assert len(replica_queries) == 0
+
+    def test_write_sets_pin_cookie(
+        self, api_client_with_credentials, replica_settings
+    ):
+        """Test a successful write pins the client to the primary"""
+        response = api_client_with_credentials.post("/api/v1/auth/logout/")
+
+        assert response.status_code == status.HTTP_204_NO_CONTENT
+        assert replica_settings.READ_YOUR_WRITES_COOKIE in response.cookies
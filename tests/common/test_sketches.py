@@ -0,0 +1,113 @@
+from datetime import timedelta
+
+import fakeredis
+import pytest
+from django.utils import timezone
+
+from core_apps.common.models import ContentView, ViewerSketch
+from core_apps.common.sketches import HyperLogLog
+from core_apps.common.unique_viewers import (
+    DatabaseSketchStore,
+    RedisSketchStore,
+)
+from core_apps.common.view_buffer import flush_view_buffer, get_view_buffer
+from core_apps.products.analytics import get_product_analytics
+from tests.factories.product import ProductFactory
+
+
+def fill(sketch, start, stop):
+    """Add numbered viewer keys to a sketch"""
+    sketch.update(f"user:{number}" for number in range(start, stop))
+    return sketch
+
+
+class TestHyperLogLog:
+    """Tests for the HyperLogLog distinct counter"""
+
+    @pytest.mark.parametrize("distinct", [100, 5000, 50000])
+    def test_estimate_is_close(self, distinct):
+        """Test the estimate stays within a few percent of the truth"""
+        sketch = fill(HyperLogLog(), 0, distinct)
+
+        assert sketch.count() == pytest.approx(distinct, rel=0.05)
+
+    def test_repeats_are_not_counted(self):
+        """Test adding the same item again leaves the estimate unchanged"""
+        sketch = fill(HyperLogLog(), 0, 1000)
+        before = sketch.count()
+
+        fill(sketch, 0, 1000)
+
+        assert sketch.count() == before
+
+    def test_merge_counts_the_union(self):
+        """Test merged sketches estimate the union of their items"""
+        merged = fill(HyperLogLog(), 0, 3000)
+        merged.merge(fill(HyperLogLog(), 2000, 5000))
+
+        assert merged.count() == pytest.approx(5000, rel=0.05)
+        with pytest.raises(ValueError):
+            merged.merge(HyperLogLog(precision=10))
+
+    def test_small_sketches_stay_sparse(self):
+        """Test few items serialize small and round trip either way"""
+        sparse = fill(HyperLogLog(), 0, 10)
+        dense = fill(HyperLogLog(), 0, 5000)
+
+        assert len(sparse.to_bytes()) == 2 + 3 * 10
+        assert len(dense.to_bytes()) == 2 + 4096
+        for sketch in (sparse, dense):
+            copy = HyperLogLog.from_bytes(sketch.to_bytes())
+            assert copy.count() == sketch.count()
+
+
+class TestSketchStores:
+    """Tests for the daily viewer sketch stores"""
+
+    @pytest.fixture(
+        params=[
+            pytest.param("database", marks=pytest.mark.django_db),
+            "redis",
+        ]
+    )
+    def store(self, request):
+        if request.param == "redis":
+            return RedisSketchStore(fakeredis.FakeStrictRedis())
+        return DatabaseSketchStore(12)
+
+    def test_range_counts_distinct_viewers(self, store):
+        """Test viewers seen on several days are counted once"""
+        today = timezone.localdate()
+        yesterday = today - timedelta(days=1)
+        store.add({("product:1", yesterday): {"user:1", "user:2"}})
+        store.add({("product:1", today): {"user:2", "user:3"}})
+        store.add({("product:2", today): {"user:4"}})
+
+        assert store.count("product:1", yesterday, today) == 3
+        assert store.count("product:1", today, today) == 2
+        assert store.count("product:3", yesterday, today) == 0
+
+
+@pytest.mark.django_db
+class TestProductUniqueViewers:
+    """Tests for sketching the viewers of flushed product views"""
+
+    @pytest.fixture(autouse=True)
+    def empty_buffer(self):
+        get_view_buffer("local").drain()
+
+    def test_flush_sketches_products_and_categories(self):
+        """Test flushed viewers reach product and category sketches"""
+        product = ProductFactory()
+        sibling = ProductFactory(category=product.category)
+        for ip in ("10.0.0.1", "10.0.0.2"):
+            ContentView.record_view(product, None, ip)
+        ContentView.record_view(sibling, None, "10.0.0.1")
+        ContentView.record_view(sibling, None, "10.0.0.3")
+
+        flush_view_buffer()
+
+        assert ViewerSketch.objects.count() == 3
+        analytics = get_product_analytics(product, 7)
+        assert analytics["unique_viewers"] == 2
+        assert analytics["category_unique_viewers"] == 3
@@ -0,0 +1,113 @@
+import pytest
+import redis
+from django.contrib.auth import get_user_model
+from django.contrib.auth.models import AnonymousUser
+from rest_framework import status
+from rest_framework.test import APIClient, APIRequestFactory
+
+from core_apps.common.throttling import (
+    RedisAnonRateThrottle,
+    RedisScopedRateThrottle,
+)
+
+pytestmark = pytest.mark.django_db
+
+User = get_user_model()
+
+
+class ScopedView:
+    throttle_scope = "login"
+
+
+def check(throttle_class=RedisScopedRateThrottle, view=ScopedView()):
+    """Run one throttle check for an anonymous request"""
+    throttle = throttle_class()
+    request = APIRequestFactory().get("/")
+    request.user = AnonymousUser()
+    return throttle, throttle.allow_request(request, view)
+
+
+class TestRedisThrottles:
+    """Tests for the Redis sliding-window throttles"""
+
+    def test_scope_limit_and_remaining(self, settings):
+        """Test requests are counted down and rejected past the limit"""
+        for remaining in range(9, -1, -1):
+            throttle, allowed = check()
+            assert allowed
+            assert throttle.remaining == remaining
+
+        throttle, allowed = check()
+        assert not allowed
+        assert 0 < throttle.wait() <= 60
+
+    def test_unscoped_view_is_not_limited(self, throttle_redis):
+        """Test views without a scope skip the scoped throttle"""
+        _, allowed = check(view=object())
+
+        assert allowed
+        assert throttle_redis.keys() == []
+
+    def test_script_is_registered_once(self, throttle_redis, monkeypatch):
+        """Test checks reuse the script registered on the client"""
+        registered = []
+        register_script = throttle_redis.register_script
+        monkeypatch.setattr(
+            throttle_redis,
+            "register_script",
+            lambda script: registered.append(script) or register_script(script),
+        )
+
+        for _ in range(3):
+            assert check()[1]
+
+        assert len(registered) == 1
+
+    def test_redis_outage_fails_open(self, monkeypatch):
+        """Test requests are allowed when Redis is unreachable"""
+
+        class Down:
+            def register_script(self, script):
+                raise redis.ConnectionError("down")
+
+        monkeypatch.setattr(
+            "core_apps.common.throttling.get_redis_client", lambda: Down()
+        )
+
+        assert check()[1]
+
+    def test_rate_limit_headers(self, api_client):
+        """Test API responses report the tightest remaining quota"""
+        response = api_client.get("/api/v1/categories/")
+
+        assert response.status_code == status.HTTP_200_OK
+        assert response["X-RateLimit-Limit"] == "20"
+        assert response["X-RateLimit-Remaining"] == "19"
+        assert response["X-RateLimit-Window"] == "86400"
+
+    def test_login_scope(self):
+        """Test the login endpoint has its own stricter limit"""
+        client = APIClient()
+        for _ in range(10):
+            client.post("/api/v1/auth/login/", {}, format="json")
+
+        response = client.post("/api/v1/auth/login/", {}, format="json")
+
+        assert response.status_code == status.HTTP_429_TOO_MANY_REQUESTS
+        assert response["X-RateLimit-Remaining"] == "0"
+        assert "Retry-After" in response
+
+    def test_login_daily_cap(self, monkeypatch):
+        """Test logins also count against the daily anonymous quota"""
+        rates = {**RedisScopedRateThrottle.THROTTLE_RATES, "login": "100/min"}
+        monkeypatch.setattr(RedisScopedRateThrottle, "THROTTLE_RATES", rates)
+        daily = RedisAnonRateThrottle.THROTTLE_RATES["anon"]
+        client = APIClient()
+        for _ in range(int(daily.split("/")[0])):
+            client.post("/api/v1/auth/login/", {}, format="json")
+
+        response = client.post("/api/v1/auth/login/", {}, format="json")
+
+        assert response.status_code == status.HTTP_429_TOO_MANY_REQUESTS
+        assert response["X-RateLimit-Window"] == "86400"
+        assert int(response["Retry-After"]) > 60
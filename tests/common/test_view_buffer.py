@@ -0,0 +1,130 @@
+import fakeredis
+import pytest
+from django.contrib.auth import get_user_model
+from django.contrib.contenttypes.models import ContentType
+from django.core.cache import cache
+from rest_framework.test import APIClient
+
+from core_apps.common.models import ContentView
+from core_apps.common.tasks import flush_content_views
+from core_apps.common.view_buffer import (
+    RedisViewBuffer,
+    flush_view_buffer,
+    get_view_buffer,
+)
+from tests.factories.product import ProductFactory
+
+pytestmark = pytest.mark.django_db
+
+User = get_user_model()
+
+
+@pytest.fixture(autouse=True)
+def empty_buffer():
+    """Start every test with an empty local buffer"""
+    get_view_buffer("local").drain()
+    cache.clear()
+
+
+@pytest.fixture
+def product():
+    return ProductFactory()
+
+
+@pytest.fixture
+def viewer():
+    return User.objects.create_user(
+        username="viewer",
+        first_name="View",
+        last_name="Er",
+        email="viewer@example.com",
+        password="testpass123",
+    )
+
+
+class TestBufferedViews:
+    """Tests for buffering content views and writing them in bulk"""
+
+    def test_views_are_written_only_on_flush(
+        self, product, viewer, django_assert_num_queries
+    ):
+        """Test recording is query free and flushes upsert the counts"""
+        ContentType.objects.get_for_model(product)
+        with django_assert_num_queries(0):
+            ContentView.record_view(product, viewer, "10.0.0.1")
+            ContentView.record_view(product, viewer, "10.0.0.1")
+            ContentView.record_view(product, None, "10.0.0.2")
+        assert not ContentView.objects.exists()
+
+        assert flush_content_views() == 2
+        first = ContentView.objects.get(user=viewer)
+        assert first.view_count == 2
+        assert ContentView.objects.get(user=None).viewer_ip == "10.0.0.2"
+
+        ContentView.record_view(product, viewer, "10.0.0.1")
+        flush_content_views()
+        second = ContentView.objects.get(user=viewer)
+        assert second.view_count == 3
+        assert second.last_viewed > first.last_viewed
+        assert ContentView.objects.count() == 2
+
+    def test_user_viewing_from_two_addresses_is_one_viewer(
+        self, product, viewer
+    ):
+        """Test a user's views are merged across IP addresses"""
+        ContentView.record_view(product, viewer, "10.0.0.1")
+        ContentView.record_view(product, viewer, "10.0.0.3")
+
+        flush_view_buffer()
+
+        view = ContentView.objects.get()
+        assert view.view_count == 2
+        assert view.viewer_key == f"user:{viewer.pk}"
+        assert view.viewer_ip == "10.0.0.3"
+
+    def test_deleted_user_is_counted_as_anonymous(self, product, viewer):
+        """Test views of users deleted before the flush are kept"""
+        ContentView.record_view(product, viewer, "10.0.0.1")
+        ContentView.record_view(product, None, "10.0.0.1")
+        viewer.delete()
+
+        flush_view_buffer()
+
+        view = ContentView.objects.get()
+        assert view.user is None
+        assert view.view_count == 2
+
+    def test_product_page_records_a_view(self, product):
+        """Test retrieving a product buffers a view for it"""
+        response = APIClient().get(f"/api/v1/products/{product.slug}/")
+
+        assert response.status_code == 200
+        assert not ContentView.objects.exists()
+        flush_view_buffer()
+        assert ContentView.objects.get().content_object == product
+
+
+class TestRedisViewBuffer:
+    """Tests for the shared Redis view buffer"""
+
+    def test_views_survive_a_failed_flush(self, product, monkeypatch):
+        """Test a drained hash is kept until its views are written"""
+        buffer = RedisViewBuffer(fakeredis.FakeRedis())
+        content_type_id = ContentType.objects.get_for_model(product).pk
+        for _ in range(3):
+            buffer.add((content_type_id, product.pkid, None, "::1"), 1.0)
+
+        def fail(views):
+            raise RuntimeError("database is down")
+
+        monkeypatch.setattr(ContentView, "upsert_views", fail)
+        with pytest.raises(RuntimeError):
+            flush_view_buffer(buffer)
+        monkeypatch.undo()
+
+        buffer.add((content_type_id, product.pkid, None, "::1"), 2.0)
+        flush_view_buffer(buffer)
+        assert ContentView.objects.get().view_count == 3
+        flush_view_buffer(buffer)
+        assert ContentView.objects.get().view_count == 4
+        assert buffer.drain() == {}
@@ -0,0 +1,117 @@
+from datetime import timedelta
+
+import pytest
+from django.contrib.auth import get_user_model
+from django.utils import timezone
+from rest_framework.test import APIClient
+
+from core_apps.common.models import ContentView, ContentViewDaily
+from core_apps.common.tasks import purge_content_views
+from core_apps.common.view_buffer import flush_view_buffer, get_view_buffer
+from tests.factories.product import ProductFactory
+
+pytestmark = pytest.mark.django_db
+
+User = get_user_model()
+
+
+@pytest.fixture(autouse=True)
+def empty_buffer():
+    get_view_buffer("local").drain()
+
+
+@pytest.fixture
+def product():
+    return ProductFactory()
+
+
+def view(product, ip, times=1):
+    """Record anonymous views of a product"""
+    for _ in range(times):
+        ContentView.record_view(product, None, ip)
+
+
+class TestDailyRollups:
+    """Tests for the daily view rollups written by the flush"""
+
+    def test_viewers_are_counted_once_per_day(self, product):
+        """Test views add up while each viewer counts once a day"""
+        view(product, "10.0.0.1", times=2)
+        view(product, "10.0.0.2")
+        flush_view_buffer()
+        view(product, "10.0.0.1")
+        flush_view_buffer()
+
+        rollup = ContentViewDaily.objects.get()
+        assert rollup.day == timezone.localdate()
+        assert rollup.views == 4
+        assert rollup.unique_viewers == 2
+        assert rollup.content_object == product
+
+    def test_returning_viewer_is_new_on_a_later_day(self, product):
+        """Test a viewer last seen yesterday counts again today"""
+        view(product, "10.0.0.1")
+        flush_view_buffer()
+        ContentView.objects.update(
+            last_viewed=timezone.now() - timedelta(days=1)
+        )
+        ContentViewDaily.objects.update(
+            day=timezone.localdate() - timedelta(days=1)
+        )
+
+        view(product, "10.0.0.1")
+        flush_view_buffer()
+
+        today = ContentViewDaily.objects.get(day=timezone.localdate())
+        assert today.unique_viewers == 1
+        assert ContentView.objects.get().view_count == 2
+
+
+class TestRetention:
+    """Tests for purging viewer rows past the retention window"""
+
+    def test_purge_keeps_rollups(self, product, settings):
+        """Test expired viewers are deleted in batches, rollups are kept"""
+        settings.CONTENT_VIEW_PURGE_BATCH_SIZE = 2
+        for last in range(5):
+            view(product, f"10.0.1.{last}")
+        view(product, "10.0.2.1")
+        flush_view_buffer()
+        expired = timezone.now() - settings.CONTENT_VIEW_RETENTION
+        ContentView.objects.exclude(viewer_ip="10.0.2.1").update(
+            last_viewed=expired - timedelta(hours=1)
+        )
+
+        assert purge_content_views() == {"views": 5, "sketches": 0}
+
+        assert ContentView.objects.get().viewer_ip == "10.0.2.1"
+        assert ContentViewDaily.objects.get().unique_viewers == 6
+
+
+class TestProductAnalytics:
+    """Tests for the product analytics endpoint"""
+
+    def test_admin_reads_daily_rollups(self, product):
+        """Test the endpoint serves per-day rollups to admins only"""
+        view(product, "10.0.0.1", times=3)
+        flush_view_buffer()
+        url = f"/api/v1/products/{product.slug}/analytics/"
+        admin = User.objects.create_user(
+            username="analyst",
+            first_name="Ana",
+            last_name="Lyst",
+            email="analyst@example.com",
+            password="testpass123",
+            is_staff=True,
+        )
+        client = APIClient()
+
+        assert client.get(url).status_code in (401, 403)
+
+        client.force_authenticate(admin)
+        response = client.get(url, {"days": 7})
+        assert response.status_code == 200
+        assert response.data["views"] == 3
+        [today] = response.data["daily"]
+        assert today["unique_viewers"] == 1
+        assert client.get(url, {"days": 0}).status_code == 400
@@ -1,3 +1,4 @@
+import fakeredis
 import pytest
 from django.contrib.auth import get_user_model
 from pytest_factoryboy import register
@@ -20,6 +21,30 @@ register(ProductLineFactory)
 register(ProductTypeFactory)
 
 
+@pytest.fixture(autouse=True)
+def throttle_redis(monkeypatch):
+    """
+    Run the Redis throttles against an in-process fake server
+    """
+    client = fakeredis.FakeRedis()
+    monkeypatch.setattr(
+        "core_apps.common.throttling.get_redis_client", lambda: client
+    )
+    return client
+
+
+@pytest.fixture(autouse=True)
+def stock_event_redis(monkeypatch):
+    """
+    Queue low stock events in an in-process fake server
+    """
+    client = fakeredis.FakeRedis()
+    monkeypatch.setattr(
+        "core_apps.products.stock.get_stock_event_client", lambda: client
+    )
+    return client
+
+
 @pytest.fixture
 def category_factory():
     """
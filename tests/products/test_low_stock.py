@@ -0,0 +1,194 @@
+from datetime import timedelta
+
+import pytest
+from django.core import mail
+from django.core.cache import cache
+from django.db.models import F
+
+from core_apps.products.models import ProductLine
+from core_apps.products.stock import (
+    CHECKED_AT_KEY,
+    drain_stock_events,
+    get_low_stock_lines,
+    get_type_thresholds,
+)
+from core_apps.products.tasks import (
+    check_low_stock_levels,
+    send_low_stock_alerts,
+)
+from tests.factories.product import ProductLineFactory, ProductTypeFactory
+
+pytestmark = pytest.mark.django_db
+
+
+@pytest.fixture(autouse=True)
+def no_previous_check():
+    cache.delete(CHECKED_AT_KEY)
+
+
+class TestLowStockCheck:
+    """Tests for the low stock digest task"""
+
+    def test_thresholds_fall_back_from_line_to_type(self, settings):
+        """Test a line's threshold wins over its type's and the default"""
+        settings.LOW_STOCK_THRESHOLD = 5
+        strict = ProductTypeFactory(low_stock_threshold=20)
+        default = ProductLineFactory(stock_qty=5)
+        by_type = ProductLineFactory(stock_qty=15, product_type=strict)
+        ProductLineFactory(stock_qty=25, product_type=strict)
+        by_line = ProductLineFactory(stock_qty=40, low_stock_threshold=50)
+        ProductLineFactory(stock_qty=6)
+
+        low = {line.sku: line.threshold for line in get_low_stock_lines()}
+
+        assert low[default.sku] == 5
+        assert low[by_type.sku] == 20
+        assert low[by_line.sku] == 50
+        assert len(low) == 3
+
+    def test_digest_is_chunked_in_few_queries(
+        self, settings, django_assert_num_queries
+    ):
+        """Test lines are streamed into one email per chunk"""
+        settings.LOW_STOCK_DIGEST_SIZE = 2
+        lines = [ProductLineFactory(stock_qty=1) for _ in range(5)]
+
+        with django_assert_num_queries(1):
+            assert check_low_stock_levels() == 5
+
+        assert [message.subject for message in mail.outbox] == [
+            f"Low Stock Alert (part {part})" for part in (1, 2, 3)
+        ]
+        assert lines[0].sku in "".join(m.body for m in mail.outbox)
+
+    def test_later_runs_only_read_changed_lines(self):
+        """Test lines unchanged since the last check are not reported"""
+        unchanged = ProductLineFactory(stock_qty=1)
+        assert check_low_stock_levels() == 1
+        checked_at = cache.get(CHECKED_AT_KEY)
+        ProductLine.objects.filter(pk=unchanged.pk).update(
+            updated_at=checked_at - timedelta(hours=1)
+        )
+        changed = ProductLineFactory(stock_qty=10)
+        changed.stock_qty = 2
+        changed.save()
+        mail.outbox.clear()
+
+        assert check_low_stock_levels() == 1
+
+        assert changed.sku in mail.outbox[0].body
+        assert unchanged.sku not in mail.outbox[0].body
+        assert cache.get(CHECKED_AT_KEY) > checked_at
+
+    def test_later_runs_read_queryset_stock_writes(self):
+        """Test F() decrements and bulk updates count as changes"""
+        decremented = ProductLineFactory(stock_qty=6)
+        bulk = ProductLineFactory(stock_qty=8)
+        check_low_stock_levels()
+        checked_at = cache.get(CHECKED_AT_KEY)
+        ProductLine.objects.update(updated_at=checked_at - timedelta(hours=1))
+        mail.outbox.clear()
+
+        ProductLine.objects.filter(pk=decremented.pk).update(
+            stock_qty=F("stock_qty") - 2
+        )
+        bulk.stock_qty = 3
+        ProductLine.objects.bulk_update([bulk], ["stock_qty"])
+
+        assert check_low_stock_levels() == 2
+        assert decremented.sku in mail.outbox[0].body
+        assert bulk.sku in mail.outbox[0].body
+
+    def test_later_runs_read_lines_of_changed_types(self, settings):
+        """Test raising a type's threshold reports lines falling back to it"""
+        settings.LOW_STOCK_THRESHOLD = 5
+        product_type = ProductTypeFactory()
+        inherited = ProductLineFactory(stock_qty=8, product_type=product_type)
+        ProductLineFactory(
+            stock_qty=8, product_type=product_type, low_stock_threshold=2
+        )
+        assert check_low_stock_levels() == 0
+        checked_at = cache.get(CHECKED_AT_KEY)
+        ProductLine.objects.update(updated_at=checked_at - timedelta(hours=1))
+
+        product_type.low_stock_threshold = 10
+        product_type.save()
+
+        assert check_low_stock_levels() == 1
+        assert inherited.sku in mail.outbox[0].body
+
+
+class TestLowStockEvents:
+    """Tests for low stock events raised as stock is written"""
+
+    def test_bulk_decrement_reports_each_line_once(
+        self, django_capture_on_commit_callbacks, django_assert_num_queries
+    ):
+        """Test F() decrements queue one event per crossing"""
+        lines = [ProductLineFactory(stock_qty=qty) for qty in (7, 6, 50)]
+        queryset = ProductLine.objects.filter(
+            pk__in=[line.pk for line in lines]
+        )
+        get_type_thresholds()
+
+        for _ in range(3):
+            with django_capture_on_commit_callbacks(execute=True):
+                # Lock, update, read back
+                with django_assert_num_queries(3):
+                    assert queryset.update(stock_qty=F("stock_qty") - 1) == 3
+
+        assert drain_stock_events() == [lines[1].pk, lines[0].pk]
+
+    def test_empty_updates_run_no_query(self, django_assert_num_queries):
+        """Test updates of provably empty querysets do nothing"""
+        ProductLineFactory(stock_qty=10)
+
+        with django_assert_num_queries(0):
+            assert (
+                ProductLine.objects.filter(pk__in=[]).update(
+                    stock_qty=F("stock_qty") - 1
+                )
+                == 0
+            )
+            assert ProductLine.objects.none().update(stock_qty=0) == 0
+
+        assert drain_stock_events() == []
+
+    def test_restock_rearms_the_alert(self, django_capture_on_commit_callbacks):
+        """Test a line is reported again after going back above threshold"""
+        line = ProductLineFactory(stock_qty=10)
+
+        for qty in (3, 2, 20, 4):
+            line.stock_qty = qty
+            with django_capture_on_commit_callbacks(execute=True):
+                line.save()
+
+        assert drain_stock_events() == [line.pk, line.pk]
+
+    def test_alerts_are_batched_into_one_digest(
+        self, django_capture_on_commit_callbacks
+    ):
+        """Test queued events are sent together, skipping restocked lines"""
+        with django_capture_on_commit_callbacks(execute=True):
+            low = [ProductLineFactory(stock_qty=1) for _ in range(3)]
+        ProductLine.objects.filter(pk=low[2].pk).update(stock_qty=30)
+        mail.outbox.clear()
+
+        assert send_low_stock_alerts() == 2
+
+        [message] = mail.outbox
+        assert low[0].sku in message.body
+        assert low[2].sku not in message.body
+        assert send_low_stock_alerts() == 0
+
+    def test_rolled_back_updates_queue_nothing(
+        self, django_capture_on_commit_callbacks
+    ):
+        """Test events are only queued once the stock write commits"""
+        line = ProductLineFactory(stock_qty=10)
+
+        with django_capture_on_commit_callbacks() as callbacks:
+            ProductLine.objects.filter(pk=line.pk).update(stock_qty=0)
+
+        assert len(callbacks) == 1
+        assert drain_stock_events() == []
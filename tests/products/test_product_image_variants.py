@@ -0,0 +1,137 @@
+from io import BytesIO
+
+import pytest
+from django.core.files.storage import default_storage
+from django.core.files.uploadedfile import SimpleUploadedFile
+from PIL import Image
+
+from core_apps.products.models import ProductImage
+from core_apps.products.serializers import ProductImageSerializer
+from tests.factories.product import ProductLineFactory
+
+pytestmark = pytest.mark.django_db
+
+
+@pytest.fixture(autouse=True)
+def media_root(settings, tmp_path):
+    settings.MEDIA_ROOT = str(tmp_path)
+    settings.MEDIA_URL = "/media/"
+    return tmp_path
+
+
+@pytest.fixture
+def product_line():
+    return ProductLineFactory()
+
+
+def make_upload(size=(2000, 1000), name="photo.jpg"):
+    """Build an uploaded noisy JPEG photo"""
+    image = Image.effect_noise(size, 64).convert("RGB")
+    output = BytesIO()
+    image.save(output, "JPEG", quality=95)
+    return SimpleUploadedFile(name, output.getvalue(), "image/jpeg")
+
+
+def create_image(product_line, capture, **kwargs):
+    """Create a product image and run the variant task queued on commit"""
+    with capture(execute=True):
+        image = ProductImage.objects.create(
+            product_line=product_line,
+            alternative_text="Photo",
+            **kwargs,
+        )
+    image.refresh_from_db()
+    return image
+
+
+class TestProductImageVariants:
+    """Tests for the responsive product image variants"""
+
+    def test_variants_generated_on_save(
+        self, product_line, django_capture_on_commit_callbacks
+    ):
+        """Test every width is generated in WebP and JPEG"""
+        image = create_image(
+            product_line, django_capture_on_commit_callbacks, url=make_upload()
+        )
+
+        assert image.variants["source"] == image.url.name
+        for key in ["webp", "jpeg"]:
+            assert list(image.variants[key]) == ["160", "480", "1080"]
+            with default_storage.open(image.variants[key]["480"]) as file:
+                with Image.open(file) as variant:
+                    assert variant.size == (480, 240)
+
+        original = image.url.size
+        smallest = default_storage.size(image.variants["webp"]["160"])
+        assert smallest * 10 < original
+
+    def test_small_images_are_not_upscaled(
+        self, product_line, django_capture_on_commit_callbacks
+    ):
+        """Test widths above the source collapse to the source width"""
+        image = create_image(
+            product_line,
+            django_capture_on_commit_callbacks,
+            url=make_upload(size=(300, 300)),
+        )
+
+        assert list(image.variants["jpeg"]) == ["160", "300"]
+
+    def test_variants_are_content_addressed(
+        self, product_line, django_capture_on_commit_callbacks
+    ):
+        """Test identical images share the same variant files"""
+        upload = make_upload(size=(600, 400))
+        first = create_image(
+            product_line, django_capture_on_commit_callbacks, url=upload
+        )
+        upload.seek(0)
+        second = create_image(
+            product_line, django_capture_on_commit_callbacks, url=upload
+        )
+
+        assert first.url.name != second.url.name
+        assert first.variants["webp"] == second.variants["webp"]
+
+    def test_unchanged_file_is_not_regenerated(
+        self, product_line, django_capture_on_commit_callbacks
+    ):
+        """Test saves keeping the same file do not queue the task again"""
+        image = create_image(
+            product_line, django_capture_on_commit_callbacks, url=make_upload()
+        )
+
+        with django_capture_on_commit_callbacks() as callbacks:
+            image.alternative_text = "Renamed"
+            image.save()
+
+        assert callbacks == []
+
+    def test_serializer_srcset(
+        self, product_line, django_capture_on_commit_callbacks
+    ):
+        """Test the serializer emits a srcset per MIME type"""
+        image = create_image(
+            product_line, django_capture_on_commit_callbacks, url=make_upload()
+        )
+
+        srcset = ProductImageSerializer(image).data["srcset"]
+
+        assert set(srcset) == {"image/webp", "image/jpeg"}
+        candidates = srcset["image/webp"].split(", ")
+        assert [c.split(" ")[1] for c in candidates] == [
+            "160w",
+            "480w",
+            "1080w",
+        ]
+        assert candidates[0].startswith("/media/product_images/variants/")
+
+    def test_missing_source_leaves_no_variants(
+        self, product_line, django_capture_on_commit_callbacks
+    ):
+        """Test images whose file is missing are skipped"""
+        image = create_image(product_line, django_capture_on_commit_callbacks)
+
+        assert image.variants == {}
+        assert ProductImageSerializer(image).data["srcset"] == {}
@@ -0,0 +1,128 @@
+from datetime import timedelta
+
+import pytest
+from django.core.cache import cache
+from django.utils import timezone
+from rest_framework.test import APIClient
+
+from core_apps.common.models import ContentView
+from core_apps.common.view_buffer import flush_view_buffer, get_view_buffer
+from core_apps.products.models import Product
+from core_apps.products.popularity import (
+    add_popularity,
+    get_current_popularity,
+    get_event_weight,
+    rebuild_popularity,
+)
+from tests.factories.product import ProductFactory
+
+pytestmark = pytest.mark.django_db
+
+
+@pytest.fixture(autouse=True)
+def empty_buffer():
+    get_view_buffer("local").drain()
+
+
+def view(product, times, ip="10.0.0.1"):
+    """Record anonymous views of a product"""
+    for _ in range(times):
+        ContentView.record_view(product, None, ip)
+
+
+class TestPopularity:
+    """Tests for time-decayed product popularity"""
+
+    def test_events_halve_every_half_life(self, settings):
+        """Test an event's weight decays by half per half-life"""
+        now = timezone.now()
+        later = now + settings.PRODUCT_POPULARITY_HALF_LIFE
+
+        score = get_event_weight(now, 8.0)
+
+        assert get_current_popularity(score, now) == pytest.approx(8.0)
+        assert get_current_popularity(score, later) == pytest.approx(4.0)
+
+    def test_recent_events_outrank_older_ones(self, settings):
+        """Test fewer recent events beat more events from long ago"""
+        old, new = ProductFactory(), ProductFactory()
+        now = timezone.now()
+        long_ago = now - settings.PRODUCT_POPULARITY_HALF_LIFE * 3
+
+        add_popularity({old.pk: get_event_weight(long_ago, 6.0), new.pk: 0.0})
+        add_popularity({new.pk: get_event_weight(now, 1.0)})
+
+        old.refresh_from_db()
+        new.refresh_from_db()
+        assert new.popularity > old.popularity
+        assert get_current_popularity(old.popularity) == pytest.approx(
+            0.75, rel=1e-3
+        )
+
+    def test_flushed_views_feed_popularity(self):
+        """Test every view flush adds to the viewed products' scores"""
+        quiet, busy = ProductFactory(), ProductFactory()
+        view(quiet, 1)
+        view(busy, 2)
+        view(busy, 1, ip="10.0.0.2")
+
+        flush_view_buffer()
+
+        quiet.refresh_from_db()
+        busy.refresh_from_db()
+        assert get_current_popularity(busy.popularity) == pytest.approx(
+            3.0, rel=1e-3
+        )
+        assert get_current_popularity(quiet.popularity) == pytest.approx(
+            1.0, rel=1e-3
+        )
+
+    def test_rebuild_matches_recorded_views(self):
+        """Test the batch rebuild recomputes scores from daily rollups"""
+        product = ProductFactory()
+        view(product, 3)
+        flush_view_buffer()
+        Product.objects.update(popularity=0.0)
+
+        assert rebuild_popularity() == 1
+
+        # Rollups count a day's views at noon, at most half a day off
+        product.refresh_from_db()
+        assert get_current_popularity(product.popularity) == pytest.approx(
+            3.0, rel=0.05
+        )
+
+    def test_products_can_be_ordered_by_popularity(self):
+        """Test the list endpoint accepts ordering=-popularity"""
+        products = [ProductFactory() for _ in range(3)]
+        now = timezone.now() - timedelta(minutes=1)
+        add_popularity(
+            {
+                product.pk: get_event_weight(now, weight)
+                for product, weight in zip(products, [2.0, 5.0, 1.0])
+            }
+        )
+
+        response = APIClient().get(
+            "/api/v1/products/", {"ordering": "-popularity"}
+        )
+
+        assert response.status_code == 200
+        names = [item["name"] for item in response.data["results"]]
+        assert names == [products[i].name for i in (1, 0, 2)]
+
+    def test_ordered_list_is_served_from_cache(self, django_assert_num_queries):
+        """Test a repeated ordered list request runs no queries"""
+        cache.clear()
+        products = [ProductFactory() for _ in range(2)]
+        add_popularity({products[1].pk: 1.0})
+        client = APIClient()
+        params = {"ordering": "-popularity"}
+        first = client.get("/api/v1/products/", params)
+
+        with django_assert_num_queries(0):
+            second = client.get("/api/v1/products/", params)
+
+        assert second.status_code == 200
+        assert second.data["results"] == first.data["results"]
+        assert second.data["results"][0]["name"] == products[1].name
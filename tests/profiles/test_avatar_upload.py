@@ -0,0 +1,194 @@
+from io import BytesIO
+
+import pytest
+from django.contrib.auth import get_user_model
+from django.core.files.uploadedfile import SimpleUploadedFile
+from PIL import Image
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from core_apps.common.uploads import get_staged_path
+from core_apps.profiles.avatars import InvalidAvatar, prepare_avatar
+from core_apps.profiles.models import Profile
+from core_apps.profiles.tasks import process_avatar_upload
+
+pytestmark = pytest.mark.django_db
+
+User = get_user_model()
+
+ENDPOINT = "/api/v1/profiles/upload_avatar/"
+
+
+@pytest.fixture(autouse=True)
+def avatar_settings(settings, tmp_path):
+    settings.UPLOAD_STAGING_DIR = str(tmp_path / "staging")
+    settings.MEDIA_ROOT = str(tmp_path / "media")
+    settings.AVATAR_STORAGE = "local"
+    settings.AVATAR_MAX_DIMENSION = 64
+    return settings
+
+
+@pytest.fixture
+def user():
+    return User.objects.create_user(
+        username="avataruser",
+        first_name="Avatar",
+        last_name="User",
+        email="avatar@example.com",
+        password="testpass123",
+        is_active=True,
+    )
+
+
+@pytest.fixture
+def client(user):
+    client = APIClient()
+    client.force_authenticate(user)
+    return client
+
+
+def make_image(size=(200, 100), image_format="JPEG", exif=True):
+    """Encode a test image, optionally with an EXIF camera tag"""
+    image = Image.new("RGB", size, "red")
+    output = BytesIO()
+    if exif:
+        tags = Image.Exif()
+        tags[0x010F] = "Test Camera"
+        image.save(output, image_format, exif=tags)
+    else:
+        image.save(output, image_format)
+    return output.getvalue()
+
+
+def staged_files(settings):
+    """List the references left in the staging directory"""
+    staging = get_staged_path("0" * 32).parent
+    return sorted(p.name for p in staging.iterdir()) if staging.exists() else []
+
+
+class TestPrepareAvatar:
+    """Tests for avatar validation and re-encoding"""
+
+    def test_downscales_and_strips_metadata(self, tmp_path):
+        """Test avatars fit the maximum size and lose their EXIF data"""
+        path = tmp_path / "avatar.jpg"
+        path.write_bytes(make_image())
+
+        with Image.open(BytesIO(prepare_avatar(path))) as avatar:
+            assert avatar.format == "JPEG"
+            assert avatar.size == (64, 32)
+            assert not avatar.getexif()
+            assert "icc_profile" not in avatar.info
+
+    def test_flattens_transparency(self, tmp_path):
+        """Test transparent PNGs are flattened onto white"""
+        path = tmp_path / "avatar.png"
+        Image.new("RGBA", (10, 10), (0, 0, 0, 0)).save(path)
+
+        with Image.open(BytesIO(prepare_avatar(path))) as avatar:
+            assert avatar.mode == "RGB"
+            assert min(avatar.getpixel((5, 5))) > 240
+
+    def test_rejects_non_images_and_huge_images(self, tmp_path, settings):
+        """Test files that are not sane images are rejected"""
+        path = tmp_path / "avatar.jpg"
+        path.write_bytes(b"not an image")
+        with pytest.raises(InvalidAvatar):
+            prepare_avatar(path)
+
+        settings.AVATAR_MAX_PIXELS = 100
+        path.write_bytes(make_image())
+        with pytest.raises(InvalidAvatar):
+            prepare_avatar(path)
+
+
+class TestUploadAvatar:
+    """Tests for the streaming avatar upload endpoint"""
+
+    def test_only_the_reference_is_enqueued(
+        self, client, user, settings, monkeypatch
+    ):
+        """Test the image is staged and only its reference is queued"""
+        calls = []
+        monkeypatch.setattr(
+            "core_apps.profiles.views.process_avatar_upload.delay",
+            lambda *args: calls.append(args),
+        )
+        upload = SimpleUploadedFile("me.jpg", make_image(), "image/jpeg")
+
+        response = client.patch(
+            ENDPOINT, {"avatar": upload}, format="multipart"
+        )
+
+        assert response.status_code == status.HTTP_202_ACCEPTED
+        [(profile_id, reference)] = calls
+        assert profile_id == str(user.profile.id)
+        assert staged_files(settings) == [reference]
+
+    def test_task_stores_avatar_and_discards_staged_file(
+        self, client, user, settings
+    ):
+        """Test the eager task processes, stores and cleans up the upload"""
+        upload = SimpleUploadedFile("me.jpg", make_image(), "image/jpeg")
+
+        response = client.patch(
+            ENDPOINT, {"avatar": upload}, format="multipart"
+        )
+
+        assert response.status_code == status.HTTP_202_ACCEPTED
+        profile = Profile.objects.get(user=user)
+        assert str(profile.avatar).startswith("avatars/")
+        assert staged_files(settings) == []
+
+    def test_locally_stored_avatar_is_served_from_media(
+        self, client, user, settings
+    ):
+        """Test profiles with a local avatar link to the media storage"""
+        settings.MEDIA_URL = "/media/"
+        upload = SimpleUploadedFile("me.jpg", make_image(), "image/jpeg")
+        client.patch(ENDPOINT, {"avatar": upload}, format="multipart")
+
+        response = client.get("/api/v1/profiles/my_profile/")
+
+        assert response.status_code == status.HTTP_200_OK
+        name = str(Profile.objects.get(user=user).avatar)
+        assert response.data["avatar"] == (
+            f"http://testserver/media/{name}.jpg"
+        )
+
+    def test_oversized_upload_is_rejected_while_streaming(
+        self, client, settings
+    ):
+        """Test uploads past the limit get a 413 and leave nothing staged"""
+        settings.AVATAR_MAX_UPLOAD_SIZE = 1024
+        content = make_image(size=(400, 400), image_format="PNG", exif=False)
+        upload = SimpleUploadedFile("big.png", content, "image/png")
+
+        response = client.patch(
+            ENDPOINT, {"avatar": upload}, format="multipart"
+        )
+
+        assert response.status_code == status.HTTP_413_REQUEST_ENTITY_TOO_LARGE
+        assert staged_files(settings) == []
+
+    def test_invalid_upload_is_discarded(self, client, settings):
+        """Test staged files failing validation are removed"""
+        upload = SimpleUploadedFile("me.jpg", b"not an image", "image/jpeg")
+
+        response = client.patch(
+            ENDPOINT, {"avatar": upload}, format="multipart"
+        )
+
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+        assert staged_files(settings) == []
+
+    def test_task_rejects_invalid_staged_file(self, user, settings):
+        """Test the task drops staged files that are not valid images"""
+        path = get_staged_path("a" * 32)
+        path.parent.mkdir(parents=True)
+        path.write_bytes(b"not an image")
+
+        process_avatar_upload(str(user.profile.id), "a" * 32)
+
+        assert not path.exists()
+        assert not Profile.objects.get(user=user).avatar
@@ -0,0 +1,78 @@
+import pytest
+from django.contrib.auth import get_user_model
+from django.db import connection
+from rest_framework.test import APIClient
+
+from core_apps.common.filters import TrigramSearchFilter
+from core_apps.profiles.models import Profile
+from core_apps.profiles.views import ProfileViewSet
+
+pytestmark = pytest.mark.django_db
+
+User = get_user_model()
+
+
+def create_user(username, first_name, last_name):
+    return User.objects.create_user(
+        username=username,
+        first_name=first_name,
+        last_name=last_name,
+        email=f"{username}@example.com",
+        password="testpass123",
+        is_active=True,
+    )
+
+
+class TestSearchName:
+    """Tests for the profile search document"""
+
+    def test_filled_on_profile_creation(self):
+        """Test new profiles get the user's lowercased names"""
+        user = create_user("JDoe", "Jane", "Doe")
+
+        assert Profile.objects.get(user=user).search_name == "jdoe jane doe"
+
+    def test_synced_on_name_change(self):
+        """Test renaming a user updates the profile document"""
+        user = create_user("jdoe", "Jane", "Doe")
+        user.last_name = "Smith"
+        user.save()
+
+        assert Profile.objects.get(user=user).search_name == "jdoe jane smith"
+
+    def test_unrelated_saves_do_not_write(self, django_assert_num_queries):
+        """Test saves keeping the names skip the profile update"""
+        user = create_user("jdoe", "Jane", "Doe")
+        user = User.objects.get(pk=user.pk)
+        user.is_active = False
+
+        with django_assert_num_queries(1):
+            user.save(update_fields=["is_active"])
+
+
+class TestTrigramSearchFilter:
+    """Tests for profile search"""
+
+    def test_search_endpoint(self):
+        """Test the search parameter matches any part of the names"""
+        create_user("jdoe", "Jane", "Doe")
+        create_user("bsmith", "Bob", "Smith")
+        client = APIClient()
+        client.force_authenticate(create_user("viewer", "View", "Er"))
+
+        response = client.get("/api/v1/profiles/", {"search": "SMI"})
+
+        results = response.json()["profiles"]["results"]
+        assert [p["username"] for p in results] == ["bsmith"]
+
+    def test_ranks_by_word_similarity_on_postgresql(self, monkeypatch):
+        """Test PostgreSQL queries rank with the trigram operators"""
+        monkeypatch.setattr(connection, "vendor", "postgresql")
+        request = type("Request", (), {"query_params": {"search": "Jane"}})
+
+        queryset = TrigramSearchFilter().filter_queryset(
+            request, Profile.objects.all(), ProfileViewSet()
+        )
+
+        assert queryset.query.order_by == ("-search_rank", "pk")
+        assert "search_rank" in queryset.query.annotations
@@ -0,0 +1,156 @@
+from io import BytesIO
+from types import SimpleNamespace
+
+import pytest
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from PIL import Image
+
+from core_apps.common.uploads import get_staged_path
+from core_apps.profiles.avatars import get_avatar_source_hash
+from core_apps.profiles.models import Profile
+from core_apps.profiles.pipeline import save_profile
+from core_apps.profiles.tasks import import_social_avatar
+
+pytestmark = pytest.mark.django_db
+
+User = get_user_model()
+
+AVATAR_URL = "https://lh3.googleusercontent.com/a/avatar=s96-c"
+
+GOOGLE = SimpleNamespace(name="google-oauth2")
+
+
+@pytest.fixture(autouse=True)
+def avatar_settings(settings, tmp_path):
+    settings.UPLOAD_STAGING_DIR = str(tmp_path / "staging")
+    settings.MEDIA_ROOT = str(tmp_path / "media")
+    settings.AVATAR_STORAGE = "local"
+    settings.AVATAR_MAX_DIMENSION = 64
+    cache.clear()
+    return settings
+
+
+@pytest.fixture
+def user():
+    return User.objects.create_user(
+        username="socialuser",
+        first_name="Social",
+        last_name="User",
+        email="social@example.com",
+        password="testpass123",
+        is_active=True,
+    )
+
+
+class FakeResponse:
+    """Streaming response stand-in for requests.get"""
+
+    def __init__(self, content):
+        self.content = content
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        return False
+
+    def raise_for_status(self):
+        pass
+
+    def iter_content(self, chunk_size):
+        for start in range(0, len(self.content), chunk_size):
+            yield self.content[start : start + chunk_size]  # noqa: E203
+
+
+@pytest.fixture
+def downloads(monkeypatch):
+    """Serve a PNG for every avatar download and record the URLs"""
+    image = BytesIO()
+    Image.new("RGB", (200, 200), "blue").save(image, "PNG")
+    urls = []
+
+    def fake_get(url, **kwargs):
+        urls.append(url)
+        return FakeResponse(image.getvalue())
+
+    monkeypatch.setattr("core_apps.profiles.avatars.requests.get", fake_get)
+    return urls
+
+
+class TestSaveProfile:
+    """Tests for the social auth avatar pipeline step"""
+
+    @pytest.fixture
+    def queued(self, monkeypatch):
+        calls = []
+        monkeypatch.setattr(
+            "core_apps.profiles.pipeline.import_social_avatar.delay",
+            lambda *args: calls.append(args),
+        )
+        return calls
+
+    def test_queues_import_without_downloading(
+        self, user, queued, downloads, django_capture_on_commit_callbacks
+    ):
+        """Test the login only queues the import, once per avatar URL"""
+        with django_capture_on_commit_callbacks(execute=True):
+            profile, created = save_profile(
+                GOOGLE, user, {"picture": AVATAR_URL}
+            )
+            save_profile(GOOGLE, user, {"picture": AVATAR_URL})
+
+        assert not created
+        assert queued == [(str(profile.id), AVATAR_URL)]
+        assert downloads == []
+
+    def test_skips_already_imported_avatar(
+        self, user, queued, django_capture_on_commit_callbacks
+    ):
+        """Test nothing is queued when the stored hash matches the URL"""
+        Profile.objects.filter(user=user).update(
+            avatar_source_hash=get_avatar_source_hash(AVATAR_URL)
+        )
+
+        with django_capture_on_commit_callbacks(execute=True):
+            save_profile(GOOGLE, user, {"picture": AVATAR_URL})
+
+        assert queued == []
+
+    def test_ignores_other_backends_and_missing_pictures(self, user, queued):
+        """Test only Google logins with a picture are handled"""
+        facebook = SimpleNamespace(name="facebook")
+
+        assert save_profile(facebook, user, {"picture": AVATAR_URL}) is None
+        assert save_profile(GOOGLE, user, {}) is None
+        assert queued == []
+
+
+class TestImportSocialAvatar:
+    """Tests for the background social avatar import"""
+
+    def test_imports_once_per_url(self, user, downloads, settings):
+        """Test the avatar is stored with its hash and never refetched"""
+        profile_id = str(user.profile.id)
+
+        import_social_avatar(profile_id, AVATAR_URL)
+        import_social_avatar(profile_id, AVATAR_URL)
+
+        profile = Profile.objects.get(user=user)
+        assert str(profile.avatar).startswith("avatars/")
+        assert profile.avatar_source_hash == get_avatar_source_hash(AVATAR_URL)
+        assert downloads == [AVATAR_URL]
+        assert not any(get_staged_path("0" * 32).parent.iterdir())
+
+    def test_oversized_download_is_not_retried(self, user, downloads, settings):
+        """Test an avatar past the upload limit is skipped for good"""
+        settings.AVATAR_MAX_UPLOAD_SIZE = 16
+        profile_id = str(user.profile.id)
+
+        import_social_avatar(profile_id, AVATAR_URL)
+        import_social_avatar(profile_id, AVATAR_URL)
+
+        profile = Profile.objects.get(user=user)
+        assert not profile.avatar
+        assert profile.avatar_source_hash == get_avatar_source_hash(AVATAR_URL)
+        assert downloads == [AVATAR_URL]
@@ -0,0 +1,146 @@
+import asyncio
+
+import pytest
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from rest_framework import status
+from rest_framework.test import APIClient
+from rest_framework_simplejwt.tokens import AccessToken
+
+from core_apps.users.login import LoginOverloaded, PasswordVerifier
+from core_apps.users.views import AsyncLoginView
+
+pytestmark = pytest.mark.django_db
+
+User = get_user_model()
+
+ENDPOINT = "/api/v1/auth/login/"
+
+
+@pytest.fixture(autouse=True)
+def clear_cache():
+    """Reset login throttling between tests"""
+    cache.clear()
+
+
+@pytest.fixture
+def user():
+    return User.objects.create_user(
+        username="testuser",
+        first_name="Test",
+        last_name="User",
+        email="test@example.com",
+        password="testpass123",
+        is_active=True,
+    )
+
+
+class TestAsyncLogin:
+    """Tests for the async login view"""
+
+    def test_login_sets_cookies(self, user):
+        """Test valid credentials log in and set JWT cookies"""
+        response = APIClient().post(
+            ENDPOINT,
+            {"email": user.email, "password": "testpass123"},
+            format="json",
+        )
+
+        assert response.status_code == status.HTTP_200_OK
+        assert response.json() == {"message": "Login Successful"}
+        assert response["X-Login-Queue-Depth"] == "0"
+        assert AccessToken(response.cookies["access"].value)["user_id"] == (
+            str(user.id)
+        )
+        assert "refresh" in response.cookies
+
+    @pytest.mark.parametrize(
+        "email, password",
+        [("test@example.com", "wrong"), ("nobody@example.com", "testpass123")],
+    )
+    def test_invalid_credentials(self, user, email, password):
+        """Test wrong passwords and unknown emails are rejected alike"""
+        response = APIClient().post(
+            ENDPOINT, {"email": email, "password": password}
+        )
+
+        assert response.status_code == status.HTTP_401_UNAUTHORIZED
+        assert "access" not in response.cookies
+
+    def test_inactive_user_rejected(self, user):
+        """Test inactive users cannot log in"""
+        user.is_active = False
+        user.save()
+
+        response = APIClient().post(
+            ENDPOINT,
+            {"email": user.email, "password": "testpass123"},
+            format="json",
+        )
+
+        assert response.status_code == status.HTTP_401_UNAUTHORIZED
+
+    def test_missing_fields(self):
+        """Test missing credentials return field errors"""
+        response = APIClient().post(ENDPOINT, {}, format="json")
+
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+        assert set(response.json()) == {"email", "password"}
+
+    @pytest.mark.parametrize("password", [123, ["testpass123"], {"a": 1}])
+    def test_non_string_credentials(self, user, password):
+        """Test credentials that are not strings are rejected, not hashed"""
+        response = APIClient().post(
+            ENDPOINT, {"email": user.email, "password": password}, format="json"
+        )
+
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+        assert response.json() == {"password": ["Not a valid string."]}
+
+    def test_login_is_documented(self):
+        """Test the async view appears in the API schema"""
+        response = APIClient().get("/swagger/?format=openapi")
+
+        assert response.status_code == status.HTTP_200_OK
+        assert "post" in response.json()["paths"]["/auth/login/"]
+
+    def test_overload_returns_503(self, user, monkeypatch):
+        """Test logins beyond the admission limit are shed"""
+        full = PasswordVerifier(max_workers=1, max_pending=0)
+        monkeypatch.setattr("core_apps.users.views.password_verifier", full)
+
+        response = APIClient().post(
+            ENDPOINT,
+            {"email": user.email, "password": "testpass123"},
+            format="json",
+        )
+
+        assert response.status_code == status.HTTP_503_SERVICE_UNAVAILABLE
+        assert response["Retry-After"] == "1"
+        assert full.get_stats()["rejected"] == 1
+
+    def test_view_is_async(self):
+        """Test the login view runs natively under ASGI"""
+        assert AsyncLoginView.view_is_async
+
+
+def test_verifier_bounds_pending_checks():
+    """Test admission control counts queued and running checks"""
+    verifier = PasswordVerifier(max_workers=1, max_pending=1)
+
+    class Slow:
+        password = "md5$salt$hash"
+
+        def set_password(self, raw):
+            pass
+
+    async def run():
+        first = asyncio.ensure_future(verifier.verify(Slow(), "x"))
+        await asyncio.sleep(0)
+        assert verifier.pending == 1
+        with pytest.raises(LoginOverloaded):
+            await verifier.verify(Slow(), "x")
+        assert await first is False
+        assert verifier.pending == 0
+
+    asyncio.run(run())
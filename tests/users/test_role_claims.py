@@ -0,0 +1,118 @@
+import pytest
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from rest_framework import status
+from rest_framework.exceptions import AuthenticationFailed
+from rest_framework.test import APIClient, APIRequestFactory
+from rest_framework_simplejwt.tokens import AccessToken
+
+from core_apps.common.permissions import IsSeller, IsSellerOrReadOnly
+from core_apps.users.tokens import RoleRefreshToken
+
+pytestmark = pytest.mark.django_db
+
+User = get_user_model()
+
+
+@pytest.fixture(autouse=True)
+def clear_cache():
+    """Start every test with a cold token version cache"""
+    cache.clear()
+
+
+@pytest.fixture
+def user():
+    return User.objects.create_user(
+        username="seller",
+        first_name="Test",
+        last_name="Seller",
+        email="seller@example.com",
+        password="testpass123",
+        is_active=True,
+    )
+
+
+def token_request(user, method="post"):
+    """Build a request authenticated with a role-claim access token"""
+    token = RoleRefreshToken.for_user(user).access_token
+    request = getattr(APIRequestFactory(), method)("/")
+    request.auth = AccessToken(str(token))
+    return request
+
+
+def set_role(user, role):
+    profile = user.profile
+    profile.user_type = role
+    profile.save()
+
+
+class TestRoleClaims:
+    """Tests for role claims embedded in JWTs"""
+
+    def test_login_embeds_role_claims(self, user):
+        """Test login cookies carry the role, staff flags and version"""
+        response = APIClient().post(
+            "/api/v1/auth/login/",
+            {"email": user.email, "password": "testpass123"},
+        )
+
+        assert response.status_code == status.HTTP_200_OK
+        token = AccessToken(response.cookies["access"].value)
+        assert token["role"] == "buyer"
+        assert token["is_staff"] is False
+        assert token["token_version"] == 0
+
+    def test_permission_uses_token_only(self, user, django_assert_num_queries):
+        """Test a warm permission check needs no database query"""
+        set_role(user, "seller")
+        request = token_request(user)
+        IsSeller().has_permission(request, None)
+
+        with django_assert_num_queries(0):
+            assert IsSeller().has_permission(request, None)
+
+    def test_buyer_cannot_write(self, user):
+        """Test roles outside the allowed set are denied"""
+        assert not IsSeller().has_permission(token_request(user), None)
+        assert IsSellerOrReadOnly().has_permission(
+            token_request(user, "get"), None
+        )
+
+    def test_staff_claim_grants_access(self, user):
+        """Test staff tokens pass role checks"""
+        user.is_staff = True
+        user.save()
+
+        assert IsSeller().has_permission(token_request(user), None)
+
+    def test_role_change_rejects_old_tokens(self, user):
+        """Test tokens issued before a role change are rejected"""
+        set_role(user, "seller")
+        request = token_request(user)
+        set_role(user, "buyer")
+
+        with pytest.raises(AuthenticationFailed):
+            IsSeller().has_permission(request, None)
+
+    def test_staff_change_blocks_refresh(self, user):
+        """Test refreshing fails once the staff flags change"""
+        refresh = RoleRefreshToken.for_user(user)
+        user.is_staff = True
+        user.save()
+
+        response = APIClient().post(
+            "/api/v1/auth/refresh/", {"refresh": str(refresh)}
+        )
+
+        assert response.status_code == status.HTTP_401_UNAUTHORIZED
+
+    def test_refresh_with_current_claims(self, user):
+        """Test refreshing keeps working while the role is unchanged"""
+        refresh = RoleRefreshToken.for_user(user)
+        client = APIClient()
+        client.cookies["refresh"] = str(refresh)
+
+        response = client.post("/api/v1/auth/refresh/")
+
+        assert response.status_code == status.HTTP_200_OK
+        assert AccessToken(response.cookies["access"].value)["role"] == "buyer"
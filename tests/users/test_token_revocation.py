@@ -0,0 +1,185 @@
+from datetime import timedelta
+
+import pytest
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.utils import timezone
+from rest_framework import status
+from rest_framework.test import APIClient
+from rest_framework_simplejwt.token_blacklist.models import (
+    BlacklistedToken,
+    OutstandingToken,
+)
+
+from core_apps.common.sketches import BloomFilter
+from core_apps.users import revocation
+from core_apps.users.revocation import is_token_revoked, revocation_filter
+from core_apps.users.tasks import purge_expired_tokens
+from core_apps.users.tokens import RoleRefreshToken
+
+pytestmark = pytest.mark.django_db
+
+User = get_user_model()
+
+
+@pytest.fixture(autouse=True)
+def clear_revocations():
+    """Start every test with an empty cache and a cold filter"""
+    cache.clear()
+    revocation_filter.clear()
+    yield
+    revocation_filter.clear()
+
+
+@pytest.fixture
+def user():
+    return User.objects.create_user(
+        username="testuser",
+        first_name="Test",
+        last_name="User",
+        email="test@example.com",
+        password="testpass123",
+        is_active=True,
+    )
+
+
+def refresh(refresh_token):
+    """Post a refresh token to the refresh endpoint"""
+    return APIClient().post(
+        "/api/v1/auth/refresh/", {"refresh": str(refresh_token)}
+    )
+
+
+def test_bloom_filter_has_no_false_negatives():
+    """Test every added item is reported as present"""
+    bloom = BloomFilter(capacity=1000, error_rate=0.01)
+    items = [f"jti-{i}" for i in range(1000)]
+    bloom.update(items)
+
+    assert all(item in bloom for item in items)
+    false_positives = sum(f"other-{i}" in bloom for i in range(1000))
+    assert false_positives < 50
+
+
+class TestTokenRevocation:
+    """Tests for refresh token revocation lookups"""
+
+    def test_rotated_token_is_rejected(self, user):
+        """Test a refresh token cannot be reused after rotation"""
+        token = RoleRefreshToken.for_user(user)
+
+        assert refresh(token).status_code == status.HTTP_200_OK
+        assert refresh(token).status_code == status.HTTP_401_UNAUTHORIZED
+
+    def test_cookie_refresh_rotates_cookie(self, user):
+        """Test a refresh through the cookie stores the rotated token"""
+        client = APIClient()
+        client.cookies["refresh"] = str(RoleRefreshToken.for_user(user))
+
+        for _ in range(2):
+            response = client.post("/api/v1/auth/refresh/", {}, format="json")
+            assert response.status_code == status.HTTP_200_OK
+            assert "refresh" not in response.data
+
+    def test_single_token_decode_per_refresh(self, user, monkeypatch):
+        """Test a refresh checks the token's blacklist entry once"""
+        token = RoleRefreshToken.for_user(user)
+        checked = []
+        monkeypatch.setattr(
+            revocation, "is_token_revoked", lambda jti: checked.append(jti)
+        )
+
+        assert refresh(token).status_code == status.HTTP_200_OK
+        assert checked == [token["jti"]]
+
+    def test_unrevoked_lookup_skips_database(
+        self, user, django_assert_num_queries
+    ):
+        """Test a warm filter answers negative lookups without queries"""
+        revocation_filter.rebuild()
+        token = RoleRefreshToken.for_user(user)
+
+        with django_assert_num_queries(0):
+            assert not is_token_revoked(token["jti"])
+
+    def test_revocation_seen_before_filter_rebuild(
+        self, user, django_assert_num_queries
+    ):
+        """Test revocations from other processes are found in the cache"""
+        revocation_filter.rebuild()
+        token = RoleRefreshToken.for_user(user)
+        token.blacklist()
+        # Simulate a filter built before another process revoked the token
+        revocation_filter.bloom = BloomFilter(capacity=10)
+
+        with django_assert_num_queries(0):
+            assert is_token_revoked(token["jti"])
+
+    def test_filter_hit_falls_back_to_blacklist(self, user):
+        """Test revoked tokens are found once the cache entry is gone"""
+        token = RoleRefreshToken.for_user(user)
+        token.blacklist()
+        cache.clear()
+        revocation_filter.clear()
+
+        assert is_token_revoked(token["jti"])
+
+    def test_cache_outage_falls_back_to_blacklist(self, user, monkeypatch):
+        """Test a filter miss is not trusted while the cache is down"""
+        revocation_filter.rebuild()
+        token = RoleRefreshToken.for_user(user)
+        token.blacklist()
+        # Revoked by another process after the filter was built
+        revocation_filter.bloom = BloomFilter(capacity=10)
+        cache.clear()
+        monkeypatch.setattr(revocation, "is_cache_available", lambda _: False)
+
+        assert is_token_revoked(token["jti"])
+
+    def test_stale_filter_rebuilds_once_off_request_path(
+        self, user, monkeypatch
+    ):
+        """Test a stale filter keeps answering while one rebuild starts"""
+        revocation_filter.rebuild()
+        revocation_filter.built_at -= revocation_filter.ttl + 1
+        started = []
+
+        class DeferredThread:
+            def __init__(self, **kwargs):
+                self.kwargs = kwargs
+
+            def start(self):
+                started.append(self.kwargs)
+
+        monkeypatch.setattr(revocation.threading, "Thread", DeferredThread)
+
+        for _ in range(3):
+            assert not revocation_filter.might_contain("unknown")
+
+        assert len(started) == 1
+        revocation_filter._rebuilding.release()
+
+
+class TestPurgeExpiredTokens:
+    """Tests for the batched token purge task"""
+
+    def test_purges_only_expired_rows(self, user, settings):
+        """Test expired rows are deleted in batches and live ones kept"""
+        settings.TOKEN_PURGE_BATCH_SIZE = 2
+        live = RoleRefreshToken.for_user(user)
+        live.blacklist()
+        past = timezone.now() - timedelta(days=1)
+        for i in range(5):
+            expired = OutstandingToken.objects.create(
+                user=user, jti=f"expired-{i}", token="t", expires_at=past
+            )
+            if i % 2:
+                BlacklistedToken.objects.create(token=expired)
+
+        summary = purge_expired_tokens()
+
+        assert summary == {"blacklisted": 2, "outstanding": 5}
+        assert list(OutstandingToken.objects.values_list("jti", flat=True)) == [
+            live["jti"]
+        ]
+        assert BlacklistedToken.objects.count() == 1
@@ -0,0 +1,164 @@
+import pytest
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from rest_framework.exceptions import AuthenticationFailed
+from rest_framework.test import APIRequestFactory
+from rest_framework_simplejwt.tokens import RefreshToken
+
+from core_apps.common.cookie_auth import CookieAuthentication
+from core_apps.users.cache import (
+    LocalTTLCache,
+    cache_user,
+    get_user_version,
+    get_user_version_key,
+    local_user_cache,
+)
+
+pytestmark = pytest.mark.django_db
+
+User = get_user_model()
+
+
+@pytest.fixture(autouse=True)
+def clear_user_caches():
+    """Start every test with cold user caches"""
+    cache.clear()
+    local_user_cache.clear()
+    yield
+    local_user_cache.clear()
+
+
+@pytest.fixture
+def user():
+    return User.objects.create_user(
+        username="testuser",
+        first_name="Test",
+        last_name="User",
+        email="test@example.com",
+        password="testpass123",
+    )
+
+
+def authenticate(user, token=None):
+    """Authenticate a request carrying an access token for the user"""
+    token = token or RefreshToken.for_user(user).access_token
+    request = APIRequestFactory().get("/", HTTP_AUTHORIZATION=f"Bearer {token}")
+    return CookieAuthentication().authenticate(request)
+
+
+class TestCachedUserResolution:
+    """Tests for cached user lookups in CookieAuthentication"""
+
+    def test_warm_cache_needs_no_queries(self, user, django_assert_num_queries):
+        """Test a repeat authentication does not query the database"""
+        token = RefreshToken.for_user(user).access_token
+        with django_assert_num_queries(1):
+            authenticate(user, token)
+        with django_assert_num_queries(0):
+            authenticated, _ = authenticate(user, token)
+
+        assert authenticated.pk == user.pk
+
+    def test_shared_cache_serves_other_processes(
+        self, user, django_assert_num_queries
+    ):
+        """Test a cold local tier falls back to the shared cache"""
+        token = RefreshToken.for_user(user).access_token
+        authenticate(user, token)
+        local_user_cache.clear()
+
+        with django_assert_num_queries(0):
+            authenticated, _ = authenticate(user, token)
+        assert authenticated.email == user.email
+
+    def test_save_invalidates_cached_user(self, user):
+        """Test profile edits are visible on the next request"""
+        authenticate(user)
+        user.first_name = "Changed"
+        user.save()
+
+        authenticated, _ = authenticate(user)
+        assert authenticated.first_name == "Changed"
+
+    def test_deactivation_rejects_cached_user(self, user):
+        """Test a deactivated user is not served from cache"""
+        authenticate(user)
+        user.is_active = False
+        user.save()
+
+        with pytest.raises(AuthenticationFailed):
+            authenticate(user)
+
+    def test_copy_cached_before_commit_is_orphaned(
+        self, user, django_capture_on_commit_callbacks
+    ):
+        """Test a copy loaded before a save commits is not served after"""
+        with django_capture_on_commit_callbacks(execute=True):
+            version = get_user_version(user.id)
+            stale = User.objects.get(pk=user.pk)
+            user.first_name = "Changed"
+            user.save()
+            # A concurrent request caching the row it read before the save
+            cache_user(user.id, stale, get_user_version(user.id))
+            local_user_cache.clear()
+
+        authenticated, _ = authenticate(user)
+        assert version != get_user_version(user.id)
+        assert authenticated.first_name == "Changed"
+
+    def test_lost_version_bypasses_cache(self, user, django_assert_num_queries):
+        """Test cached copies are not read once their version is gone"""
+        token = RefreshToken.for_user(user).access_token
+        authenticate(user, token)
+        local_user_cache.clear()
+        cache.delete(get_user_version_key(user.id))
+
+        with django_assert_num_queries(1):
+            authenticate(user, token)
+
+    def test_unavailable_cache_is_not_used(
+        self, user, monkeypatch, django_assert_num_queries
+    ):
+        """Test users are neither read nor cached without a version"""
+        token = RefreshToken.for_user(user).access_token
+        authenticate(user, token)
+        local_user_cache.clear()
+        cache.delete(get_user_version_key(user.id))
+        # The version cannot be restored, as while Redis is down
+        monkeypatch.setattr(cache, "add", lambda *args, **kwargs: False)
+
+        for _ in range(2):
+            with django_assert_num_queries(1):
+                authenticate(user, token)
+
+    def test_cached_user_is_copied(self, user):
+        """Test request code cannot mutate the cached instance"""
+        authenticate(user)
+        first, _ = authenticate(user)
+        first.first_name = "Mutated"
+
+        second, _ = authenticate(user)
+        assert second.first_name == "Test"
+
+
+class TestLocalTTLCache:
+    """Tests for the per-process LRU tier"""
+
+    def test_evicts_least_recently_used(self):
+        """Test the oldest untouched entry is evicted when full"""
+        local = LocalTTLCache(maxsize=2, timeout=60)
+        local.set("a", 1)
+        local.set("b", 2)
+        local.get("a")
+        local.set("c", 3)
+
+        assert local.get("a") == 1
+        assert local.get("b") is None
+        assert local.get("c") == 3
+
+    def test_entries_expire(self):
+        """Test entries older than the timeout are dropped"""
+        local = LocalTTLCache(maxsize=2, timeout=0)
+        local.set("a", 1)
+
+        assert local.get("a") is None
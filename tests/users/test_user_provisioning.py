@@ -0,0 +1,162 @@
+import json
+
+import pytest
+from django.contrib.auth import get_user_model
+from django.contrib.auth.hashers import make_password
+from django.core.management import call_command
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from core_apps.profiles.models import Profile
+from core_apps.users.provisioning import allocate_profile_slugs, provision_users
+
+pytestmark = pytest.mark.django_db
+
+User = get_user_model()
+
+
+def make_records(count, prefix="seller"):
+    return [
+        {
+            "email": f"{prefix}{i}@example.com",
+            "username": f"{prefix}{i}",
+            "first_name": "Seller",
+            "last_name": f"Number {i}",
+        }
+        for i in range(count)
+    ]
+
+
+class TestProvisionUsers:
+    """Tests for bulk user provisioning"""
+
+    def test_creates_users_and_profiles(self):
+        """Test every record gets a user and a complete profile"""
+        records = make_records(5)
+        records[0]["password"] = make_password("secret", hasher="md5")
+
+        summary = provision_users(records, user_type="seller", batch_size=2)
+
+        assert summary == {
+            "created": 5,
+            "skipped": 0,
+            "failed": 0,
+            "rejected": [],
+        }
+        profile = Profile.objects.select_related("user").get(slug="seller0")
+        assert profile.user_type == "seller"
+        assert profile.search_name == "seller0 seller number 0"
+        assert profile.user.check_password("secret")
+        assert not User.objects.get(username="seller1").has_usable_password()
+
+    def test_queries_per_chunk_are_constant(self, django_assert_num_queries):
+        """Test a chunk costs the same few queries whatever its size"""
+        # Lookups of taken emails, usernames and slugs, then savepoint,
+        # user insert, profile insert and release
+        with django_assert_num_queries(7):
+            provision_users(make_records(50), batch_size=50)
+
+    def test_skips_existing_duplicate_and_invalid_records(self):
+        """Test rejected records are reported and the rest created"""
+        provision_users(make_records(1))
+        records = make_records(2) + [
+            {"email": "seller1@example.com", "username": "other"},
+            {**make_records(1, "x")[0], "email": "not-an-email"},
+            {**make_records(1, "y")[0], "password": "plain-text"},
+        ]
+
+        summary = provision_users(records)
+
+        assert summary["created"] == 1
+        assert summary["skipped"] == 1
+        assert summary["failed"] == 3
+        assert [e["index"] for e in summary["rejected"]] == [0, 2, 3, 4]
+        assert User.objects.count() == 2
+
+    def test_rejects_values_of_the_wrong_type(self):
+        """Test non-string values are reported per record"""
+        records = make_records(4)
+        records[0]["email"] = 42
+        records[1]["username"] = ["seller1"]
+        records[2]["user_type"] = ["seller"]
+
+        summary = provision_users(records)
+
+        assert summary["created"] == 1
+        assert [(e["index"], e["error"]) for e in summary["rejected"]] == [
+            (0, "Not a string: email"),
+            (1, "Not a string: username"),
+            (2, "Not a string: user_type"),
+        ]
+
+    def test_slugs_are_unique_in_bulk(self):
+        """Test slugs colliding after slugify get numbered suffixes"""
+        provision_users(make_records(1, "john"))
+
+        slugs = allocate_profile_slugs(["john0", "JOHN0", "jane"])
+
+        assert slugs == ["john0-2", "john0-3", "jane"]
+
+
+class TestProvisioningEntryPoints:
+    """Tests for the provisioning API and command"""
+
+    def test_api_is_admin_only(self):
+        """Test only staff can provision users"""
+        admin = User.objects.create_superuser(
+            username="admin",
+            first_name="Ad",
+            last_name="Min",
+            email="admin@example.com",
+            password="testpass123",
+        )
+        client = APIClient()
+        payload = {"users": make_records(3), "user_type": "seller"}
+
+        response = client.post(
+            "/api/v1/auth/provision/", payload, format="json"
+        )
+        assert response.status_code == status.HTTP_401_UNAUTHORIZED
+
+        client.force_authenticate(admin)
+        response = client.post(
+            "/api/v1/auth/provision/", payload, format="json"
+        )
+        assert response.status_code == status.HTTP_200_OK
+        assert response.json()["users"]["created"] == 3
+        assert Profile.objects.filter(user_type="seller").count() == 3
+
+    def test_api_reports_bad_values_per_record(self):
+        """Test records with values of the wrong type do not fail the call"""
+        admin = User.objects.create_superuser(
+            username="admin",
+            first_name="Ad",
+            last_name="Min",
+            email="admin@example.com",
+            password="testpass123",
+        )
+        client = APIClient()
+        client.force_authenticate(admin)
+        records = make_records(2)
+        records[0]["email"] = 42
+
+        response = client.post(
+            "/api/v1/auth/provision/", {"users": records}, format="json"
+        )
+
+        assert response.status_code == status.HTTP_200_OK
+        summary = response.json()["users"]
+        assert summary["created"] == 1
+        assert summary["rejected"] == [
+            {"index": 0, "email": 42, "error": "Not a string: email"}
+        ]
+
+    def test_command(self, tmp_path, capsys):
+        """Test the command provisions a JSON file"""
+        path = tmp_path / "users.json"
+        path.write_text(json.dumps(make_records(4)))
+
+        call_command("provision_users", str(path), "--user-type", "seller")
+
+        assert "created=4" in capsys.readouterr().out
+        assert Profile.objects.filter(user_type="seller").count() == 4